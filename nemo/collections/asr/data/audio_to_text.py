@@ -31,6 +31,7 @@ from nemo.collections.asr.parts.preprocessing.segment import ChannelSelectorType
 from nemo.collections.asr.parts.preprocessing.segment import available_formats as valid_sf_formats
 from nemo.collections.common import tokenizers
 from nemo.collections.common.parts.preprocessing import collections, parsers
+from nemo.collections.common.parts.preprocessing.manifest_index import tokenizer_cache_key
 from nemo.core.classes import Dataset, IterableDataset
 from nemo.core.neural_types import *
 from nemo.utils import logging
@@ -134,6 +135,14 @@ class ASRManifestProcessor:
         bos_id: Id of beginning of sequence symbol to append if not None.
         eos_id: Id of end of sequence symbol to append if not None.
         pad_id: Id of pad symbol. Defaults to 0.
+        index_by_file_id: If True, saves a mapping from filename base (ID) to index in the collection.
+        manifest_parse_func: Optional function to parse manifest entries. Defaults to None.
+        use_manifest_index: If True, parse and tokenize the manifest once into a memory-mapped index
+            that is shared by ranks, dataloader workers and later runs. Defaults to False.
+        manifest_index_dir: Directory to save the manifest index to. If None, the index is written
+            next to the manifest. Defaults to None.
+        tokenization_num_workers: Number of processes used to tokenize the manifest transcripts.
+            Defaults to None (tokenize in the current process).
     """
 
     def __init__(
@@ -148,6 +157,9 @@ class ASRManifestProcessor:
         pad_id: int = 0,
         index_by_file_id: bool = False,
         manifest_parse_func: Optional[Callable] = None,
+        use_manifest_index: bool = False,
+        manifest_index_dir: Optional[str] = None,
+        tokenization_num_workers: Optional[int] = None,
     ):
         self.parser = parser
 
@@ -159,6 +171,9 @@ class ASRManifestProcessor:
             max_number=max_utts,
             index_by_file_id=index_by_file_id,
             parse_func=manifest_parse_func,
+            use_manifest_index=use_manifest_index,
+            manifest_index_dir=manifest_index_dir,
+            tokenization_num_workers=tokenization_num_workers,
         )
 
         self.eos_id = eos_id
@@ -427,6 +442,12 @@ class _AudioTextDataset(Dataset):
         return_sample_id (bool): whether to return the sample_id as a part of each sample
         channel_selector (int | Iterable[int] | str): select a single channel or a subset of channels from multi-channel audio. If set to `'average'`, it performs averaging across channels. Disabled if set to `None`. Defaults to `None`. Uses zero-based indexing.
         manifest_parse_func: Optional function to parse manifest entries. Defaults to None.
+        use_manifest_index: If True, parse and tokenize the manifest once into a memory-mapped index
+            that is shared by ranks, dataloader workers and later runs. Defaults to False.
+        manifest_index_dir: Directory to save the manifest index to. If None, the index is written
+            next to the manifest. Defaults to None.
+        tokenization_num_workers: Number of processes used to tokenize the manifest transcripts.
+            Defaults to None (tokenize in the current process).
     """
 
     @property
@@ -457,6 +478,9 @@ class _AudioTextDataset(Dataset):
         return_sample_id: bool = False,
         channel_selector: Optional[ChannelSelectorType] = None,
         manifest_parse_func: Optional[Callable] = None,
+        use_manifest_index: bool = False,
+        manifest_index_dir: Optional[str] = None,
+        tokenization_num_workers: Optional[int] = None,
     ):
         if type(manifest_filepath) == str:
             manifest_filepath = manifest_filepath.split(",")
@@ -474,6 +498,9 @@ class _AudioTextDataset(Dataset):
             eos_id=eos_id,
             pad_id=pad_id,
             manifest_parse_func=manifest_parse_func,
+            use_manifest_index=use_manifest_index,
+            manifest_index_dir=manifest_index_dir,
+            tokenization_num_workers=tokenization_num_workers,
         )
         self.featurizer = WaveformFeaturizer(sample_rate=sample_rate, int_values=int_values, augmentor=augmentor)
         self.trim = trim
@@ -554,6 +581,12 @@ class AudioToCharDataset(_AudioTextDataset):
         return_sample_id (bool): whether to return the sample_id as a part of each sample
         channel_selector (int | Iterable[int] | str): select a single channel or a subset of channels from multi-channel audio. If set to `'average'`, it performs averaging across channels. Disabled if set to `None`. Defaults to `None`. Uses zero-based indexing.
         manifest_parse_func: Optional function to parse manifest entries. Defaults to None.
+        use_manifest_index: If True, parse and tokenize the manifest once into a memory-mapped index
+            that is shared by ranks, dataloader workers and later runs. Defaults to False.
+        manifest_index_dir: Directory to save the manifest index to. If None, the index is written
+            next to the manifest. Defaults to None.
+        tokenization_num_workers: Number of processes used to tokenize the manifest transcripts.
+            Defaults to None (tokenize in the current process).
     """
 
     @property
@@ -588,6 +621,9 @@ class AudioToCharDataset(_AudioTextDataset):
         return_sample_id: bool = False,
         channel_selector: Optional[ChannelSelectorType] = None,
         manifest_parse_func: Optional[Callable] = None,
+        use_manifest_index: bool = False,
+        manifest_index_dir: Optional[str] = None,
+        tokenization_num_workers: Optional[int] = None,
     ):
         self.labels = labels
 
@@ -611,6 +647,9 @@ class AudioToCharDataset(_AudioTextDataset):
             return_sample_id=return_sample_id,
             channel_selector=channel_selector,
             manifest_parse_func=manifest_parse_func,
+            use_manifest_index=use_manifest_index,
+            manifest_index_dir=manifest_index_dir,
+            tokenization_num_workers=tokenization_num_workers,
         )
 
 
@@ -650,6 +689,12 @@ class AudioToBPEDataset(_AudioTextDataset):
         return_sample_id (bool): whether to return the sample_id as a part of each sample
         channel_selector (int | Iterable[int] | str): select a single channel or a subset of channels from multi-channel audio. If set to `'average'`, it performs averaging across channels. Disabled if set to `None`. Defaults to `None`. Uses zero-based indexing.
         manifest_parse_func: Optional function to parse manifest entries. Defaults to None.
+        use_manifest_index: If True, parse and tokenize the manifest once into a memory-mapped index
+            that is shared by ranks, dataloader workers and later runs. Defaults to False.
+        manifest_index_dir: Directory to save the manifest index to. If None, the index is written
+            next to the manifest. Defaults to None.
+        tokenization_num_workers: Number of processes used to tokenize the manifest transcripts.
+            Defaults to None (tokenize in the current process).
     """
 
     @property
@@ -678,6 +723,9 @@ class AudioToBPEDataset(_AudioTextDataset):
         return_sample_id: bool = False,
         channel_selector: Optional[ChannelSelectorType] = None,
         manifest_parse_func: Optional[Callable] = None,
+        use_manifest_index: bool = False,
+        manifest_index_dir: Optional[str] = None,
+        tokenization_num_workers: Optional[int] = None,
     ):
         if use_start_end_token and hasattr(tokenizer, "bos_id") and tokenizer.bos_id > 0:
             bos_id = tokenizer.bos_id
@@ -712,6 +760,13 @@ class AudioToBPEDataset(_AudioTextDataset):
                 t = self._tokenizer.text_to_ids(*args)
                 return t
 
+            def batch_text_to_ids(self, texts, *args, num_threads=1):
+                return self._tokenizer.batch_text_to_ids(texts, *args, num_threads=num_threads)
+
+            @property
+            def cache_key(self):
+                return tokenizer_cache_key(self._tokenizer)
+
         super().__init__(
             manifest_filepath=manifest_filepath,
             parser=TokenizerWrapper(tokenizer),
@@ -728,6 +783,9 @@ class AudioToBPEDataset(_AudioTextDataset):
             return_sample_id=return_sample_id,
             channel_selector=channel_selector,
             manifest_parse_func=manifest_parse_func,
+            use_manifest_index=use_manifest_index,
+            manifest_index_dir=manifest_index_dir,
+            tokenization_num_workers=tokenization_num_workers,
         )
 
 
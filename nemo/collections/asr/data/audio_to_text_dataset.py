@@ -159,6 +159,9 @@ def get_char_dataset(config: dict, augmentor: Optional['AudioAugmentor'] = None)
         parser=config.get('parser', 'en'),
         return_sample_id=config.get('return_sample_id', False),
         channel_selector=config.get('channel_selector', None),
+        use_manifest_index=config.get('use_manifest_index', False),
+        manifest_index_dir=config.get('manifest_index_dir', None),
+        tokenization_num_workers=config.get('tokenization_num_workers', None),
     )
     return dataset
 
@@ -239,6 +242,9 @@ def get_bpe_dataset(
         use_start_end_token=config.get('use_start_end_token', True),
         return_sample_id=config.get('return_sample_id', False),
         channel_selector=config.get('channel_selector', None),
+        use_manifest_index=config.get('use_manifest_index', False),
+        manifest_index_dir=config.get('manifest_index_dir', None),
+        tokenization_num_workers=config.get('tokenization_num_workers', None),
     )
     return dataset
 
@@ -1016,6 +1016,13 @@ class EncDecMultiTaskModel(ASRModel, ExportableEncDecModel, ASRBPEMixin, ASRModu
         temporary_datalayer = self._setup_dataloader_from_config(config=DictConfig(dl_config))
         return temporary_datalayer
 
+    def _supports_transcription_session(self) -> bool:
+        """
+        Transcription sessions are not supported: `_transcribe_forward()` expects `PromptedAudioToTextMiniBatch`
+        batches carrying the prompt of every item, which sessions do not collate.
+        """
+        return False
+
     def _transcribe_on_end(self, trcfg: MultiTaskTranscriptionConfig):
         """
         Internal function to teardown the model after transcription. Perform all teardown and post-checks here.
@@ -14,12 +14,12 @@
 
 import json
 import os
-import pickle as pkl
 import shutil
 import tempfile
 from copy import deepcopy
 from typing import Any, List, Optional, Union
 
+import numpy as np
 import torch
 from lightning.pytorch.utilities import rank_zero_only
 from omegaconf import DictConfig, OmegaConf
@@ -35,6 +35,7 @@ from nemo.collections.asr.parts.utils.speaker_utils import (
     get_uniqname_from_filepath,
     parse_scale_configs,
     perform_clustering,
+    save_embeddings_store,
     segments_manifest_to_subsegments_manifest,
     validate_vad_manifest,
     write_rttm2manifest,
@@ -340,7 +341,18 @@ class ClusteringDiarizer(torch.nn.Module, Model, DiarizationMixin):
         self._speaker_model.eval()
         self.time_stamps = {}
 
-        all_embs = torch.empty([0])
+        uniq_names, time_stamps = [], []
+        with open(manifest_file, 'r', encoding='utf-8') as manifest:
+            for line in manifest:
+                dic = json.loads(line.strip())
+                uniq_names.append(get_uniqname_from_filepath(dic['audio_filepath']))
+                start = dic['offset']
+                end = start + dic['duration']
+                time_stamps.append([start, end])
+
+        # the embeddings of all segments are written into a buffer sized from the manifest, in manifest order
+        all_embs = None
+        num_embs = 0
         for test_batch in tqdm(
             self._speaker_model.test_dataloader(),
             desc=f'[{scale_idx+1}/{num_scales}] extract embeddings',
@@ -353,23 +365,32 @@ class ClusteringDiarizer(torch.nn.Module, Model, DiarizationMixin):
                 _, embs = self._speaker_model.forward(input_signal=audio_signal, input_signal_length=audio_signal_len)
                 emb_shape = embs.shape[-1]
                 embs = embs.view(-1, emb_shape)
-                all_embs = torch.cat((all_embs, embs.cpu().detach()), dim=0)
+                if all_embs is None:
+                    all_embs = torch.empty((len(uniq_names), emb_shape), dtype=torch.float32)
+                all_embs[num_embs : num_embs + embs.shape[0]] = embs.detach()
+                num_embs += embs.shape[0]
             del test_batch
 
-        with open(manifest_file, 'r', encoding='utf-8') as manifest:
-            for i, line in enumerate(manifest.readlines()):
-                line = line.strip()
-                dic = json.loads(line)
-                uniq_name = get_uniqname_from_filepath(dic['audio_filepath'])
-                if uniq_name in self.embeddings:
-                    self.embeddings[uniq_name] = torch.cat((self.embeddings[uniq_name], all_embs[i].view(1, -1)))
-                else:
-                    self.embeddings[uniq_name] = all_embs[i].view(1, -1)
-                if uniq_name not in self.time_stamps:
-                    self.time_stamps[uniq_name] = []
-                start = dic['offset']
-                end = start + dic['duration']
-                self.time_stamps[uniq_name].append([start, end])
+        if num_embs != len(uniq_names):
+            raise ValueError(
+                f"Number of extracted embeddings ({num_embs}) does not match the number of segments "
+                f"({len(uniq_names)}) in {manifest_file}"
+            )
+
+        if num_embs > 0:
+            # group the segments by recording: the recordings are ordered by first appearance in the manifest
+            # and their segments keep the manifest order, so that every recording is a contiguous block of rows
+            recording_names = list(dict.fromkeys(uniq_names))
+            recording_indices = {uniq_name: idx for idx, uniq_name in enumerate(recording_names)}
+            recording_ids = np.array([recording_indices[uniq_name] for uniq_name in uniq_names])
+            order = np.argsort(recording_ids, kind='stable')
+            ends = np.cumsum(np.bincount(recording_ids, minlength=len(recording_names))).tolist()
+            grouped_embs = all_embs[torch.from_numpy(order)]
+            start = 0
+            for uniq_name, end in zip(recording_names, ends):
+                self.embeddings[uniq_name] = grouped_embs[start:end]
+                self.time_stamps[uniq_name] = [time_stamps[i] for i in order[start:end]]
+                start = end
 
         if self._speaker_params.save_embeddings:
             embedding_dir = os.path.join(self._speaker_dir, 'embeddings')
@@ -378,8 +399,7 @@ class ClusteringDiarizer(torch.nn.Module, Model, DiarizationMixin):
 
             prefix = get_uniqname_from_filepath(manifest_file)
             name = os.path.join(embedding_dir, prefix)
-            self._embeddings_file = name + '_embeddings.pkl'
-            pkl.dump(self.embeddings, open(self._embeddings_file, 'wb'))
+            self._embeddings_file = save_embeddings_store(self.embeddings, name + '_embeddings')
             logging.info("Saved embedding files to {}".format(embedding_dir))
 
     def diarize(self, paths2audio_files: List[str] = None, batch_size: int = 0):
@@ -53,6 +53,7 @@ from nemo.collections.asr.parts.utils.speaker_utils import (
     get_scale_mapping_argmat,
     get_uniq_id_list_from_manifest,
     labels_to_pyannote_object,
+    load_embeddings_store,
     make_rttm_with_overlap,
     parse_scale_configs,
     rttm_to_labels,
@@ -971,10 +972,12 @@ class ClusterEmbedding(torch.nn.Module):
     def load_emb_scale_seq_dict(self, out_dir):
         """
         Load saved embeddings generated by clustering diarizer. This function is used for inference mode of MSDD.
+        Embeddings are memory-mapped from the embedding stores of every scale, or unpickled from the pickle files
+        saved by previous versions of the clustering diarizer.
 
         Args:
             out_dir (str):
-                Path to the directory where embedding pickle files are saved.
+                Path to the directory where embedding store or pickle files are saved.
         Returns:
             emb_scale_seq_dict (dict):
                 Dictionary containing embedding tensors which are indexed by scale numbers.
@@ -982,9 +985,15 @@ class ClusterEmbedding(torch.nn.Module):
         window_len_list = list(self.cfg_diar_infer.diarizer.speaker_embeddings.parameters.window_length_in_sec)
         emb_scale_seq_dict = {scale_index: None for scale_index in range(len(window_len_list))}
         for scale_index in range(len(window_len_list)):
-            pickle_path = os.path.join(
-                out_dir, 'speaker_outputs', 'embeddings', f'subsegments_scale{scale_index}_embeddings.pkl'
+            file_prefix = os.path.join(
+                out_dir, 'speaker_outputs', 'embeddings', f'subsegments_scale{scale_index}_embeddings'
             )
+            if os.path.exists(file_prefix + '.npy'):
+                logging.info(f"Loading embedding store of scale:{scale_index} at {file_prefix}.npy")
+                emb_scale_seq_dict[scale_index] = load_embeddings_store(file_prefix)
+                continue
+
+            pickle_path = file_prefix + '.pkl'
             logging.info(f"Loading embedding pickle file of scale:{scale_index} at {pickle_path}")
             with open(pickle_path, "rb") as input_file:
                 emb_dict = pkl.load(input_file)
@@ -26,3 +26,4 @@ from nemo.collections.asr.parts.mixins.transcription import (
     TranscriptionMixin,
     TranscriptionReturnType,
 )
+from nemo.collections.asr.parts.mixins.transcription_session import TranscriptionSession, TranscriptionSessionStats
@@ -381,6 +381,49 @@ class TranscriptionMixin(ABC):
             # set mode back to its original value
             self._transcribe_on_end(transcribe_cfg)
 
+    def transcription_session(
+        self,
+        batch_size: int = 16,
+        max_wait_time: float = 0.05,
+        duration_bins: Optional[List[float]] = None,
+        num_workers: int = 2,
+        override_config: Optional[TranscribeConfig] = None,
+    ) -> 'TranscriptionSession':
+        """
+        Creates a long-lived transcription session, which amortizes the setup of `transcribe()` over many requests.
+        Requests with paths to audio files or audio arrays can be submitted from many threads, and are transcribed
+        in dynamic batches of similar durations.
+
+        Example:
+            with model.transcription_session(batch_size=16, max_wait_time=0.05) as session:
+                future = session.submit("audio.wav")
+                text = future.result()
+
+        Args:
+            batch_size: (int) maximum number of requests per batch.
+            max_wait_time: (float) maximum time in seconds a request waits for its batch to fill up.
+            duration_bins: (Optional[List[float]]) upper bounds in seconds of the duration buckets of requests.
+            num_workers: (int) number of threads loading audio files.
+            override_config: (Optional[TranscribeConfig]) transcription config used for all requests.
+
+        Returns:
+            A started `TranscriptionSession`, which should be closed after use.
+
+        Raises:
+            NotImplementedError: if the model does not support transcription sessions (see
+                `_supports_transcription_session()`), e.g. `EncDecMultiTaskModel`.
+        """
+        from nemo.collections.asr.parts.mixins.transcription_session import TranscriptionSession
+
+        return TranscriptionSession(
+            self,
+            batch_size=batch_size,
+            max_wait_time=max_wait_time,
+            duration_bins=duration_bins,
+            num_workers=num_workers,
+            override_config=override_config,
+        ).start()
+
     """
     Transcribe Execution Flow
     """
@@ -512,18 +555,7 @@ class TranscriptionMixin(ABC):
         Returns:
             A config dict that is used to setup the dataloader for transcription.
         """
-        # Check if sample rate is set
-        sample_rate = None
-        if hasattr(self, 'cfg') and 'sample_rate' in self.cfg:
-            sample_rate = self.cfg.sample_rate
-        elif hasattr(self, 'sample_rate'):
-            sample_rate = self.sample_rate
-
-        if sample_rate is None:
-            raise RuntimeError(
-                "Provided `audio` data contains numpy or torch tensors, however the class "
-                "does not have `sample_rate` attribute. Please set `sample_rate` attribute to the model explicitly."
-            )
+        sample_rate = self._get_transcribe_sample_rate()
 
         ds_config = {
             'audio_tensors': audio_tensors,
@@ -643,7 +675,58 @@ class TranscriptionMixin(ABC):
         # Import collate function here to avoid circular imports
         from nemo.collections.asr.data.audio_to_text import _speech_collate_fn
 
-        # Calculate pad id
+        pad_id = self._get_transcribe_pad_id()
+
+        return DataLoader(
+            dataset=dataset,
+            shuffle=False,
+            batch_size=config['batch_size'],
+            num_workers=config['num_workers'],
+            pin_memory=False,
+            drop_last=False,
+            collate_fn=partial(_speech_collate_fn, pad_id=pad_id),
+        )
+
+    def _supports_transcription_session(self) -> bool:
+        """
+        Internal function to check whether the model can be used by a `TranscriptionSession`. A session collates
+        audio tensors with `_speech_collate_fn`, like `_setup_transcribe_tensor_dataloader()`, so models that
+        collate transcription batches differently are not supported.
+
+        Returns:
+            Whether the model supports transcription sessions.
+        """
+        return type(self)._setup_transcribe_tensor_dataloader is TranscriptionMixin._setup_transcribe_tensor_dataloader
+
+    def _get_transcribe_sample_rate(self) -> int:
+        """
+        Internal function to resolve the sample rate expected for audio tensors passed to transcription.
+
+        Returns:
+            The sample rate of the model.
+        """
+        # Check if sample rate is set
+        sample_rate = None
+        if hasattr(self, 'cfg') and 'sample_rate' in self.cfg:
+            sample_rate = self.cfg.sample_rate
+        elif hasattr(self, 'sample_rate'):
+            sample_rate = self.sample_rate
+
+        if sample_rate is None:
+            raise RuntimeError(
+                "Provided `audio` data contains numpy or torch tensors, however the class "
+                "does not have `sample_rate` attribute. Please set `sample_rate` attribute to the model explicitly."
+            )
+
+        return sample_rate
+
+    def _get_transcribe_pad_id(self) -> int:
+        """
+        Internal function to resolve the pad id used to collate the token placeholders of transcription batches.
+
+        Returns:
+            The pad id.
+        """
         if hasattr(self, 'tokenizer') and hasattr(self.tokenizer, 'pad_id'):
             pad_id = self.tokenizer.pad_id
         elif hasattr(self, 'transcribe_pad_id'):
@@ -658,15 +741,7 @@ class TranscriptionMixin(ABC):
             )
             pad_id = 0
 
-        return DataLoader(
-            dataset=dataset,
-            shuffle=False,
-            batch_size=config['batch_size'],
-            num_workers=config['num_workers'],
-            pin_memory=False,
-            drop_last=False,
-            collate_fn=partial(_speech_collate_fn, pad_id=pad_id),
-        )
+        return pad_id
 
 
 class ASRTranscriptionMixin(TranscriptionMixin):
@@ -0,0 +1,399 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import collections
+import copy
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Union
+
+import numpy as np
+import torch
+
+from nemo.collections.asr.parts.mixins.transcription import (
+    InternalTranscribeConfig,
+    TranscribeConfig,
+    TranscriptionMixin,
+)
+from nemo.collections.asr.parts.preprocessing.segment import AudioSegment
+from nemo.collections.common.data.utils import move_data_to_device
+from nemo.utils import logging
+
+DEFAULT_DURATION_BINS = [2.0, 5.0, 10.0, 20.0, 30.0]
+
+
+@dataclass
+class _TranscriptionRequest:
+    future: Future
+    submit_time: float
+    samples: Optional[torch.Tensor] = None
+    duration: float = 0.0
+    ready_time: float = 0.0
+
+
+@dataclass
+class TranscriptionSessionStats:
+    """Statistics of the requests and batches processed by a `TranscriptionSession`."""
+
+    num_requests: int = 0
+    num_failed_requests: int = 0
+    num_batches: int = 0
+    # sum of the sizes of all batches, divided by the maximum batch size for the fill ratio
+    total_batch_size: int = 0
+    # latency from submission to result of the most recent requests, in seconds
+    latencies: Deque[float] = field(default_factory=lambda: collections.deque(maxlen=10000))
+    # time spent by the most recent requests waiting for their batch, in seconds
+    queue_times: Deque[float] = field(default_factory=lambda: collections.deque(maxlen=10000))
+
+    def summary(self, batch_size: int) -> Dict[str, float]:
+        latencies = np.asarray(self.latencies) if len(self.latencies) > 0 else np.zeros(1)
+        queue_times = np.asarray(self.queue_times) if len(self.queue_times) > 0 else np.zeros(1)
+        num_batches = max(self.num_batches, 1)
+        return {
+            'num_requests': self.num_requests,
+            'num_failed_requests': self.num_failed_requests,
+            'num_batches': self.num_batches,
+            'mean_batch_size': self.total_batch_size / num_batches,
+            'mean_batch_fill': self.total_batch_size / (num_batches * batch_size),
+            'latency_mean': float(latencies.mean()),
+            'latency_p50': float(np.percentile(latencies, 50)),
+            'latency_p95': float(np.percentile(latencies, 95)),
+            'latency_max': float(latencies.max()),
+            'queue_time_mean': float(queue_times.mean()),
+        }
+
+
+class TranscriptionSession:
+    """
+    A long-lived transcription session of a `TranscriptionMixin` model.
+
+    `transcribe()` sets up the model, writes a temporary manifest and builds a DataLoader on every call, and tears
+    everything down afterwards. For services making many small transcription calls, this overhead dominates
+    the latency. A session instead performs the setup once: the model stays in evaluation mode and a pool of
+    threads loading audio files stays alive until the session is closed.
+
+    Requests (paths to audio files, or audio arrays at the sample rate of the model) can be submitted from many
+    threads. They are grouped in buckets of similar durations, and a background thread forms dynamic batches:
+    a batch is run as soon as a bucket holds `batch_size` requests, or when its oldest request waited for
+    `max_wait_time` seconds, in which case the batch is completed with requests of the closest buckets.
+
+    Batches are collated like the audio tensors passed to `transcribe()`, and use the model's
+    `_transcribe_forward()` and `_transcribe_output_processing()`. The decoding strategy (e.g. timestamps)
+    should be set with `change_decoding_strategy()` before starting the session. Models that collate
+    transcription batches differently, e.g. the prompted batches of `EncDecMultiTaskModel`, are not supported
+    (see `TranscriptionMixin._supports_transcription_session()`).
+
+    Example:
+        with model.transcription_session(batch_size=16, max_wait_time=0.05) as session:
+            futures = [session.submit(audio) for audio in audio_list]
+            texts = [future.result() for future in futures]
+            print(session.stats())
+
+    Args:
+        model: The model to transcribe with.
+        batch_size: Maximum number of requests per batch.
+        max_wait_time: Maximum time in seconds a request waits for its batch to fill up.
+        duration_bins: Upper bounds in seconds of the duration buckets of requests.
+        num_workers: Number of threads loading audio files.
+        override_config: Transcription config used for all requests. A copy of it is used, with its `batch_size`
+            set to `batch_size`.
+    """
+
+    def __init__(
+        self,
+        model: TranscriptionMixin,
+        batch_size: int = 16,
+        max_wait_time: float = 0.05,
+        duration_bins: Optional[List[float]] = None,
+        num_workers: int = 2,
+        override_config: Optional[TranscribeConfig] = None,
+    ):
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be positive, but got {batch_size}")
+        if max_wait_time < 0:
+            raise ValueError(f"`max_wait_time` must be non-negative, but got {max_wait_time}")
+        if not model._supports_transcription_session():
+            raise NotImplementedError(
+                f"{type(model).__name__} does not support transcription sessions, as its transcription batches are "
+                "not collated from audio tensors only. Please use `transcribe()` instead."
+            )
+
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait_time = max_wait_time
+        self.duration_bins = sorted(duration_bins if duration_bins is not None else DEFAULT_DURATION_BINS)
+        self.num_workers = max(1, num_workers)
+
+        if override_config is None:
+            if hasattr(model, 'get_transcribe_config'):
+                override_config = model.get_transcribe_config()
+            else:
+                override_config = TranscribeConfig()
+        else:
+            # the config of the caller is not modified
+            override_config = copy.deepcopy(override_config)
+        if override_config._internal is None:
+            override_config._internal = InternalTranscribeConfig()
+        override_config.batch_size = batch_size
+        # audio is loaded by the session, and is never passed to a DataLoader
+        override_config.num_workers = 0
+        override_config.verbose = False
+        self.transcribe_cfg = override_config
+
+        self.sample_rate = None
+        self.pad_id = None
+
+        # one queue of pending requests per duration bucket, and a last one for longer requests
+        self._buckets = [collections.deque() for _ in range(len(self.duration_bins) + 1)]
+        self._num_pending = 0
+        self._num_loading = 0
+        self._condition = threading.Condition()
+        self._stats = TranscriptionSessionStats()
+        self._loader = None
+        self._batcher = None
+        self._started = False
+        self._closing = False
+
+    def start(self) -> 'TranscriptionSession':
+        """Sets up the model for transcription and starts the threads of the session."""
+        if self._started:
+            return self
+
+        self.sample_rate = self.model._get_transcribe_sample_rate()
+        self.pad_id = self.model._get_transcribe_pad_id()
+
+        # the session always feeds audio tensors to the model
+        self.model._transcribe_on_begin([torch.zeros(0)], self.transcribe_cfg)
+
+        self._loader = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="transcription_loader")
+        self._batcher = threading.Thread(target=self._batching_loop, name="transcription_batcher", daemon=True)
+        self._started = True
+        self._closing = False
+        self._batcher.start()
+        return self
+
+    def close(self):
+        """Transcribes all pending requests, stops the threads of the session and restores the model."""
+        if not self._started:
+            return
+
+        # wait for the files being loaded to be queued
+        self._loader.shutdown(wait=True)
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._batcher.join()
+        self._started = False
+
+        self.model._transcribe_on_end(self.transcribe_cfg)
+
+    def __enter__(self) -> 'TranscriptionSession':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, audio: Union[str, np.ndarray, torch.Tensor]) -> Future:
+        """
+        Submits a request to the session.
+
+        Args:
+            audio: A path to an audio file, or a 1D audio array at the sample rate of the model.
+
+        Returns:
+            A future of the transcription of the audio, as a single item of the outputs of `transcribe()`.
+        """
+        if not self._started or self._closing:
+            raise RuntimeError("The transcription session is not running. Call `start()` before submitting audio.")
+
+        request = _TranscriptionRequest(future=Future(), submit_time=time.perf_counter())
+        if isinstance(audio, str):
+            with self._condition:
+                self._num_loading += 1
+            self._loader.submit(self._load_and_enqueue, request, audio)
+        elif isinstance(audio, (np.ndarray, torch.Tensor)):
+            request.samples = torch.as_tensor(audio)
+            self._enqueue(request)
+        else:
+            raise ValueError(
+                f"Input `audio` is of type {type(audio)}. "
+                "Only `str` (path to audio file), `np.ndarray`, and `torch.Tensor` are supported as input."
+            )
+        return request.future
+
+    def transcribe(self, audio: List[Union[str, np.ndarray, torch.Tensor]]) -> List[Any]:
+        """
+        Submits a list of requests to the session and waits for their transcriptions.
+
+        Args:
+            audio: A list of paths to audio files or 1D audio arrays.
+
+        Returns:
+            The list of the transcriptions of the audio.
+        """
+        futures = [self.submit(item) for item in audio]
+        return [future.result() for future in futures]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the statistics of the session: number of requests and batches, mean batch size and fill ratio,
+        and latencies from submission to result (mean, median, 95th percentile and maximum) and mean
+        time waiting for a batch of the most recent requests, in seconds.
+        """
+        with self._condition:
+            return self._stats.summary(self.batch_size)
+
+    def _load_and_enqueue(self, request: _TranscriptionRequest, audio_file: str):
+        try:
+            segment = AudioSegment.from_file(
+                audio_file,
+                target_sr=self.sample_rate,
+                channel_selector=getattr(self.transcribe_cfg, 'channel_selector', None),
+            )
+            request.samples = torch.as_tensor(segment.samples, dtype=torch.float32)
+        except Exception as e:
+            with self._condition:
+                self._num_loading -= 1
+                self._stats.num_requests += 1
+                self._stats.num_failed_requests += 1
+            request.future.set_exception(e)
+            return
+
+        self._enqueue(request, loaded=True)
+
+    def _enqueue(self, request: _TranscriptionRequest, loaded: bool = False):
+        request.duration = request.samples.shape[0] / self.sample_rate
+        request.ready_time = time.perf_counter()
+        bucket = bisect.bisect_left(self.duration_bins, request.duration)
+        with self._condition:
+            if loaded:
+                self._num_loading -= 1
+            self._buckets[bucket].append(request)
+            self._num_pending += 1
+            self._condition.notify_all()
+
+    def _pop_batch(self) -> Optional[List[_TranscriptionRequest]]:
+        """Forms the next batch from the pending requests, if any is due. Must be called holding the condition."""
+        if self._num_pending == 0:
+            return None
+
+        # a full bucket is run first
+        for bucket in self._buckets:
+            if len(bucket) >= self.batch_size:
+                return [bucket.popleft() for _ in range(self.batch_size)]
+
+        # otherwise, wait for the oldest request to time out
+        oldest_bucket_idx = min(
+            (idx for idx, bucket in enumerate(self._buckets) if len(bucket) > 0),
+            key=lambda idx: self._buckets[idx][0].ready_time,
+        )
+        oldest_request = self._buckets[oldest_bucket_idx][0]
+        if not self._closing and time.perf_counter() - oldest_request.ready_time < self.max_wait_time:
+            return None
+
+        # complete the batch with requests of the closest buckets
+        batch = []
+        bucket_indices = sorted(range(len(self._buckets)), key=lambda idx: abs(idx - oldest_bucket_idx))
+        for idx in bucket_indices:
+            bucket = self._buckets[idx]
+            while len(bucket) > 0 and len(batch) < self.batch_size:
+                batch.append(bucket.popleft())
+        return batch
+
+    def _batching_loop(self):
+        while True:
+            with self._condition:
+                while True:
+                    batch = self._pop_batch()
+                    if batch is not None:
+                        self._num_pending -= len(batch)
+                        break
+                    if self._closing and self._num_pending == 0 and self._num_loading == 0:
+                        return
+
+                    timeout = None
+                    if self._num_pending > 0:
+                        oldest_ready_time = min(bucket[0].ready_time for bucket in self._buckets if len(bucket) > 0)
+                        timeout = max(0.0, oldest_ready_time + self.max_wait_time - time.perf_counter())
+                    self._condition.wait(timeout)
+
+            self._run_batch(batch)
+
+    @torch.inference_mode()
+    def _run_batch(self, batch: List[_TranscriptionRequest]):
+        # Import collate function here to avoid circular imports
+        from nemo.collections.asr.data.audio_to_text import _speech_collate_fn
+
+        start_time = time.perf_counter()
+        try:
+            items = [
+                (request.samples, torch.tensor(request.samples.shape[0], dtype=torch.long), None, None)
+                for request in batch
+            ]
+            test_batch = _speech_collate_fn(items, pad_id=self.pad_id)
+            test_batch = move_data_to_device(test_batch, self.transcribe_cfg._internal.device)
+            model_outputs = self.model._transcribe_forward(test_batch, self.transcribe_cfg)
+            processed_outputs = self.model._transcribe_output_processing(model_outputs, self.transcribe_cfg)
+            results = _split_processed_outputs(processed_outputs, len(batch))
+        except Exception as e:
+            logging.error(f"Transcription of a batch of {len(batch)} requests failed: {e}")
+            results = None
+            error = e
+
+        end_time = time.perf_counter()
+        with self._condition:
+            self._stats.num_batches += 1
+            self._stats.total_batch_size += len(batch)
+            self._stats.num_requests += len(batch)
+            if results is None:
+                self._stats.num_failed_requests += len(batch)
+            for request in batch:
+                self._stats.latencies.append(end_time - request.submit_time)
+                self._stats.queue_times.append(start_time - request.ready_time)
+
+        for idx, request in enumerate(batch):
+            # release the audio as soon as possible
+            request.samples = None
+            if results is None:
+                request.future.set_exception(error)
+            else:
+                request.future.set_result(results[idx])
+
+
+def _split_processed_outputs(processed_outputs: Any, batch_size: int) -> List[Any]:
+    """
+    Splits the outputs of `_transcribe_output_processing()` for a batch into the outputs of every item.
+    A list gives its items, a tuple of lists gives tuples and a dict of lists gives dicts.
+    """
+    if isinstance(processed_outputs, list):
+        results = processed_outputs
+    elif isinstance(processed_outputs, tuple) and all(isinstance(output, list) for output in processed_outputs):
+        results = list(zip(*processed_outputs))
+    elif isinstance(processed_outputs, dict):
+        keys = list(processed_outputs.keys())
+        results = [dict(zip(keys, values)) for values in zip(*processed_outputs.values())]
+    else:
+        raise NotImplementedError(
+            "Given output result for transcription is not supported by transcription sessions. "
+            "Please return a list of results, a dict of list of results, or a tuple of list of results."
+        )
+
+    if len(results) != batch_size:
+        raise RuntimeError(
+            f"The number of results of the batch ({len(results)}) does not match the batch size ({batch_size})."
+        )
+    return results
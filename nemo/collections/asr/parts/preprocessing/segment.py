@@ -33,10 +33,13 @@
 # SOFTWARE.
 # This file contains code artifacts adapted from https://github.com/ryanleary/patter
 
+import collections
+import contextlib
 import math
 import os
 import random
-from typing import Iterable, List, Optional, Union
+import threading
+from typing import Iterable, List, Optional, Tuple, Union
 
 import librosa
 import numpy as np
@@ -60,6 +63,174 @@ except ModuleNotFoundError:
 
 available_formats = sf.available_formats()
 sf_supported_formats = ["." + i.lower() for i in available_formats.keys()]
+# libsndfile detects the container from the file content, so Opus files can be decoded (and seeked)
+# without ffmpeg whenever libsndfile was built with Opus support.
+if 'OGG' in available_formats and 'OPUS' in sf.available_subtypes('OGG'):
+    sf_supported_formats.append('.opus')
+
+
+class _CachedSoundFile:
+    """An open `sf.SoundFile` together with the (mtime, size) signature of the file it was opened from."""
+
+    __slots__ = ('handle', 'signature', 'lock')
+
+    def __init__(self, handle: sf.SoundFile, signature: Tuple[int, int]):
+        self.handle = handle
+        self.signature = signature
+        self.lock = threading.Lock()
+
+
+class AudioFileCache:
+    """
+    Bounded LRU cache of open `soundfile.SoundFile` handles, keyed by path.
+
+    Opening a compressed file (FLAC, MP3, Ogg/Opus) parses its header and, for some formats, scans the stream,
+    which dominates the cost of reading a short segment out of a long recording. Cached handles keep the parsed
+    header (sample rate, number of frames and channels) so that repeated reads only pay for a seek and the decode
+    of the requested frames.
+
+    A cached handle is invalidated when the modification time or size of the file changes. Handles are never shared
+    across processes: a forked process (e.g. a dataloader worker) starts with an empty cache, since inherited file
+    descriptors share their position with the parent. File-like objects are never cached.
+
+    Args:
+        max_size: maximum number of open handles. Set to 0 to disable caching.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def resize(self, max_size: int):
+        """Change the maximum number of open handles, closing the least recently used ones if needed."""
+        with self._lock:
+            self.max_size = max_size
+            self._shrink(max_size)
+
+    def clear(self):
+        """Close all cached handles."""
+        with self._lock:
+            self._shrink(0)
+
+    def _shrink(self, max_size: int):
+        while len(self._entries) > max(max_size, 0):
+            _, entry = self._entries.popitem(last=False)
+            with entry.lock:
+                entry.handle.close()
+
+    def _get_entry(self, audio_file) -> Optional[_CachedSoundFile]:
+        if self.max_size <= 0 or not isinstance(audio_file, (str, os.PathLike)):
+            return None
+        path = os.fspath(audio_file)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # let the uncached path raise the same error as before
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # do not close the inherited handles, they share the file position with the parent process
+                self._entries = collections.OrderedDict()
+                self._pid = os.getpid()
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(path)
+                return entry
+
+        entry = _CachedSoundFile(sf.SoundFile(path, 'r'), signature)
+        with self._lock:
+            stale = self._entries.pop(path, None)
+            if stale is not None:
+                with stale.lock:
+                    stale.handle.close()
+            self._entries[path] = entry
+            self._shrink(self.max_size)
+        return entry
+
+    @contextlib.contextmanager
+    def open(self, audio_file):
+        """
+        Context manager yielding an open `sf.SoundFile` positioned at the first frame of `audio_file`.
+        The handle is locked for the duration of the context and must not be closed by the caller.
+        """
+        entry = self._get_entry(audio_file)
+        if entry is None:
+            with sf.SoundFile(audio_file, 'r') as f:
+                yield f
+            return
+
+        with entry.lock:
+            if entry.handle.closed:
+                # evicted by another thread after the lookup
+                with sf.SoundFile(audio_file, 'r') as f:
+                    yield f
+            else:
+                entry.handle.seek(0)
+                yield entry.handle
+
+
+# Handles shared by `AudioSegment.from_file` and `AudioSegment.segment_from_file`.
+audio_file_cache = AudioFileCache()
+
+
+def _read_frames(
+    f: sf.SoundFile,
+    offset: Optional[float] = None,
+    duration: Optional[float] = None,
+    dtype: str = 'float32',
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Seek to `offset` seconds and decode `duration` seconds (or until the end) of `f` into `out`."""
+    sample_rate = f.samplerate
+    start = 0
+    if offset is not None and offset > 0:
+        start = int(offset * sample_rate)
+        f.seek(start)
+    num_frames = max(f.frames - start, 0)
+    if duration is not None and duration > 0:
+        num_frames = min(int(duration * sample_rate), num_frames)
+
+    shape = (num_frames, f.channels) if f.channels > 1 else (num_frames,)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    else:
+        if out.shape[1:] != shape[1:] or len(out) < num_frames:
+            raise ValueError(f'Buffer of shape {out.shape} cannot hold the requested frames of shape {shape}')
+        out = out[:num_frames]
+    return f.read(dtype=out.dtype.name, out=out)
+
+
+def read_audio_samples(
+    audio_file: Union[str, os.PathLike],
+    offset: Optional[float] = None,
+    duration: Optional[float] = None,
+    dtype: str = 'float32',
+    out: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, int]:
+    """
+    Read a segment of a file supported by soundfile, decoding only the requested frames.
+
+    Args:
+        audio_file: path to the audio file or a file-like object
+        offset: offset in seconds, reading starts at the beginning of the file if not positive
+        duration: duration in seconds, reading stops at the end of the file if not positive
+        dtype: data type of the samples, ignored if `out` is provided
+        out: optional preallocated C-contiguous buffer with shape (num_samples,) for single-channel
+             or (num_samples, num_channels) for multi-channel files. Samples are decoded directly into
+             the buffer and the returned array is a view of its first frames.
+
+    Returns:
+        Tuple of the samples [num_samples] or [num_samples x num_channels] and the sample rate of the file.
+    """
+    with audio_file_cache.open(audio_file) as f:
+        return _read_frames(f, offset=offset, duration=duration, dtype=dtype, out=out), f.samplerate
 
 
 ChannelSelectorType = Union[int, Iterable[int], str]
@@ -335,15 +506,10 @@ class AudioSegment(object):
 
         if not isinstance(audio_file, str) or os.path.splitext(audio_file)[-1] in sf_supported_formats:
             try:
-                with sf.SoundFile(audio_file, 'r') as f:
+                with audio_file_cache.open(audio_file) as f:
                     dtype = 'int32' if int_values else 'float32'
                     sample_rate = f.samplerate
-                    if offset is not None and offset > 0:
-                        f.seek(int(offset * sample_rate))
-                    if duration is not None and duration > 0:
-                        samples = f.read(int(duration * sample_rate), dtype=dtype)
-                    else:
-                        samples = f.read(dtype=dtype)
+                    samples = _read_frames(f, offset=offset, duration=duration, dtype=dtype)
             except RuntimeError as e:
                 logging.error(
                     f"Loading {audio_file} via SoundFile raised RuntimeError: `{e}`. "
@@ -355,16 +521,18 @@ class AudioSegment(object):
 
         if HAVE_PYDUB and samples is None:
             try:
-                samples = Audio.from_file(audio_file, codec=ffmpeg_codecs.get(os.path.splitext(audio_file)[-1]))
+                # let ffmpeg trim the decoded stream instead of decoding the whole file into memory,
+                # pydub does things in milliseconds
+                start_second = int(offset * 1000) / 1000 if offset is not None and offset > 0 else None
+                duration_second = int(duration * 1000) / 1000 if duration is not None and duration > 0 else None
+                samples = Audio.from_file(
+                    audio_file,
+                    codec=ffmpeg_codecs.get(os.path.splitext(audio_file)[-1]),
+                    start_second=start_second,
+                    duration=duration_second,
+                )
                 sample_rate = samples.frame_rate
                 num_channels = samples.channels
-                if offset is not None and offset > 0:
-                    # pydub does things in milliseconds
-                    seconds = offset * 1000
-                    samples = samples[int(seconds) :]
-                if duration is not None and duration > 0:
-                    seconds = duration * 1000
-                    samples = samples[: int(seconds)]
                 samples = np.array(samples.get_array_of_samples())
                 # For multi-channel signals, channels are stacked in a one-dimensional vector
                 if num_channels > 1:
@@ -514,7 +682,7 @@ class AudioSegment(object):
         """
         is_segmented = False
         try:
-            with sf.SoundFile(audio_file, 'r') as f:
+            with audio_file_cache.open(audio_file) as f:
                 sample_rate = f.samplerate
                 if target_sr is not None:
                     n_segments_at_original_sr = math.ceil(n_segments * sample_rate / target_sr)
@@ -472,46 +472,19 @@ class AbstractCTCDecoding(ConfidenceMixin):
         Returns:
             A list of strings.
         """
-        for ind in range(len(hypotheses_list)):
-            # Extract the integer encoded hypothesis
-            hyp = hypotheses_list[ind]
-            prediction = hyp.y_sequence
-            predictions_len = hyp.length if hyp.length > 0 else None
+        if fold_consecutive:
+            folded_predictions = self._fold_consecutive_batch(hypotheses_list)
 
+        for ind in range(len(hypotheses_list)):
             if fold_consecutive:
-                if type(prediction) != list:
-                    prediction = prediction.numpy().tolist()
-
-                if predictions_len is not None:
-                    prediction = prediction[:predictions_len]
-
-                # CTC decoding procedure
-                decoded_prediction = []
-                token_lengths = []  # preserve token lengths
-                token_repetitions = []  # preserve number of repetitions per token
-
-                previous = self.blank_id
-                last_length = 0
-                last_repetition = 1
-
-                for pidx, p in enumerate(prediction):
-                    if (p != previous or previous == self.blank_id) and p != self.blank_id:
-                        decoded_prediction.append(p)
-
-                        token_lengths.append(pidx - last_length)
-                        last_length = pidx
-                        token_repetitions.append(last_repetition)
-                        last_repetition = 1
-
-                    if p == previous and previous != self.blank_id:
-                        last_repetition += 1
-
-                    previous = p
-
-                if len(token_repetitions) > 0:
-                    token_repetitions = token_repetitions[1:] + [last_repetition]
+                decoded_prediction, token_lengths, token_repetitions = folded_predictions[ind]
 
             else:
+                # Extract the integer encoded hypothesis
+                hyp = hypotheses_list[ind]
+                prediction = hyp.y_sequence
+                predictions_len = hyp.length if hyp.length > 0 else None
+
                 if predictions_len is not None:
                     prediction = prediction[:predictions_len]
                 decoded_prediction = prediction[prediction != self.blank_id].tolist()
@@ -536,6 +509,63 @@ class AbstractCTCDecoding(ConfidenceMixin):
 
         return hypotheses_list
 
+    def _fold_consecutive_batch(self, hypotheses_list: List[Hypothesis]) -> List[tuple]:
+        """
+        Performs the CTC collapse of a list of hypotheses at once on the padded [B, T] tensor of their labels.
+
+        Args:
+            hypotheses_list: List of Hypothesis with integer encoded `y_sequence`.
+
+        Returns:
+            A list with a tuple for every hypothesis, containing:
+                the ctc collapsed integer ids,
+                the number of frames from the previous emitted token (or from the start) to every token,
+                the number of frames every token was repeated for.
+        """
+        predictions = [torch.as_tensor(hyp.y_sequence, dtype=torch.long) for hyp in hypotheses_list]
+        if len(predictions) == 0:
+            return []
+        device = predictions[0].device
+        predictions = [prediction.to(device) for prediction in predictions]
+        lengths = [
+            min(int(hyp.length), len(prediction)) if hyp.length > 0 else len(prediction)
+            for hyp, prediction in zip(hypotheses_list, predictions)
+        ]
+        labels = torch.nn.utils.rnn.pad_sequence(predictions, batch_first=True, padding_value=self.blank_id)
+        lengths = torch.tensor(lengths, dtype=torch.long, device=device)
+        batch_size, max_time = labels.shape
+
+        frames = torch.arange(max_time, device=device).expand(batch_size, max_time)
+        valid = frames < lengths.unsqueeze(1)
+        previous = torch.cat([torch.full_like(labels[:, :1], self.blank_id), labels[:, :-1]], dim=1)
+        # a token is emitted at the first frame of every run of the same non-blank label
+        emitted = valid & (labels != self.blank_id) & (labels != previous)
+        # the following frames of the run are repetitions of the emitted token
+        repeated = valid & (labels == previous) & (previous != self.blank_id)
+
+        num_tokens = emitted.sum(dim=1)
+        first_token_indices = num_tokens.cumsum(dim=0) - num_tokens
+        emitted_frames = frames[emitted]
+        # the length of a token is the distance to the previous emitted token, or to the start for the first one
+        previous_emitted_frames = torch.zeros_like(emitted_frames)
+        previous_emitted_frames[1:] = emitted_frames[:-1]
+        previous_emitted_frames[first_token_indices[num_tokens > 0]] = 0
+        token_lengths = emitted_frames - previous_emitted_frames
+        # every repetition belongs to the last emitted token of its sequence
+        token_indices = first_token_indices.unsqueeze(1) + emitted.cumsum(dim=1) - 1
+        token_repetitions = torch.ones_like(emitted_frames)
+        token_repetitions.index_add_(0, token_indices[repeated], torch.ones_like(token_indices[repeated]))
+
+        # convert to python objects only once for the whole batch
+        decoded_predictions = labels[emitted].tolist()
+        token_lengths = token_lengths.tolist()
+        token_repetitions = token_repetitions.tolist()
+        ends = (first_token_indices + num_tokens).tolist()
+        return [
+            (decoded_predictions[start:end], token_lengths[start:end], token_repetitions[start:end])
+            for start, end in zip(first_token_indices.tolist(), ends)
+        ]
+
     def compute_confidence(self, hypotheses_list: List[Hypothesis]) -> List[Hypothesis]:
         """
         Computes high-level (per-token and/or per-word) confidence scores for a list of hypotheses.
@@ -644,9 +674,10 @@ class AbstractCTCDecoding(ConfidenceMixin):
                 f" {len(hypothesis.text)}"
             )
 
-        # Correctly process the token ids to chars/subwords.
+        # Correctly process the token ids to chars/subwords, decoding every distinct token id once.
+        token_strs = {char: self.decode_tokens_to_str([char]) for char in set(hypothesis.text)}
         for i, char in enumerate(hypothesis.text):
-            char_offsets[i]["char"] = self.decode_tokens_to_str([char])
+            char_offsets[i]["char"] = token_strs[char]
 
         char_offsets = self._refine_timestamps(char_offsets, self.supported_punctuation)
 
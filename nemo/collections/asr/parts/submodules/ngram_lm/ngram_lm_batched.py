@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import mmap
+import os
 import re
 from collections import defaultdict
-from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import InitVar, dataclass, field
 from pathlib import Path
 from typing import NamedTuple, Optional, Union, cast
@@ -46,6 +49,12 @@ _BOS_ID = -1  # Begin-of-Sentence
 _EOS_ID = -2  # End-of-Sentence
 _UNK_ID = -3  # Unk
 _SPECIAL_SYMBOLS_MAP = {"<s>": _BOS_ID, "</s>": _EOS_ID, "<unk>": _UNK_ID}
+_SPECIAL_SYMBOLS_SURROGATES = {symbol: chr(0xD800 + i) for i, symbol in enumerate(_SPECIAL_SYMBOLS_MAP)}
+
+# Binary format of the suffix tree: magic, length of the JSON header, JSON header, aligned NumPy (.npy) arrays
+_SUFFIX_TREE_MAGIC = b"NGPULM01"
+_SUFFIX_TREE_ALIGNMENT = 64
+SUFFIX_TREE_FILE_SUFFIX = ".ngpulm"
 
 
 def _log_10_to_e(score):
@@ -53,6 +62,15 @@ def _log_10_to_e(score):
     return score / np.log10(np.e)
 
 
+def _get_ngrams_dtype(order: int) -> list:
+    """NumPy structured dtype to store n-grams of the given order (symbols, weight, backoff)"""
+    return [
+        ("symbols", [(f"{i}", np.int32) for i in range(order)]),
+        ("weight", np.float32),
+        ("backoff", np.float32),
+    ]
+
+
 class KenLMBatchedWrapper:
     """
     KenLM model wrapper for single element and batched queries (slow) for reference decoding and testing purposes.
@@ -259,8 +277,7 @@ class SuffixTreeStorage:
 
     arcs: np.ndarray = field(init=False)
     states: np.ndarray = field(init=False)
-
-    _arc_cache: dict[tuple[int, ...], int] = field(default_factory=dict)
+    _arcs_keys: Optional[np.ndarray] = field(init=False, default=None, repr=False)
 
     unk_prob: float = float("-inf")
     normalize_unk: bool = True
@@ -361,132 +378,236 @@ class SuffixTreeStorage:
             NEG_INF,
         )
 
-    def _find_state(self, symbols: tuple[int, ...], bos_id: int) -> int:
+    def _find_states(self, symbols: np.ndarray, bos_id: int) -> np.ndarray:
         """
-        Find the state given sequence of symbols
+        Find the states given sequences of symbols (vectorized).
+        Arcs for all orders except the maximum are sorted by (from state, label), which allows walking the tree
+        with binary search.
+
         Args:
-            symbols: sequence of symbols
+            symbols: [N, L] sequences of symbols
             bos_id: ID of the Begin-of-Sentence symbol
 
         Returns:
-            state in tree for the last symbol
-        """
-        if len(symbols) > 1:
-            return self._arc_cache[tuple(symbols)]
-        assert len(symbols) == 1
-        label = symbols[0]
-        if label == bos_id:
-            return 1
-        elif label >= 0:
-            return self.arcs[label]["to"]
-        raise ValueError(f"Invalid symbol {label}")
+            [N] states in tree for the last symbol of each sequence
+        """
+        labels = symbols[:, 0]
+        is_invalid = ((labels < 0) & (labels != bos_id)) | (labels >= self.vocab_size)
+        if is_invalid.any():
+            raise ValueError(f"Invalid symbols {symbols[is_invalid][0].tolist()}")
+        states = np.where(labels == bos_id, self.bos_state, self.arcs["to"][np.maximum(labels, 0)]).astype(np.int64)
+        if symbols.shape[1] == 1:
+            return states
+        arcs = self.arcs[: self.num_arcs]
+        if self._arcs_keys is None or self._arcs_keys.shape[0] != self.num_arcs:
+            self._arcs_keys = arcs["from"].astype(np.int64) * self.vocab_size + arcs["ilabel"]
+            assert (self._arcs_keys[1:] > self._arcs_keys[:-1]).all()
+        arcs_keys = self._arcs_keys
+        for i in range(1, symbols.shape[1]):
+            labels = symbols[:, i]
+            queries = states * self.vocab_size + labels
+            arc_ids = np.minimum(np.searchsorted(arcs_keys, queries), arcs_keys.shape[0] - 1)
+            is_missing = (arcs_keys[arc_ids] != queries) | (labels < 0) | (labels >= self.vocab_size)
+            if is_missing.any():
+                raise ValueError(f"Prefix of n-gram is not found {symbols[is_missing][0].tolist()}")
+            states = arcs["to"][arc_ids].astype(np.int64)
+        return states
+
+    def _set_arcs_ranges(self, first_arc: int, from_states: np.ndarray):
+        """Set arcs ranges for states given the from states of arcs added contiguously starting from `first_arc`"""
+        assert (from_states[1:] >= from_states[:-1]).all()
+        states, first_ids, counts = np.unique(from_states, return_index=True, return_counts=True)
+        self.states["arcs_start"][states] = first_arc + first_ids
+        self.states["arcs_end"][states] = first_arc + first_ids + counts
+
+    def _add_final_weights(self, symbols: np.ndarray, weights: np.ndarray, bos_id: int) -> np.ndarray:
+        """Store weights of ngrams ending with EOS as final weights of the states; return mask of other ngrams"""
+        is_final = symbols[:, -1] < 0
+        assert (symbols[is_final, -1] == _EOS_ID).all()
+        if is_final.any():
+            self.states["final"][self._find_states(symbols[is_final, :-1], bos_id=bos_id)] = weights[is_final]
+        return ~is_final
 
     def _add_ngrams_next_order(self, ngrams: np.ndarray, bos_id: int):
         """Add ngrams for the order > 1; should be called after adding unigrams, using increasing order"""
-        ngrams.sort(order="symbols")
-        new_arc_cache = dict()
-        for ngram in tqdm(ngrams):
-            symbols = ngram["symbols"].item()
-            ilabel = symbols[-1]
-            from_state = self._find_state(symbols[:-1], bos_id=bos_id)
-            if ilabel < 0:
-                assert ilabel == _EOS_ID
-                self.states[from_state]["final"] = ngram["weight"]
-                continue
-            assert ilabel < self.vocab_size
-            backoff_state = self._find_state(symbols[1:], bos_id=bos_id)
-
-            arc_id = self.num_arcs
-            next_state = self.num_states
-            self.num_arcs += 1
-            self.num_states += 1
-            self.arcs[arc_id] = (from_state, next_state, ilabel, ngram["weight"])
-            # state: start_arcs, end_arcs, order, backoff_to, backoff_weight
-            self.states[next_state] = (
-                0,
-                0,
-                self.states[from_state]["order"] + 1,
-                backoff_state,
-                ngram["backoff"],
-                NEG_INF,
-            )
-
-            if self.states[from_state]["arcs_start"] == 0:
-                self.states[from_state]["arcs_start"] = arc_id
-                self.states[from_state]["arcs_end"] = arc_id + 1
-            else:
-                assert self.states[from_state]["arcs_end"] == arc_id
-                self.states[from_state]["arcs_end"] = arc_id + 1
-            # cache state
-            new_arc_cache[symbols] = next_state
-        self._arc_cache = new_arc_cache  # replace arc cache, previous is not needed
-
-    def _start_adding_ngrams_for_order(self, order: int, max_ngrams: int):
-        """Prepare for adding ngrams for the given order: initialize temporary storage"""
-        self._start_arcs = self.num_arcs
-        self._cur_order = order
-        if order < self.max_order:
-            dtype = [
-                ("symbols", [(f"{i}", np.int32) for i in range(order)]),
-                ("weight", np.float32),
-                ("backoff", np.float32),
-            ]
-            self._ngrams = np.zeros([max_ngrams], dtype=dtype)
-            self._ngrams_cnt = 0
-        # for max order - no need in accumulator
-
-    def _add_ngram(self, ngram: NGram, bos_id: int):
-        """Helper to add ngram"""
-        assert len(ngram.symbols) == self._cur_order
-        if self._cur_order == self.max_order:
-            self._add_ngram_max_order(ngram=ngram, bos_id=bos_id)
-            return
-        self._ngrams[self._ngrams_cnt] = (ngram.symbols, ngram.weight, ngram.backoff)
-        self._ngrams_cnt += 1
-
-    def _end_adding_ngrams_for_order(self, order: int, bos_id: int, unk_id: int):
-        """Finish adding ngrams for the given order"""
+        order = len(ngrams.dtype["symbols"].names)
+        symbols = np.stack([ngrams["symbols"][f"{i}"] for i in range(order)], axis=-1).astype(np.int64)
+        # sort by symbols (same as `ngrams.sort(order="symbols")` for unique ngrams, but much faster)
+        sort_ids = np.lexsort(symbols.T[::-1])
+        symbols, ngrams = symbols[sort_ids], ngrams[sort_ids]
+        is_arc = self._add_final_weights(symbols=symbols, weights=ngrams["weight"], bos_id=bos_id)
+        symbols, ngrams = symbols[is_arc], ngrams[is_arc]
+        assert (symbols[:, -1] < self.vocab_size).all()
+        from_states = self._find_states(symbols[:, :-1], bos_id=bos_id)
+        backoff_states = self._find_states(symbols[:, 1:], bos_id=bos_id)
+
+        num_ngrams = ngrams.shape[0]
+        next_states = np.arange(self.num_states, self.num_states + num_ngrams)
+        arcs = self.arcs[self.num_arcs : self.num_arcs + num_ngrams]
+        arcs["from"] = from_states
+        arcs["to"] = next_states
+        arcs["ilabel"] = symbols[:, -1]
+        arcs["weight"] = ngrams["weight"]
+        # state: start_arcs, end_arcs, order, backoff_to, backoff_weight
+        states = self.states[self.num_states : self.num_states + num_ngrams]
+        states["arcs_start"] = 0
+        states["arcs_end"] = 0
+        states["order"] = self.states["order"][from_states] + 1
+        states["backoff_to"] = backoff_states
+        states["backoff_w"] = ngrams["backoff"]
+        states["final"] = NEG_INF
+        self._set_arcs_ranges(first_arc=self.num_arcs, from_states=from_states)
+        self.num_arcs += num_ngrams
+        self.num_states += num_ngrams
+
+    def _add_ngrams_max_order(self, ngrams: np.ndarray, bos_id: int):
+        """Add ngrams for the maximum order: arcs lead to the backoff states, no new states are added"""
+        order = len(ngrams.dtype["symbols"].names)
+        symbols = np.stack([ngrams["symbols"][f"{i}"] for i in range(order)], axis=-1).astype(np.int64)
+        is_arc = self._add_final_weights(symbols=symbols, weights=ngrams["weight"], bos_id=bos_id)
+        symbols, ngrams = symbols[is_arc], ngrams[is_arc]
+        from_states = self._find_states(symbols[:, :-1], bos_id=bos_id)
+        backoff_states = self._find_states(symbols[:, 1:], bos_id=bos_id)
+
+        # sort arcs by (from state, label)
+        ilabels = symbols[:, -1]
+        sort_ids = np.argsort(from_states * self.vocab_size + ilabels, kind="stable")
+        from_states = from_states[sort_ids]
+
+        num_ngrams = ngrams.shape[0]
+        arcs = self.arcs[self.num_arcs : self.num_arcs + num_ngrams]
+        arcs["from"] = from_states
+        arcs["to"] = backoff_states[sort_ids]
+        arcs["ilabel"] = ilabels[sort_ids]
+        arcs["weight"] = ngrams["weight"][sort_ids]
+        self._set_arcs_ranges(first_arc=self.num_arcs, from_states=from_states)
+        self.num_arcs += num_ngrams
+        self._arcs_keys = None  # not needed after adding the last order
+
+    def _add_ngrams_for_order(self, order: int, ngrams: np.ndarray, bos_id: int, unk_id: int):
+        """Add all ngrams of the given order; should be called using increasing order"""
+        assert ngrams.dtype == np.dtype(_get_ngrams_dtype(order))
         if order == 1:
-            assert self._ngrams.shape[0] == self._ngrams_cnt
-            self._add_unigrams(ngrams=self._ngrams, bos_id=bos_id, unk_id=unk_id)
-            self._ngrams = None
-            self._ngrams_cnt = 0
+            self._add_unigrams(ngrams=ngrams, bos_id=bos_id, unk_id=unk_id)
         elif order < self.max_order:
-            assert self._ngrams.shape[0] == self._ngrams_cnt
-            self._add_ngrams_next_order(ngrams=self._ngrams, bos_id=bos_id)
-            self._ngrams = None
-            self._ngrams_cnt = 0
+            self._add_ngrams_next_order(ngrams=ngrams, bos_id=bos_id)
         else:
-            self._end_adding_ngrams_max_order()
-
-    def _add_ngram_max_order(self, ngram: NGram, bos_id: int):
-        """Add ngram for the maximum order"""
-        ilabel = ngram.symbols[-1]
-        from_state = self._find_state(ngram.symbols[:-1], bos_id=bos_id)
-        if ilabel < 0:
-            assert ilabel == _EOS_ID
-            self.states[from_state]["final"] = ngram.weight
-            return
-        backoff_state = self._find_state(ngram.symbols[1:], bos_id=bos_id)
-
-        arc_id = self.num_arcs
-        self.num_arcs += 1
-        self.arcs[arc_id] = (from_state, backoff_state, ilabel, ngram.weight)
-
-    def _end_adding_ngrams_max_order(self):
-        """Finish adding ngrams for the maximum order"""
-        self.arcs[self._start_arcs : self.num_arcs].sort(order=["from", "ilabel"])
-        for arc_i in range(self._start_arcs, self.num_arcs):
-            from_state = self.arcs[arc_i]["from"]
-            if self.states[from_state]["arcs_start"] == 0:
-                self.states[from_state]["arcs_start"] = arc_i
-            self.states[from_state]["arcs_end"] = arc_i + 1
+            self._add_ngrams_max_order(ngrams=ngrams, bos_id=bos_id)
 
     def sanity_check(self):
         """Sanity check for the model"""
         assert (self.arcs["ilabel"][: self.num_arcs] < self.vocab_size).all()
         assert (self.arcs["ilabel"][: self.num_arcs] >= 0).all()
 
+    def save(self, path: Path | str, source_info: Optional[dict] = None):
+        """
+        Save the suffix tree to the binary file, which can be loaded (memory-mapped) with `SuffixTreeStorage.load`.
+        The file is written atomically: concurrent readers see either the previous or the complete new file.
+
+        Args:
+            path: path to the output file
+            source_info: optional metadata (e.g., description of the ARPA file), stored in the header
+        """
+        path = Path(path)
+        header = {
+            "vocab_size": self.vocab_size,
+            "max_order": self.max_order,
+            "num_states": self.num_states,
+            "num_arcs": self.num_arcs,
+            "unk_prob": float(self.unk_prob),
+            "normalize_unk": self.normalize_unk,
+            "start_state": self.start_state,
+            "bos_state": self.bos_state,
+            "source_info": source_info,
+        }
+        # the model also uses `vocab_size` (zero) arcs after the last arc as padding
+        arrays = {
+            "arcs": self.arcs[: self.num_arcs + self.vocab_size],
+            "states": self.states[: self.num_states],
+        }
+        header["arrays"] = list(arrays.keys())
+        header_bytes = json.dumps(header).encode("utf-8")
+        tmp_path = path.with_name(f"{path.name}.tmp{os.getpid()}")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_SUFFIX_TREE_MAGIC)
+                f.write(np.uint64(len(header_bytes)).tobytes())
+                f.write(header_bytes)
+                for array in arrays.values():
+                    f.write(b"\0" * (-f.tell() % _SUFFIX_TREE_ALIGNMENT))
+                    np.lib.format.write_array(f, array, allow_pickle=False)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @staticmethod
+    def _read_header(f) -> dict:
+        """Read the header of the binary file with the suffix tree"""
+        magic = f.read(len(_SUFFIX_TREE_MAGIC))
+        if magic != _SUFFIX_TREE_MAGIC:
+            raise ValueError(f"Not a suffix tree file (or unsupported version): {f.name}")
+        header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        return json.loads(f.read(header_length).decode("utf-8"))
+
+    @classmethod
+    def read_info(cls, path: Path | str) -> dict:
+        """
+        Read the metadata of the binary file with the suffix tree without loading the arrays
+
+        Args:
+            path: path to the file saved with `SuffixTreeStorage.save`
+
+        Returns:
+            dictionary with the suffix tree parameters and the `source_info` passed to `save`
+        """
+        with open(path, "rb") as f:
+            return cls._read_header(f)
+
+    @classmethod
+    def load(cls, path: Path | str, mmap: bool = True) -> "SuffixTreeStorage":
+        """
+        Load the suffix tree from the binary file saved with `SuffixTreeStorage.save`.
+
+        Args:
+            path: path to the file
+            mmap: memory-map the arrays (copy-on-write) instead of reading them into memory (default: True)
+
+        Returns:
+            SuffixTreeStorage instance (arrays contain only the used states and arcs)
+        """
+        arrays = dict()
+        with open(path, "rb") as f:
+            header = cls._read_header(f)
+            for name in header["arrays"]:
+                f.seek(f.tell() + (-f.tell() % _SUFFIX_TREE_ALIGNMENT))
+                if not mmap:
+                    arrays[name] = np.lib.format.read_array(f, allow_pickle=False)
+                    continue
+                version = np.lib.format.read_magic(f)
+                if version == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+                assert not fortran_order and len(shape) == 1
+                arrays[name] = np.memmap(f.name, dtype=dtype, mode="c", offset=f.tell(), shape=shape)
+                f.seek(f.tell() + arrays[name].nbytes)
+        suffix_tree_np = cls(
+            num_states_max=0,
+            num_arcs_max=0,
+            vocab_size=header["vocab_size"],
+            max_order=header["max_order"],
+            separate_bos_state=header["bos_state"] != header["start_state"],
+            unk_prob=header["unk_prob"],
+            normalize_unk=header["normalize_unk"],
+            num_states=header["num_states"],
+            num_arcs=header["num_arcs"],
+            start_state=header["start_state"],
+        )
+        suffix_tree_np.arcs = arrays["arcs"]
+        suffix_tree_np.states = arrays["states"]
+        return suffix_tree_np
+
 
 @dataclass
 class NGramLMConfig:
@@ -617,17 +738,19 @@ class NGramGPULanguageModel(ModelPT):
         normalize_unk: bool = True,
         use_triton: bool | None = None,
         token_offset: int = DEFAULT_TOKEN_OFFSET,
+        use_cache: bool = True,
     ) -> "NGramGPULanguageModel":
         """
-        Constructor from ARPA or Nemo (`.nemo`) checkpoint.
+        Constructor from ARPA, Nemo (`.nemo`) checkpoint or binary suffix tree (`.ngpulm`) file.
 
         Args:
-            lm_path: path to .nemo checkpoint or ARPA (text) file
+            lm_path: path to .nemo checkpoint, .ngpulm suffix tree or ARPA (text) file
             vocab_size: model vocabulary size:
             normalize_unk: normalize unk probabilities (for tokens missing in LM) to make
                 all unigram probabilities sum to 1.0 (default: True)
             use_triton: allow using Triton implementation; None (default) means "auto" (used if available)
             token_offset: offset for the tokens used for building ARPA LM
+            use_cache: cache the converted ARPA model in the binary file next to it (see `from_arpa`)
 
         Returns:
             NGramGPULanguageModel instance
@@ -636,14 +759,39 @@ class NGramGPULanguageModel(ModelPT):
             lm_path = Path(lm_path)
         if lm_path.suffix == ".nemo":
             return cls.from_nemo(lm_path=lm_path, vocab_size=vocab_size, use_triton=use_triton)
+        if lm_path.suffix == SUFFIX_TREE_FILE_SUFFIX:
+            return cls.from_suffix_tree_file(lm_path=lm_path, vocab_size=vocab_size, use_triton=use_triton)
         return cls.from_arpa(
             lm_path=lm_path,
             vocab_size=vocab_size,
             normalize_unk=normalize_unk,
             token_offset=token_offset,
             use_triton=use_triton,
+            use_cache=use_cache,
         )
 
+    @classmethod
+    def from_suffix_tree_file(
+        cls,
+        lm_path: Path | str,
+        vocab_size: int,
+        use_triton: bool | None = None,
+    ) -> "NGramGPULanguageModel":
+        """
+        Constructor from the binary suffix tree file (saved with `SuffixTreeStorage.save`, e.g., ARPA cache).
+
+        Args:
+            lm_path: path to .ngpulm file
+            vocab_size: model vocabulary size
+            use_triton: allow using Triton implementation; None (default) means "auto" (used if available)
+
+        Returns:
+            NGramGPULanguageModel instance
+        """
+        suffix_tree_np = SuffixTreeStorage.load(lm_path, mmap=True)
+        assert suffix_tree_np.vocab_size == vocab_size
+        return cls.from_suffix_tree(suffix_tree_np=suffix_tree_np, use_triton=use_triton)
+
     @classmethod
     def from_arpa(
         cls,
@@ -652,9 +800,13 @@ class NGramGPULanguageModel(ModelPT):
         normalize_unk: bool = True,
         use_triton: bool | None = None,
         token_offset: int = DEFAULT_TOKEN_OFFSET,
+        use_cache: bool = True,
+        num_workers: int | None = None,
     ) -> "NGramGPULanguageModel":
         """
         Constructor from ARPA LM (text format).
+        The converted suffix tree is cached in the binary file next to the ARPA model (see `get_arpa_cache_path`),
+        which is memory-mapped instead of parsing the ARPA file again while the ARPA file is not modified.
 
         Args:
             lm_path: path to ARPA model (human-readable)
@@ -665,45 +817,132 @@ class NGramGPULanguageModel(ModelPT):
                 None (default) means "auto" (used if available), True means forced mode
                 (will crash if Triton is unavailable)
             token_offset: offset for the tokens used for building ARPA LM
+            use_cache: load the suffix tree from the cache file if it is up to date, otherwise save it after
+                parsing the ARPA file (default: True). Failure to write the cache is not an error.
+            num_workers: number of processes to parse the ARPA file, None (default) means the number of CPUs,
+                0 or 1 means parsing in the main process
 
         Returns:
             NGramGPULanguageModel instance
         """
-        logging.info(f"{cls.__name__}: reading LM from {lm_path}")
-        with open(lm_path, "r", encoding="utf-8") as f:
-            order2cnt = cls._read_header(f=f)
-            # init suffix tree storage
-            max_order = max(order2cnt.keys())
-            total_ngrams = sum(order2cnt.values())
-            max_states = 2 + vocab_size + sum(order2cnt[o] for o in range(2, max_order))  # without last!
-            suffix_tree_np = SuffixTreeStorage(
-                num_states_max=max_states,
-                num_states=0,
-                num_arcs=0,
-                num_arcs_max=total_ngrams + vocab_size * 2 + 1,
-                normalize_unk=normalize_unk,
-                vocab_size=vocab_size,
-                max_order=max_order,
-            )
-            # add ngrams to suffix tree
-            ngram_cur_order_i = 0
-            cur_order = 1
-            for ngram in tqdm(cls._read_ngrams(f=f, token_offset=token_offset), total=total_ngrams):
-                if ngram_cur_order_i == 0:
-                    suffix_tree_np._start_adding_ngrams_for_order(order=cur_order, max_ngrams=order2cnt[cur_order])
-                ngram_cur_order_i += 1
-                suffix_tree_np._add_ngram(ngram=ngram, bos_id=_BOS_ID)
-
-                if ngram_cur_order_i == order2cnt[cur_order]:
-                    suffix_tree_np._end_adding_ngrams_for_order(order=cur_order, bos_id=_BOS_ID, unk_id=_UNK_ID)
-                    logging.info(f"Processed {order2cnt[cur_order]} n-grams of order {cur_order}")
-                    cur_order += 1
-                    ngram_cur_order_i = 0
-
-            assert ngram_cur_order_i == 0
-            suffix_tree_np.sanity_check()
+        lm_path = Path(lm_path)
+        cache_path = cls.get_arpa_cache_path(
+            lm_path=lm_path, vocab_size=vocab_size, normalize_unk=normalize_unk, token_offset=token_offset
+        )
+        arpa_stat = lm_path.stat()
+        source_info = {
+            "arpa_file": lm_path.name,
+            "arpa_size": arpa_stat.st_size,
+            "arpa_mtime_ns": arpa_stat.st_mtime_ns,
+            "token_offset": token_offset,
+        }
+        if use_cache and cache_path.exists():
+            try:
+                info = SuffixTreeStorage.read_info(cache_path)
+            except (OSError, ValueError) as e:
+                logging.warning(f"{cls.__name__}: ignoring invalid LM cache {cache_path}: {e}")
+                info = None
+            if (
+                info is not None
+                and info["source_info"] == source_info
+                and info["vocab_size"] == vocab_size
+                and info["normalize_unk"] == normalize_unk
+            ):
+                logging.info(f"{cls.__name__}: loading LM {lm_path} from cache {cache_path}")
+                return cls.from_suffix_tree(
+                    suffix_tree_np=SuffixTreeStorage.load(cache_path, mmap=True), use_triton=use_triton
+                )
+
+        suffix_tree_np = cls._arpa_to_suffix_tree(
+            lm_path=lm_path,
+            vocab_size=vocab_size,
+            normalize_unk=normalize_unk,
+            token_offset=token_offset,
+            num_workers=num_workers,
+        )
+        if use_cache:
+            try:
+                suffix_tree_np.save(cache_path, source_info=source_info)
+                logging.info(f"{cls.__name__}: saved LM cache to {cache_path}")
+            except OSError as e:
+                logging.warning(f"{cls.__name__}: unable to save LM cache to {cache_path}: {e}")
         return NGramGPULanguageModel.from_suffix_tree(suffix_tree_np=suffix_tree_np, use_triton=use_triton)
 
+    @staticmethod
+    def get_arpa_cache_path(
+        lm_path: Path | str, vocab_size: int, normalize_unk: bool = True, token_offset: int = DEFAULT_TOKEN_OFFSET
+    ) -> Path:
+        """
+        Path to the binary cache of the ARPA model (next to the ARPA file, depends on the conversion parameters)
+        """
+        lm_path = Path(lm_path)
+        return lm_path.with_name(
+            f"{lm_path.name}.v{vocab_size}-o{token_offset}-n{int(normalize_unk)}{SUFFIX_TREE_FILE_SUFFIX}"
+        )
+
+    @classmethod
+    def _arpa_to_suffix_tree(
+        cls,
+        lm_path: Path,
+        vocab_size: int,
+        normalize_unk: bool,
+        token_offset: int,
+        num_workers: int | None = None,
+        chunk_size: int = 64 * 2**20,
+    ) -> SuffixTreeStorage:
+        """
+        Parse ARPA model and build the suffix tree.
+        Sections of the ARPA file with n-grams of each order are split into chunks of lines (`chunk_size` bytes),
+        which are parsed in parallel by `num_workers` processes, while the suffix tree is built in the main process
+        in increasing order.
+        """
+        logging.info(f"{cls.__name__}: reading LM from {lm_path}")
+        order2cnt, order2chunks = cls._split_arpa(lm_path=lm_path, chunk_size=chunk_size)
+        # init suffix tree storage
+        max_order = max(order2cnt.keys())
+        total_ngrams = sum(order2cnt.values())
+        max_states = 2 + vocab_size + sum(order2cnt[o] for o in range(2, max_order))  # without last!
+        suffix_tree_np = SuffixTreeStorage(
+            num_states_max=max_states,
+            num_states=0,
+            num_arcs=0,
+            num_arcs_max=total_ngrams + vocab_size * 2 + 1,
+            normalize_unk=normalize_unk,
+            vocab_size=vocab_size,
+            max_order=max_order,
+        )
+
+        num_chunks = sum(len(chunks) for chunks in order2chunks.values())
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_workers = min(num_workers, num_chunks)
+        executor = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 1 else None
+        try:
+            # submit all chunks at once; results are consumed in order
+            order2results = dict()
+            for order in range(1, max_order + 1):
+                order2results[order] = []
+                for start, end in order2chunks.get(order, []):
+                    chunk_args = dict(lm_path=lm_path, start=start, end=end, order=order, token_offset=token_offset)
+                    if executor is None:
+                        order2results[order].append(chunk_args)
+                    else:
+                        order2results[order].append(executor.submit(cls._parse_ngrams_chunk, **chunk_args))
+            for order in tqdm(range(1, max_order + 1)):
+                ngrams = [
+                    cls._parse_ngrams_chunk(**result) if executor is None else result.result()
+                    for result in order2results.pop(order)
+                ]
+                ngrams = np.concatenate(ngrams) if ngrams else np.zeros([0], dtype=_get_ngrams_dtype(order))
+                assert ngrams.shape[0] == order2cnt[order], f"Expected {order2cnt[order]} n-grams of order {order}"
+                suffix_tree_np._add_ngrams_for_order(order=order, ngrams=ngrams, bos_id=_BOS_ID, unk_id=_UNK_ID)
+                logging.info(f"Processed {order2cnt[order]} n-grams of order {order}")
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        suffix_tree_np.sanity_check()
+        return suffix_tree_np
+
     @classmethod
     def dummy_unigram_lm(
         cls,
@@ -818,24 +1057,106 @@ class NGramGPULanguageModel(ModelPT):
         return order2cnt
 
     @classmethod
-    def _read_ngrams(cls, f, token_offset: int) -> Iterator[NGram]:
-        special_words_pattern = '|'.join(re.escape(symbol) for symbol in _SPECIAL_SYMBOLS_MAP)
-        pattern = re.compile(rf'({special_words_pattern}|.)\s?')
-        for line in f:
-            if line.endswith("\n"):
-                line = line[:-1]
+    def _split_arpa(cls, lm_path: Path, chunk_size: int) -> tuple[dict[int, int], dict[int, list[tuple[int, int]]]]:
+        """
+        Find sections with n-grams in ARPA file and split them into chunks of lines
 
-            if not line:
-                continue
+        Args:
+            lm_path: path to ARPA file
+            chunk_size: approximate size of the chunk in bytes
 
-            if line.startswith("\\end\\"):
-                break
+        Returns:
+            tuple: dictionary with order -> number of ngrams, dictionary with order -> list of chunks (start, end)
+        """
+        order_pattern = re.compile(r"\\(\d+)-grams:")
+        with open(lm_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as lm_data:
+            # section headers start with "\": \data\, \1-grams:, ..., \end\
+            sections = []
+            pos = lm_data.find(b"\n\\")
+            while pos >= 0:
+                line_end = lm_data.find(b"\n", pos + 1)
+                line_end = len(lm_data) if line_end < 0 else line_end
+                sections.append((lm_data[pos + 1 : line_end].decode("utf-8").strip(), pos + 1, line_end + 1))
+                pos = lm_data.find(b"\n\\", line_end)
+            if not sections:
+                raise ValueError(f"No n-gram sections found in ARPA file {lm_path}")
+            order2cnt = cls._read_header(f=iter(lm_data[: sections[0][1]].decode("utf-8").split("\n")))
+
+            order2chunks: dict[int, list[tuple[int, int]]] = dict()
+            for (name, _, body_start), (_, body_end, _) in zip(sections, sections[1:] + [(None, len(lm_data), None)]):
+                match = order_pattern.fullmatch(name)
+                if match is None:
+                    continue
+                chunks = []
+                chunk_start = body_start
+                while chunk_start < body_end:
+                    chunk_end = lm_data.find(b"\n", min(chunk_start + chunk_size, body_end) - 1, body_end)
+                    chunk_end = body_end if chunk_end < 0 else chunk_end + 1
+                    chunks.append((chunk_start, chunk_end))
+                    chunk_start = chunk_end
+                order2chunks[int(match.group(1))] = chunks
+        return order2cnt, order2chunks
 
-            if line.startswith("\\"):
-                continue
+    @staticmethod
+    def _parse_ngrams_chunk(lm_path: Path, start: int, end: int, order: int, token_offset: int) -> np.ndarray:
+        """
+        Parse chunk of lines [start, end) (in bytes) with n-grams of the given order from ARPA file.
+        Lines with single-character symbols separated by spaces (typical for LMs with token offset) are parsed
+        in a vectorized manner, other lines are parsed with `_line_to_ngram`.
 
-            ngram = cls._line_to_ngram(line=line, pattern=pattern, token_offset=token_offset)
-            yield ngram
+        Returns:
+            array of n-grams (see `_get_ngrams_dtype`) in the order of lines
+        """
+        with open(lm_path, "rb") as f:
+            f.seek(start)
+            text = f.read(end - start).decode("utf-8")
+        # special symbols are replaced with single characters, which can not be decoded from UTF-8 (surrogates)
+        for symbol, char in _SPECIAL_SYMBOLS_SURROGATES.items():
+            text = text.replace(symbol, char)
+        # NB: do not use `splitlines`, some symbols (e.g., "\x85") are treated as line boundaries
+        lines = [line for line in text.replace("\r\n", "\n").split("\n") if line]
+        ngrams = np.zeros([len(lines)], dtype=_get_ngrams_dtype(order))
+        if not lines:
+            return ngrams
+        # NB: `partition` is much faster than `split` here, since it does not create (GC-tracked) lists
+        fields = [line.partition("\t") for line in lines]
+        ngrams["weight"] = _log_10_to_e(np.array([line_fields[0] for line_fields in fields], dtype=np.float64))
+        fields = [line_fields[2].partition("\t") for line_fields in fields]
+        symbols_strs = [line_fields[0] for line_fields in fields]
+        backoffs = [line_fields[2] for line_fields in fields]
+        del fields
+        ngrams["backoff"] = _log_10_to_e(
+            np.array([backoff if backoff else 0.0 for backoff in backoffs], dtype=np.float64)
+        )
+
+        symbols = np.zeros([len(lines), order], dtype=np.int64)
+        num_chars = 2 * order - 1
+        is_simple = np.array([len(symbols_str) == num_chars for symbols_str in symbols_strs])
+        simple_ids = np.flatnonzero(is_simple)
+        if simple_ids.size > 0:
+            chars = np.frombuffer(
+                "".join([symbols_strs[i] for i in simple_ids]).encode("utf-32-le", "surrogatepass"), dtype=np.uint32
+            ).reshape(-1, num_chars)
+            is_separated = (chars[:, 1::2] == ord(" ")).all(axis=-1)
+            chars = chars[is_separated, ::2].astype(np.int64)
+            simple_symbols = chars - token_offset
+            for symbol, char in _SPECIAL_SYMBOLS_SURROGATES.items():
+                simple_symbols[chars == ord(char)] = _SPECIAL_SYMBOLS_MAP[symbol]
+            symbols[simple_ids[is_separated]] = simple_symbols
+            is_simple[simple_ids[~is_separated]] = False
+
+        special_words_pattern = '|'.join(re.escape(symbol) for symbol in _SPECIAL_SYMBOLS_MAP)
+        pattern = re.compile(rf'({special_words_pattern}|.)\s?')
+        for i in np.flatnonzero(~is_simple):
+            line = lines[i]
+            for symbol, char in _SPECIAL_SYMBOLS_SURROGATES.items():
+                line = line.replace(char, symbol)
+            ngram = NGramGPULanguageModel._line_to_ngram(line=line, pattern=pattern, token_offset=token_offset)
+            assert len(ngram.symbols) == order, f"Expected n-gram of order {order}, got {line}"
+            symbols[i] = ngram.symbols
+        for i in range(order):
+            ngrams["symbols"][f"{i}"] = symbols[:, i]
+        return ngrams
 
     @staticmethod
     def _line_to_ngram(line: str, pattern: re.Pattern, token_offset: int) -> NGram:
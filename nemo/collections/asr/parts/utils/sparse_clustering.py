@@ -0,0 +1,497 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Sparse-affinity variant of the NME-SC clustering in `offline_clustering.py`.
+# The dense path builds N x N affinity matrices and runs full eigendecompositions, which limits it to
+# recordings with tens of thousands of segments. Here, the affinity graph is a k-nearest-neighbor graph built with
+# blocked matrix multiplications, and only the few smallest eigenpairs of its Laplacian are computed with the
+# Lanczos method, so memory grows linearly with the number of segments.
+
+from typing import List, Tuple
+
+import numpy as np
+import torch
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import eigsh
+
+from nemo.collections.asr.parts.utils.offline_clustering import (
+    SpectralClustering,
+    getEnhancedSpeakerCount,
+    getLamdaGaplist,
+    split_input_data,
+)
+
+
+def getNearestScaleMapping(timestamps_in_scales: List[torch.Tensor]) -> List[torch.Tensor]:
+    """
+    Map every base-scale segment to the segment of each scale with the closest center.
+    Gives the same mapping as `get_argmin_mat` with a binary search instead of an N x N distance matrix.
+
+    Args:
+        timestamps_in_scales (list):
+            List containing timestamp tensors for each scale.
+
+    Returns:
+        session_scale_mapping_list (list):
+            List containing argmin arrays indexed by scale index.
+    """
+    base_scale_anchor = torch.mean(timestamps_in_scales[-1], dim=1)
+    session_scale_mapping_list = []
+    for time_stamps in timestamps_in_scales:
+        sorted_anchor, sorted_index = torch.sort(torch.mean(time_stamps, dim=1), stable=True)
+        # The closest anchors are the last one before and the first one after the base-scale anchor.
+        # Among equal anchors, the first in the sorted order has the smallest index, as `argmin` would pick.
+        right = torch.searchsorted(sorted_anchor, base_scale_anchor).clamp(max=sorted_anchor.shape[0] - 1)
+        left = torch.searchsorted(sorted_anchor, sorted_anchor[(right - 1).clamp(min=0)])
+        left_dist = torch.abs(sorted_anchor[left] - base_scale_anchor)
+        right_dist = torch.abs(sorted_anchor[right] - base_scale_anchor)
+        left_index, right_index = sorted_index[left], sorted_index[right]
+        use_left = (left_dist < right_dist) | ((left_dist == right_dist) & (left_index < right_index))
+        session_scale_mapping_list.append(torch.where(use_left, left_index, right_index))
+    return session_scale_mapping_list
+
+
+def getMultiScaleKNNGraph(
+    multiscale_weights: torch.Tensor,
+    embeddings_in_scales: List[torch.Tensor],
+    timestamps_in_scales: List[torch.Tensor],
+    n_neighbors: int,
+    max_block_numel: int = 2**24,
+    device: torch.device = torch.device('cpu'),
+) -> torch.Tensor:
+    """
+    Find the nearest neighbors of every base-scale segment under the fused multiscale cosine similarity.
+
+    The weighted sum of the cosine similarities of all scales is the inner product of the concatenated unit-norm
+    embeddings of each scale, scaled by the square root of the scale weights. The similarities are computed for
+    a block of rows at a time, so no more than `max_block_numel` similarity values are held in memory.
+    Unlike `getMultiScaleCosAffinityMatrix`, the per-scale similarities are not min-max normalized,
+    since the normalization requires the full matrix of each scale.
+
+    Args:
+        multiscale_weights (Tensor):
+            Tensor containing multiscale weights
+            Dimensions: (Number of scales) x 1
+        embeddings_in_scales (list):
+            List containing split embedding tensors by each scale
+        timestamps_in_scales (list):
+            List containing split timestamps tensors by each scale
+        n_neighbors (int):
+            Number of neighbors to find for each segment, excluding the segment itself.
+        max_block_numel (int):
+            Maximum number of similarity values computed at once.
+        device (torch.device):
+            Torch device variable
+
+    Returns:
+        knn_indices (LongTensor):
+            Indices of the nearest neighbors of each segment in descending order of similarity.
+            Dimensions: (Number of base-scale segments) x n_neighbors
+    """
+    multiscale_weights = torch.squeeze(multiscale_weights, dim=0).float()
+    session_scale_mapping_list = getNearestScaleMapping(timestamps_in_scales)
+    features = []
+    for scale_idx, mapping_argmat in enumerate(session_scale_mapping_list):
+        emb_t = embeddings_in_scales[scale_idx].float()
+        emb_t = emb_t / (torch.norm(emb_t, dim=1, keepdim=True) + 3.5e-4)
+        features.append(torch.sqrt(multiscale_weights[scale_idx]) * emb_t[mapping_argmat])
+    features = torch.cat(features, dim=1).to(device)
+
+    num_segments = features.shape[0]
+    n_neighbors = min(n_neighbors, num_segments - 1)
+    block_size = max(1, max_block_numel // num_segments)
+    knn_indices = torch.empty(num_segments, n_neighbors, dtype=torch.long)
+    for start in range(0, num_segments, block_size):
+        end = min(start + block_size, num_segments)
+        sim_block = torch.mm(features[start:end], features.t())
+        sim_block[torch.arange(end - start), torch.arange(start, end)] = -float('inf')
+        knn_indices[start:end] = torch.topk(sim_block, n_neighbors, dim=1, sorted=True)[1].cpu()
+    return knn_indices
+
+
+def getSparseAffinityGraph(knn_indices: torch.Tensor, p_value: int) -> sparse.csr_matrix:
+    """
+    Connect each segment to its top-p neighbors and symmetrize the binary graph,
+    in the same way as `getAffinityGraphMat` does for a dense affinity matrix.
+    """
+    num_segments = knn_indices.shape[0]
+    cols = knn_indices[:, :p_value].reshape(-1).numpy()
+    rows = np.repeat(np.arange(num_segments), p_value)
+    binary_graph = sparse.csr_matrix(
+        (np.ones(rows.shape[0], dtype=np.float64), (rows, cols)), shape=(num_segments, num_segments)
+    )
+    return 0.5 * (binary_graph + binary_graph.T)
+
+
+def isSparseGraphFullyConnected(affinity_mat: sparse.csr_matrix) -> bool:
+    """
+    Check whether the given sparse affinity graph is fully connected.
+    """
+    return connected_components(affinity_mat, directed=False, return_labels=False) == 1
+
+
+def eigDecomposeConnectedGraph(
+    affinity_mat: sparse.csr_matrix, num_eigs: int, random_state: int = 0, tol: float = 1e-6
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the smallest eigenvalues and the eigenvectors of the normalized Laplacian of a connected graph.
+
+    The smallest eigenvalues of the normalized Laplacian I - D^(-1/2) A D^(-1/2) are the largest eigenvalues of
+    D^(-1/2) A D^(-1/2), which the Lanczos method finds in a few sparse matrix-vector products.
+    Small graphs are decomposed with a dense solver.
+    """
+    num_segments = affinity_mat.shape[0]
+    degree = np.asarray(affinity_mat.sum(axis=1)).ravel()
+    inv_sqrt_degree = np.where(degree > 0, 1.0 / np.sqrt(np.maximum(degree, 1e-12)), 0.0)
+    norm_affinity = sparse.diags(inv_sqrt_degree) @ affinity_mat @ sparse.diags(inv_sqrt_degree)
+    if num_eigs >= num_segments - 1:
+        mus, diffusion_map = np.linalg.eigh(norm_affinity.toarray())
+        mus, diffusion_map = mus[num_segments - num_eigs :], diffusion_map[:, num_segments - num_eigs :]
+    else:
+        v0 = np.random.RandomState(random_state).rand(num_segments)
+        mus, diffusion_map = eigsh(norm_affinity, k=num_eigs, which='LA', v0=v0, tol=tol)
+    order = np.argsort(-mus, kind='stable')
+    return 1.0 - mus[order], diffusion_map[:, order]
+
+
+def sparseEigDecompose(
+    affinity_mat: sparse.csr_matrix, num_eigs: int, random_state: int = 0, tol: float = 1e-6
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Calculate the smallest eigenvalues and the eigenvectors of the normalized Laplacian of a sparse affinity graph.
+
+    The Lanczos method can miss copies of a repeated eigenvalue, such as the zero eigenvalue that every connected
+    component of the graph adds, so each component is decomposed separately. If there are at least `num_eigs`
+    components, the smallest eigenvalues are all zero and the eigenvectors are the indicators of the largest
+    components, weighted by the square root of the degrees.
+
+    Args:
+        affinity_mat (csr_matrix):
+            Symmetric sparse affinity graph without self-loops
+        num_eigs (int):
+            Number of eigenpairs to compute
+        random_state (int):
+            Seed of the starting vector of the Lanczos iterations
+        tol (float):
+            Relative accuracy of the eigenvalues
+
+    Returns:
+        lambdas (Tensor):
+            The smallest eigenvalues of the normalized Laplacian in ascending order
+        diffusion_map (Tensor):
+            The corresponding eigenvectors, one per column
+    """
+    num_segments = affinity_mat.shape[0]
+    num_eigs = min(num_eigs, num_segments)
+    num_components, component_labels = connected_components(affinity_mat, directed=False)
+    if num_components == 1:
+        lambdas, diffusion_map = eigDecomposeConnectedGraph(affinity_mat, num_eigs, random_state, tol)
+    elif num_components >= num_eigs:
+        component_sizes = np.bincount(component_labels)
+        largest_components = np.argsort(-component_sizes, kind='stable')[:num_eigs]
+        sqrt_degree = np.sqrt(np.asarray(affinity_mat.sum(axis=1)).ravel())
+        diffusion_map = np.zeros((num_segments, num_eigs))
+        for eig_idx, component in enumerate(largest_components):
+            in_component = component_labels == component
+            diffusion_map[in_component, eig_idx] = sqrt_degree[in_component]
+        diffusion_map /= np.linalg.norm(diffusion_map, axis=0, keepdims=True) + 1e-10
+        lambdas = np.zeros(num_eigs)
+    else:
+        lambdas_list, diffusion_map_list = [], []
+        for component in range(num_components):
+            index = np.flatnonzero(component_labels == component)
+            comp_lambdas, comp_diffusion_map = eigDecomposeConnectedGraph(
+                affinity_mat[index][:, index], min(num_eigs, index.shape[0]), random_state, tol
+            )
+            diffusion_map = np.zeros((num_segments, comp_lambdas.shape[0]))
+            diffusion_map[index] = comp_diffusion_map
+            lambdas_list.append(comp_lambdas)
+            diffusion_map_list.append(diffusion_map)
+        lambdas = np.concatenate(lambdas_list)
+        order = np.argsort(lambdas, kind='stable')[:num_eigs]
+        lambdas, diffusion_map = lambdas[order], np.concatenate(diffusion_map_list, axis=1)[:, order]
+    return torch.from_numpy(lambdas).float(), torch.from_numpy(diffusion_map).float()
+
+
+class SparseSpectralClustering(SpectralClustering):
+    """
+    Spectral clustering on a sparse affinity graph. The spectral embeddings are the row-normalized eigenvectors
+    of the normalized Laplacian, which are computed with `sparseEigDecompose`.
+    """
+
+    def forward(self, X: sparse.csr_matrix) -> torch.Tensor:
+        """
+        Call self.clusterSpectralEmbeddings() function to predict cluster labels.
+
+        Args:
+            X (csr_matrix):
+                Sparse affinity graph input
+
+        Returns:
+            labels (Tensor):
+                Clustering label output
+        """
+        if X.shape[0] != X.shape[1]:
+            raise ValueError("The affinity matrix is not a square matrix.")
+        return self.clusterSpectralEmbeddings(X, cuda=False, device=torch.device('cpu'))
+
+    def getSpectralEmbeddings(
+        self, affinity_mat: sparse.csr_matrix, n_spks: int = 8, cuda: bool = False
+    ) -> torch.Tensor:
+        """
+        Calculate the eigenvectors of the smallest eigenvalues to extract spectral embeddings.
+
+        Args:
+            affinity_mat (csr_matrix):
+                Sparse affinity graph input
+            n_spks (int):
+                Number of eigenvectors to use
+
+        Returns:
+            embedding (Tensor):
+                Spectral embeddings (N x n_spks)
+        """
+        _, diffusion_map = sparseEigDecompose(affinity_mat, num_eigs=n_spks, random_state=self.random_state)
+        return diffusion_map / (torch.norm(diffusion_map, dim=1, keepdim=True) + 1e-10)
+
+
+class SparseNMESC:
+    """
+    NME-SC analysis on k-nearest-neighbor graphs. For each candidate p-value, the graph connecting every segment to
+    its top-p neighbors is built from the precomputed neighbor lists, and the ratio between p and the maximum
+    eigengap of its normalized Laplacian is computed. The p-value with the smallest ratio is selected, and
+    the number of speakers is estimated from the eigengap of the selected graph.
+    Since the normalized Laplacian spectrum does not scale with p, the eigengap is not divided by the
+    largest eigenvalue as in `NMESC.getEigRatio`.
+
+    References:
+        Tae Jin Park et al., Auto-Tuning Spectral Clustering for Speaker Diarization
+        Using Normalized Maximum Eigengap, IEEE Signal Processing Letters 27 (2019),
+        https://arxiv.org/abs/2003.02405
+    """
+
+    def __init__(
+        self,
+        knn_indices: torch.Tensor,
+        max_num_speakers: int = 10,
+        max_rp_threshold: float = 0.15,
+        sparse_search: bool = True,
+        sparse_search_volume: int = 30,
+        fixed_thres: float = -1.0,
+        maj_vote_spk_count: bool = False,
+    ):
+        """
+        Args:
+            knn_indices (LongTensor):
+                Neighbor indices of each segment in descending order of similarity, from `getMultiScaleKNNGraph`.
+                The largest searched p-value is limited by the number of neighbors.
+            max_num_speakers (int):
+                Maximum number of speakers for estimating number of speakers.
+            max_rp_threshold (float):
+                Limits the range of parameter search to p <= N * max_rp_threshold.
+            sparse_search (bool):
+                If True, limit the number of p_values we search to sparse_search_volume.
+            sparse_search_volume (int):
+                Number of p_values we search during NME analysis.
+            fixed_thres (float):
+                A fixed threshold which can be used instead of estimating the threshold with NME analysis.
+            maj_vote_spk_count (bool):
+                If True, take a majority vote on all p-values in the given range to estimate the number of speakers.
+        """
+        self.knn_indices = knn_indices
+        self.max_num_speakers = max_num_speakers
+        self.max_rp_threshold = max_rp_threshold
+        self.sparse_search = sparse_search
+        self.sparse_search_volume = sparse_search_volume
+        self.fixed_thres = fixed_thres
+        self.maj_vote_spk_count = maj_vote_spk_count
+        self.min_p_value = 2
+        self.eps = 1e-10
+
+    def forward(self) -> Tuple[torch.Tensor, torch.Tensor, sparse.csr_matrix]:
+        """
+        Run NME analysis on the candidate p-values.
+
+        Returns:
+            est_num_of_spk (Tensor):
+                Estimated number of speakers from NMESC approach
+            p_hat_value (Tensor):
+                Estimated p-value (determines how many neighboring values to be selected)
+            affinity_mat (csr_matrix):
+                Sparse affinity graph of the estimated p-value
+        """
+        p_value_list = self.getPvalueList()
+        eig_ratio_list = torch.zeros(p_value_list.shape[0])
+        est_num_of_spk_list = torch.zeros(p_value_list.shape[0], dtype=torch.int)
+        for p_idx, p_value in enumerate(p_value_list.tolist()):
+            eig_ratio_list[p_idx], est_num_of_spk_list[p_idx] = self.getEigRatio(p_value)
+
+        index_nn = int(torch.argmin(eig_ratio_list))
+        affinity_mat = getSparseAffinityGraph(self.knn_indices, int(p_value_list[index_nn]))
+
+        # If the graph is not fully connected, take the smallest p-value that makes it fully connected.
+        if not isSparseGraphFullyConnected(affinity_mat):
+            index_nn = p_value_list.shape[0] - 1
+            for p_idx, p_value in enumerate(p_value_list.tolist()):
+                affinity_mat = getSparseAffinityGraph(self.knn_indices, p_value)
+                if isSparseGraphFullyConnected(affinity_mat):
+                    index_nn = p_idx
+                    break
+
+        if self.maj_vote_spk_count:
+            est_num_of_spk = torch.mode(est_num_of_spk_list)[0]
+        else:
+            est_num_of_spk = est_num_of_spk_list[index_nn]
+        return est_num_of_spk, p_value_list[index_nn], affinity_mat
+
+    def getEigRatio(self, p_neighbors: int) -> Tuple[float, int]:
+        """
+        For a given p_neighbors value, calculate g_p, which is a ratio between p_neighbors and the
+        maximum eigengap value, and the number of speakers estimated from the eigengap.
+        """
+        affinity_mat = getSparseAffinityGraph(self.knn_indices, p_neighbors)
+        lambdas, _ = sparseEigDecompose(affinity_mat, num_eigs=self.max_num_speakers + 1)
+        lambda_gap_list = getLamdaGaplist(lambdas)
+        max_key = int(torch.argmax(lambda_gap_list[: self.max_num_speakers]))
+        g_p = (p_neighbors / self.knn_indices.shape[0]) / (lambda_gap_list[max_key].item() + self.eps)
+        return g_p, max_key + 1
+
+    def getPvalueList(self) -> torch.Tensor:
+        """
+        Generates a p-value (p_neighbour) list for searching, in the same way as `NMESC.getPvalueList`.
+        The p-values are limited by the number of precomputed neighbors.
+        """
+        num_segments, max_neighbors = self.knn_indices.shape
+        thres = self.fixed_thres if self.fixed_thres is not None and self.fixed_thres > 0.0 else self.max_rp_threshold
+        max_N = min(max(int(num_segments * thres), self.min_p_value), max_neighbors)
+        if self.fixed_thres is not None and self.fixed_thres > 0.0:
+            p_value_list = torch.tensor([max_N])
+        elif self.sparse_search:
+            steps = min(max_N, max(self.sparse_search_volume, 2))
+            p_value_list = torch.unique(torch.linspace(start=1, end=max_N, steps=steps).int())
+        else:
+            p_value_list = torch.arange(1, max_N + 1)
+        return p_value_list
+
+
+class SparseSpeakerClustering(torch.nn.Module):
+    def __init__(
+        self,
+        max_neighbors: int = 64,
+        max_block_numel: int = 2**24,
+        min_samples_for_nmesc: int = 6,
+        sparse_search: bool = True,
+        maj_vote_spk_count: bool = False,
+        cuda: bool = False,
+    ):
+        """
+        Speaker clustering on sparse k-nearest-neighbor affinity graphs for very long recordings.
+        It takes the same inputs as `SpeakerClustering.forward_infer`, but the memory usage grows linearly with
+        the number of segments, so recordings with 100k+ segments can be clustered on CPU without chunking.
+        Unlike `SpeakerClustering`, this class uses scipy sparse solvers and cannot be exported with torch.jit.script.
+
+        Args:
+            max_neighbors (int):
+                The number of neighbors found for each segment, which is the largest p-value that can be selected.
+            max_block_numel (int):
+                The maximum number of similarity values computed at once when building the neighbor graph.
+            min_samples_for_nmesc (int):
+                The minimum number of samples required for NME clustering.
+            sparse_search (bool):
+                Toggle sparse search mode. If True, limit the size of p_value_list to sparse_search_volume.
+            maj_vote_spk_count (bool):
+                If True, take a majority vote on all p-values in the given range to estimate the number of speakers.
+            cuda (bool):
+                If True, the similarities for the neighbor graph are computed on GPU.
+                The eigendecomposition always runs on CPU.
+        """
+        super().__init__()
+        self.max_neighbors: int = max_neighbors
+        self.max_block_numel: int = max_block_numel
+        self.min_samples_for_nmesc: int = min_samples_for_nmesc
+        self.sparse_search: bool = sparse_search
+        self.maj_vote_spk_count: bool = maj_vote_spk_count
+        self.cuda: bool = cuda
+        self.embeddings_in_scales: List[torch.Tensor] = [torch.Tensor(0)]
+        self.timestamps_in_scales: List[torch.Tensor] = [torch.Tensor(0)]
+        self.device = torch.device("cuda") if self.cuda else torch.device("cpu")
+
+    def forward_infer(
+        self,
+        embeddings_in_scales: torch.Tensor,
+        timestamps_in_scales: torch.Tensor,
+        multiscale_segment_counts: torch.LongTensor,
+        multiscale_weights: torch.Tensor,
+        oracle_num_speakers: int = -1,
+        max_num_speakers: int = 8,
+        max_rp_threshold: float = 0.15,
+        enhanced_count_thres: int = 80,
+        sparse_search_volume: int = 30,
+        fixed_thres: float = -1.0,
+        kmeans_random_trials: int = 1,
+    ) -> torch.LongTensor:
+        """
+        Build the k-nearest-neighbor graph of the multiscale embeddings, run NME analysis on the sparse graphs to
+        estimate the p-value and the number of speakers, and perform spectral clustering on the selected graph.
+        See `SpeakerClustering.forward_infer` for the description of the arguments.
+
+        Returns:
+            (LongTensor): Speaker labels for the segments in the provided input embeddings.
+        """
+        self.embeddings_in_scales, self.timestamps_in_scales = split_input_data(
+            embeddings_in_scales, timestamps_in_scales, multiscale_segment_counts
+        )
+        # Last slot is the base scale embeddings
+        emb = self.embeddings_in_scales[-1]
+
+        # Cases for extreamly short sessions
+        if emb.shape[0] == 1:
+            return torch.zeros((1,), dtype=torch.int64)
+        elif emb.shape[0] <= max(enhanced_count_thres, self.min_samples_for_nmesc) and oracle_num_speakers < 0:
+            est_num_of_spk_enhanced = getEnhancedSpeakerCount(emb=emb, cuda=self.cuda)
+        else:
+            est_num_of_spk_enhanced = torch.tensor(-1)
+
+        if oracle_num_speakers > 0:
+            max_num_speakers = oracle_num_speakers
+
+        knn_indices = getMultiScaleKNNGraph(
+            multiscale_weights=multiscale_weights,
+            embeddings_in_scales=self.embeddings_in_scales,
+            timestamps_in_scales=self.timestamps_in_scales,
+            n_neighbors=self.max_neighbors,
+            max_block_numel=self.max_block_numel,
+            device=self.device,
+        )
+        nmesc = SparseNMESC(
+            knn_indices,
+            max_num_speakers=min(max_num_speakers, emb.shape[0] - 1),
+            max_rp_threshold=max_rp_threshold,
+            sparse_search=self.sparse_search,
+            sparse_search_volume=sparse_search_volume,
+            fixed_thres=fixed_thres if emb.shape[0] > self.min_samples_for_nmesc else max_rp_threshold,
+            maj_vote_spk_count=self.maj_vote_spk_count,
+        )
+        est_num_of_spk, _, affinity_mat = nmesc.forward()
+
+        if oracle_num_speakers > 0:
+            n_clusters = int(oracle_num_speakers)
+        elif est_num_of_spk_enhanced > 0:
+            n_clusters = int(est_num_of_spk_enhanced.item())
+        else:
+            n_clusters = int(est_num_of_spk)
+
+        spectral_model = SparseSpectralClustering(n_clusters=n_clusters, n_random_trials=kmeans_random_trials)
+        return spectral_model.forward(affinity_mat)
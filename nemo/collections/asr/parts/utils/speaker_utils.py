@@ -30,6 +30,7 @@ from tqdm import tqdm
 from nemo.collections.asr.data.audio_to_label import repeat_signal
 from nemo.collections.asr.parts.utils.longform_clustering import LongFormSpeakerClustering
 from nemo.collections.asr.parts.utils.offline_clustering import get_argmin_mat, split_input_data
+from nemo.collections.asr.parts.utils.sparse_clustering import SparseSpeakerClustering
 from nemo.utils import logging
 
 
@@ -245,6 +246,60 @@ def get_embs_and_timestamps(multiscale_embeddings_and_timestamps, multiscale_arg
     return embs_and_timestamps
 
 
+def save_embeddings_store(embeddings: Dict[str, torch.Tensor], file_prefix: str) -> str:
+    """
+    Save the speaker embeddings of every recording in a store that can be memory-mapped when loading.
+    The embeddings of all recordings are written one after another in a `.npy` matrix, and the rows of
+    every recording are saved in a `.json` index.
+
+    Args:
+        embeddings (dict):
+            Dictionary of embedding tensors of shape (number of segments, embedding dimension), indexed by unique ID.
+        file_prefix (str):
+            Path prefix of the store files `{file_prefix}.npy` and `{file_prefix}.json`.
+
+    Returns:
+        store_path (str):
+            Path to the `.npy` matrix of the store.
+    """
+    num_rows = sum(emb.shape[0] for emb in embeddings.values())
+    emb_dim = next(iter(embeddings.values())).shape[-1] if len(embeddings) > 0 else 0
+    store_path = file_prefix + '.npy'
+    index = {}
+    matrix = np.lib.format.open_memmap(store_path, mode='w+', dtype=np.float32, shape=(num_rows, emb_dim))
+    start = 0
+    for uniq_id, emb in embeddings.items():
+        end = start + emb.shape[0]
+        matrix[start:end] = emb.detach().cpu().float().numpy()
+        index[uniq_id] = [start, end]
+        start = end
+    matrix.flush()
+    del matrix
+
+    with open(file_prefix + '.json', 'w') as f:
+        json.dump(index, f)
+    return store_path
+
+
+def load_embeddings_store(file_prefix: str) -> Dict[str, torch.Tensor]:
+    """
+    Load the speaker embeddings saved by `save_embeddings_store`. The matrix of the store is memory-mapped
+    (copy-on-write), and the embeddings of every recording are views on it, so nothing is read before being used.
+
+    Args:
+        file_prefix (str):
+            Path prefix of the store files `{file_prefix}.npy` and `{file_prefix}.json`.
+
+    Returns:
+        embeddings (dict):
+            Dictionary of embedding tensors of shape (number of segments, embedding dimension), indexed by unique ID.
+    """
+    with open(file_prefix + '.json', 'r') as f:
+        index = json.load(f)
+    matrix = torch.from_numpy(np.load(file_prefix + '.npy', mmap_mode='c'))
+    return {uniq_id: matrix[start:end] for uniq_id, (start, end) in index.items()}
+
+
 def get_timestamps(multiscale_timestamps, multiscale_args_dict):
     """
     The timestamps in `multiscale_timestamps` dictionary are indexed by scale index.
@@ -473,9 +528,24 @@ def perform_clustering(
         logging.warning("cuda=False, using CPU for eigen decomposition. This might slow down the clustering process.")
         cuda = False
 
-    speaker_clustering = LongFormSpeakerClustering(cuda=cuda)
+    use_sparse_affinity = clustering_params.get('use_sparse_affinity', False)
+    if use_sparse_affinity:
+        speaker_clustering = SparseSpeakerClustering(
+            max_neighbors=clustering_params.get('max_neighbors', 64),
+            maj_vote_spk_count=clustering_params.get('maj_vote_spk_count', False),
+            cuda=cuda,
+        )
+        long_form_kwargs = {}
+    else:
+        speaker_clustering = LongFormSpeakerClustering(cuda=cuda)
+        long_form_kwargs = {
+            'chunk_cluster_count': clustering_params.get('chunk_cluster_count', None),
+            'embeddings_per_chunk': clustering_params.get('embeddings_per_chunk', None),
+        }
 
     if clustering_params.get('export_script_module', False):
+        if use_sparse_affinity:
+            raise ValueError("`export_script_module` is not supported with `use_sparse_affinity`.")
         speaker_clustering = torch.jit.script(speaker_clustering)
         torch.jit.save(speaker_clustering, 'speaker_clustering_script.pt')
 
@@ -500,8 +570,7 @@ def perform_clustering(
             max_num_speakers=int(clustering_params.max_num_speakers),
             max_rp_threshold=float(clustering_params.max_rp_threshold),
             sparse_search_volume=int(clustering_params.sparse_search_volume),
-            chunk_cluster_count=clustering_params.get('chunk_cluster_count', None),
-            embeddings_per_chunk=clustering_params.get('embeddings_per_chunk', None),
+            **long_form_kwargs,
         )
 
         del uniq_embs_and_timestamps
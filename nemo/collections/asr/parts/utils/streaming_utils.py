@@ -14,7 +14,7 @@
 
 import copy
 import os
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 import torch
@@ -30,6 +30,13 @@ from nemo.collections.asr.parts.utils import rnnt_utils
 from nemo.core.classes import IterableDataset
 from nemo.core.neural_types import LengthsType, MelSpectrogramType, NeuralType
 
+try:
+    import numba
+
+    HAVE_NUMBA = True
+except (ImportError, ModuleNotFoundError):
+    HAVE_NUMBA = False
+
 # Minimum number of tokens required to assign a LCS merge step, otherwise ignore and
 # select all i-1 and ith buffer tokens to merge.
 MIN_MERGE_SUBSEQUENCE_LEN = 1
@@ -69,6 +76,121 @@ def write_lcs_alignment_to_pickle(alignment, filepath, extras=None):
     torch.save(extras, filepath)
 
 
+def _lcs_suffix_table(X: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """
+    Computes the longest common suffix tables of a batch of token sequences.
+
+    Args:
+        X: Integer array of shape [B, m] with the previous buffers, padded with a value that never matches Y.
+        Y: Integer array of shape [B, n] with the current chunks, padded with a value that never matches X.
+
+    Returns:
+        Integer array of shape [B, m + 1, n + 1] such that `table[b, i, j]` is the length of the longest common
+        suffix of `X[b, :i]` and `Y[b, :j]`.
+    """
+    batch_size, m = X.shape
+    n = Y.shape[1]
+    table = np.zeros((batch_size, m + 1, n + 1), dtype=np.int32)
+    matches = X[:, :, None] == Y[:, None, :]
+    # every row only depends on the previous one, so the recurrence is vectorized over the batch and the columns
+    for i in range(1, m + 1):
+        table[:, i, 1:] = (table[:, i - 1, :-1] + 1) * matches[:, i - 1]
+    return table
+
+
+def _lcs_merge_indices(LCSuff: np.ndarray, min_merge_len: int):
+    """
+    Computes the slice indices of longest_common_subsequence_merge from the LCS alignment matrix.
+    See longest_common_subsequence_merge for the description of the heuristics. Compiled with numba when available.
+
+    Returns:
+        A tuple of (i, j, slice_len, is_complete_merge).
+    """
+    m = LCSuff.shape[0] - 1
+    n = LCSuff.shape[1] - 1
+
+    # Longest common substring, the last one in row-major order in case of ties
+    result = 0
+    i = 0
+    j = 0
+    if LCSuff.size > 0:
+        result = LCSuff.max()
+    if result > 0:
+        flat = LCSuff.ravel()
+        idx = flat.size - 1 - np.argmax(flat[::-1] == result)
+        i = idx // (n + 1)
+        j = idx % (n + 1)
+    slice_len = result
+
+    # Perfect alignment is found if the longest common subsequence extends to the final row of the old buffer
+    is_complete_merge = i == m
+    if is_complete_merge:
+        # Backtrack to find the origin point of the slice (j)
+        length = result
+        while length >= 0 and i > 0 and j > 0:
+            if LCSuff[i - 1, j - 1] > 0:
+                length -= 1
+                i, j = i - 1, j - 1
+            else:
+                i, j, length = i - 1, j - 1, length - 1
+                break
+        return i, j, slice_len, is_complete_merge
+
+    # (1) Backward search for leftmost LCS. Scanning a row from the left, only the first element that is longer
+    # than the current maximum can be selected, since the following ones are to the right of it.
+    max_j = 0
+    max_j_idx = n
+    i_partial = m
+    j_partial = -1
+    for i_idx in range(m, -1, -1):
+        candidates = np.nonzero(LCSuff[i_idx, : max_j_idx + 1] > max_j)[0]
+        if len(candidates) > 0:
+            max_j_idx = candidates[0]
+            max_j = LCSuff[i_idx, max_j_idx]
+            i_partial = i_idx
+            j_partial = max_j_idx
+
+    # EARLY EXIT (if max subsequence length <= MIN merge length)
+    if max_j <= min_merge_len:
+        return i_partial, 0, 0, is_complete_merge
+
+    # (2) Expand this alignment along the diagonal *downwards* towards the end of the old buffer
+    j_temp = j_partial + 1
+    j_exp = 0
+    j_skip = 0
+    for i_idx in range(i_partial + 1, m + 1):
+        j_any_skip = 0
+        for j_idx in range(j_temp, j_temp + j_skip + 1):
+            if j_idx < n + 1:
+                if LCSuff[i_idx, j_idx] == 0:
+                    j_any_skip = 1
+                else:
+                    j_exp = 1 + j_skip + j_any_skip
+        j_skip += j_any_skip
+        j_temp += 1
+
+    j_skip = 0
+    j_partial += j_exp
+
+    # (3) Backtrack the partial alignment, counting diagonal skips, to find the start and the length of the slice
+    slice_count = 0
+    while i_partial > 0 and j_partial > 0:
+        if LCSuff[i_partial, j_partial] == 0:
+            j_partial -= 1
+            j_skip += 1
+
+        if j_partial > 0:
+            slice_count += 1
+            i_partial -= 1
+            j_partial -= 1
+
+    return max(0, i_partial), max(0, j_partial), slice_count + j_skip, is_complete_merge
+
+
+if HAVE_NUMBA:
+    _lcs_merge_indices = numba.jit(nopython=True, nogil=True)(_lcs_merge_indices)
+
+
 def longest_common_subsequence_merge(X, Y, filepath=None):
     """
     Longest Common Subsequence merge algorithm for aligning two consecutive buffers.
@@ -91,6 +213,24 @@ def longest_common_subsequence_merge(X, Y, filepath=None):
 
     Total cost of the model is O(m_{i-1} * n_{i}) where (m, n) represents the number of subword ids of the buffer.
 
+    The heuristics are as follows:
+
+    If the longest common substring extends to the final row of the old buffer, the alignment is complete and
+    the slice is found by backtracking along its diagonal.
+
+    Otherwise, there are 3 steps for partial mismatch in alignment
+        1) Backward search for leftmost LCS. This is required for cases where multiple common subsequences exist.
+            We only need to select the leftmost one - since that corresponds to the last potential subsequence
+            that matched with the new buffer. If we just chose the LCS (and not the leftmost LCS), then we can
+            potentially slice off major sections of text which are repeated between two overlapping buffers.
+            If its length is at most MIN_MERGE_SUBSEQUENCE_LEN (e.g. long silence), no tokens are sliced.
+        2) Greedy expansion of leftmost LCS to the right, along the diagonal *downwards* towards the end of the
+            old buffer, allowing one diagonal misalignment per timestep. This is a common case where due to
+            LSTM state or reduced buffer size, the alignment breaks in the middle.
+        3) Backtrack final leftmost expanded LCS to find origin point of slice, counting the diagonal skips.
+
+    See longest_common_subsequence_merge_batch to merge several streams at once.
+
     Args:
         X: The subset of the previous chunk i-1, sliced such X = X[-(lcs_delay * max_steps_per_timestep):]
             Therefore there can be at most lcs_delay * max_steps_per_timestep symbols for X, preserving computation.
@@ -104,188 +244,57 @@ def longest_common_subsequence_merge(X, Y, filepath=None):
             - slice_len: number of tokens to slice off from the ith chunk.
         The LCS alignment matrix itself (shape m + 1, n + 1)
     """
-    # LCSuff is the table with zero
-    # value initially in each cell
-    m = len(X)
-    n = len(Y)
-    LCSuff = [[0 for _ in range(n + 1)] for _ in range(m + 1)]
-
-    # To store the length of
-    # longest common substring
-    result = 0
-    result_idx = [0, 0, 0]  # Contains (i, j, slice_len)
-
-    # Following steps to build
-    # LCSuff[m+1][n+1] in bottom up fashion
-    for i in range(m + 1):
-        for j in range(n + 1):
-            if i == 0 or j == 0:
-                LCSuff[i][j] = 0
-            elif X[i - 1] == Y[j - 1]:
-                LCSuff[i][j] = LCSuff[i - 1][j - 1] + 1
-
-                if result <= LCSuff[i][j]:
-                    result = LCSuff[i][j]  # max(result, LCSuff[i][j])
-                    result_idx = [i, j, result]
-
-            else:
-                LCSuff[i][j] = 0
-
-    # Check if perfect alignment was found or not
-    # Perfect alignment is found if :
-    # Longest common subsequence extends to the final row of of the old buffer
-    # This means that there exists a diagonal LCS backtracking to the beginning of the new buffer
-    i, j = result_idx[0:2]
-    is_complete_merge = i == m
+    result_idxs, alignments = longest_common_subsequence_merge_batch(
+        [X], [Y], filepaths=None if filepath is None else [filepath]
+    )
+    return result_idxs[0], alignments[0]
 
-    # Perfect alignment was found, slice eagerly
-    if is_complete_merge:
-        length = result_idx[-1]
-
-        # In case the LCS was incomplete - missing a few tokens at the beginning
-        # Perform backtrack to find the origin point of the slice (j) and how many tokens should be sliced
-        while length >= 0 and i > 0 and j > 0:
-            # Alignment exists at the required diagonal
-            if LCSuff[i - 1][j - 1] > 0:
-                length -= 1
-                i, j = i - 1, j - 1
 
-            else:
-                # End of longest alignment
-                i, j, length = i - 1, j - 1, length - 1
-                break
+def longest_common_subsequence_merge_batch(
+    Xs: List[List[int]], Ys: List[List[int]], filepaths: Optional[List[Optional[str]]] = None
+) -> Tuple[List[List[int]], List[np.ndarray]]:
+    """
+    Batched version of longest_common_subsequence_merge, which aligns several pairs of consecutive buffers at once.
+    The LCS alignment matrices of all streams are computed with vectorized operations and the merge heuristics
+    run on them with numba when available.
 
-    else:
-        # Expand hypothesis to catch partial mismatch
-
-        # There are 3 steps for partial mismatch in alignment
-        # 1) Backward search for leftmost LCS
-        # 2) Greedy expansion of leftmost LCS to the right
-        # 3) Backtrack final leftmost expanded LCS to find origin point of slice
-
-        # (1) Backward search for Leftmost LCS
-        # This is required for cases where multiple common subsequences exist
-        # We only need to select the leftmost one - since that corresponds
-        # to the last potential subsequence that matched with the new buffer.
-        # If we just chose the LCS (and not the leftmost LCS), then we can potentially
-        # slice off major sections of text which are repeated between two overlapping buffers.
-
-        # backward linear search for leftmost j with longest subsequence
-        max_j = 0
-        max_j_idx = n
-
-        i_partial = m  # Starting index of i for partial merge
-        j_partial = -1  # Index holder of j for partial merge
-        j_skip = 0  # Number of tokens that were skipped along the diagonal
-        slice_count = 0  # Number of tokens that should be sliced
-
-        # Select leftmost LCS
-        for i_idx in range(m, -1, -1):  # start from last timestep of old buffer
-            for j_idx in range(0, n + 1):  # start from first token from new buffer
-                # Select the longest LCSuff, while minimizing the index of j (token index for new buffer)
-                if LCSuff[i_idx][j_idx] > max_j and j_idx <= max_j_idx:
-                    max_j = LCSuff[i_idx][j_idx]
-                    max_j_idx = j_idx
-
-                    # Update the starting indices of the partial merge
-                    i_partial = i_idx
-                    j_partial = j_idx
-
-        # EARLY EXIT (if max subsequence length <= MIN merge length)
-        # Important case where there is long silence
-        # The end of one buffer will have many blank tokens, the beginning of new buffer may have many blank tokens
-        # As such, LCS will potentially be from the region of actual tokens.
-        # This can be detected as the max length of the suffix in LCS
-        # If this max length of the leftmost suffix is less than some margin, avoid slicing all together.
-        if max_j <= MIN_MERGE_SUBSEQUENCE_LEN:
-            # If the number of partiial tokens to be deleted are less than the minimum,
-            # dont delete any tokens at all.
-
-            i = i_partial
-            j = 0
-            result_idx[-1] = 0
+    Args:
+        Xs: The subsets of the previous chunks of each stream, see longest_common_subsequence_merge.
+        Ys: The current chunks of each stream.
+        filepaths: Optional filepaths to save the LCS alignment matrix of each stream for later introspection.
 
-        else:
-            # Some valid long partial alignment was found
-            # (2) Expand this alignment along the diagonal *downwards* towards the end of the old buffer
-            # such that i_partial = m + 1.
-            # This is a common case where due to LSTM state or reduced buffer size, the alignment breaks
-            # in the middle but there are common subsequences between old and new buffers towards the end
-            # We can expand the current leftmost LCS in a diagonal manner downwards to include such potential
-            # merge regions.
-
-            # Expand current partial subsequence with co-located tokens
-            i_temp = i_partial + 1  # diagonal next i
-            j_temp = j_partial + 1  # diagonal next j
-
-            j_exp = 0  # number of tokens to expand along the diagonal
-            j_skip = 0  # how many diagonals didnt have the token. Incremented by 1 for every row i
-
-            for i_idx in range(i_temp, m + 1):  # walk from i_partial + 1 => m + 1
-                j_any_skip = 0  # If the diagonal element at this location is not found, set to 1
-                # j_any_skip expands the search space one place to the right
-                # This allows 1 diagonal misalignment per timestep i (and expands the search for the next timestep)
-
-                # walk along the diagonal corresponding to i_idx, plus allowing diagonal skips to occur
-                # diagonal elements may not be aligned due to ASR model predicting
-                # incorrect token in between correct tokens
-                for j_idx in range(j_temp, j_temp + j_skip + 1):
-                    if j_idx < n + 1:
-                        if LCSuff[i_idx][j_idx] == 0:
-                            j_any_skip = 1
-                        else:
-                            j_exp = 1 + j_skip + j_any_skip
-
-                # If the diagonal element existed, dont expand the search space,
-                # otherwise expand the search space 1 token to the right
-                j_skip += j_any_skip
-
-                # Move one step to the right for the next diagonal j corresponding to i
-                j_temp += 1
-
-            # reset j_skip, augment j_partial with expansions
-            j_skip = 0
-            j_partial += j_exp
-
-            # (3) Given new leftmost j_partial with expansions, backtrack the partial alignments
-            # counting how many diagonal skips occured to compute slice length
-            # as well as starting point of slice.
-
-            # Partial backward trace to find start of slice
-            while i_partial > 0 and j_partial > 0:
-                if LCSuff[i_partial][j_partial] == 0:
-                    # diagonal skip occured, move j to left 1 extra time
-                    j_partial -= 1
-                    j_skip += 1
-
-                if j_partial > 0:
-                    # If there are more steps to be taken to the left, slice off the current j
-                    # Then loop for next (i, j) diagonal to the upper left
-                    slice_count += 1
-                    i_partial -= 1
-                    j_partial -= 1
-
-            # Recompute total slice length as slice count along diagonal
-            # plus the number of diagonal skips
-            i = max(0, i_partial)
-            j = max(0, j_partial)
-            result_idx[-1] = slice_count + j_skip
-
-    # Set the value of i and j
-    result_idx[0] = i
-    result_idx[1] = j
-
-    if filepath is not None:
-        extras = {
-            "is_complete_merge": is_complete_merge,
-            "X": X,
-            "Y": Y,
-            "slice_idx": result_idx,
-        }
-        write_lcs_alignment_to_pickle(LCSuff, filepath=filepath, extras=extras)
-        print("Wrote alignemnt to :", filepath)
+    Returns:
+        A tuple of the lists of `[i, j, slice_len]` and of the LCS alignment matrices of each stream.
+    """
+    if len(Xs) == 0:
+        return [], []
+    X = np.full((len(Xs), max(len(x) for x in Xs)), -1, dtype=np.int64)
+    Y = np.full((len(Ys), max(len(y) for y in Ys)), -2, dtype=np.int64)
+    for b, (x, y) in enumerate(zip(Xs, Ys)):
+        X[b, : len(x)] = x
+        Y[b, : len(y)] = y
+    tables = _lcs_suffix_table(X, Y)
+
+    result_idxs, alignments = [], []
+    for b, (x, y) in enumerate(zip(Xs, Ys)):
+        LCSuff = np.ascontiguousarray(tables[b, : len(x) + 1, : len(y) + 1])
+        i, j, slice_len, is_complete_merge = _lcs_merge_indices(LCSuff, MIN_MERGE_SUBSEQUENCE_LEN)
+        result_idx = [int(i), int(j), int(slice_len)]
+        result_idxs.append(result_idx)
+        alignments.append(LCSuff)
+
+        filepath = filepaths[b] if filepaths is not None else None
+        if filepath is not None:
+            extras = {
+                "is_complete_merge": bool(is_complete_merge),
+                "X": x,
+                "Y": y,
+                "slice_idx": result_idx,
+            }
+            write_lcs_alignment_to_pickle(LCSuff, filepath=filepath, extras=extras)
+            print("Wrote alignemnt to :", filepath)
 
-    return result_idx, LCSuff
+    return result_idxs, alignments
 
 
 def lcs_alignment_merge_buffer(buffer, data, delay, model, max_steps_per_timestep: int = 5, filepath: str = None):
@@ -296,31 +305,45 @@ def lcs_alignment_merge_buffer(buffer, data, delay, model, max_steps_per_timeste
     the notion that the chunk size is >= the context window. In case this assumptio is violated, the results of the
     merge will be incorrect (or at least obtain worse WER overall).
     """
-    # If delay timesteps is 0, that means no future context was used. Simply concatenate the buffer with new data.
-    if delay < 1:
-        buffer += data
-        return buffer
-
-    # If buffer is empty, simply concatenate the buffer and data.
-    if len(buffer) == 0:
-        buffer += data
-        return buffer
+    return lcs_alignment_merge_buffer_batch(
+        [buffer], [data], delay, max_steps_per_timestep=max_steps_per_timestep, filepaths=[filepath]
+    )[0]
+
+
+def lcs_alignment_merge_buffer_batch(
+    buffers: List[List[int]],
+    datas: List[List[int]],
+    delay: int,
+    max_steps_per_timestep: int = 5,
+    filepaths: Optional[List[Optional[str]]] = None,
+) -> List[List[int]]:
+    """
+    Batched version of lcs_alignment_merge_buffer, which merges the new text of several streams
+    with the previous text contained in their buffers. The buffers are extended in place and returned.
+    """
+    merge_idxs = []
+    for b, (buffer, data) in enumerate(zip(buffers, datas)):
+        # If delay timesteps is 0, that means no future context was used. Simply concatenate the buffer with new data.
+        # If buffer is empty, simply concatenate the buffer and data.
+        if delay < 1 or len(buffer) == 0:
+            buffer += data
+        else:
+            merge_idxs.append(b)
 
     # Prepare a subset of the buffer that will be LCS Merged with new data
     search_size = int(delay * max_steps_per_timestep)
-    buffer_slice = buffer[-search_size:]
+    lcs_idxs, _ = longest_common_subsequence_merge_batch(
+        [buffers[b][-search_size:] for b in merge_idxs],
+        [datas[b] for b in merge_idxs],
+        filepaths=None if filepaths is None else [filepaths[b] for b in merge_idxs],
+    )
 
-    # Perform LCS Merge
-    lcs_idx, lcs_alignment = longest_common_subsequence_merge(buffer_slice, data, filepath=filepath)
-
-    # Slice off new data
-    # i, j, slice_len = lcs_idx
-    slice_idx = lcs_idx[1] + lcs_idx[-1]  # slice = j + slice_len
-    data = data[slice_idx:]
-
-    # Concat data to buffer
-    buffer += data
-    return buffer
+    for b, lcs_idx in zip(merge_idxs, lcs_idxs):
+        # Slice off new data
+        # i, j, slice_len = lcs_idx
+        slice_idx = lcs_idx[1] + lcs_idx[-1]  # slice = j + slice_len
+        buffers[b] += datas[b][slice_idx:]
+    return buffers
 
 
 def inplace_buffer_merge(buffer, data, timesteps, model):
@@ -1412,13 +1435,18 @@ class LongestCommonSubsequenceBatchedFrameASRRNNT(BatchedFrameASRRNNT):
         self.infer_logits()
 
         self.unmerged = [[] for _ in range(self.batch_size)]
-        for idx, alignments in enumerate(self.all_alignments):
-
-            signal_end_idx = self.frame_bufferer.signal_end_index[idx]
-            if signal_end_idx is None:
+        for idx in range(len(self.all_alignments)):
+            if self.frame_bufferer.signal_end_index[idx] is None:
                 raise ValueError("Signal did not end")
 
-            for a_idx, alignment in enumerate(alignments):
+        # Streams are independent, so the chunks are merged one step at a time for all streams at once
+        num_chunks = max((len(alignments) for alignments in self.all_alignments), default=0)
+        for a_idx in range(num_chunks):
+            merge_idxs, merge_ids, filepaths = [], [], []
+            for idx, alignments in enumerate(self.all_alignments):
+                if a_idx >= len(alignments):
+                    continue
+                alignment = alignments[a_idx]
 
                 # Middle token first chunk
                 if a_idx == 0:
@@ -1436,7 +1464,7 @@ class LongestCommonSubsequenceBatchedFrameASRRNNT(BatchedFrameASRRNNT):
 
                 else:
                     ids, toks = self._alignment_decoder(alignment, self.asr_model.tokenizer, self.blank_id)
-                    if len(ids) > 0 and a_idx < signal_end_idx:
+                    if len(ids) > 0 and a_idx < self.frame_bufferer.signal_end_index[idx]:
 
                         if self.alignment_basepath is not None:
                             basepath = self.alignment_basepath
@@ -1451,14 +1479,19 @@ class LongestCommonSubsequenceBatchedFrameASRRNNT(BatchedFrameASRRNNT):
                         else:
                             filepath = None
 
-                        self.unmerged[idx] = lcs_alignment_merge_buffer(
-                            self.unmerged[idx],
-                            ids,
-                            self.lcs_delay,
-                            model=self.asr_model,
-                            max_steps_per_timestep=self.max_steps_per_timestep,
-                            filepath=filepath,
-                        )
+                        merge_idxs.append(idx)
+                        merge_ids.append(ids)
+                        filepaths.append(filepath)
+
+            merged = lcs_alignment_merge_buffer_batch(
+                [self.unmerged[idx] for idx in merge_idxs],
+                merge_ids,
+                self.lcs_delay,
+                max_steps_per_timestep=self.max_steps_per_timestep,
+                filepaths=filepaths,
+            )
+            for idx, buffer in zip(merge_idxs, merged):
+                self.unmerged[idx] = buffer
 
         output = []
         for idx in range(self.batch_size):
@@ -293,12 +293,13 @@ def generate_overlap_vad_seq(
     shift_length_in_sec: float,
     num_workers: int,
     out_dir: str = None,
+    batch_size: int = 64,
 ) -> str:
     """
     Generate predictions with overlapping input windows/segments.
     Then a smoothing filter is applied to decide the label for a frame spanned by multiple windows.
     Two common smoothing filters are supported: majority vote (median) and average (mean).
-    This function uses multiprocessing to speed up.
+    Files are smoothed in batches with generate_overlap_vad_seq_batch and batches are processed with multiprocessing.
     Args:
         frame_pred_dir (str): Directory of frame prediction file to be processed.
         smoothing_method (str): median or mean smoothing filter.
@@ -307,6 +308,7 @@ def generate_overlap_vad_seq(
         shift_length_in_sec (float): amount of shift of window for generating the frame.
         out_dir (str): directory of generated predictions.
         num_workers(float): number of process for multiprocessing
+        batch_size (int): number of files smoothed together.
     Returns:
         overlap_out_dir(str): directory of the generated predictions.
     """
@@ -329,21 +331,22 @@ def generate_overlap_vad_seq(
         "out_dir": overlap_out_dir,
         "smoothing_method": smoothing_method,
     }
+    chunks = [frame_filepathlist[i : i + batch_size] for i in range(0, len(frame_filepathlist), batch_size)]
     if num_workers is not None and num_workers > 1:
         with multiprocessing.Pool(processes=num_workers) as p:
-            inputs = zip(frame_filepathlist, repeat(per_args))
+            inputs = zip(chunks, repeat(per_args))
             results = list(
                 tqdm(
-                    p.imap(generate_overlap_vad_seq_per_file_star, inputs),
-                    total=len(frame_filepathlist),
+                    p.imap(generate_overlap_vad_seq_per_chunk_star, inputs),
+                    total=len(chunks),
                     desc='generating preds',
                     leave=True,
                 )
             )
 
     else:
-        for frame_filepath in tqdm(frame_filepathlist, desc='generating preds', leave=False):
-            generate_overlap_vad_seq_per_file(frame_filepath, per_args)
+        for chunk in tqdm(chunks, desc='generating preds', leave=False):
+            generate_overlap_vad_seq_per_chunk(chunk, per_args)
 
     return overlap_out_dir
 
@@ -427,6 +430,137 @@ def generate_overlap_vad_seq_per_tensor(
     return preds
 
 
+def _get_overlap_vad_seq_steps(per_args: Dict[str, float]) -> Tuple[int, int, int]:
+    """
+    Return the shift and the window length in units of the output sequence,
+    and the jump over the input frame sequence between two windows.
+    """
+    frame_len = per_args.get('frame_len', 0.01)
+    shift = int(per_args['shift_length_in_sec'] / frame_len)  # number of units of shift
+    seg = int((per_args['window_length_in_sec'] / frame_len + 1))  # number of units of each window/segment
+    jump_on_target = int(seg * (1 - per_args['overlap']))  # jump on target generated sequence
+    jump_on_frame = int(jump_on_target / shift)  # jump on input frame sequence
+    if jump_on_frame < 1:
+        raise ValueError(
+            f"Note we jump over frame sequence to generate overlapping input segments. "
+            f"Your input makes jump_on_frame={jump_on_frame} < 1 which is invalid because it cannot jump and will "
+            f"stuck. Please try different window_length_in_sec, shift_length_in_sec and overlap choices."
+        )
+    return shift, seg, jump_on_frame
+
+
+def generate_overlap_vad_seq_batch(
+    frames: List[torch.Tensor], per_args: Dict[str, float], smoothing_method: str
+) -> List[torch.Tensor]:
+    """
+    Batched version of generate_overlap_vad_seq_per_tensor, which smooths frame sequences of different lengths
+    at once and returns the same predictions.
+
+    Every output unit gathers the predictions of the (at most `ceil(seg / (jump_on_frame * shift))`) windows
+    covering it into a [batch, target_len, num_windows] tensor, which is reduced in the same order as the
+    per-tensor loop so that the mean is bit-identical.
+
+    Args:
+        frames (List[torch.Tensor]): frame level predictions of each file.
+        per_args (Dict[str, float]): overlap, window_length_in_sec, shift_length_in_sec and optional frame_len.
+        smoothing_method (str): median or mean smoothing filter.
+    Returns:
+        preds (List[torch.Tensor]): smoothed predictions of each file.
+    """
+    if smoothing_method not in ('mean', 'median'):
+        raise ValueError("smoothing_method should be either mean or median")
+    shift, seg, jump_on_frame = _get_overlap_vad_seq_steps(per_args)
+    if len(frames) == 0:
+        return []
+
+    padded = torch.nn.utils.rnn.pad_sequence(frames, batch_first=True)
+    max_len = padded.shape[1]
+    target = torch.arange(max_len * shift, device=padded.device)
+    # first and last selected frames (multiples of jump_on_frame) whose window [i * shift, i * shift + seg)
+    # covers each unit of the target sequence
+    last = torch.div(target, shift, rounding_mode='floor')
+    last = torch.div(last, jump_on_frame, rounding_mode='floor') * jump_on_frame
+    first = torch.div(target - seg, shift, rounding_mode='floor') + 1
+    first = (-torch.div(-first, jump_on_frame, rounding_mode='floor') * jump_on_frame).clamp(min=0)
+    num_windows = max(int(torch.div(last - first, jump_on_frame, rounding_mode='floor').max()) + 1, 1)
+    frame_idx = first.unsqueeze(1) + jump_on_frame * torch.arange(num_windows, device=padded.device)
+    valid = frame_idx <= last.unsqueeze(1)
+    windows = padded[:, frame_idx.clamp(max=max_len - 1)]  # [B, target_len, num_windows]
+
+    if smoothing_method == 'mean':
+        preds = torch.zeros(windows.shape[:2], dtype=padded.dtype, device=padded.device)
+        for k in range(num_windows):
+            preds = preds + torch.where(valid[:, k], windows[:, :, k], 0.0)
+        preds = preds / valid.sum(dim=1).to(padded.dtype)
+    else:
+        preds = torch.nanquantile(windows.masked_fill(~valid, float('nan')), q=0.5, dim=-1)
+
+    results = []
+    for pred, frame in zip(preds, frames):
+        pred = pred[: len(frame) * shift].clone()
+        missing = torch.isnan(pred)
+        pred[missing] = pred[~missing][-1]
+        results.append(pred)
+    return results
+
+
+def _round_vad_preds(preds: torch.Tensor, decimals: int = 4) -> torch.Tensor:
+    """
+    Round predictions to the values obtained by writing them with `f"{pred:.4f}"` and reading them back.
+    The product of a float32 value and 10**4 is exact in float64, so rounding it half-to-even matches the formatting.
+    """
+    scale = 10.0**decimals
+    return (torch.round(preds.double() * scale) / scale).float()
+
+
+def load_vad_preds_from_files(filepaths: List[str]) -> Tuple[List[str], List[torch.Tensor]]:
+    """
+    Load the names and the predictions of several prediction files (e.g., `.frame`, `.mean` or `.median`).
+    Same as load_tensor_from_file applied to every file.
+    """
+    names, preds = [], []
+    for filepath in filepaths:
+        with open(filepath, "r", encoding='utf-8') as f:
+            values = np.array(f.read().split(), dtype=np.float64)
+        names.append(Path(filepath).stem)
+        preds.append(torch.from_numpy(values).float())
+    return names, preds
+
+
+def _write_vad_preds(preds: torch.Tensor, filepath: str):
+    with open(filepath, "w", encoding='utf-8') as f:
+        f.write("".join(f"{pred:.4f}\n" for pred in preds.tolist()))
+
+
+def generate_overlap_vad_seq_per_chunk(frame_filepaths: List[str], per_args: dict) -> List[str]:
+    """
+    Smooth the predictions of several files at once with generate_overlap_vad_seq_batch,
+    writing the same files as generate_overlap_vad_seq_per_file.
+    """
+    out_dir = per_args['out_dir']
+    smoothing_method = per_args['smoothing_method']
+    names, frames = load_vad_preds_from_files(frame_filepaths)
+
+    per_args_float: Dict[str, float] = {}
+    for i in per_args:
+        if type(per_args[i]) == float or type(per_args[i]) == int:
+            per_args_float[i] = per_args[i]
+
+    overlap_filepaths = []
+    for name, preds in zip(names, generate_overlap_vad_seq_batch(frames, per_args_float, smoothing_method)):
+        overlap_filepath = os.path.join(out_dir, name + "." + smoothing_method)
+        _write_vad_preds(preds, overlap_filepath)
+        overlap_filepaths.append(overlap_filepath)
+    return overlap_filepaths
+
+
+def generate_overlap_vad_seq_per_chunk_star(args):
+    """
+    A workaround for tqdm with starmap of multiprocessing
+    """
+    return generate_overlap_vad_seq_per_chunk(*args)
+
+
 def generate_overlap_vad_seq_per_file(frame_filepath: str, per_args: dict) -> str:
     """
     A wrapper for generate_overlap_vad_seq_per_tensor.
@@ -583,6 +717,71 @@ def binarization(sequence: torch.Tensor, per_args: Dict[str, float]) -> torch.Te
     return speech_segments
 
 
+def binarization_batch(
+    sequences: List[torch.Tensor], onsets: List[float], offsets: List[float], per_args: Dict[str, float]
+) -> List[torch.Tensor]:
+    """
+    Batched version of binarization with per-sequence onset and offset thresholds, which returns the same segments.
+
+    With onset >= offset, a frame above onset always ends up in speech and a frame below offset always ends up in
+    non-speech, so the state of every frame is the one set by the last of these frames before it. The states are
+    computed with a cumulative max over the batch and segments are read from the state changes. Sequences with
+    onset < offset fall back to binarization.
+
+    Args:
+        sequences (List[torch.Tensor]): frame level predictions of each file.
+        onsets (List[float]): onset threshold of each file.
+        offsets (List[float]): offset threshold of each file.
+        per_args: pad_onset, pad_offset and frame_length_in_sec, see binarization.
+
+    Returns:
+        speech_segments (List[torch.Tensor]): speech segments of each file, see binarization.
+    """
+    frame_length_in_sec = per_args.get('frame_length_in_sec', 0.01)
+    pad_onset = per_args.get('pad_onset', 0.0)
+    pad_offset = per_args.get('pad_offset', 0.0)
+    if len(sequences) == 0:
+        return []
+
+    padded = torch.nn.utils.rnn.pad_sequence(sequences, batch_first=True)
+    batch_size, max_len = padded.shape
+    lengths = torch.tensor([len(sequence) for sequence in sequences], device=padded.device)
+    # thresholds are compared in the dtype of the predictions, like the python floats in binarization
+    onset = torch.tensor(onsets, dtype=padded.dtype, device=padded.device).unsqueeze(1)
+    offset = torch.tensor(offsets, dtype=padded.dtype, device=padded.device).unsqueeze(1)
+
+    above = padded > onset
+    switch = above | (padded < offset)
+    positions = torch.arange(max_len, device=padded.device).expand(batch_size, max_len)
+    last_switch = torch.where(switch, positions, -1).cummax(dim=1).values
+    speech = above.gather(1, last_switch.clamp(min=0)) & (last_switch >= 0) & (positions < lengths.unsqueeze(1))
+
+    # every row starts and ends with non-speech, so state changes alternate between starts and ends
+    speech = torch.nn.functional.pad(speech, [1, 1])
+    rows, changes = torch.nonzero(speech[:, 1:] != speech[:, :-1], as_tuple=True)
+    rows, starts, ends = rows[1::2], changes[0::2], changes[1::2]
+    is_last = ends == lengths[rows]
+
+    begin = (starts.double() * frame_length_in_sec - pad_onset).clamp(min=0)
+    end = torch.where(is_last, ends - 1, ends).double() * frame_length_in_sec + pad_offset
+    keep = is_last | (end > begin)
+    segments = torch.stack((begin, end), dim=1)[keep].to(torch.get_default_dtype())
+    counts = torch.bincount(rows[keep], minlength=batch_size).tolist()
+
+    speech_segments = []
+    for i, row_segments in enumerate(torch.split(segments, counts)):
+        if onsets[i] < offsets[i]:
+            row_args = dict(per_args)
+            row_args['onset'], row_args['offset'] = onsets[i], offsets[i]
+            speech_segments.append(binarization(sequences[i], row_args))
+        elif len(row_segments) == 0:
+            speech_segments.append(torch.empty(0))
+        else:
+            # Merge the overlapped speech segments due to padding
+            speech_segments.append(merge_overlap_segment(row_segments))
+    return speech_segments
+
+
 @torch.jit.script
 def remove_segments(original_segments: torch.Tensor, to_be_removed_segments: torch.Tensor) -> torch.Tensor:
     """
@@ -706,14 +905,13 @@ def prepare_gen_segment_table(sequence: torch.Tensor, per_args: dict) -> Tuple[s
 
 
 @torch.jit.script
-def generate_vad_segment_table_per_tensor(sequence: torch.Tensor, per_args: Dict[str, float]) -> torch.Tensor:
+def speech_segments_to_table(speech_segments: torch.Tensor, per_args: Dict[str, float]) -> torch.Tensor:
     """
-    See description in generate_overlap_vad_seq.
-    Use this for single instance pipeline.
+    Filter the speech segments produced by binarization and convert them to a sorted table of
+    `[start, end, duration]` rows.
     """
     UNIT_FRAME_LEN = 0.01
 
-    speech_segments = binarization(sequence, per_args)
     speech_segments = filtering(speech_segments, per_args)
 
     if speech_segments.shape == torch.Size([0]):
@@ -727,6 +925,16 @@ def generate_vad_segment_table_per_tensor(sequence: torch.Tensor, per_args: Dict
     return speech_segments
 
 
+@torch.jit.script
+def generate_vad_segment_table_per_tensor(sequence: torch.Tensor, per_args: Dict[str, float]) -> torch.Tensor:
+    """
+    See description in generate_overlap_vad_seq.
+    Use this for single instance pipeline.
+    """
+    speech_segments = binarization(sequence, per_args)
+    return speech_segments_to_table(speech_segments, per_args)
+
+
 def generate_vad_segment_table_per_file(pred_filepath: str, per_args: dict) -> str:
     """
     A wrapper for generate_vad_segment_table_per_tensor
@@ -735,20 +943,27 @@ def generate_vad_segment_table_per_file(pred_filepath: str, per_args: dict) -> s
     out_dir, per_args_float = prepare_gen_segment_table(sequence, per_args)
 
     preds = generate_vad_segment_table_per_tensor(sequence, per_args_float)
-    ext = ".rttm" if per_args.get("use_rttm", False) else ".txt"
+    return write_vad_segment_table(preds, name, out_dir, use_rttm=per_args.get("use_rttm", False))
+
+
+def write_vad_segment_table(preds: torch.Tensor, name: str, out_dir: str, use_rttm: bool = False) -> str:
+    """
+    Write a table of speech segments of a file as produced by generate_vad_segment_table_per_tensor.
+    """
+    ext = ".rttm" if use_rttm else ".txt"
     save_name = name + ext
     save_path = os.path.join(out_dir, save_name)
 
     if preds.shape[0] == 0:
         with open(save_path, "w", encoding='utf-8') as fp:
-            if per_args.get("use_rttm", False):
+            if use_rttm:
                 fp.write(f"SPEAKER <NA> 1 0 0 <NA> <NA> speech <NA> <NA>\n")
             else:
                 fp.write(f"0 0 speech\n")
     else:
         with open(save_path, "w", encoding='utf-8') as fp:
             for i in preds:
-                if per_args.get("use_rttm", False):
+                if use_rttm:
                     fp.write(f"SPEAKER {name} 1 {i[0]:.4f} {i[2]:.4f} <NA> <NA> speech <NA> <NA>\n")
                 else:
                     fp.write(f"{i[0]:.4f} {i[2]:.4f} speech\n")
@@ -756,6 +971,168 @@ def generate_vad_segment_table_per_file(pred_filepath: str, per_args: dict) -> s
     return save_path
 
 
+def _cal_vad_onset_offset_per_sequence(
+    scale: str, onset: float, offset: float, sequence: torch.Tensor
+) -> Tuple[float, float]:
+    """
+    Same as cal_vad_onset_offset, with tensor reductions instead of python sorting and min/max.
+    """
+    if scale == "relative":
+        mini = sequence.min()
+        maxi = sequence.max()
+    elif scale == "percentile":
+        sorted_sequence = torch.sort(sequence).values
+        size = len(sequence)
+        mini = float(sorted_sequence[int(math.ceil(size / 100)) - 1])
+        maxi = float(sorted_sequence[int(math.ceil((size * 99) / 100)) - 1])
+    else:
+        return cal_vad_onset_offset(scale, onset, offset)
+
+    onset = mini + onset * (maxi - mini)
+    offset = mini + offset * (maxi - mini)
+    return float(onset), float(offset)
+
+
+def generate_vad_segment_table_batch(sequences: List[torch.Tensor], per_args: dict) -> List[torch.Tensor]:
+    """
+    Batched version of generate_vad_segment_table_per_tensor, which converts the frame level predictions of
+    several files to tables of speech segments at once.
+
+    Args:
+        sequences (List[torch.Tensor]): frame level predictions of each file.
+        per_args (dict): postprocessing parameters and frame_length_in_sec, see binarization and filtering.
+            Onset and offset are scaled for every sequence according to `scale`, see cal_vad_onset_offset.
+    Returns:
+        tables (List[torch.Tensor]): `[start, end, duration]` rows of the speech segments of each file.
+    """
+    per_args = dict(per_args)
+    if 'filter_speech_first' in per_args:
+        per_args['filter_speech_first'] = 1.0 if per_args['filter_speech_first'] else 0.0
+
+    per_args_float: Dict[str, float] = {}
+    for i in per_args:
+        if type(per_args[i]) == float or type(per_args[i]) == int:
+            per_args_float[i] = per_args[i]
+
+    scale = per_args.get('scale', 'absolute')
+    thresholds = [
+        _cal_vad_onset_offset_per_sequence(scale, per_args['onset'], per_args['offset'], sequence)
+        for sequence in sequences
+    ]
+    onsets = [onset for onset, _ in thresholds]
+    offsets = [offset for _, offset in thresholds]
+
+    speech_segments = binarization_batch(sequences, onsets, offsets, per_args_float)
+    return [speech_segments_to_table(segments, per_args_float) for segments in speech_segments]
+
+
+def generate_vad_segment_table_per_chunk(pred_filepaths: List[str], per_args: dict) -> List[str]:
+    """
+    Generate the speech segment tables of several files at once with generate_vad_segment_table_batch,
+    writing the same files as generate_vad_segment_table_per_file.
+    """
+    names, sequences = load_vad_preds_from_files(pred_filepaths)
+    tables = generate_vad_segment_table_batch(sequences, per_args)
+    return [
+        write_vad_segment_table(table, name, per_args['out_dir'], use_rttm=per_args.get("use_rttm", False))
+        for name, table in zip(names, tables)
+    ]
+
+
+def generate_vad_segments(
+    frame_preds: Dict[str, torch.Tensor],
+    postprocessing_params: dict,
+    frame_length_in_sec: float,
+    smoothing_method: Optional[str] = None,
+    overlap: float = 0.5,
+    window_length_in_sec: float = 0.15,
+    shift_length_in_sec: float = 0.01,
+    batch_size: int = 64,
+    round_decimals: Optional[int] = 4,
+    out_path: Optional[str] = None,
+) -> Dict[str, torch.Tensor]:
+    """
+    In-memory equivalent of generate_overlap_vad_seq followed by generate_vad_segment_table, which does not write
+    intermediate prediction files. Files are processed in batches of similar lengths.
+
+    Args:
+        frame_preds (Dict[str, torch.Tensor]): frame level speech probabilities of each file,
+            e.g. from generate_vad_frame_pred with `return_preds=True`.
+        postprocessing_params (dict): thresholds for prediction score, see binarization and filtering.
+        frame_length_in_sec (float): frame length of the sequences fed to binarization,
+            i.e. shift_length_in_sec without smoothing and the smoothing unit (0.01) with smoothing.
+        smoothing_method (str): median or mean smoothing filter, or None to skip smoothing.
+        overlap (float): amounts of overlap of adjacent windows.
+        window_length_in_sec (float): length of window for generating the frame.
+        shift_length_in_sec (float): amount of shift of window for generating the frame.
+        batch_size (int): number of files processed together.
+        round_decimals (int): round predictions before each stage like the files written by the file-based
+            pipeline do, so that the segments are identical. Set to None to keep full precision.
+        out_path (str): optional path of a `.npz` file to save the segments to, see save_vad_segments.
+    Returns:
+        segments (Dict[str, torch.Tensor]): `[start, end, duration]` rows of the speech segments of each file.
+    """
+    names = list(frame_preds.keys())
+    order = sorted(range(len(names)), key=lambda i: len(frame_preds[names[i]]))
+    per_args = {"frame_length_in_sec": frame_length_in_sec, **postprocessing_params}
+    smoothing_args = {
+        "overlap": overlap,
+        "window_length_in_sec": window_length_in_sec,
+        "shift_length_in_sec": shift_length_in_sec,
+    }
+
+    segments = {}
+    for start in range(0, len(order), batch_size):
+        batch_names = [names[i] for i in order[start : start + batch_size]]
+        sequences = [frame_preds[name].float() for name in batch_names]
+        if round_decimals is not None:
+            sequences = [_round_vad_preds(sequence, round_decimals) for sequence in sequences]
+        if smoothing_method:
+            sequences = generate_overlap_vad_seq_batch(sequences, smoothing_args, smoothing_method)
+            if round_decimals is not None:
+                sequences = [_round_vad_preds(sequence, round_decimals) for sequence in sequences]
+        segments.update(zip(batch_names, generate_vad_segment_table_batch(sequences, per_args)))
+
+    segments = {name: segments[name] for name in names}
+    if out_path is not None:
+        save_vad_segments(segments, out_path)
+    return segments
+
+
+def save_vad_segments(segments: Dict[str, torch.Tensor], filepath: str):
+    """
+    Save the speech segments of many files to a single `.npz` file.
+    """
+    names = list(segments.keys())
+    tables = [segments[name].reshape(-1, 3).cpu().numpy() for name in names]
+    np.savez(
+        filepath,
+        names=np.array(names, dtype=np.str_),
+        counts=np.array([len(table) for table in tables], dtype=np.int64),
+        segments=np.concatenate(tables) if tables else np.empty((0, 3), dtype=np.float32),
+    )
+
+
+def load_vad_segments(filepath: str) -> Dict[str, torch.Tensor]:
+    """
+    Load speech segments saved with save_vad_segments.
+    """
+    with np.load(filepath) as data:
+        tables = torch.split(torch.from_numpy(data['segments']), data['counts'].tolist())
+        return dict(zip(data['names'].tolist(), tables))
+
+
+def write_vad_segment_tables(segments: Dict[str, torch.Tensor], out_dir: str, use_rttm: bool = False) -> str:
+    """
+    Write the tables of speech segments returned by generate_vad_segments,
+    in the same format as generate_vad_segment_table.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    for name, table in segments.items():
+        write_vad_segment_table(table, name, out_dir, use_rttm=use_rttm)
+    return out_dir
+
+
 def generate_vad_segment_table(
     vad_pred_dir: str,
     postprocessing_params: dict,
@@ -763,6 +1140,7 @@ def generate_vad_segment_table(
     num_workers: int,
     out_dir: str = None,
     use_rttm: bool = False,
+    batch_size: int = 64,
 ) -> str:
     """
     Convert frame level prediction to speech segment in start and end times format.
@@ -776,6 +1154,7 @@ def generate_vad_segment_table(
         frame_length_in_sec (float): frame length.
         out_dir (str): output dir of generated table/csv file.
         num_workers(float): number of process for multiprocessing
+        batch_size (int): number of files processed together with generate_vad_segment_table_batch.
     Returns:
         out_dir(str): directory of the generated table.
     """
@@ -799,21 +1178,22 @@ def generate_vad_segment_table(
         "use_rttm": use_rttm,
     }
     per_args = {**per_args, **postprocessing_params}
+    chunks = [vad_pred_filepath_list[i : i + batch_size] for i in range(0, len(vad_pred_filepath_list), batch_size)]
     num_workers = None
     if num_workers is not None and num_workers > 1:
         with multiprocessing.Pool(num_workers) as p:
-            inputs = zip(vad_pred_filepath_list, repeat(per_args))
+            inputs = zip(chunks, repeat(per_args))
             list(
                 tqdm(
-                    p.imap(generate_vad_segment_table_per_file_star, inputs),
-                    total=len(vad_pred_filepath_list),
+                    p.imap(generate_vad_segment_table_per_chunk_star, inputs),
+                    total=len(chunks),
                     desc='creating speech segments',
                     leave=True,
                 )
             )
     else:
-        for vad_pred_filepath in tqdm(vad_pred_filepath_list, desc='creating speech segments', leave=True):
-            generate_vad_segment_table_per_file(vad_pred_filepath, per_args)
+        for chunk in tqdm(chunks, desc='creating speech segments', leave=True):
+            generate_vad_segment_table_per_chunk(chunk, per_args)
 
     return out_dir
 
@@ -825,6 +1205,13 @@ def generate_vad_segment_table_per_file_star(args):
     return generate_vad_segment_table_per_file(*args)
 
 
+def generate_vad_segment_table_per_chunk_star(args):
+    """
+    A workaround for tqdm with starmap of multiprocessing
+    """
+    return generate_vad_segment_table_per_chunk(*args)
+
+
 def vad_construct_pyannote_object_per_file(
     vad_table_filepath: str, groundtruth_RTTM_file: str
 ) -> Tuple[Annotation, Annotation]:
@@ -1165,9 +1552,12 @@ def generate_vad_frame_pred(
     manifest_vad_input: str,
     out_dir: str,
     use_feat: bool = False,
-) -> str:
+    return_preds: bool = False,
+) -> Union[str, Dict[str, torch.Tensor]]:
     """
-    Generate VAD frame level prediction and write to out_dir
+    Generate VAD frame level prediction and write to out_dir.
+    If return_preds is True, nothing is written and the predictions of each file are returned instead,
+    e.g. to be post-processed with generate_vad_segments.
     """
     time_unit = int(window_length_in_sec / shift_length_in_sec)
     trunc = int(time_unit / 2)
@@ -1182,6 +1572,7 @@ def generate_vad_frame_pred(
     logging.info(f"Inference on {len(data)} audio files/json lines!")
 
     status = get_vad_stream_status(data)
+    frame_preds = {}
     for i, test_batch in enumerate(tqdm(vad_model.test_dataloader(), total=len(vad_model.test_dataloader()))):
         test_batch = [x.to(vad_model.device) for x in test_batch]
         with torch.amp.autocast(vad_model.device.type):
@@ -1206,17 +1597,22 @@ def generate_vad_frame_pred(
             else:
                 to_save = pred
 
-            to_save = to_save.cpu().tolist()
             all_len += len(to_save)
-            outpath = os.path.join(out_dir, data[i] + ".frame")
-            with open(outpath, "a", encoding='utf-8') as fout:
-                for f in range(len(to_save)):
-                    fout.write('{0:0.4f}\n'.format(to_save[f]))
+            if return_preds:
+                frame_preds.setdefault(data[i], []).append(to_save.float().cpu())
+            else:
+                to_save = to_save.cpu().tolist()
+                outpath = os.path.join(out_dir, data[i] + ".frame")
+                with open(outpath, "a", encoding='utf-8') as fout:
+                    for f in range(len(to_save)):
+                        fout.write('{0:0.4f}\n'.format(to_save[f]))
 
         del test_batch
         if status[i] == 'end' or status[i] == 'single':
             logging.debug(f"Overall length of prediction of {data[i]} is {all_len}!")
             all_len = 0
+    if return_preds:
+        return {name: torch.cat(preds) for name, preds in frame_preds.items()}
     return out_dir
 
 
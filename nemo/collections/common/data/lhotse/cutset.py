@@ -195,6 +195,8 @@ def read_dataset_config(config) -> tuple[CutSet, bool]:
         "max_open_streams": config.get("max_open_streams", None),
         "token_equivalent_duration": config.get("token_equivalent_duration", None),
         "skip_missing_manifest_entries": config.get("skip_missing_manifest_entries", False),
+        "tarred_prefetch_shards": config.get("tarred_prefetch_shards", 0),
+        "tarred_prefetch_max_bytes": config.get("tarred_prefetch_max_bytes", 1 << 30),
         "force_map_dataset": config.get("force_map_dataset", False),
         "force_iterable_dataset": config.get("force_iterable_dataset", False),
     }
@@ -545,6 +547,8 @@ def read_nemo_manifest(config) -> tuple[CutSet, bool]:
                     config.manifest_filepath,
                     tar_paths=config.tarred_audio_filepaths,
                     skip_missing_manifest_entries=config.get("skip_missing_manifest_entries", False),
+                    prefetch_shards=config.get("tarred_prefetch_shards", 0),
+                    prefetch_max_bytes=config.get("tarred_prefetch_max_bytes", 1 << 30),
                     **common_kwargs,
                 )
             )
@@ -589,6 +593,8 @@ def read_nemo_manifest(config) -> tuple[CutSet, bool]:
                     manifest_path=manifest_path,
                     tar_paths=tar_path,
                     skip_missing_manifest_entries=config.get("skip_missing_manifest_entries", False),
+                    prefetch_shards=config.get("tarred_prefetch_shards", 0),
+                    prefetch_max_bytes=config.get("tarred_prefetch_max_bytes", 1 << 30),
                     **common_kwargs,
                 )
             else:
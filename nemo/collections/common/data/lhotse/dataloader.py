@@ -79,6 +79,10 @@ class LhotseDataLoadingConfig:
     #  Enable this to support dataloading from JSON manifests that reference subsets of audio tar files.
     skip_missing_manifest_entries: bool = False
     tarred_random_access: bool = False  # deprecated, replaced by: skip_missing_manifest_entries
+    #  Read this many tar shards ahead in background threads (per dataloading worker), buffering at most
+    #  tarred_prefetch_max_bytes of audio; 0 reads the shards one after another.
+    tarred_prefetch_shards: int = 0
+    tarred_prefetch_max_bytes: int = 1 << 30
     # 2. Batch size.
     #   a. Existing NeMo options.
     batch_size: int | None = None
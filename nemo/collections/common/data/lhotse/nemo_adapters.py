@@ -15,10 +15,15 @@
 import random
 import re
 import tarfile
+import threading
+import time
+from collections import deque
 from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
-from typing import Generator, Iterable, List, Literal
+from typing import Any, Callable, Generator, Iterable, Iterator, List, Literal
 
 import soundfile
 from cytoolz import groupby
@@ -266,6 +271,12 @@ class LazyNeMoTarredIterator:
         ...     tar_paths=["nemo_manifests/audio_0.tar", ...],
         ...     extra_fields=[{"type": "text_sample", "name": "question", "path": "questions.txt"}],
         ... ))
+
+    By default, a shard is opened only after the previous one is consumed, so the training waits for the storage
+    at every shard boundary. Set ``prefetch_shards`` to read the next shards ahead in background threads
+    (together with their JSON manifests and the audio headers), buffering at most ``prefetch_max_bytes``
+    of audio data per iterator (i.e., per dataloading worker). The order of the cuts is not affected.
+    Read statistics of the recent shards (wait time, throughput) are available in ``shard_stats``.
     """
 
     def __init__(
@@ -278,6 +289,8 @@ class LazyNeMoTarredIterator:
         lang_field: str = "lang",
         skip_missing_manifest_entries: bool = False,
         extra_fields: list[dict[str, str]] | None = None,
+        prefetch_shards: int = 0,
+        prefetch_max_bytes: int = 1 << 30,
     ) -> None:
         self.skip_missing_manifest_entries = skip_missing_manifest_entries
         self.shard_id_to_manifest: dict[int, Iterable[dict]]
@@ -321,6 +334,9 @@ class LazyNeMoTarredIterator:
         self.text_field = text_field
         self.lang_field = lang_field
         self.extra_fields = extra_fields
+        self.prefetch_shards = prefetch_shards
+        self.prefetch_max_bytes = prefetch_max_bytes
+        self.shard_stats: deque[ShardReadStats] = deque(maxlen=SHARD_STATS_HISTORY)
         self._validate()
 
     def to_shards(self) -> List["LazyNeMoTarredIterator"]:
@@ -338,6 +354,8 @@ class LazyNeMoTarredIterator:
                     shard_seed=self.shard_seed,
                     text_field=self.text_field,
                     lang_field=self.lang_field,
+                    prefetch_shards=self.prefetch_shards,
+                    prefetch_max_bytes=self.prefetch_max_bytes,
                 )
                 for path, tarpath in zip(self.paths, self.shard_id_to_tar_path.values())
             ]
@@ -353,6 +371,7 @@ class LazyNeMoTarredIterator:
             f"* Tar path(s) indicate(s) IDs: {sorted(shard_ids_tars)}\n"
         )
         validate_extra_fields(self.extra_fields)
+        assert self.prefetch_shards >= 0, f"prefetch_shards must be non-negative, got {self.prefetch_shards}"
 
     @property
     def shard_ids(self) -> List[int]:
@@ -374,6 +393,17 @@ class LazyNeMoTarredIterator:
                             f"Cannot locate JSON entry for tar file '{tar_info.name}'"
                         ) from e
 
+    def _read_shard(self, sid: int) -> Generator[tuple[int, tuple], None, None]:
+        """
+        Yields the size and ``(manifest entries, raw audio, tar info, audio info)`` of every file of the shard.
+        """
+        manifest_path = self.paths[sid] if len(self.paths) > 1 else self.paths[0]
+        shard_manifest: dict[str, list[dict]] = groupby(_get_manifest_basename, self.shard_id_to_manifest[sid])
+        tar_path = self.shard_id_to_tar_path[sid]
+        for _, raw_audio, tar_info in self._iter_sequential(tar_path, shard_manifest, manifest_path):
+            meta = soundfile.info(BytesIO(raw_audio))
+            yield len(raw_audio), (shard_manifest[tar_info.name], raw_audio, tar_info, meta)
+
     def __iter__(self) -> Generator[Cut, None, None]:
         shard_ids = self.shard_ids
 
@@ -384,64 +414,74 @@ class LazyNeMoTarredIterator:
         # Propagate the random seed
         extra_fields = [ExtraField.from_dict({"seed": seed, **field_cfg}) for field_cfg in self.extra_fields or ()]
 
-        # Handle NeMo tarred manifests with offsets.
-        # They have multiple JSONL entries where audio paths end with '-sub1', '-sub2', etc. for each offset.
-        offset_pattern = re.compile(r'^(?P<stem>.+)(?P<sub>-sub\d+)(?P<ext>\.\w+)?$')
-
-        for sid in shard_ids:
-            manifest_path = self.paths[sid] if len(self.paths) > 1 else self.paths[0]
-
-            def basename(d: dict) -> str:
-                return (
-                    m.group("stem") + ifnone(m.group("ext"), "")
-                    if (m := offset_pattern.match(k := d["audio_filepath"])) is not None
-                    else k
-                )
+        stats = [ShardReadStats(shard_id=sid, tar_path=self.shard_id_to_tar_path[sid]) for sid in shard_ids]
+        prefetcher = None
+        if self.prefetch_shards > 0:
+            prefetcher = TarShardPrefetcher(
+                read_shard=lambda position: self._read_shard(shard_ids[position]),
+                stats=stats,
+                num_ahead=self.prefetch_shards,
+                max_bytes=self.prefetch_max_bytes,
+            )
 
-            shard_manifest: dict[str, list[dict]] = groupby(basename, self.shard_id_to_manifest[sid])
-            tar_path = self.shard_id_to_tar_path[sid]
-            try:
-                for data, raw_audio, tar_info in self._iter_sequential(tar_path, shard_manifest, manifest_path):
-                    meta = soundfile.info(BytesIO(raw_audio))
-                    recording = Recording(
-                        id=tar_info.path,
-                        sources=[AudioSource(type="memory", channels=list(range(meta.channels)), source=raw_audio)],
-                        sampling_rate=int(meta.samplerate),
-                        num_samples=meta.frames,
-                        duration=meta.duration,
-                    )
-                    cuts_for_recording = []
-                    for data in sorted(shard_manifest[tar_info.name], key=lambda d: d["audio_filepath"]):
-                        # filter out entries with valid "_skipme" values.
-                        if data.get("_skipme", False):
-                            continue
-                        # Cut the recording into corresponding segment and discard audio data outside the segment.
-                        cut = make_cut_with_subset_inmemory_recording(
-                            recording, offset=data.get("offset", 0.0), duration=data.get("duration")
+        try:
+            for position, sid in enumerate(shard_ids):
+                manifest_path = self.paths[sid] if len(self.paths) > 1 else self.paths[0]
+                tar_path = self.shard_id_to_tar_path[sid]
+                if prefetcher is not None:
+                    shard_files = prefetcher.iter_shard(position)
+                else:
+                    shard_files = _iter_with_stats(self._read_shard(sid), stats[position])
+                try:
+                    for manifest_entries, raw_audio, tar_info, meta in shard_files:
+                        recording = Recording(
+                            id=tar_info.path,
+                            sources=[
+                                AudioSource(type="memory", channels=list(range(meta.channels)), source=raw_audio)
+                            ],
+                            sampling_rate=int(meta.samplerate),
+                            num_samples=meta.frames,
+                            duration=meta.duration,
                         )
-                        cut.supervisions.append(
-                            SupervisionSegment(
-                                id=cut.id,
-                                recording_id=cut.recording_id,
-                                start=0,
-                                duration=cut.duration,
-                                text=data.get(self.text_field),
-                                language=data.get(self.lang_field),
+                        cuts_for_recording = []
+                        for data in sorted(manifest_entries, key=lambda d: d["audio_filepath"]):
+                            # filter out entries with valid "_skipme" values.
+                            if data.get("_skipme", False):
+                                continue
+                            # Cut the recording into corresponding segment and discard audio data outside the segment.
+                            cut = make_cut_with_subset_inmemory_recording(
+                                recording, offset=data.get("offset", 0.0), duration=data.get("duration")
                             )
-                        )
-                        cut.custom = _to_custom_attr_dict(data)
-                        cut.manifest_origin = manifest_path
-                        cut.tar_origin = tar_path
-                        for extra_field in extra_fields:
-                            extra_field.attach_to(cut)
-                        cuts_for_recording.append(cut)
-                    del recording  # free the memory - helps with very large audio files
-                    del raw_audio
-                    yield from cuts_for_recording
-            except tarfile.ReadError:
-                logging.warning(
-                    f"Skipping tar file due to read errors (unstable storage or bad file?): {tar_path=}",
-                )
+                            cut.supervisions.append(
+                                SupervisionSegment(
+                                    id=cut.id,
+                                    recording_id=cut.recording_id,
+                                    start=0,
+                                    duration=cut.duration,
+                                    text=data.get(self.text_field),
+                                    language=data.get(self.lang_field),
+                                )
+                            )
+                            cut.custom = _to_custom_attr_dict(data)
+                            cut.manifest_origin = manifest_path
+                            cut.tar_origin = tar_path
+                            for extra_field in extra_fields:
+                                extra_field.attach_to(cut)
+                            cuts_for_recording.append(cut)
+                        del recording  # free the memory - helps with very large audio files
+                        del raw_audio
+                        yield from cuts_for_recording
+                except tarfile.ReadError:
+                    logging.warning(
+                        f"Skipping tar file due to read errors (unstable storage or bad file?): {tar_path=}",
+                    )
+                finally:
+                    shard_files.close()
+                self.shard_stats.append(stats[position])
+                logging.debug(f"Read tar shard: {stats[position]}")
+        finally:
+            if prefetcher is not None:
+                prefetcher.close()
 
     def __len__(self) -> int:
         return len(self.source)
@@ -450,6 +490,181 @@ class LazyNeMoTarredIterator:
         return LazyIteratorChain(self, other)
 
 
+# Handle NeMo tarred manifests with offsets.
+# They have multiple JSONL entries where audio paths end with '-sub1', '-sub2', etc. for each offset.
+_OFFSET_PATTERN = re.compile(r'^(?P<stem>.+)(?P<sub>-sub\d+)(?P<ext>\.\w+)?$')
+
+
+def _get_manifest_basename(d: dict) -> str:
+    return (
+        m.group("stem") + ifnone(m.group("ext"), "")
+        if (m := _OFFSET_PATTERN.match(k := d["audio_filepath"])) is not None
+        else k
+    )
+
+
+# number of recent shards whose read statistics are kept by ``LazyNeMoTarredIterator.shard_stats``
+SHARD_STATS_HISTORY = 1000
+
+
+@dataclass
+class ShardReadStats:
+    """Read statistics of a tar shard of ``LazyNeMoTarredIterator``."""
+
+    shard_id: int
+    tar_path: str
+    num_files: int = 0
+    num_bytes: int = 0
+    # seconds spent opening the shard and reading its files (including the audio headers and manifest)
+    read_time: float = 0.0
+    # seconds the consumer of the iterator was blocked waiting for the data of the shard
+    wait_time: float = 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.num_bytes / self.read_time if self.read_time > 0 else 0.0
+
+
+def _iter_with_stats(items: Iterator[tuple[int, Any]], stats: ShardReadStats) -> Generator[Any, None, None]:
+    """Reads the shard in the consumer thread, the whole read time is the wait time."""
+    start = time.perf_counter()
+    try:
+        for num_bytes, item in items:
+            stats.wait_time += time.perf_counter() - start
+            stats.num_files += 1
+            stats.num_bytes += num_bytes
+            yield item
+            start = time.perf_counter()
+        stats.wait_time += time.perf_counter() - start
+    finally:
+        items.close()
+        stats.read_time = stats.wait_time
+
+
+class _ShardBuffer:
+    def __init__(self):
+        self.items = deque()
+        self.done = False
+        self.error = None
+
+
+class TarShardPrefetcher:
+    """
+    Reads shards in background threads, up to ``num_ahead`` shards ahead of the shard being consumed,
+    so that opening the next shards on a slow storage overlaps with the consumption of the current one.
+    Consumers get the items of every shard in the original order with ``iter_shard``, shard by shard.
+
+    The size of the buffered items of all shards is limited by ``max_bytes``. The shard being consumed may always
+    buffer one item, so that a large item, or the next shards filling the budget, can't block the consumer.
+    Errors raised while reading a shard are re-raised by ``iter_shard`` after the items read before them.
+
+    Args:
+        read_shard: function returning an iterator of ``(size in bytes, item)`` of the shard at the position
+        stats: read statistics of the shards at each position, updated by the prefetcher
+        num_ahead: number of shards read ahead of the one being consumed
+        max_bytes: max total size of the buffered items
+    """
+
+    def __init__(
+        self,
+        read_shard: Callable[[int], Iterator[tuple[int, Any]]],
+        stats: list[ShardReadStats],
+        num_ahead: int,
+        max_bytes: int,
+    ) -> None:
+        self.read_shard = read_shard
+        self.stats = stats
+        self.num_ahead = num_ahead
+        self.max_bytes = max_bytes
+        self._buffers = [_ShardBuffer() for _ in stats]
+        self._used_bytes = 0
+        self._head = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=num_ahead + 1, thread_name_prefix="TarShardPrefetcher")
+        self._num_submitted = 0
+        self._submit_readers()
+
+    def _submit_readers(self) -> None:
+        while self._num_submitted < min(len(self._buffers), self._head + self.num_ahead + 1):
+            self._executor.submit(self._read, self._num_submitted)
+            self._num_submitted += 1
+
+    def _can_buffer(self, position: int, num_bytes: int) -> bool:
+        if self._used_bytes == 0 or self._used_bytes + num_bytes <= self.max_bytes:
+            return True
+        return position == self._head and not self._buffers[position].items
+
+    def _read(self, position: int) -> None:
+        buffer, stats = self._buffers[position], self.stats[position]
+        start = time.perf_counter()
+        blocked_time = 0.0
+        items = None
+        try:
+            items = self.read_shard(position)
+            for num_bytes, item in items:
+                with self._cond:
+                    blocked_start = time.perf_counter()
+                    while not self._closed and not self._can_buffer(position, num_bytes):
+                        self._cond.wait()
+                    blocked_time += time.perf_counter() - blocked_start
+                    if self._closed:
+                        return
+                    buffer.items.append((num_bytes, item))
+                    self._used_bytes += num_bytes
+                    stats.num_files += 1
+                    stats.num_bytes += num_bytes
+                    self._cond.notify_all()
+        except Exception as e:
+            buffer.error = e
+        finally:
+            if items is not None:
+                items.close()
+            with self._cond:
+                stats.read_time = time.perf_counter() - start - blocked_time
+                buffer.done = True
+                self._cond.notify_all()
+
+    def iter_shard(self, position: int) -> Generator[Any, None, None]:
+        """Items of the shard at the position, shards must be consumed in order."""
+        assert position == self._head, f"Shards must be consumed in order: expected {self._head}, got {position}"
+        buffer, stats = self._buffers[position], self.stats[position]
+        try:
+            while True:
+                with self._cond:
+                    start = time.perf_counter()
+                    while not buffer.items and not buffer.done:
+                        self._cond.wait()
+                    stats.wait_time += time.perf_counter() - start
+                    if not buffer.items:
+                        if buffer.error is not None:
+                            raise buffer.error
+                        return
+                    num_bytes, item = buffer.items.popleft()
+                    self._used_bytes -= num_bytes
+                    self._cond.notify_all()
+                yield item
+        finally:
+            with self._cond:
+                # drop the items left if the consumer stopped early
+                self._used_bytes -= sum(num_bytes for num_bytes, _ in buffer.items)
+                buffer.items.clear()
+                self._head = position + 1
+                self._cond.notify_all()
+            if not self._closed:
+                self._submit_readers()
+
+    def close(self) -> None:
+        """Stops the readers and drops the buffered items."""
+        with self._cond:
+            self._closed = True
+            for buffer in self._buffers:
+                buffer.items.clear()
+            self._used_bytes = 0
+            self._cond.notify_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
 def make_cut_with_subset_inmemory_recording(
     recording: Recording, offset: float = 0.0, duration: float | None = None
 ) -> Cut:
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import collections
+import collections.abc
 import json
 import os
 from itertools import combinations
@@ -21,7 +22,7 @@ from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 import numpy as np
 import pandas as pd
 
-from nemo.collections.common.parts.preprocessing import manifest, parsers
+from nemo.collections.common.parts.preprocessing import manifest, manifest_index, parsers
 from nemo.collections.common.parts.preprocessing.manifest import get_full_path
 from nemo.utils import logging, logging_mode
 
@@ -32,6 +33,61 @@ class _Collection(collections.UserList):
     OUTPUT_TYPE = None  # Single element output type.
 
 
+class _IndexedAudioTextData(collections.abc.Sequence):
+    """Read-only list of `AudioText` entities materialized on access from a `ManifestIndex`.
+
+    Entities are stored as a struct of arrays rather than as Python objects, so the resident memory of
+    the collection does not grow with per-entity object overhead, and forked dataloader workers do not
+    touch (and copy) the pages holding the collection when updating reference counts.
+
+    Args:
+        output_type: Entity type to construct.
+        index: Manifest index holding the manifest columns.
+        tokens: Tokenized text of every row of the index.
+        rows: Index rows selected after filtering and sorting.
+        ids: Optional entity id of every row of the index. If None, the row number is used.
+    """
+
+    def __init__(
+        self,
+        output_type: type,
+        index: manifest_index.ManifestIndex,
+        tokens: manifest_index.TokenizedText,
+        rows: np.ndarray,
+        ids: Optional[np.ndarray] = None,
+    ):
+        self.output_type = output_type
+        self.index = index
+        self.tokens = tokens
+        self.rows = rows
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError(f"Index {idx} is out of range for a collection with {len(self)} entries")
+
+        row = int(self.rows[idx])
+        index = self.index
+        return self.output_type(
+            row if self.ids is None else int(self.ids[row]),
+            index.get_audio_file(row),
+            index.get_duration(row),
+            self.tokens[row],
+            index.get_offset(row),
+            index.get_text(row),
+            index.get_speaker(row),
+            index.get_orig_sr(row),
+            index.get_lang(row),
+        )
+
+
 class Text(_Collection):
     """Simple list of preprocessed text entries, result in list of tokens."""
 
@@ -91,7 +147,11 @@ class FromFileText(Text):
 
 
 class AudioText(_Collection):
-    """List of audio-transcript text correspondence with preprocessing."""
+    """List of audio-transcript text correspondence with preprocessing.
+
+    Entries are kept in compact array-backed storage (see `ManifestIndex`) and are returned as
+    `OUTPUT_TYPE` namedtuples when accessed.
+    """
 
     OUTPUT_TYPE = collections.namedtuple(
         typename='AudioTextEntity',
@@ -115,6 +175,7 @@ class AudioText(_Collection):
         max_number: Optional[int] = None,
         do_sort_by_duration: bool = False,
         index_by_file_id: bool = False,
+        tokenization_num_workers: Optional[int] = None,
     ):
         """Instantiates audio-text manifest with filters and preprocessing.
 
@@ -133,26 +194,44 @@ class AudioText(_Collection):
             max_number: Maximum number of samples to collect.
             do_sort_by_duration: True if sort samples list by duration. Not compatible with index_by_file_id.
             index_by_file_id: If True, saves a mapping from filename base (ID) to index in data.
+            tokenization_num_workers: Number of processes used to tokenize the transcripts. Results and
+                filtering are identical to tokenizing in the current process (default: None).
         """
 
-        output_type = self.OUTPUT_TYPE
         all_has_duration = True
-        data, duration_filtered, num_filtered, total_duration = [], 0.0, 0, 0.0
+        duration_filtered, num_filtered, total_duration = 0.0, 0, 0.0
+        columns, tokens, kept_ids = manifest_index.ManifestIndexBuilder(), manifest_index.TokenizedTextBuilder(), []
         if index_by_file_id:
             self.mapping = {}
 
+        def _is_duration_filtered(duration):
+            return duration is not None and (
+                (min_duration is not None and duration < min_duration)
+                or (max_duration is not None and duration > max_duration)
+            )
+
+        def _needs_lang(text):
+            return hasattr(parser, "is_aggregate") and parser.is_aggregate and isinstance(text, str)
+
+        # Transcripts to tokenize, in the order in which the loop below consumes them. Tokenization may run
+        # ahead of the loop on a process pool; the serial path only tokenizes what the loop consumes.
+        parse_jobs = (
+            (text, lang if _needs_lang(text) else None)
+            for duration, text, labels, lang in zip(durations, texts, token_labels, langs)
+            if not _is_duration_filtered(duration)
+            and labels is None
+            and text != ''
+            and not (_needs_lang(text) and lang is None)
+        )
+        parsed = manifest_index.tokenize_texts(parser, parse_jobs, num_workers=tokenization_num_workers)
+
         for id_, audio_file, duration, offset, text, speaker, orig_sr, token_labels, lang in zip(
             ids, audio_files, durations, offsets, texts, speakers, orig_sampling_rates, token_labels, langs
         ):
             if duration is None:
                 all_has_duration = False
             # Duration filters.
-            if duration is not None and min_duration is not None and duration < min_duration:
-                duration_filtered += duration
-                num_filtered += 1
-                continue
-
-            if duration is not None and max_duration is not None and duration > max_duration:
+            if _is_duration_filtered(duration):
                 duration_filtered += duration
                 num_filtered += 1
                 continue
@@ -161,16 +240,10 @@ class AudioText(_Collection):
                 text_tokens = token_labels
             else:
                 if text != '':
-                    if hasattr(parser, "is_aggregate") and parser.is_aggregate and isinstance(text, str):
-                        if lang is not None:
-                            text_tokens = parser(text, lang)
-                        # for future use if want to add language bypass to audio_to_text classes
-                        # elif hasattr(parser, "lang") and parser.lang is not None:
-                        #    text_tokens = parser(text, parser.lang)
-                        else:
-                            raise ValueError("lang required in manifest when using aggregate tokenizers")
-                    else:
-                        text_tokens = parser(text)
+                    if _needs_lang(text) and lang is None:
+                        parsed.close()
+                        raise ValueError("lang required in manifest when using aggregate tokenizers")
+                    text_tokens = next(parsed)
                 else:
                     text_tokens = []
 
@@ -181,28 +254,110 @@ class AudioText(_Collection):
 
             total_duration += duration if duration is not None else 0.0
 
-            data.append(output_type(id_, audio_file, duration, text_tokens, offset, text, speaker, orig_sr, lang))
+            columns.append(
+                dict(
+                    audio_file=audio_file,
+                    duration=duration,
+                    offset=offset,
+                    text=text,
+                    speaker=speaker,
+                    orig_sr=orig_sr,
+                    lang=lang,
+                )
+            )
+            tokens.append(text_tokens)
+            kept_ids.append(id_)
             if index_by_file_id:
                 file_id, _ = os.path.splitext(os.path.basename(audio_file))
                 if file_id not in self.mapping:
                     self.mapping[file_id] = []
-                self.mapping[file_id].append(len(data) - 1)
+                self.mapping[file_id].append(len(columns) - 1)
 
             # Max number of entities filter.
-            if len(data) == max_number:
+            if len(columns) == max_number:
                 break
 
+        parsed.close()
+        index = columns.finish()
+        rows = np.arange(len(index))
         if do_sort_by_duration:
             if index_by_file_id:
                 logging.warning("Tried to sort dataset by duration, but cannot since index_by_file_id is set.")
             else:
-                data.sort(key=lambda entity: entity.duration)
+                rows = np.argsort(index.duration, kind='stable')
 
-        logging.info("Dataset loaded with %d files totalling %.2f hours", len(data), total_duration / 3600)
+        logging.info("Dataset loaded with %d files totalling %.2f hours", len(rows), total_duration / 3600)
         logging.info("%d files were filtered totalling %.2f hours", num_filtered, duration_filtered / 3600)
         if not all_has_duration:
             logging.info(f"Not all audios have duration information, the total number of hours is inaccurate.")
-        super().__init__(data)
+        super().__init__()
+        self.data = _IndexedAudioTextData(
+            self.OUTPUT_TYPE, index, tokens.finish(), rows, ids=np.asarray(kept_ids, dtype=np.int64)
+        )
+
+    def _init_from_index(
+        self,
+        index: manifest_index.ManifestIndex,
+        parser: parsers.CharParser,
+        min_duration: Optional[float] = None,
+        max_duration: Optional[float] = None,
+        max_number: Optional[int] = None,
+        do_sort_by_duration: bool = False,
+        index_by_file_id: bool = False,
+        tokenization_num_workers: Optional[int] = None,
+    ):
+        """Instantiates the collection lazily from a manifest index, with the same filters as `__init__`.
+
+        Filtering and sorting are done with array operations over the index columns, and entities
+        are only materialized when accessed.
+        """
+        tokens = index.get_tokens(parser, num_workers=tokenization_num_workers)
+        durations = np.asarray(index.duration)
+        status = np.asarray(tokens.status)
+
+        with np.errstate(invalid='ignore'):
+            keep = np.ones(len(index), dtype=bool)
+            if min_duration is not None:
+                keep &= ~(durations < min_duration)
+            if max_duration is not None:
+                keep &= ~(durations > max_duration)
+        missing_lang = keep & (status == manifest_index.TOKENS_MISSING_LANG)
+        keep &= status == manifest_index.TOKENS_OK
+
+        rows = np.flatnonzero(keep)
+        # Only rows up to the last collected one are visited when `max_number` is reached.
+        num_visited = len(index)
+        if max_number and len(rows) >= max_number:
+            rows = rows[:max_number]
+            num_visited = rows[-1] + 1
+        if np.any(missing_lang[:num_visited]):
+            raise ValueError("lang required in manifest when using aggregate tokenizers")
+        filtered = ~keep[:num_visited]
+        num_filtered = int(filtered.sum())
+        duration_filtered = float(np.nansum(durations[:num_visited][filtered]))
+        total_duration = float(np.nansum(durations[rows]))
+        all_has_duration = not np.isnan(durations[:num_visited]).any()
+
+        if index_by_file_id:
+            self.mapping = {}
+            for i, row in enumerate(rows):
+                file_id, _ = os.path.splitext(os.path.basename(index.get_audio_file(row)))
+                if file_id not in self.mapping:
+                    self.mapping[file_id] = []
+                self.mapping[file_id].append(i)
+
+        if do_sort_by_duration:
+            if index_by_file_id:
+                logging.warning("Tried to sort dataset by duration, but cannot since index_by_file_id is set.")
+            else:
+                rows = rows[np.argsort(durations[rows], kind='stable')]
+
+        logging.info("Dataset loaded with %d files totalling %.2f hours", len(rows), total_duration / 3600)
+        logging.info("%d files were filtered totalling %.2f hours", num_filtered, duration_filtered / 3600)
+        if not all_has_duration:
+            logging.info(f"Not all audios have duration information, the total number of hours is inaccurate.")
+        super().__init__()
+        self.data = _IndexedAudioTextData(self.OUTPUT_TYPE, index, tokens, rows)
 
 
 class VideoText(_Collection):
@@ -445,15 +600,34 @@ class InstructionTuningAudioText(_Collection):
 class ASRAudioText(AudioText):
     """`AudioText` collector from asr structured json files."""
 
-    def __init__(self, manifests_files: Union[str, List[str]], parse_func: Optional[Callable] = None, *args, **kwargs):
+    def __init__(
+        self,
+        manifests_files: Union[str, List[str]],
+        parse_func: Optional[Callable] = None,
+        *args,
+        use_manifest_index: bool = False,
+        manifest_index_dir: Optional[str] = None,
+        **kwargs,
+    ):
         """Parse lists of audio files, durations and transcripts texts.
 
         Args:
             manifests_files: Either single string file or list of such -
                 manifests to yield items from.
+            parse_func: Optional function to parse manifest entries.
+            use_manifest_index: If True, the manifests are parsed and tokenized once into a memory-mapped
+                `ManifestIndex` that is reused by later runs, ranks and dataloader workers.
+            manifest_index_dir: Directory to save the manifest index to.
+                If None, will write to the same folder as the first manifest.
             *args: Args to pass to `AudioText` constructor.
             **kwargs: Kwargs to pass to `AudioText` constructor.
         """
+        if use_manifest_index:
+            index = manifest_index.ManifestIndex.from_manifests(
+                manifests_files, parse_func=parse_func, index_mapping_dir=manifest_index_dir
+            )
+            self._init_from_index(index, *args, **kwargs)
+            return
 
         (
             ids,
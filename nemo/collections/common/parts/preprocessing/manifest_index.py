@@ -0,0 +1,841 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Binary, columnar index of ASR manifests.
+
+Parsing a JSONL manifest and tokenizing every transcript is repeated by every rank and every dataloader
+worker, which is slow and memory hungry for very large manifests. :class:`ManifestIndex` stores the parsed
+manifest once as a directory of ``.npy`` arrays (one file per column) that are memory-mapped read-only,
+so the OS page cache shares them between all processes on a node. Tokenized transcripts are cached in
+the same directory, keyed by a hash of the parser/tokenizer that produced them.
+
+The index directory layout is::
+
+    <manifest>.<hash>.manifest_index/
+        meta.json                   # version, manifest fingerprints, column encodings, categorical values
+        duration.npy                # float64, NaN when missing
+        offset.npy                  # float64, NaN when missing
+        audio_file.codes.npy        # int32, row -> entry of the interned path table
+        audio_file.data.npy         # uint8, concatenated UTF-8 bytes of the unique paths
+        audio_file.offsets.npy      # int64, (num_paths + 1) offsets into ``audio_file.data.npy``
+        text.{data,offsets}.npy     # same as above, one entry per row
+        token_labels.{data,offsets,present}.npy
+        speaker.codes.npy, orig_sr.codes.npy, lang.codes.npy
+        tokens/<parser hash>/{ids,offsets,status}.npy
+"""
+
+import functools
+import hashlib
+import itertools
+import json
+import multiprocessing as mp
+import os
+import pickle
+import re
+import shutil
+import types
+import uuid
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+
+from nemo.collections.common.parts.preprocessing import manifest
+from nemo.utils import logging
+from nemo.utils.data_utils import DataStoreObject
+
+__all__ = [
+    'ManifestIndex',
+    'ManifestIndexBuilder',
+    'TokenizedText',
+    'TokenizedTextBuilder',
+    'get_parser_cache_key',
+    'tokenize_texts',
+    'tokenizer_cache_key',
+]
+
+__manifest_index_version__ = "2"
+
+# Values of ``TokenizedText.status``.
+TOKENS_OK = 0
+TOKENS_PARSE_FAILED = 1  # parser returned None, the sample is filtered out
+TOKENS_MISSING_LANG = 2  # aggregate tokenizer without ``lang`` in the manifest
+
+# How the tokens of a row are obtained in `ManifestIndex.tokenize`.
+_MODE_LABELS, _MODE_EMPTY, _MODE_MISSING_LANG, _MODE_PARSE, _MODE_PARSE_WITH_LANG = range(5)
+
+
+def _load_array(path: str, mmap: bool = True) -> np.ndarray:
+    """Loads a ``.npy`` file, memory-mapped read-only when possible."""
+    if mmap:
+        try:
+            return np.load(path, mmap_mode='r')
+        except ValueError:
+            # older numpy versions cannot memory-map zero-sized arrays
+            pass
+    return np.load(path)
+
+
+def _save_arrays(dirname: str, arrays: Dict[str, np.ndarray]):
+    for name, arr in arrays.items():
+        np.save(os.path.join(dirname, f"{name}.npy"), arr)
+
+
+def _publish_dir(tmp_dir: str, final_dir: str):
+    """Atomically moves a fully written directory into place. If another process won the race, keep theirs."""
+    try:
+        os.rename(tmp_dir, final_dir)
+    except OSError:
+        if not os.path.isdir(final_dir):
+            raise
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _smallest_int_dtype(arr: np.ndarray) -> np.dtype:
+    if len(arr) == 0:
+        return np.dtype(np.int16)
+    lo, hi = arr.min(), arr.max()
+    for dtype in (np.int16, np.int32):
+        if lo >= np.iinfo(dtype).min and hi <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class _StringColumnBuilder:
+    """Accumulates a ragged column of strings. Values that are not strings are stored JSON-encoded.
+
+    With ``intern=True`` repeated values are stored once and rows hold integer codes into the table of
+    unique values, which suits columns such as audio paths of long recordings split with offsets.
+    """
+
+    def __init__(self, intern: bool = False):
+        self.data = bytearray()
+        self.offsets = array('q', [0])
+        self.is_json = bytearray()
+        self.codes = array('i') if intern else None
+        self.value_to_code = {} if intern else None
+
+    def append(self, value: Any):
+        if self.codes is not None:
+            key = (isinstance(value, str), value if isinstance(value, str) else json.dumps(value))
+            code = self.value_to_code.get(key)
+            if code is not None:
+                self.codes.append(code)
+                return
+            code = self.value_to_code[key] = len(self.value_to_code)
+            self.codes.append(code)
+        if isinstance(value, str):
+            self.data += value.encode('utf-8')
+            self.is_json.append(0)
+        else:
+            self.data += json.dumps(value).encode('utf-8')
+            self.is_json.append(1)
+        self.offsets.append(len(self.data))
+
+    def to_arrays(self, name: str) -> Dict[str, np.ndarray]:
+        arrays = {
+            f'{name}.data': np.frombuffer(self.data, dtype=np.uint8),
+            f'{name}.offsets': np.frombuffer(self.offsets, dtype=np.int64),
+        }
+        if any(self.is_json):
+            arrays[f'{name}.is_json'] = np.frombuffer(self.is_json, dtype=np.uint8).astype(bool)
+        if self.codes is not None:
+            arrays[f'{name}.codes'] = np.frombuffer(self.codes, dtype=np.int32)
+        return arrays
+
+
+class _StringColumn:
+    def __init__(
+        self,
+        data: np.ndarray,
+        offsets: np.ndarray,
+        is_json: Optional[np.ndarray] = None,
+        codes: Optional[np.ndarray] = None,
+    ):
+        self.data = data
+        self.offsets = offsets
+        self.is_json = is_json
+        self.codes = codes
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1 if self.codes is None else len(self.codes)
+
+    def to_arrays(self, name: str) -> Dict[str, np.ndarray]:
+        arrays = {f'{name}.data': self.data, f'{name}.offsets': self.offsets}
+        if self.is_json is not None:
+            arrays[f'{name}.is_json'] = self.is_json
+        if self.codes is not None:
+            arrays[f'{name}.codes'] = self.codes
+        return arrays
+
+    def __getitem__(self, row: int) -> Any:
+        if self.codes is not None:
+            row = self.codes[row]
+        value = self.data[self.offsets[row] : self.offsets[row + 1]].tobytes().decode('utf-8')
+        if self.is_json is not None and self.is_json[row]:
+            return json.loads(value)
+        return value
+
+
+class _CategoricalColumnBuilder:
+    """Accumulates a column with few distinct values (e.g. language or speaker) as integer codes."""
+
+    def __init__(self):
+        self.codes = array('i')
+        self.value_to_code = {}
+
+    def append(self, value: Any):
+        key = json.dumps(value)
+        code = self.value_to_code.get(key)
+        if code is None:
+            code = self.value_to_code[key] = len(self.value_to_code)
+        self.codes.append(code)
+
+    def values(self) -> List[str]:
+        return list(self.value_to_code.keys())
+
+
+class _CategoricalColumn:
+    def __init__(self, codes: np.ndarray, values: List[str]):
+        self.codes = codes
+        self.values = [json.loads(value) for value in values]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> Any:
+        return self.values[self.codes[row]]
+
+
+class _RaggedIntBuilder:
+    def __init__(self):
+        self.data = array('q')
+        self.offsets = array('q', [0])
+
+    def append(self, values: Iterable[int]):
+        self.data.extend(values)
+        self.offsets.append(len(self.data))
+
+    def to_arrays(self, name: str) -> Dict[str, np.ndarray]:
+        data = np.frombuffer(self.data, dtype=np.int64)
+        return {
+            f'{name}.data': data.astype(_smallest_int_dtype(data)),
+            f'{name}.offsets': np.frombuffer(self.offsets, dtype=np.int64),
+        }
+
+
+class TokenizedText:
+    """Token ids of every manifest row, stored as one flat buffer with per-row offsets.
+
+    Args:
+        ids: concatenated token ids of all rows.
+        offsets: ``num_rows + 1`` offsets into ``ids``.
+        status: per-row ``TOKENS_*`` status code.
+        cache_dir: directory the arrays were memory-mapped from, if any. Used to re-open the arrays
+            instead of copying them when the object is pickled (e.g. for spawned dataloader workers).
+    """
+
+    def __init__(self, ids: np.ndarray, offsets: np.ndarray, status: np.ndarray, cache_dir: Optional[str] = None):
+        self.ids = ids
+        self.offsets = offsets
+        self.status = status
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def load(cls, cache_dir: str) -> 'TokenizedText':
+        return cls(
+            ids=_load_array(os.path.join(cache_dir, 'ids.npy')),
+            offsets=_load_array(os.path.join(cache_dir, 'offsets.npy')),
+            status=_load_array(os.path.join(cache_dir, 'status.npy')),
+            cache_dir=cache_dir,
+        )
+
+    def save(self, cache_dir: str):
+        _save_arrays(cache_dir, dict(ids=self.ids, offsets=self.offsets, status=self.status))
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def __getitem__(self, row: int) -> List[int]:
+        return self.ids[self.offsets[row] : self.offsets[row + 1]].tolist()
+
+    def __getstate__(self):
+        if self.cache_dir is not None:
+            return {'cache_dir': self.cache_dir}
+        return self.__dict__
+
+    def __setstate__(self, state):
+        if set(state.keys()) == {'cache_dir'}:
+            state = TokenizedText.load(state['cache_dir']).__dict__
+        self.__dict__.update(state)
+
+
+class TokenizedTextBuilder:
+    """Accumulates the token ids of consecutive rows into a :class:`TokenizedText`."""
+
+    def __init__(self):
+        self._ids = _RaggedIntBuilder()
+        self._status = bytearray()
+
+    def append(self, text_tokens: Optional[Iterable[int]], status: int = TOKENS_OK):
+        self._ids.append(text_tokens if text_tokens is not None else [])
+        self._status.append(status)
+
+    def __len__(self) -> int:
+        return len(self._status)
+
+    def finish(self) -> TokenizedText:
+        arrays = self._ids.to_arrays('tokens')
+        return TokenizedText(
+            ids=arrays['tokens.data'],
+            offsets=arrays['tokens.offsets'],
+            status=np.frombuffer(self._status, dtype=np.uint8),
+        )
+
+
+def _file_sha1(path: str) -> str:
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+# Tokenizer attributes that cache data derived from the rest of the state and are filled on first use.
+_LAZY_TOKENIZER_ATTRIBUTES = {'_inv_vocab_dict'}
+
+
+def _describe_tokenizer_state(value: Any, seen: Dict[int, int]) -> Any:
+    """Returns a JSON-serializable description of ``value`` that does not depend on the process.
+
+    Files and bytes are described by the hash of their content, sentencepiece, tiktoken and HuggingFace fast
+    tokenizers by the hash of their model, functions by their qualified name, and other objects by their class and
+    attributes. An object met again is described by its order of first appearance in ``seen``. Raises TypeError
+    for values that cannot be described.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        # vocabularies and models are identified by their content, not by their path
+        return {'file': _file_sha1(value)} if os.path.isfile(value) else value
+    if isinstance(value, (bytes, bytearray)):
+        return {'bytes': hashlib.sha1(value).hexdigest()}
+    if isinstance(value, (list, tuple)):
+        return [_describe_tokenizer_state(item, seen) for item in value]
+    if isinstance(value, (set, frozenset)):
+        items = [json.dumps(_describe_tokenizer_state(item, seen), sort_keys=True) for item in value]
+        return {'set': sorted(items)}
+    if isinstance(value, dict):
+        return [[_describe_tokenizer_state(k, seen), _describe_tokenizer_state(v, seen)] for k, v in value.items()]
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return {'array': f"{value.dtype.str}{value.shape}:{hashlib.sha1(value.tobytes()).hexdigest()}"}
+    if isinstance(value, (np.generic, re.Pattern)):
+        return repr(value)
+
+    if id(value) in seen:
+        return {'ref': seen[id(value)]}
+    seen[id(value)] = len(seen)
+    if isinstance(value, np.ndarray):
+        return {'objects': [_describe_tokenizer_state(item, seen) for item in value.ravel().tolist()]}
+    if hasattr(value, 'serialized_model_proto'):
+        # sentencepiece.SentencePieceProcessor
+        return {'model': hashlib.sha1(value.serialized_model_proto()).hexdigest()}
+    if hasattr(value, 'backend_tokenizer') and hasattr(value.backend_tokenizer, 'to_str'):
+        # HuggingFace fast tokenizer
+        return {'model': hashlib.sha1(value.backend_tokenizer.to_str().encode('utf-8')).hexdigest()}
+    if hasattr(value, '_mergeable_ranks') and hasattr(value, '_pat_str'):
+        # tiktoken.Encoding, its compiled BPE is derived from the ranks, pattern and special tokens
+        state = [value.name, value._pat_str, value._mergeable_ranks, value._special_tokens]
+        return {'model': _describe_tokenizer_state(state, seen)}
+    if isinstance(value, types.MethodType):
+        return {'method': value.__func__.__qualname__, 'self': _describe_tokenizer_state(value.__self__, seen)}
+    if isinstance(value, types.FunctionType) and '<' not in value.__qualname__:
+        return {'function': f"{value.__module__}.{value.__qualname__}"}
+    if isinstance(value, (types.FunctionType, types.BuiltinFunctionType)) or not hasattr(value, '__dict__'):
+        # lambdas and local functions may differ between objects with the same name
+        raise TypeError(f"Cannot describe the state of {type(value)}")
+    cls = type(value)
+    attributes = {
+        k: v
+        for k, v in sorted(vars(value).items())
+        if k not in _LAZY_TOKENIZER_ATTRIBUTES and not isinstance(getattr(cls, k, None), functools.cached_property)
+    }
+    return {'class': f"{cls.__module__}.{cls.__qualname__}", 'state': _describe_tokenizer_state(attributes, seen)}
+
+
+def tokenizer_cache_key(tokenizer: Any) -> Optional[str]:
+    """Returns a key identifying a tokenizer by its class, configuration and vocabulary or model file contents.
+
+    The key does not depend on the process or on the paths of the files, so that all ranks share the tokens
+    cached for the same tokenizer. Returns None if the state of the tokenizer cannot be
+    described (see `_describe_tokenizer_state`).
+    """
+    try:
+        state = json.dumps(_describe_tokenizer_state(tokenizer, {}), sort_keys=True)
+    except (TypeError, ValueError, RecursionError) as e:
+        logging.warning(f"Cannot derive a cache key for tokenizer {type(tokenizer).__name__}: {e}")
+        return None
+    cls = type(tokenizer)
+    return f"{cls.__module__}.{cls.__qualname__}:{hashlib.sha1(state.encode('utf-8')).hexdigest()}"
+
+
+def get_parser_cache_key(parser: Callable) -> Optional[str]:
+    """Returns a string identifying the tokenization performed by ``parser``.
+
+    Parsers may define a ``cache_key`` attribute, otherwise the key is derived like `tokenizer_cache_key`.
+    Returns None when no stable key can be derived, in which case tokens are not persisted. A ``cache_key`` of
+    None also means that the tokens must not be persisted.
+    """
+    if hasattr(parser, 'cache_key'):
+        return parser.cache_key
+    return tokenizer_cache_key(parser)
+
+
+# Parser of the tokenization pool worker, set once per process by `_init_tokenization_worker`.
+_worker_parser = None
+
+
+def _init_tokenization_worker(parser: Callable):
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _parse_text(parser: Callable, text: Any, lang: Optional[str]) -> Optional[List[int]]:
+    if lang is not None:
+        return parser(text, lang)
+    return parser(text)
+
+
+def _parse_texts(parser: Callable, chunk: List[Tuple[Any, Optional[str]]]) -> List[Optional[List[int]]]:
+    """Parses a chunk of ``(text, lang)`` pairs, with a single call to ``parser.batch_text_to_ids`` if it has one.
+
+    The batched call is used when all texts are strings, with either no language or a language for every text.
+    """
+    batch_text_to_ids = getattr(parser, 'batch_text_to_ids', None)
+    if batch_text_to_ids is not None and all(isinstance(text, str) for text, _ in chunk):
+        texts, langs = [text for text, _ in chunk], [lang for _, lang in chunk]
+        # the worker processes already use all CPUs, tokenizers should not start more threads
+        if all(lang is None for lang in langs):
+            return batch_text_to_ids(texts, num_threads=1)
+        if all(lang is not None for lang in langs):
+            return batch_text_to_ids(texts, langs, num_threads=1)
+    return [_parse_text(parser, text, lang) for text, lang in chunk]
+
+
+def _tokenize_chunk(chunk: List[Tuple[Any, Optional[str]]]) -> List[Optional[List[int]]]:
+    return _parse_texts(_worker_parser, chunk)
+
+
+def _get_tokenization_context(parser: Callable) -> Optional[mp.context.BaseContext]:
+    """Returns the multiprocessing context of the tokenization pool, or None if the pool cannot be used.
+
+    The default start method is used, except that spawn replaces fork once CUDA is initialized in this
+    process, as forked workers cannot use it. Without fork, the parser is pickled to the workers; if it
+    cannot be pickled, None is returned.
+    """
+    ctx = mp.get_context()
+    if ctx.get_start_method() == 'fork' and torch.cuda.is_initialized():
+        ctx = mp.get_context('spawn')
+    if ctx.get_start_method() != 'fork':
+        try:
+            pickle.dumps(parser)
+        except Exception as e:
+            logging.warning(
+                "Tokenizing in the current process: the parser cannot be sent to "
+                f"'{ctx.get_start_method()}' workers ({e})."
+            )
+            return None
+    return ctx
+
+
+def tokenize_texts(
+    parser: Callable,
+    texts: Iterable[Tuple[Any, Optional[str]]],
+    num_workers: Optional[int] = None,
+    chunk_size: int = 1024,
+) -> Iterator[Optional[List[int]]]:
+    """Yields ``parser(text)`` (or ``parser(text, lang)`` when ``lang`` is not None) for every ``(text, lang)``.
+
+    With ``num_workers > 1`` the texts are split into chunks of ``chunk_size`` that are tokenized on a
+    process pool; the results are still yielded in input order. Parsers with a ``batch_text_to_ids`` method
+    tokenize every chunk with a single call. The pool uses the default start method (see
+    `_get_tokenization_context`). It is shut down when the generator is exhausted or closed, so consumers
+    may stop early. The serial path calls the parser lazily, only for the texts that are consumed.
+
+    Args:
+        parser: callable converting a text (and optionally a language) to a list of token ids or None.
+        texts: iterable of ``(text, lang)`` pairs.
+        num_workers: number of processes to tokenize with. None, 0 or 1 tokenize in the current process.
+        chunk_size: number of texts sent to a worker at once.
+    """
+    ctx = _get_tokenization_context(parser) if num_workers and num_workers > 1 else None
+    if ctx is None:
+        for text, lang in texts:
+            yield _parse_text(parser, text, lang)
+        return
+
+    texts = iter(texts)
+    chunks = iter(lambda: list(itertools.islice(texts, chunk_size)), [])
+    # With fork, the parser is inherited by the workers through the initializer and does not need to be picklable.
+    with ctx.Pool(num_workers, initializer=_init_tokenization_worker, initargs=(parser,)) as pool:
+        for chunk_tokens in pool.imap(_tokenize_chunk, chunks):
+            yield from chunk_tokens
+
+
+def _manifest_fingerprint(manifests_files: List[str], parse_func: Optional[Callable]) -> str:
+    files = []
+    for manifest_file in manifests_files:
+        local_file = DataStoreObject(manifest_file).get()
+        stat = os.stat(os.path.expanduser(local_file))
+        files.append([str(manifest_file), stat.st_size, stat.st_mtime_ns])
+    parse_func_name = None if parse_func is None else f"{parse_func.__module__}.{parse_func.__qualname__}"
+    payload = json.dumps([__manifest_index_version__, files, parse_func_name])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def get_manifest_index_dir(
+    manifests_files: Union[str, List[str]],
+    parse_func: Optional[Callable] = None,
+    index_mapping_dir: Optional[str] = None,
+) -> str:
+    """Returns the directory of the index for the given manifests.
+
+    The directory name contains a hash of the manifest paths, sizes and modification times,
+    so modifying a manifest results in a new index.
+
+    Args:
+        manifests_files: manifest file or list of manifest files.
+        parse_func: optional custom manifest line parser, see :func:`manifest.item_iter`.
+        index_mapping_dir: directory to save the index to.
+            If None, will write to the same folder as the first manifest.
+    """
+    if isinstance(manifests_files, str):
+        manifests_files = [manifests_files]
+    fingerprint = _manifest_fingerprint(manifests_files, parse_func)
+    first_manifest = DataStoreObject(manifests_files[0]).get()
+    if index_mapping_dir is None:
+        index_mapping_dir = os.path.dirname(os.path.abspath(os.path.expanduser(first_manifest)))
+    return os.path.join(index_mapping_dir, f"{os.path.basename(first_manifest)}.{fingerprint[:16]}.manifest_index")
+
+
+class ManifestIndexBuilder:
+    """Accumulates manifest items into the columns of a :class:`ManifestIndex`, one row per item.
+
+    Items are dicts with the keys produced by :func:`manifest.item_iter`; only the columns of the
+    index are kept. Strings are concatenated into byte buffers and audio paths are interned, so the
+    memory used grows with the size of the data rather than with the number of Python objects.
+    """
+
+    def __init__(self):
+        self._durations = array('d')
+        self._offsets = array('d')
+        self._strings = {
+            name: _StringColumnBuilder(intern=name in ManifestIndex.INTERNED_COLUMNS)
+            for name in ManifestIndex.STRING_COLUMNS
+        }
+        self._categoricals = {name: _CategoricalColumnBuilder() for name in ManifestIndex.CATEGORICAL_COLUMNS}
+        self._token_labels = TokenizedTextBuilder()
+
+    def append(self, item: Dict[str, Any]):
+        duration, offset = item['duration'], item['offset']
+        self._durations.append(np.nan if duration is None else duration)
+        self._offsets.append(np.nan if offset is None else offset)
+        for name, builder in self._strings.items():
+            builder.append(item[name])
+        for name, builder in self._categoricals.items():
+            builder.append(item[name])
+        token_labels = item.get('token_labels', None)
+        self._token_labels.append(token_labels, status=token_labels is not None)
+
+    def __len__(self) -> int:
+        return len(self._durations)
+
+    def finish(self, **meta) -> 'ManifestIndex':
+        """Returns an in-memory :class:`ManifestIndex`, ``meta`` is stored with the index metadata."""
+        token_labels = self._token_labels.finish()
+        columns = {
+            'duration': np.frombuffer(self._durations, dtype=np.float64),
+            'offset': np.frombuffer(self._offsets, dtype=np.float64),
+            'token_labels.data': token_labels.ids,
+            'token_labels.offsets': token_labels.offsets,
+            'token_labels.present': token_labels.status.astype(bool),
+        }
+        for name, builder in self._strings.items():
+            columns.update(builder.to_arrays(name))
+        for name, builder in self._categoricals.items():
+            columns[f'{name}.codes'] = np.frombuffer(builder.codes, dtype=np.int32)
+
+        meta = dict(
+            version=__manifest_index_version__,
+            num_rows=len(self),
+            categorical_values={name: builder.values() for name, builder in self._categoricals.items()},
+            **meta,
+        )
+        return ManifestIndex(columns, meta)
+
+
+class ManifestIndex:
+    """Columnar, memory-mapped view of the items yielded by :func:`manifest.item_iter`.
+
+    Use :meth:`from_manifests` to load an existing index or to build it. Row ``i`` of the index
+    corresponds to the item with ``id == i``.
+
+    Args:
+        columns: mapping from array name to array.
+        meta: index metadata (column values of categorical columns, number of rows, ...).
+        index_dir: directory the index was loaded from, or None for an in-memory index.
+    """
+
+    CATEGORICAL_COLUMNS = ('speaker', 'orig_sr', 'lang')
+    STRING_COLUMNS = ('audio_file', 'text')
+    INTERNED_COLUMNS = ('audio_file',)
+
+    def __init__(self, columns: Dict[str, np.ndarray], meta: Dict[str, Any], index_dir: Optional[str] = None):
+        self.index_dir = index_dir
+        self.meta = meta
+        self.duration = columns['duration']
+        self.offset = columns['offset']
+        self._strings = {
+            name: _StringColumn(
+                columns[f'{name}.data'],
+                columns[f'{name}.offsets'],
+                is_json=columns.get(f'{name}.is_json', None),
+                codes=columns.get(f'{name}.codes', None),
+            )
+            for name in self.STRING_COLUMNS
+        }
+        self._categoricals = {
+            name: _CategoricalColumn(columns[f'{name}.codes'], meta['categorical_values'][name])
+            for name in self.CATEGORICAL_COLUMNS
+        }
+        self._token_labels = TokenizedText(
+            ids=columns['token_labels.data'],
+            offsets=columns['token_labels.offsets'],
+            status=columns['token_labels.present'],
+        )
+        self._tokens_cache = {}
+
+    @classmethod
+    def build(cls, manifests_files: Union[str, List[str]], parse_func: Optional[Callable] = None) -> 'ManifestIndex':
+        """Parses the manifests with :func:`manifest.item_iter` into an in-memory index."""
+        builder = ManifestIndexBuilder()
+        for item in manifest.item_iter(manifests_files, parse_func=parse_func):
+            builder.append(item)
+        return builder.finish(
+            manifests_files=[manifests_files] if isinstance(manifests_files, str) else list(manifests_files)
+        )
+
+    @classmethod
+    def load(cls, index_dir: str) -> 'ManifestIndex':
+        """Memory-maps an index previously written with :meth:`save`."""
+        with open(os.path.join(index_dir, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+        if meta.get('version') != __manifest_index_version__:
+            raise RuntimeError(
+                f"Version mismatch: Please delete the existing manifest index {index_dir}. Expected version = "
+                f"{__manifest_index_version__}, but index version = {meta.get('version')}."
+            )
+        columns = {
+            fn[: -len('.npy')]: _load_array(os.path.join(index_dir, fn))
+            for fn in os.listdir(index_dir)
+            if fn.endswith('.npy')
+        }
+        return cls(columns, meta, index_dir=index_dir)
+
+    def save(self, index_dir: str):
+        """Writes the index to ``index_dir``. The directory is published atomically."""
+        tmp_dir = f"{index_dir}.tmp-{uuid.uuid4().hex}"
+        os.makedirs(tmp_dir)
+        columns = {'duration': self.duration, 'offset': self.offset}
+        for name, column in self._strings.items():
+            columns.update(column.to_arrays(name))
+        for name, column in self._categoricals.items():
+            columns[f'{name}.codes'] = column.codes
+        columns['token_labels.data'] = self._token_labels.ids
+        columns['token_labels.offsets'] = self._token_labels.offsets
+        columns['token_labels.present'] = self._token_labels.status
+        _save_arrays(tmp_dir, columns)
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(self.meta, f)
+        _publish_dir(tmp_dir, index_dir)
+        self.index_dir = index_dir
+
+    @classmethod
+    def from_manifests(
+        cls,
+        manifests_files: Union[str, List[str]],
+        parse_func: Optional[Callable] = None,
+        index_mapping_dir: Optional[str] = None,
+    ) -> 'ManifestIndex':
+        """Loads the index of the given manifests, building and saving it first if it does not exist.
+
+        Concurrent callers (ranks on the same node, or on a shared filesystem) are serialized with a
+        file lock so that only the first one parses the manifests. If the index cannot be written
+        (e.g. read-only manifest directory), an in-memory index is returned.
+
+        Args:
+            manifests_files: manifest file or list of manifest files.
+            parse_func: optional custom manifest line parser, see :func:`manifest.item_iter`.
+            index_mapping_dir: directory to save the index to.
+                If None, will write to the same folder as the first manifest.
+        """
+        from filelock import FileLock
+
+        index_dir = get_manifest_index_dir(manifests_files, parse_func, index_mapping_dir)
+        if os.path.isdir(index_dir):
+            return cls.load(index_dir)
+        try:
+            os.makedirs(os.path.dirname(index_dir), exist_ok=True)
+            lock = FileLock(f"{index_dir}.lock")
+            with lock:
+                if not os.path.isdir(index_dir):
+                    logging.info(f"Building manifest index {index_dir}")
+                    cls.build(manifests_files, parse_func=parse_func).save(index_dir)
+        except OSError as e:
+            logging.warning(f"Could not write manifest index to {index_dir} ({e}), using an in-memory index.")
+            return cls.build(manifests_files, parse_func=parse_func)
+        return cls.load(index_dir)
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+    def __getstate__(self):
+        if self.index_dir is not None:
+            return {'index_dir': self.index_dir}
+        return self.__dict__
+
+    def __setstate__(self, state):
+        if set(state.keys()) == {'index_dir'}:
+            state = ManifestIndex.load(state['index_dir']).__dict__
+        self.__dict__.update(state)
+
+    def get_duration(self, row: int) -> Optional[float]:
+        duration = self.duration[row]
+        return None if np.isnan(duration) else float(duration)
+
+    def get_offset(self, row: int) -> Optional[float]:
+        offset = self.offset[row]
+        return None if np.isnan(offset) else float(offset)
+
+    def get_audio_file(self, row: int) -> Optional[str]:
+        return self._strings['audio_file'][row]
+
+    def get_text(self, row: int) -> Any:
+        return self._strings['text'][row]
+
+    def get_speaker(self, row: int) -> Any:
+        return self._categoricals['speaker'][row]
+
+    def get_orig_sr(self, row: int) -> Optional[int]:
+        return self._categoricals['orig_sr'][row]
+
+    def get_lang(self, row: int) -> Optional[str]:
+        return self._categoricals['lang'][row]
+
+    def get_token_labels(self, row: int) -> Optional[List[int]]:
+        if not self._token_labels.status[row]:
+            return None
+        return self._token_labels[row]
+
+    def tokenize(self, parser: Callable, num_workers: Optional[int] = None) -> TokenizedText:
+        """Tokenizes the text of every row with ``parser``.
+
+        Rows with ``token_labels`` in the manifest use them as-is, empty texts result in no tokens.
+
+        Args:
+            parser: callable converting a text (and a language for aggregate tokenizers) to token ids.
+            num_workers: number of processes to tokenize with, see :func:`tokenize_texts`.
+        """
+        is_aggregate = getattr(parser, 'is_aggregate', False)
+
+        def _mode(row: int) -> int:
+            if self._token_labels.status[row]:
+                return _MODE_LABELS
+            text = self.get_text(row)
+            if text == '':
+                return _MODE_EMPTY
+            if is_aggregate and isinstance(text, str):
+                return _MODE_MISSING_LANG if self.get_lang(row) is None else _MODE_PARSE_WITH_LANG
+            return _MODE_PARSE
+
+        modes = bytearray(_mode(row) for row in range(len(self)))
+        parse_jobs = (
+            (self.get_text(row), self.get_lang(row) if mode == _MODE_PARSE_WITH_LANG else None)
+            for row, mode in enumerate(modes)
+            if mode in (_MODE_PARSE, _MODE_PARSE_WITH_LANG)
+        )
+        parsed = tokenize_texts(parser, parse_jobs, num_workers=num_workers)
+
+        tokens = TokenizedTextBuilder()
+        for row, mode in enumerate(modes):
+            if mode == _MODE_LABELS:
+                tokens.append(self._token_labels[row])
+            elif mode == _MODE_EMPTY:
+                tokens.append([])
+            elif mode == _MODE_MISSING_LANG:
+                tokens.append(None, status=TOKENS_MISSING_LANG)
+            else:
+                text_tokens = next(parsed)
+                if text_tokens is None:
+                    tokens.append(None, status=TOKENS_PARSE_FAILED)
+                elif isinstance(text_tokens, str):
+                    parsed.close()
+                    raise ValueError("Manifest index requires a parser that converts text to token ids.")
+                else:
+                    tokens.append(text_tokens)
+        return tokens.finish()
+
+    def get_tokens(self, parser: Callable, num_workers: Optional[int] = None) -> TokenizedText:
+        """Returns the tokenized text of every row, loading it from the index cache when available.
+
+        Token ids are cached under ``tokens/<hash>`` in the index directory, keyed by
+        :func:`get_parser_cache_key`, and are computed once per index and parser.
+
+        Args:
+            parser: callable converting a text (and a language for aggregate tokenizers) to token ids.
+            num_workers: number of processes to tokenize with when the cache is built.
+        """
+        key = get_parser_cache_key(parser)
+        if key is None or self.index_dir is None:
+            if key is None:
+                logging.info("Parser does not provide a stable cache key, tokens will not be cached.")
+            return self.tokenize(parser, num_workers=num_workers)
+
+        if key in self._tokens_cache:
+            return self._tokens_cache[key]
+
+        from filelock import FileLock
+
+        cache_dir = os.path.join(self.index_dir, 'tokens', hashlib.sha1(key.encode('utf-8')).hexdigest()[:16])
+        if not os.path.isdir(cache_dir):
+            try:
+                os.makedirs(os.path.dirname(cache_dir), exist_ok=True)
+                with FileLock(f"{cache_dir}.lock"):
+                    if not os.path.isdir(cache_dir):
+                        logging.info(f"Tokenizing manifest index into {cache_dir}")
+                        tmp_dir = f"{cache_dir}.tmp-{uuid.uuid4().hex}"
+                        os.makedirs(tmp_dir)
+                        self.tokenize(parser, num_workers=num_workers).save(tmp_dir)
+                        with open(os.path.join(tmp_dir, 'key.txt'), 'w') as f:
+                            f.write(key)
+                        _publish_dir(tmp_dir, cache_dir)
+            except OSError as e:
+                logging.warning(f"Could not write token cache to {cache_dir} ({e}), tokens will not be cached.")
+                return self.tokenize(parser, num_workers=num_workers)
+
+        tokens = TokenizedText.load(cache_dir)
+        self._tokens_cache[key] = tokens
+        return tokens
@@ -17,6 +17,7 @@ A collection of simple character based parsers. These parser handle cleaning and
 We currently support English.
 """
 
+import json
 import string
 from typing import List, Optional
 
@@ -78,6 +79,14 @@ class CharParser:
         text_tokens = self._tokenize(text)
         return text_tokens
 
+    @property
+    def cache_key(self) -> str:
+        """String identifying the parser configuration, used to cache parsed manifests."""
+        # derived lookup tables are skipped: sets do not have a stable order across processes
+        config = {k: v for k, v in vars(self).items() if k not in ('_labels_map', '_special_labels', '_table')}
+        cls = type(self)
+        return f"{cls.__module__}.{cls.__qualname__}:{json.dumps(config, sort_keys=True, default=str)}"
+
     def _normalize(self, text: str) -> Optional[str]:
         text = text.strip()
 
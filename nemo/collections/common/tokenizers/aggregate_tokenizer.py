@@ -78,33 +78,42 @@ class AggregateTokenizer(TokenizerSpec):
 
         # lookup tables to speed up token to text operations
         # if there are two tokenizers, [0,1], ['en', 'es'], each with 128 tokens, the aggregate tokenizer
-        # token range will be [0,255]. The below method provides three look up tables:
-        # one, to convert the incoming token id -- e.g. 200 into its real id (200-127 = 73)
-        # second, to compute the tokenizer id that should process that token (1)
+        # token range will be [0,255]. The below method provides three look up arrays:
+        # one, to convert the incoming token id -- e.g. 200 into its real id (200-128 = 72)
+        # second, to compute the number of the tokenizer that should process that token (1)
         # third, the compute the lang id for that token ('es')
-        offset_token_ids_by_token_id, tokenizers_by_token_id, langs_by_token_id = self._calculate_offsets()
-
-        self.offset_token_ids_by_token_id = offset_token_ids_by_token_id
-        self.tokenizers_by_token_id = tokenizers_by_token_id
-        self.langs_by_token_id = langs_by_token_id
+        self.offset_token_ids_by_token_id, self.tokenizer_nums_by_token_id = self._calculate_offsets()
+        self.tokenizers_list = list(self.tokenizers_dict.values())
+        self.langs_list = list(self.tokenizers_dict.keys())
+        self.tokenizers_by_token_id = self._object_array(self.tokenizers_list)[self.tokenizer_nums_by_token_id]
+        self.langs_by_token_id = self._object_array(self.langs_list)[self.tokenizer_nums_by_token_id]
 
     def _calculate_offsets(self):
-        offsets = {}
-        tokenizers = {}
-        langs = {}
-        cur_num = 0
-        tot = len(self.tokenizers_dict)
-        for id in range(len(self.vocabulary)):
-            off_id = id - list(self.token_id_offset.values())[cur_num]
-            if cur_num + 1 < tot:
-                if id >= list(self.token_id_offset.values())[cur_num + 1]:
-                    cur_num += 1
-                    off_id = id - list(self.token_id_offset.values())[cur_num]
-            offsets[id] = off_id
-            tokenizers[id] = list(self.tokenizers_dict.values())[cur_num]
-            langs[id] = list(self.tokenizers_dict.keys())[cur_num]
-
-        return offsets, tokenizers, langs
+        tokenizer_sizes = [len(tokenizer.vocab) for tokenizer in self.tokenizers_dict.values()]
+        tokenizer_nums = np.repeat(np.arange(len(tokenizer_sizes)), tokenizer_sizes)
+        offsets = np.array(list(self.token_id_offset.values()), dtype=np.int64)
+        offset_token_ids = np.arange(len(tokenizer_nums), dtype=np.int64) - offsets[tokenizer_nums]
+        return offset_token_ids, tokenizer_nums
+
+    @staticmethod
+    def _object_array(items):
+        array = np.empty(len(items), dtype=object)
+        array[:] = items
+        return array
+
+    def _split_by_tokenizer(self, ids):
+        """
+        Splits ids into runs of consecutive ids of the same tokenizer.
+        Returns the ids offset to their tokenizer and a list of (tokenizer number, start, end) for every run.
+        """
+        if isinstance(ids, torch.Tensor):
+            ids = ids.cpu().numpy()
+        ids = np.asarray(ids, dtype=np.int64)
+        tokenizer_nums = self.tokenizer_nums_by_token_id[ids]
+        boundaries = (np.flatnonzero(tokenizer_nums[1:] != tokenizer_nums[:-1]) + 1).tolist()
+        starts, ends = [0] + boundaries, boundaries + [len(ids)]
+        runs = [(int(tokenizer_nums[start]), start, end) for start, end in zip(starts, ends) if end > start]
+        return self.offset_token_ids_by_token_id[ids], runs
 
     def text_to_tokens(self, text, lang_id):
         tokenizer = self.tokenizers_dict[lang_id]
@@ -117,6 +126,28 @@ class AggregateTokenizer(TokenizerSpec):
 
         return token_ids
 
+    def batch_text_to_ids(self, texts: List[str], lang_ids: Union[str, List[str]], num_threads: int = 1):
+        """
+        Converts a batch of texts to token IDs. lang_ids is the language of every text, or of all of them.
+        The texts of every language are converted with a single call to batch_text_to_ids of its tokenizer, unless
+        text_to_ids is overriden by a child-class.
+        """
+        if isinstance(lang_ids, str):
+            lang_ids = [lang_ids] * len(texts)
+        if type(self).text_to_ids is not AggregateTokenizer.text_to_ids:
+            return [self.text_to_ids(text, lang_id) for text, lang_id in zip(texts, lang_ids)]
+        batch_token_ids = [None] * len(texts)
+        for lang_id in dict.fromkeys(lang_ids):
+            positions = [i for i, text_lang_id in enumerate(lang_ids) if text_lang_id == lang_id]
+            lang_token_ids = self.tokenizers_dict[lang_id].batch_text_to_ids(
+                [texts[i] for i in positions], num_threads=num_threads
+            )
+            offset = self.token_id_offset[lang_id]
+            for i, token_ids in zip(positions, lang_token_ids):
+                batch_token_ids[i] = [t + offset for t in token_ids]
+
+        return batch_token_ids
+
     def tokens_to_text(self, tokens, lang_id):
         if isinstance(tokens, np.ndarray):
             tokens = tokens.tolist()
@@ -125,43 +156,37 @@ class AggregateTokenizer(TokenizerSpec):
         return tokenizer.decode_pieces(tokens)
 
     def ids_to_text(self, ids):
-        if isinstance(ids, (np.ndarray, torch.Tensor)):
-            ids = ids.tolist()
-
-        tokens = []
-        for id in ids:
-            offset_id = self.offset_token_ids_by_token_id[id]
-            tokenizer = self.tokenizers_by_token_id[id]
-            tokens.extend(tokenizer.ids_to_tokens([offset_id]))
+        tokens = self.ids_to_tokens(ids)
         text = ''.join(tokens).replace('▁', ' ')
 
         return text
 
+    def batch_ids_to_text(self, ids_list: List[List[int]], num_threads: int = 1) -> List[str]:
+        """Converts a batch of token IDs back to texts, decoding the runs of ids of every tokenizer at once."""
+        ids_list = [ids.tolist() if isinstance(ids, (np.ndarray, torch.Tensor)) else ids for ids in ids_list]
+        tokens = self.ids_to_tokens([id for ids in ids_list for id in ids])
+        ends = np.cumsum([len(ids) for ids in ids_list]).tolist()
+        return [''.join(tokens[end - len(ids) : end]).replace('▁', ' ') for ids, end in zip(ids_list, ends)]
+
     def token_to_id(self, token, lang_id):
         tokenizer = self.tokenizers_dict[lang_id]
         return tokenizer.token_to_id(token) + self.token_id_offset[lang_id]
 
     def ids_to_tokens(self, ids):
+        offset_ids, runs = self._split_by_tokenizer(ids)
         tokens = []
-
-        for id in ids:
-            offset_id = self.offset_token_ids_by_token_id[id]
-            tokenizer = self.tokenizers_by_token_id[id]
-            token = tokenizer.ids_to_tokens([offset_id])[0]
-            tokens.append(token)
+        for tokenizer_num, start, end in runs:
+            tokens.extend(self.tokenizers_list[tokenizer_num].ids_to_tokens(offset_ids[start:end].tolist()))
 
         return tokens
 
     def ids_to_text_and_langs(self, ids):
         text_and_langs = []
 
-        for id in ids:
-            offset_id = self.offset_token_ids_by_token_id[id]
-            tokenizer = self.tokenizers_by_token_id[id]
-            token = tokenizer.ids_to_tokens([offset_id])[0]
+        langs = self.langs_by_token_id[np.asarray(ids, dtype=np.int64)]
+        for token, lang in zip(self.ids_to_tokens(ids), langs):
             text = token.replace('▁', ' ')
             text = text.strip()  # strip for display purposes
-            lang = self.langs_by_token_id[id]
             text_and_langs.append({'char': text, 'lang': lang})
 
         return text_and_langs
@@ -169,49 +194,28 @@ class AggregateTokenizer(TokenizerSpec):
     def ids_to_words_and_langs(self, ids):
         words_and_langs = []
 
-        word_ids = []  # tokens belonging to the current word
-        for id in ids:
-            offset_id = self.offset_token_ids_by_token_id[id]
-            tokenizer = self.tokenizers_by_token_id[id]
-            token = tokenizer.ids_to_tokens([offset_id])[0]
-            if token.startswith('▁'):
-                if len(word_ids) > 0:  # if this isn't the first word
-                    word = self.ids_to_text(word_ids)
-                    word = word.strip()  # strip for display purposes
-                    lang = self.ids_to_lang(word_ids)
-                    wl = {'word': word, 'lang': lang}
-                    words_and_langs.append(wl)
-                word_ids = []
-            word_ids.append(id)
-
-        if len(word_ids) > 0:  # the last tokens
-            word = self.ids_to_text(word_ids)
+        ids = np.asarray(ids, dtype=np.int64)
+        tokens = self.ids_to_tokens(ids)
+        # every word starts with a token starting with '▁', or at the first token
+        word_starts = [i for i, token in enumerate(tokens) if i == 0 or token.startswith('▁')]
+        for start, end in zip(word_starts, word_starts[1:] + [len(tokens)]):
+            word = ''.join(tokens[start:end]).replace('▁', ' ')
             word = word.strip()  # strip for display purposes
-            lang = self.ids_to_lang(word_ids)
-            wl = {'word': word, 'lang': lang}
-            words_and_langs.append(wl)
+            lang = self.ids_to_lang(ids[start:end])
+            words_and_langs.append({'word': word, 'lang': lang})
 
         return words_and_langs
 
     def ids_to_lang(self, ids):
-        lang_cnts = {}
-
-        for id in ids:
-            lang = self.langs_by_token_id[id]
-            lang_cnt = lang_cnts.get(lang)
-            if lang_cnt is not None:
-                lang_cnts[lang] = lang_cnt + 1
-            else:
-                lang_cnts[lang] = 1
-
-        max_lang = ''
-        max_lang_cnt = -1
-        for lang, lang_cnt in lang_cnts.items():
-            if lang_cnt > max_lang_cnt:
-                max_lang = lang
-                max_lang_cnt = lang_cnt
-
-        return max_lang
+        if len(ids) == 0:
+            return ''
+
+        # the most frequent language, the first one to appear in ids in case of a tie
+        tokenizer_nums = self.tokenizer_nums_by_token_id[np.asarray(ids, dtype=np.int64)]
+        lang_cnts = np.bincount(tokenizer_nums, minlength=len(self.langs_list))
+        max_lang_num = tokenizer_nums[np.argmax(lang_cnts[tokenizer_nums] == lang_cnts.max())]
+
+        return self.langs_list[max_lang_num]
 
     def tokens_to_ids(self, tokens: Union[str, List[str]], langs: Union[str, List[str]]) -> Union[int, List[int]]:
         if isinstance(tokens, str):
@@ -16,7 +16,7 @@ from typing import List, Optional
 
 from transformers import AutoTokenizer as AUTOTOKENIZER
 
-from nemo.collections.common.tokenizers.tokenizer_spec import TokenizerSpec
+from nemo.collections.common.tokenizers.tokenizer_spec import TokenizerSpec, map_in_threads
 from nemo.utils import logging
 
 __all__ = [
@@ -339,6 +339,47 @@ class AutoTokenizer(TokenizerSpec):
         text = self.tokens_to_text(tokens_clean)
         return text
 
+    def batch_text_to_ids(self, texts: List[str], num_threads: int = 1) -> List[List[int]]:
+        """
+        Converts a batch of texts to token IDs.
+
+        Fast tokenizers encode the batch with a single call to their (multi-threaded) Rust backend, whose number of
+        threads is set by the RAYON_NUM_THREADS environment variable. Other tokenizers run text_to_ids on a pool of
+        num_threads threads.
+
+        Args:
+            texts (List[str]): Input texts to be converted to IDs.
+            num_threads (int): Number of threads used by tokenizers without a Rust backend.
+
+        Returns:
+            List[List[int]]: List of token IDs of every text.
+        """
+        if not self.tokenizer.is_fast:
+            return super().batch_text_to_ids(texts, num_threads)
+        return self.tokenizer(texts, add_special_tokens=self.include_special_tokens)["input_ids"]
+
+    def batch_ids_to_text(
+        self, ids_list: List[List[int]], remove_special_tokens: bool = True, num_threads: int = 1
+    ) -> List[str]:
+        """
+        Converts a batch of token IDs back to texts.
+
+        Fast tokenizers decode the batch with a single call to their (multi-threaded) Rust backend. Other tokenizers
+        run ids_to_text on a pool of num_threads threads.
+
+        Args:
+            ids_list (List[List[int]]): List of token IDs of every text.
+            remove_special_tokens (bool): Whether to remove special tokens from the output texts.
+            num_threads (int): Number of threads used by tokenizers without a Rust backend.
+
+        Returns:
+            List[str]: The reconstructed texts.
+        """
+        if not self.tokenizer.is_fast:
+            return map_in_threads(lambda ids: self.ids_to_text(ids, remove_special_tokens), ids_list, num_threads)
+        ids_list = [ids.tolist() if hasattr(ids, "tolist") else list(ids) for ids in ids_list]
+        return self.tokenizer.backend_tokenizer.decode_batch(ids_list, skip_special_tokens=remove_special_tokens)
+
     @property
     def vocab(self):
         """
@@ -230,6 +230,19 @@ class SentencePieceTokenizer(TokenizerSpec, ChatTemplateMixin):
 
         return self.tokenizer.decode_ids(ids)
 
+    def batch_text_to_ids(self, texts: List[str], num_threads: int = 1) -> List[List[int]]:
+        """Converts a batch of texts to token IDs with SentencePiece batch encoding on num_threads threads."""
+        if self.legacy or (self.removed_extra_spaces and not self.ignore_extra_whitespaces):
+            return super().batch_text_to_ids(texts, num_threads)
+        return self.tokenizer.encode(texts, out_type=int, num_threads=num_threads or 1)
+
+    def batch_ids_to_text(self, ids_list: List[List[int]], num_threads: int = 1) -> List[str]:
+        """Converts a batch of token IDs back to texts with SentencePiece batch decoding on num_threads threads."""
+        if self.legacy:
+            return super().batch_ids_to_text(ids_list, num_threads)
+        ids_list = [ids.tolist() if isinstance(ids, (np.ndarray, torch.Tensor)) else ids for ids in ids_list]
+        return self.tokenizer.decode(ids_list, num_threads=num_threads or 1)
+
     def token_to_id(self, token):
         if self.legacy and token in self.special_token_to_id:
             return self.special_token_to_id[token]
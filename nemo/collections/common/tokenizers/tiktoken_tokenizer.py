@@ -169,6 +169,11 @@ class TiktokenTokenizer(TokenizerSpec):
         tokens = [t + self.num_special_tokens for t in tokens]
         return tokens
 
+    def batch_text_to_ids(self, texts: List[str], num_threads: int = 1) -> List[List[int]]:
+        """Converts a batch of texts to token IDs with tiktoken batch encoding on num_threads threads."""
+        batch_tokens = self.tokenizer.encode_batch(texts, num_threads=num_threads or 1)
+        return [[t + self.num_special_tokens for t in tokens] for tokens in batch_tokens]
+
     def ids_to_text(
         self, tokens: List[int], remove_special_tokens: bool = True
     ):  # Filter out special tokens and adjust the remaining tokens
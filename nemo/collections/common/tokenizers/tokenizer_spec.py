@@ -14,11 +14,21 @@
 
 from abc import ABC, abstractmethod
 from collections import OrderedDict
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
 
 __all__ = ['TokenizerSpec']
 
 
+def map_in_threads(fn: Callable, items: List, num_threads: int = 1) -> List:
+    """Returns [fn(item) for item in items], computed by a pool of num_threads threads if more than one."""
+    num_threads = min(len(items), num_threads or 1)
+    if num_threads <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(num_threads) as executor:
+        return list(executor.map(fn, items))
+
+
 class TokenizerSpec(ABC):
     """
     Inherit this class to implement a new tokenizer.
@@ -54,6 +64,22 @@ class TokenizerSpec(ABC):
         """Converts token IDs back to text."""
         pass
 
+    def batch_text_to_ids(self, texts: List[str], num_threads: int = 1) -> List[List[int]]:
+        """
+        Converts a batch of texts to token IDs.
+        Tokenizers with a batched backend override it, others run text_to_ids serially, or on a pool of num_threads
+        threads if num_threads is more than one.
+        """
+        return map_in_threads(self.text_to_ids, texts, num_threads)
+
+    def batch_ids_to_text(self, ids_list: List[List[int]], num_threads: int = 1) -> List[str]:
+        """
+        Converts a batch of token IDs back to texts.
+        Tokenizers with a batched backend override it, others run ids_to_text serially, or on a pool of num_threads
+        threads if num_threads is more than one.
+        """
+        return map_in_threads(self.ids_to_text, ids_list, num_threads)
+
     def add_special_tokens(self, special_tokens: List[str]):
         """Adds special tokens (eos, pad, cls...) to vocab."""
         raise NotImplementedError("To be implemented")
@@ -26,6 +26,7 @@ from datasets import load_dataset
 
 from nemo.collections.common.tokenizers import TokenizerSpec
 from nemo.collections.llm.gpt.data.utils import (
+    _EpochPermutationSampleMapping,
     _get_samples_mapping,
     _JSONLMemMapDataset,
     _OnlineSampleMapping,
@@ -35,6 +36,7 @@ from nemo.collections.llm.gpt.data.utils import (
 )
 from nemo.core.classes import Dataset
 from nemo.lightning.base import NEMO_DATASETS_CACHE
+from nemo.utils.sequence_packing_utils import PackedSequenceData, is_packed_sequence_dir
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +113,7 @@ def create_sft_dataset(
             use_hf_tokenizer_chat_template=use_hf_tokenizer_chat_template,
             **kwargs,
         )
-    elif path.suffix == '.npy':
+    elif path.suffix == '.npy' or is_packed_sequence_dir(path):
         return GPTSFTPackedDataset(
             pack_metadata_file_path=pack_metadata_file_path,
             pad_cu_seqlens=pad_cu_seqlens,
@@ -687,35 +689,38 @@ class GPTSFTPackedDataset(GPTSFTDataset):
     def __getitem__(self, idx):
         if self.samples_mapping is not None:
             # assert idx < len(self.samples_mapping)
-            idx = self.samples_mapping[idx]
+            idx, _, _ = self.samples_mapping[idx]
 
-        input_ids = self.indexed_dataset[idx]['input_ids']
-        seq_boundaries = self.indexed_dataset[idx]['seq_start_id'] + [len(input_ids)]
-        loss_mask = self.indexed_dataset[idx]['loss_mask']
+        item = self.indexed_dataset[idx]
+        input_ids = item['input_ids']
+        seq_boundaries = item['seq_start_id'] + [len(input_ids)]
+        loss_mask = item['loss_mask']
         if idx < 0:
             loss_mask = [0] * len(loss_mask)
         return {'input_ids': input_ids, 'seq_boundaries': seq_boundaries, 'loss_mask': loss_mask}
 
     def _load_dataset(self):
         try:
-            self.indexed_dataset = np.load(self.file_path, allow_pickle=True)
+            if is_packed_sequence_dir(self.file_path):
+                self.indexed_dataset = PackedSequenceData(self.file_path)
+            else:
+                self.indexed_dataset = np.load(self.file_path, allow_pickle=True)
         except Exception as e:
             logger.error(
-                f"Failed to load packed dataset. The dataset should be a `.npy` file. "
+                f"Failed to load packed dataset. The dataset should be a `.npy` file or a directory written by "
+                f"`PackedSequenceWriter`. "
                 f"Please check if the packed dataset was prepared correctly. The original error was:\n {e}",
             )
             exit(1)
 
     def _build_samples_mapping(self):
         if self.max_num_samples is not None:
-            # custom samples mapping logic, following the format for unpacked sft dataset
             # Note: this is epoch-level shuffling, i.e. sampling without replacement until end of epoch, then repeat.
             # Unpacked dataset shuffles by sampling with replacement indefinitely.
-            dataset_len = len(self.indexed_dataset)
-            max_num_epochs = np.ceil(self.max_num_samples / dataset_len)
-            indices = np.arange(dataset_len)[None, :].repeat(max_num_epochs, axis=0)
-            [np.random.shuffle(x) for x in indices]
-            self.samples_mapping = indices.reshape(1, -1).squeeze()[: self.max_num_samples]
+            # The permutation of every epoch is computed on the fly, nothing of the size of the schedule is built.
+            self.samples_mapping = _EpochPermutationSampleMapping(
+                dataset_size=len(self.indexed_dataset), num_samples=self.max_num_samples, seed=self.seed
+            )
         else:
             self.samples_mapping = None
 
@@ -120,29 +120,30 @@ class FineTuningDataModule(pl.LightningDataModule):
         Prepare packed sequence data
         """
         if self.packed_sequence_size > 0:
-            from nemo.collections.llm.gpt.data.packed_sequence import prepare_packed_sequence_data
-
-            if not self.train_path_packed.is_file():
-                prepare_packed_sequence_data(
-                    input_path=self.train_path,
-                    output_path=self.train_path_packed,
-                    packed_sequence_size=self.packed_sequence_size,
-                    tokenizer=self.tokenizer,
-                    max_seq_length=self.seq_length,
-                    seed=self.seed,
-                    output_metadata_path=self.pack_metadata,
-                )
-
-            if not self.validation_path_packed.is_file():
-                prepare_packed_sequence_data(
-                    input_path=self.validation_path,
-                    output_path=self.validation_path_packed,
-                    packed_sequence_size=self.packed_sequence_size,
-                    tokenizer=self.tokenizer,
-                    max_seq_length=self.seq_length,
-                    seed=self.seed,
-                    output_metadata_path=self.pack_metadata,
-                )
+            self._prepare_packed_sequence_data(self.train_path, self.train_path_packed)
+            self._prepare_packed_sequence_data(self.validation_path, self.validation_path_packed)
+
+    def _prepare_packed_sequence_data(self, input_path: Path, output_path: Path) -> None:
+        """Packs a split, or converts it if it was packed to a `.npy` file before the flat format was the default."""
+        from nemo.collections.llm.gpt.data.packed_sequence import prepare_packed_sequence_data
+        from nemo.utils.sequence_packing_utils import convert_packed_sequence_data, is_packed_sequence_dir
+
+        if output_path.is_file() or is_packed_sequence_dir(output_path):
+            return
+        legacy_path = output_path.with_suffix('.npy')
+        if output_path.suffix != '.npy' and legacy_path.is_file():
+            convert_packed_sequence_data(legacy_path, output_path)
+        else:
+            prepare_packed_sequence_data(
+                input_path=input_path,
+                output_path=output_path,
+                packed_sequence_size=self.packed_sequence_size,
+                tokenizer=self.tokenizer,
+                max_seq_length=self.seq_length,
+                seed=self.seed,
+                output_metadata_path=self.pack_metadata,
+                num_workers=self.packed_sequence_specs.tokenization_num_workers,
+            )
 
     def setup(self, stage: str):
         """Called by pytorch lightning in datamodule setup"""
@@ -293,23 +294,23 @@ class FineTuningDataModule(pl.LightningDataModule):
 
     @property
     def train_path_packed(self) -> Path:
-        """Path to training dataset file for packed sequence. The file path contains a reference to the
+        """Path to training dataset directory for packed sequence. The path contains a reference to the
         tokenizer/model name since packed sequence dataset consists of tokenized indices."""
         if self.packed_sequence_size > 0:
             if self.packed_sequence_specs.packed_train_data_path is not None:
                 return self.packed_sequence_specs.packed_train_data_path
-            return self.default_pack_path / f"training_{self.packed_sequence_size}.npy"
+            return self.default_pack_path / f"training_{self.packed_sequence_size}"
         else:
             raise ValueError("`train_path_packed` invalid since packed sequence size is not specified.")
 
     @property
     def validation_path_packed(self) -> Path:
-        """Path to validation dataset file for packed sequence. The file path contains a reference to the
+        """Path to validation dataset directory for packed sequence. The path contains a reference to the
         tokenizer/model name since packed sequence dataset consists of tokenized indices."""
         if self.packed_sequence_size > 0:
             if self.packed_sequence_specs.packed_val_data_path is not None:
                 return self.packed_sequence_specs.packed_val_data_path
-            return self.default_pack_path / f"validation_{self.packed_sequence_size}.npy"
+            return self.default_pack_path / f"validation_{self.packed_sequence_size}"
         else:
             raise ValueError("`validation_path_packed` invalid since packed sequence size is not specified.")
 
@@ -12,16 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import json
+import multiprocessing as mp
+import os
+import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional
 
 import numpy as np
+from tqdm import tqdm
 
 from nemo.collections.common.tokenizers import TokenizerSpec
 from nemo.collections.llm.gpt.data.core import create_sft_dataset
 from nemo.utils import logging
-from nemo.utils.sequence_packing_utils import create_hist, create_packing_strategy, fill_packing_strategy
+from nemo.utils.sequence_packing_utils import (
+    PackedSequenceWriter,
+    create_packing_strategy,
+    is_packed_sequence_dir,
+)
 
 
 def tokenize_dataset(path: Path, tokenizer: TokenizerSpec, max_seq_length: int, seed: int):
@@ -48,6 +57,135 @@ def tokenize_dataset(path: Path, tokenizer: TokenizerSpec, max_seq_length: int,
     return np.array([dataset[i] for i in range(len(dataset))])
 
 
+# Dataset of the tokenization pool worker, set once per process by `_init_tokenization_worker`.
+_worker_dataset = None
+
+
+def _init_tokenization_worker(dataset):
+    global _worker_dataset
+    _worker_dataset = dataset
+
+
+def _tokenize_shard(dataset, chunk_dir: str, shard: int, start: int, end: int) -> np.ndarray:
+    """
+    Tokenizes the samples [start, end) of `dataset` and saves them to `chunk_dir` as flat token ids,
+    offsets and answer start indices.
+
+    Returns:
+        np.ndarray: The sequence lengths of the samples, i.e. their number of tokens minus 1.
+    """
+    input_ids, offsets, answer_start_idx = [], [0], []
+    for i in range(start, end):
+        item = dataset[i]
+        input_ids.append(np.asarray(item['input_ids'], dtype=np.int64))
+        offsets.append(offsets[-1] + len(item['input_ids']))
+        answer_start_idx.append(item['answer_start_idx'])
+    prefix = os.path.join(chunk_dir, f"{shard:06d}")
+    np.save(f"{prefix}.input_ids.npy", np.concatenate(input_ids) if input_ids else np.zeros(0, dtype=np.int64))
+    np.save(f"{prefix}.offsets.npy", np.array(offsets, dtype=np.int64))
+    np.save(f"{prefix}.answer_start_idx.npy", np.array(answer_start_idx, dtype=np.int64))
+    # Minus 1 here to account for the fact that transformer input and label
+    # have one less token than the full sequence (see `create_hist`).
+    return np.diff(offsets) - 1
+
+
+def _tokenize_shard_star(args) -> np.ndarray:
+    return _tokenize_shard(_worker_dataset, *args)
+
+
+def tokenize_dataset_to_chunks(
+    dataset, chunk_dir: str, num_workers: Optional[int] = None, shard_size: int = 10000
+) -> Iterator[np.ndarray]:
+    """
+    Tokenizes a dataset shard by shard into `chunk_dir` (see `_tokenize_shard`), so only one shard per worker
+    is in memory at a time.
+
+    Args:
+        dataset: The SFT dataset, e.g. from `create_sft_dataset`.
+        chunk_dir (str): Directory to write the tokenized shards to.
+        num_workers (Optional[int]): Number of processes to tokenize with. None, 0 or 1 tokenize in the
+            current process.
+        shard_size (int): Number of samples per shard.
+
+    Yields:
+        np.ndarray: The sequence lengths of the samples of every shard, in order.
+    """
+    shards = [
+        (chunk_dir, shard, start, min(start + shard_size, len(dataset)))
+        for shard, start in enumerate(range(0, len(dataset), shard_size))
+    ]
+    if not num_workers or num_workers <= 1:
+        for args in shards:
+            yield _tokenize_shard(dataset, *args)
+        return
+
+    # The dataset is inherited by forked workers through the initializer, it does not need to be picklable.
+    ctx = mp.get_context("fork")
+    with ctx.Pool(num_workers, initializer=_init_tokenization_worker, initargs=(dataset,)) as pool:
+        yield from pool.imap(_tokenize_shard_star, shards)
+
+
+def fill_packing_strategy_from_chunks(
+    assignments: List[List[int]], seq_lens: np.ndarray, chunk_dir: str, shard_size: int, pad_id: int
+) -> Iterator[Dict]:
+    """
+    Streaming version of `fill_packing_strategy` for samples tokenized by `tokenize_dataset_to_chunks`.
+
+    The packs are yielded one by one and read their samples from the memory-mapped shards. The samples of every
+    length are drawn in the same random order as `fill_packing_strategy`, so the packs are identical.
+
+    Args:
+        assignments (List[List[int]]): Sequence lengths of every pack (output of `create_packing_strategy`).
+        seq_lens (np.ndarray): Sequence length of every sample.
+        chunk_dir (str): Directory of the tokenized shards.
+        shard_size (int): Number of samples per shard.
+        pad_id (int): The tokenizer's padding token.
+
+    Yields:
+        Dict: Packs with `input_ids`, `loss_mask` and `seq_start_id`.
+    """
+    # samples of every length in dataset order, then permuted as in `fill_packing_strategy`
+    order = np.argsort(seq_lens, kind='stable')
+    bounds = np.searchsorted(seq_lens[order], np.arange(seq_lens.max() + 2))
+    samples, remaining = {}, {}
+    for seq_len in range(len(bounds) - 1):
+        per_seq_samples = order[bounds[seq_len] : bounds[seq_len + 1]]
+        if len(per_seq_samples) > 0:
+            samples[seq_len] = per_seq_samples[np.random.permutation(len(per_seq_samples))]
+            remaining[seq_len] = len(per_seq_samples)
+
+    shards = {}
+
+    def read_sample(idx):
+        shard, local_idx = divmod(int(idx), shard_size)
+        if shard not in shards:
+            prefix = os.path.join(chunk_dir, f"{shard:06d}")
+            shards[shard] = [
+                np.load(f"{prefix}.{name}.npy", mmap_mode='r') for name in ('input_ids', 'offsets', 'answer_start_idx')
+            ]
+        input_ids, offsets, answer_start_idx = shards[shard]
+        return input_ids[offsets[local_idx] : offsets[local_idx + 1]], answer_start_idx[local_idx]
+
+    for assignment in assignments:
+        input_ids, loss_mask, seq_start_id = [], [], []
+        num_tokens = 0
+        for seq_length in assignment:
+            remaining[seq_length] -= 1
+            ids, answer_start_idx = read_sample(samples[seq_length][remaining[seq_length]])
+            seq_start_id.append(num_tokens)
+            num_tokens += len(ids)
+            input_ids.append(ids)
+            # (answer_start_idx - 1) because we want to train on the output after the last context token
+            loss_mask.append((np.arange(len(ids)) >= answer_start_idx - 1) & (ids != pad_id))
+        yield {
+            'input_ids': np.concatenate(input_ids),
+            'loss_mask': np.concatenate(loss_mask),
+            'seq_start_id': seq_start_id,
+        }
+
+    assert all(count == 0 for count in remaining.values()), "Error: There are items left over from the assignment"
+
+
 def prepare_packed_sequence_data(
     input_path: Path,
     output_path: Path,
@@ -57,33 +195,89 @@ def prepare_packed_sequence_data(
     max_seq_length: int,
     seed: Optional[int] = 0,
     packing_algorithm: str = "first_fit_shuffle",
-):
+    num_workers: Optional[int] = None,
+    shard_size: int = 10000,
+) -> Dict[str, float]:
     """
     Prepares a packed sequence dataset from a given input file and saves it to an output file.
 
+    The preparation is streamed: the samples are tokenized shard by shard (in parallel with `num_workers`)
+    to a temporary directory next to the output, the histogram of sequence lengths is built from the shards as
+    they are written, and the packs are filled from the memory-mapped shards and written one by one.
+    Only the sequence lengths of the whole dataset are kept in memory.
+
     Args:
         input_path (Path): Path to the input dataset file.
-        output_path (Path): Path to save the packed sequence data.
+        output_path (Path): Path to save the packed sequence data. A `.npy` path saves the packs as an object
+                array of dicts, any other path is a directory of memory-mapped flat arrays
+                (see `nemo.utils.sequence_packing_utils.PackedSequenceData`).
         packed_sequence_size (int): The maximum size for each packed sequence.
         tokenizer (TokenizerSpec): The tokenizer to use for tokenization.
         max_seq_length (int): Maximum sequence length for the tokens.
         seed (Optional[int]): Random seed for shuffling (optional).
         packing_algorithm (str): The algorithm used for packing sequences
-                currently supports "first_fit_shuffle" and "first_fit_decreasing".
+                currently supports "first_fit_shuffle", "first_fit_decreasing", "best_fit" and "best_fit_decreasing".
+        num_workers (Optional[int]): Number of processes to tokenize with. None, 0 or 1 tokenize in the
+                current process.
+        shard_size (int): Number of samples per tokenized shard.
 
     Returns:
-        None: Saves the packed sequence data to the specified output path.
+        Dict[str, float]: Counters of the preparation: number of samples, tokens and packs, time spent in every
+                stage and tokenization throughput.
     """
 
     logging.info(f"Preparing packed sequence from {input_path}")
-    dataset = tokenize_dataset(input_path, tokenizer, max_seq_length, seed)
-    sequences, histogram = create_hist(dataset, max_seq_length)
+    dataset = create_sft_dataset(
+        path=input_path,
+        tokenizer=tokenizer,
+        seq_length=max_seq_length,
+        seed=seed,
+        is_test=True,
+    )
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    stats = {'num_samples': len(dataset)}
 
-    assignments, packing_metadata = create_packing_strategy(histogram, packed_sequence_size, packing_algorithm)
-    output_data = fill_packing_strategy(assignments, sequences, packed_sequence_size, tokenizer.eos_id)
+    with tempfile.TemporaryDirectory(dir=output_path.parent, prefix=f".{output_path.name}.") as chunk_dir:
+        start = time.perf_counter()
+        seq_lens = []
+        histogram = np.zeros(max_seq_length + 1, dtype=np.int64)
+        with tqdm(total=len(dataset), desc="Tokenizing", unit="samples") as progress:
+            for shard_seq_lens in tokenize_dataset_to_chunks(dataset, chunk_dir, num_workers, shard_size):
+                seq_lens.append(shard_seq_lens)
+                histogram += np.bincount(shard_seq_lens, minlength=len(histogram))[: len(histogram)]
+                progress.update(len(shard_seq_lens))
+        seq_lens = np.concatenate(seq_lens)
+        if seq_lens.max() > max_seq_length:
+            raise ValueError(f"Samples are longer than max_seq_length={max_seq_length}: {seq_lens.max()} tokens")
+        stats['num_tokens'] = int((seq_lens + 1).sum())
+        stats['tokenization_time'] = time.perf_counter() - start
+        stats['samples_per_second'] = stats['num_samples'] / stats['tokenization_time']
+        stats['tokens_per_second'] = stats['num_tokens'] / stats['tokenization_time']
+        logging.info(
+            f"Tokenized {stats['num_samples']} samples in {stats['tokenization_time']:.1f}s "
+            f"({stats['samples_per_second']:.0f} samples/s, {stats['tokens_per_second']:.0f} tokens/s)"
+        )
 
-    # save output data
-    np.save(output_path, output_data)
+        start = time.perf_counter()
+        assignments, packing_metadata = create_packing_strategy(
+            histogram.tolist(), packed_sequence_size, packing_algorithm
+        )
+        stats['num_packs'] = len(assignments)
+        stats['packing_time'] = time.perf_counter() - start
+
+        # save output data
+        start = time.perf_counter()
+        packs = fill_packing_strategy_from_chunks(assignments, seq_lens, chunk_dir, shard_size, tokenizer.eos_id)
+        packs = tqdm(packs, total=len(assignments), desc="Writing packs", unit="packs")
+        if output_path.suffix == '.npy':
+            output_data = [{key: _maybe_tolist(value) for key, value in pack.items()} for pack in packs]
+            np.save(output_path, output_data)
+        else:
+            with PackedSequenceWriter(output_path) as writer:
+                for pack in packs:
+                    writer.write(pack)
+        stats['writing_time'] = time.perf_counter() - start
 
     # save packing metadata, packing_metadata is appended to the packing file if it exists
     if output_metadata_path is not None:
@@ -105,6 +299,11 @@ def prepare_packed_sequence_data(
             json.dump(packing_metadata_file, f)
 
     logging.info(f"Packed sequence is prepared and saved to {output_path}")
+    return stats
+
+
+def _maybe_tolist(x):
+    return x.tolist() if isinstance(x, np.ndarray) else x
 
 
 @dataclass
@@ -125,12 +324,14 @@ class PackedSequenceSpecs:
 
     packed_train_data_path: str = None
     """
-    If specified, use this file for the packed training dataset instead of the default path.
+    If specified, use this file (`.npy`) or directory (flat format) for the packed training dataset instead of
+    the default path.
     """
 
     packed_val_data_path: str = None
     """
-    If specified, use this file for the packed validation dataset instead of the default path.
+    If specified, use this file (`.npy`) or directory (flat format) for the packed validation dataset instead of
+    the default path.
     """
 
     packed_metadata_path: str = None
@@ -143,21 +344,27 @@ class PackedSequenceSpecs:
     If True, pad cu_seqlens to a constant size, which is required for use with cudagraphs.
     """
 
+    tokenization_num_workers: int = None
+    """
+    Number of processes to tokenize the dataset with when preparing the packed dataset.
+    If None, the dataset is tokenized in the current process.
+    """
+
     def __post_init__(self):
         if self.packed_train_data_path is not None:
             self.packed_train_data_path = Path(self.packed_train_data_path)
-            assert (
-                self.packed_train_data_path.suffix == ".npy"
-            ), f"packed training data file must be a .npy file: {self.packed_train_data_path}"
+            assert self.packed_train_data_path.suffix == ".npy" or is_packed_sequence_dir(
+                self.packed_train_data_path
+            ), f"packed training data must be a .npy file or a packed directory: {self.packed_train_data_path}"
             assert (
                 self.packed_train_data_path.exists()
             ), f"packed training data file does not exist: {self.packed_train_data_path}"
 
         if self.packed_val_data_path is not None:
             self.packed_val_data_path = Path(self.packed_val_data_path)
-            assert (
-                self.packed_val_data_path.suffix == ".npy"
-            ), f"packed validation data file must be a .npy file: {self.packed_val_data_path}"
+            assert self.packed_val_data_path.suffix == ".npy" or is_packed_sequence_dir(
+                self.packed_val_data_path
+            ), f"packed validation data must be a .npy file or a packed directory: {self.packed_val_data_path}"
             assert (
                 self.packed_val_data_path.exists()
             ), f"packed validation data file does not exist: {self.packed_val_data_path}"
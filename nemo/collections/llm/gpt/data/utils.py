@@ -527,6 +527,133 @@ class _OnlineSampleMapping:
         return sample_block
 
 
+_UINT64_MASK = (1 << 64) - 1
+
+
+def _splitmix64(x):
+    """SplitMix64 finalizer, a bijective mix of 64-bit integers. Works on Python ints and np.uint64 arrays."""
+    if isinstance(x, np.ndarray):
+        with np.errstate(over='ignore'):
+            x = x + np.uint64(0x9E3779B97F4A7C15)
+            x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            return x ^ (x >> np.uint64(31))
+    x = (x + 0x9E3779B97F4A7C15) & _UINT64_MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _UINT64_MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _UINT64_MASK
+    return x ^ (x >> 31)
+
+
+class _EpochPermutationSampleMapping:
+    """
+    Sample mapping that goes through the dataset once per epoch, in a different pseudo-random order every epoch,
+    without materializing any index array.
+
+    The permutation of every epoch is a Feistel network keyed by the seed and the epoch, restricted to the
+    dataset size by cycle-walking, so every sample index is computed in O(1) time and memory.
+    The mapping only depends on its arguments, so it is identical on all ranks and after resuming:
+    sample `i` of the schedule is always the same, whatever was read before.
+    """
+
+    NUM_ROUNDS = 4
+
+    def __init__(self, dataset_size: int, num_samples: int, seed: int = 1, shuffle: bool = True):
+        """
+        Args:
+            dataset_size (int): Size of the dataset.
+            num_samples (int): Number of samples the dataset should contain, can be more (up-sampling) or less
+                               (down-sampling) than the dataset size.
+            seed (int): Seed of the permutations.
+            shuffle (bool): Whether to shuffle the samples. If False, epochs go through the dataset in order.
+        """
+        if dataset_size <= 0:
+            raise ValueError(f"dataset_size must be positive, got {dataset_size}")
+        self.dataset_size = dataset_size
+        self.num_samples = num_samples
+        self.seed = seed
+        self.shuffle = shuffle
+        # balanced Feistel network on 2 * half_bits >= log2(dataset_size) bits
+        self.half_bits = max(1, (int(dataset_size - 1).bit_length() + 1) // 2)
+        self.half_mask = (1 << self.half_bits) - 1
+
+    def __str__(self):
+        return (
+            f"EpochPermutationSampleMapping(dataset_size={self.dataset_size}, num_samples={self.num_samples}, "
+            f"seed={self.seed}, shuffle={self.shuffle})"
+        )
+
+    def __len__(self) -> int:
+        return self.num_samples
+
+    def __reduce__(self):
+        return (self.__class__, (self.dataset_size, self.num_samples, self.seed, self.shuffle))
+
+    def _round_keys(self, epoch: int) -> List[int]:
+        base = _splitmix64((self.seed & _UINT64_MASK) ^ _splitmix64(epoch & _UINT64_MASK))
+        return [_splitmix64((base + k) & _UINT64_MASK) for k in range(self.NUM_ROUNDS)]
+
+    def _feistel(self, x, keys: List[int]):
+        """One pass of the Feistel network on `x`, a Python int or an np.uint64 array."""
+        if isinstance(x, np.ndarray):
+            half_bits, half_mask = np.uint64(self.half_bits), np.uint64(self.half_mask)
+            left, right = x >> half_bits, x & half_mask
+            for key in keys:
+                left, right = right, left ^ (_splitmix64(right ^ np.uint64(key)) & half_mask)
+            return (left << half_bits) | right
+        left, right = x >> self.half_bits, x & self.half_mask
+        for key in keys:
+            left, right = right, left ^ (_splitmix64(right ^ key) & self.half_mask)
+        return (left << self.half_bits) | right
+
+    def permute(self, epoch: int, positions):
+        """
+        Returns the sample indices at `positions` (an int or an array of ints in [0, dataset_size)) of `epoch`.
+        """
+        if not self.shuffle:
+            return positions
+        keys = self._round_keys(epoch)
+        if isinstance(positions, np.ndarray):
+            x = self._feistel(positions.astype(np.uint64), keys)
+            # cycle-walk the values outside of the dataset back into it
+            outside = x >= np.uint64(self.dataset_size)
+            while outside.any():
+                x[outside] = self._feistel(x[outside], keys)
+                outside = x >= np.uint64(self.dataset_size)
+            return x.astype(np.int64)
+        x = self._feistel(int(positions), keys)
+        while x >= self.dataset_size:
+            x = self._feistel(x, keys)
+        return x
+
+    def get_sample_indices(self, idx: np.ndarray) -> np.ndarray:
+        """Vectorized version of `__getitem__` that returns the dataset index of every sample of `idx`."""
+        idx = np.asarray(idx, dtype=np.int64)
+        idx = np.where(idx < 0, idx + self.num_samples, idx)
+        if ((idx < 0) | (idx >= self.num_samples)).any():
+            raise IndexError("Index out of range")
+        epochs, positions = np.divmod(idx, self.dataset_size)
+        sample_idx = np.empty_like(idx)
+        for epoch in np.unique(epochs):
+            in_epoch = epochs == epoch
+            sample_idx[in_epoch] = self.permute(int(epoch), positions[in_epoch])
+        return sample_idx
+
+    def __getitem__(self, idx):
+        # handle slices
+        if isinstance(idx, slice):
+            positions = range(self.num_samples)[idx]
+            positions = np.arange(positions.start, positions.stop, positions.step)
+            return [(i, None, None) for i in self.get_sample_indices(positions).tolist()]
+
+        idx = int(idx)
+        if idx < 0:
+            idx += self.num_samples
+        if not 0 <= idx < self.num_samples:
+            raise IndexError("Index out of range")
+        epoch, position = divmod(idx, self.dataset_size)
+        return self.permute(epoch, position), None, None  # for compatibility with NeMo's get_samples_mapping
+
+
 def build_index_files(
     dataset_paths,
     newline_int,
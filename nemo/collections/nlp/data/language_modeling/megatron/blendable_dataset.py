@@ -14,6 +14,9 @@
 
 """Blendable dataset."""
 
+import hashlib
+import multiprocessing as mp
+import os
 import time
 
 import numpy as np
@@ -22,9 +25,92 @@ import torch
 from nemo.utils import logging
 from nemo.utils.app_state import AppState
 
+# version of the cached blending indices, part of their hash
+_BLENDING_INDICES_VERSION = "1"
+
+
+def _import_helpers(compile_on_local_rank_zero=True):
+    """Compiles (on local rank 0 or on this rank only) and imports the megatron dataset C++ helpers."""
+    try:
+        if not compile_on_local_rank_zero or AppState().local_rank == 0:
+            from nemo.collections.nlp.data.language_modeling.megatron.dataset_utils import compile_helper
+
+            compile_helper()
+        if compile_on_local_rank_zero:
+            torch.distributed.barrier()
+        from nemo.collections.nlp.data.language_modeling.megatron import helpers
+    except ImportError:
+        raise ImportError(
+            f'Could not compile megatron dataset C++ helper functions and therefore cannot import helpers python file.'
+        )
+    return helpers
+
+
+def get_blending_indices_hash(weights, size, build_block_size=None):
+    """Returns the hash of the blending indices of the (normalized) weights, size and build_block_size."""
+    weights = np.asarray(weights, dtype=np.float64)
+    key = f"{_BLENDING_INDICES_VERSION}-{size}-{build_block_size}-{weights.tobytes().hex()}"
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+def _fill_blending_indices_range(
+    dataset_index, dataset_sample_index, block_index, block_sample_index, block_counts, start, end
+):
+    """Fills [start, end) of the blending indices by repeating the indices of a block of samples."""
+    block_size = len(block_index)
+    for block_start in range(start - start % block_size, end, block_size):
+        first, last = max(start, block_start), min(end, block_start + block_size)
+        offsets = slice(first - block_start, last - block_start)
+        dataset_index[first:last] = block_index[offsets]
+        dataset_sample_index[first:last] = (
+            block_sample_index[offsets] + (block_start // block_size) * block_counts[block_index[offsets]]
+        )
+
+
+_worker_block = None
+
+
+def _init_blending_worker(block):
+    global _worker_block
+    _worker_block = block
+
+
+def _fill_blending_indices_files(dataset_index_fn, dataset_sample_index_fn, start, end):
+    dataset_index = np.load(dataset_index_fn, mmap_mode="r+")
+    dataset_sample_index = np.load(dataset_sample_index_fn, mmap_mode="r+")
+    _fill_blending_indices_range(dataset_index, dataset_sample_index, *_worker_block, start, end)
+    dataset_index.flush()
+    dataset_sample_index.flush()
+
+
+def _fill_blending_indices_files_star(args):
+    return _fill_blending_indices_files(*args)
+
 
 class BlendableDataset(torch.utils.data.Dataset):
-    def __init__(self, datasets, weights, size):
+    def __init__(
+        self,
+        datasets,
+        weights,
+        size,
+        index_cache_dir: str = None,
+        build_block_size: int = None,
+        build_workers: int = None,
+    ):
+        """
+        Args:
+            datasets: datasets to blend.
+            weights: weights of the datasets in the blend.
+            size: number of samples of the blend.
+            index_cache_dir: directory to cache the blending indices in. The indices are built once on global
+                rank 0, in files named after a hash of the normalized weights, size and build_block_size, and are
+                memory-mapped read-only by all ranks. If None, the indices are built in memory by every rank.
+            build_block_size: if set, the indices of the first build_block_size samples are repeated over the
+                whole blend, so that the indices of very large blends are built in parallel by build_workers
+                processes. The number of samples of a dataset then differs from its weight by at most one per block.
+            build_workers: number of processes building the indices of a blend with build_block_size, when the
+                indices are cached. Defaults to half the number of CPUs.
+        """
         self.datasets = datasets
         num_datasets = len(datasets)
         assert num_datasets == len(weights)
@@ -40,34 +126,97 @@ class BlendableDataset(torch.utils.data.Dataset):
         # Build indecies.
         start_time = time.time()
         assert num_datasets < 255
-        self.dataset_index = np.zeros(self.size, dtype=np.uint8)
-        self.dataset_sample_index = np.zeros(self.size, dtype=np.int64)
-
-        app_state = AppState()
-        try:
-            if app_state.local_rank == 0:
-                from nemo.collections.nlp.data.language_modeling.megatron.dataset_utils import compile_helper
-
-                compile_helper()
-            torch.distributed.barrier()
-            from nemo.collections.nlp.data.language_modeling.megatron import helpers
-        except ImportError:
-            raise ImportError(
-                f'Could not compile megatron dataset C++ helper functions and therefore cannot import helpers python file.'
+        if index_cache_dir is None:
+            self.dataset_index = np.zeros(self.size, dtype=np.uint8)
+            self.dataset_sample_index = np.zeros(self.size, dtype=np.int64)
+            helpers = _import_helpers()
+            self._build_indices(helpers, self.dataset_index, self.dataset_sample_index, weights, build_block_size)
+        else:
+            self.index_cache_prefix = os.path.join(
+                index_cache_dir, f"blending_indices_{get_blending_indices_hash(weights, size, build_block_size)}"
             )
-
-        helpers.build_blending_indices(
-            self.dataset_index,
-            self.dataset_sample_index,
-            weights,
-            num_datasets,
-            self.size,
-            torch.distributed.get_rank() == 0,
-        )
+            if torch.distributed.get_rank() == 0 and not self._cached_indices_exist():
+                self._build_cached_indices(weights, build_block_size, build_workers)
+            torch.distributed.barrier()
+            self._load_cached_indices()
         logging.info(
             '> elapsed time for building blendable dataset indices: ' '{:.2f} (sec)'.format(time.time() - start_time)
         )
 
+    def _build_indices(self, helpers, dataset_index, dataset_sample_index, weights, build_block_size):
+        num_datasets = len(weights)
+        verbose = torch.distributed.get_rank() == 0
+        if build_block_size is None or build_block_size >= self.size:
+            helpers.build_blending_indices(
+                dataset_index, dataset_sample_index, weights, num_datasets, self.size, verbose
+            )
+            return
+        block = self._build_block(helpers, weights, build_block_size, verbose)
+        _fill_blending_indices_range(dataset_index, dataset_sample_index, *block, 0, self.size)
+
+    @staticmethod
+    def _build_block(helpers, weights, build_block_size, verbose):
+        """Returns the blending indices of a block of build_block_size samples and the samples per dataset."""
+        block_index = np.zeros(build_block_size, dtype=np.uint8)
+        block_sample_index = np.zeros(build_block_size, dtype=np.int64)
+        helpers.build_blending_indices(
+            block_index, block_sample_index, weights, len(weights), build_block_size, verbose
+        )
+        block_counts = np.bincount(block_index, minlength=len(weights)).astype(np.int64)
+        return block_index, block_sample_index, block_counts
+
+    def _index_cache_files(self):
+        return f"{self.index_cache_prefix}_dataset_index.npy", f"{self.index_cache_prefix}_dataset_sample_index.npy"
+
+    def _cached_indices_exist(self):
+        return all(os.path.isfile(fn) for fn in self._index_cache_files())
+
+    def _build_cached_indices(self, weights, build_block_size, build_workers):
+        logging.info(f' > building blending indices in {self.index_cache_prefix}')
+        helpers = _import_helpers(compile_on_local_rank_zero=False)
+        os.makedirs(os.path.dirname(self.index_cache_prefix), exist_ok=True)
+        # write to temporary files, renamed once complete, so that a partial cache is never loaded
+        tmp_fns = [f"{fn}.{os.getpid()}.tmp" for fn in self._index_cache_files()]
+        dataset_index = np.lib.format.open_memmap(tmp_fns[0], mode="w+", dtype=np.uint8, shape=(self.size,))
+        dataset_sample_index = np.lib.format.open_memmap(tmp_fns[1], mode="w+", dtype=np.int64, shape=(self.size,))
+        if build_block_size is None or build_block_size >= self.size:
+            self._build_indices(helpers, dataset_index, dataset_sample_index, weights, build_block_size)
+        else:
+            block = self._build_block(helpers, weights, build_block_size, verbose=True)
+            if build_workers is None:
+                build_workers = max(1, os.cpu_count() // 2)
+            # every worker fills a range of whole blocks of the memory-mapped files
+            range_size = build_block_size * max(1, -(-self.size // (build_block_size * build_workers)))
+            tasks = [
+                (*tmp_fns, start, min(start + range_size, self.size)) for start in range(0, self.size, range_size)
+            ]
+            ctx = mp.get_context("fork")
+            with ctx.Pool(build_workers, initializer=_init_blending_worker, initargs=(block,)) as p:
+                p.map(_fill_blending_indices_files_star, tasks)
+        dataset_index.flush()
+        dataset_sample_index.flush()
+        del dataset_index, dataset_sample_index
+        for tmp_fn, fn in zip(tmp_fns, self._index_cache_files()):
+            os.replace(tmp_fn, fn)
+
+    def _load_cached_indices(self):
+        dataset_index_fn, dataset_sample_index_fn = self._index_cache_files()
+        self.dataset_index = np.load(dataset_index_fn, mmap_mode="r")
+        self.dataset_sample_index = np.load(dataset_sample_index_fn, mmap_mode="r")
+        assert len(self.dataset_index) == len(self.dataset_sample_index) == self.size
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # cached indices are memory-mapped again instead of being pickled
+        if hasattr(self, 'index_cache_prefix'):
+            del state['dataset_index'], state['dataset_sample_index']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if hasattr(self, 'index_cache_prefix'):
+            self._load_cached_indices()
+
     def __len__(self):
         return self.size
 
@@ -41,6 +41,18 @@ except (ImportError, ModuleNotFoundError):
     HAVE_MEGATRON_CORE = False
 
 
+def _build_blendable_dataset(cfg, datasets, weights, size):
+    """Blends datasets, caching the blending indices in cfg.data.blending_index_cache_dir if set."""
+    return BlendableDataset(
+        datasets,
+        weights,
+        size,
+        index_cache_dir=cfg.data.get('blending_index_cache_dir', None),
+        build_block_size=cfg.data.get('blending_build_block_size', None),
+        build_workers=cfg.data.get('blending_build_workers', None),
+    )
+
+
 def build_dataset(cfg, trainer, data_prefix, data_impl, num_samples, seq_length, seed, skip_warmup, tokenizer, name):
     def _build_dataset(current_data_prefix, current_num_samples):
         delay_data_mmap = cfg.data.get('delay_data_mmap', False)
@@ -77,7 +89,7 @@ def build_dataset(cfg, trainer, data_prefix, data_impl, num_samples, seq_length,
         for i in range(len(prefixes)):
             dataset = _build_dataset(prefixes[i], datasets_num_samples[i])
             datasets.append(dataset)
-        return BlendableDataset(datasets, weights, num_samples)
+        return _build_blendable_dataset(cfg, datasets, weights, num_samples)
 
 
 def build_train_valid_test_datasets(
@@ -201,13 +213,13 @@ def build_train_valid_test_datasets(
         # Blend.
         blending_train_dataset = None
         if train_datasets:
-            blending_train_dataset = BlendableDataset(train_datasets, weights, train_n)
+            blending_train_dataset = _build_blendable_dataset(cfg, train_datasets, weights, train_n)
         blending_valid_dataset = None
         if valid_datasets:
-            blending_valid_dataset = BlendableDataset(valid_datasets, weights, valid_n)
+            blending_valid_dataset = _build_blendable_dataset(cfg, valid_datasets, weights, valid_n)
         blending_test_dataset = None
         if test_datasets:
-            blending_test_dataset = BlendableDataset(test_datasets, weights, test_n)
+            blending_test_dataset = _build_blendable_dataset(cfg, test_datasets, weights, test_n)
 
         return (blending_train_dataset, blending_valid_dataset, blending_test_dataset)
 
@@ -237,6 +237,37 @@ class GPTSFTDataset(Dataset):
             raise e
         return self._process_example(example)
 
+    def __getitems__(self, indices):
+        """
+        Batched version of __getitem__, used by torch DataLoader when sampling batches.
+        The samples mapping is applied to all indices at once and examples are read with a single batched fetch.
+        Child-classes that override __getitem__ fetch their samples one by one.
+        """
+        if self.hf_dataset or type(self).__getitem__ is not GPTSFTDataset.__getitem__:
+            return [self[idx] for idx in indices]
+
+        idx = np.asarray(indices, dtype=np.int64)
+        if self.samples_mapping is not None:
+            assert (idx < len(self.samples_mapping)).all()
+            if isinstance(self.samples_mapping, OnlineSampleMapping):
+                idx = self.samples_mapping.get_sample_indices(idx)
+            else:
+                idx = np.asarray(self.samples_mapping[idx])[:, 0].astype(np.int64)
+
+        assert (idx < len(self.indexed_dataset)).all()
+        # idx may < 0 because we pad_samples_to_global_batch_size, e.g. id = -1
+        auto_gen_idx = idx < 0
+        idx = np.where(auto_gen_idx, len(self) + idx, idx)
+        try:
+            examples = self.indexed_dataset.__getitems__(idx)
+        except Exception as e:
+            logging.error(f"Error while loading examples {idx.tolist()} from dataset {self.file_path}")
+            raise e
+        for example, auto_gen in zip(examples, auto_gen_idx.tolist()):
+            if auto_gen:
+                example['__AUTOGENERATED__'] = True
+        return [self._process_example(example) for example in examples]
+
     def _separate_template(self, prompt_template_values: List[str]):
         """
         Combine contexts and label based on prompt_template into a list of strings and a list of keys.
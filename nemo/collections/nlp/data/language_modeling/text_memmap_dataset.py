@@ -13,6 +13,8 @@
 # limitations under the License.
 
 import datetime
+import hashlib
+import itertools
 import json
 import multiprocessing as mp
 import os
@@ -42,36 +44,78 @@ __idx_version__ = "0.2"  # index file version
 __idx_suffix__ = "idx"  # index file suffix
 
 
-def _build_index_from_memdata(fn, newline_int):
+# number of bytes scanned for newlines by a worker at a time
+_INDEX_CHUNK_SIZE = 64 * 1024 * 1024
+# number of bytes at the end of the indexed data that are hashed to detect appended files
+_INDEX_TAIL_HASH_SIZE = 4096
+# samples of a file that are at most this number of bytes apart are read with a single memmap slice
+_MAX_READ_GAP = 4096
+
+
+def _open_memdata(fn):
+    """Memory-map a text file as np.uint8."""
+    if MULTISTORAGECLIENT_AVAILABLE:
+        return multistorageclient.numpy.memmap(fn, dtype=np.uint8, mode="r")
+    return np.memmap(fn, dtype=np.uint8, mode="r")
+
+
+def _find_newlines(fn, newline_int, start, end):
+    """Returns the (int64) positions of newline_int in bytes [start, end) of fn."""
+    mdata = _open_memdata(fn)
+    positions = np.flatnonzero(mdata[start:end] == newline_int).astype(np.int64) + start
+    mdata._mmap.close()
+    del mdata
+    return positions
+
+
+def _find_newlines_star(args):
+    return _find_newlines(*args)
+
+
+def _index_tail(midx, size):
+    """
+    Returns the number of newline positions in midx to keep and the end of file position to append (or None),
+    such that the last sample ends at the end of the file and there are no empty lines at the end of the file.
+    Only the last entries of midx are read, so it can be a memmap of the newline positions of the whole file.
+    """
+    # add last item in case there is no new-line at the end of the file
+    if len(midx) == 0 or midx[-1] + 1 != size:
+        return len(midx), size + 1
+    # remove empty lines from end of file
+    end = len(midx)
+    while end > 1 and midx[end - 1] - midx[end - 2] < 2:
+        end -= 1
+    return end, None
+
+
+def _tail_hash(fn, size):
+    """Hash of the last bytes of the first `size` bytes of fn, used to detect that fn was appended to."""
+    with open(fn, "rb") as f:
+        f.seek(max(0, size - _INDEX_TAIL_HASH_SIZE))
+        return hashlib.sha1(f.read(min(size, _INDEX_TAIL_HASH_SIZE))).hexdigest()
+
+
+def _build_index_from_memdata(fn, newline_int, chunk_size=_INDEX_CHUNK_SIZE):
     """
     Build index of delimiter positions between samples in memmap.
     Can be provided externally.
 
+    The file is scanned in chunks of chunk_size bytes to bound the memory used on top of the index.
+
     Returns a 1D array of ints.
     """
-    # use memmap to read file
-    if MULTISTORAGECLIENT_AVAILABLE:
-        mdata = multistorageclient.numpy.memmap(fn, dtype=np.uint8, mode="r")
-    else:
-        mdata = np.memmap(fn, dtype=np.uint8, mode="r")
-    # find newline positions
-    midx = np.where(mdata == newline_int)[0]
-    midx_dtype = midx.dtype
-    # make sure to account for all data
-    midx = midx.tolist()
-    # add last item in case there is no new-line at the end of the file
-    if (len(midx) == 0) or (midx[-1] + 1 != len(mdata)):
-        midx = midx + [len(mdata) + 1]
-
-    # remove empty lines from end of file
-    while len(midx) > 1 and (midx[-1] - midx[-2]) < 2:
-        midx.pop(-1)
-    midx = np.asarray(midx, dtype=midx_dtype)
-
-    # free memmap
+    mdata = _open_memdata(fn)
+    size = len(mdata)
     mdata._mmap.close()
     del mdata
 
+    midx = [np.empty(0, dtype=np.int64)]
+    midx += [_find_newlines(fn, newline_int, start, start + chunk_size) for start in range(0, size, chunk_size)]
+    midx = np.concatenate(midx)
+    end, eof = _index_tail(midx, size)
+    midx = midx[:end]
+    if eof is not None:
+        midx = np.append(midx, eof)
     return midx
 
 
@@ -235,6 +279,87 @@ class TextMemMapDataset(Dataset):
 
         return data
 
+    def __getitems__(self, indices):
+        """
+        Return the data of a batch of samples, as a list. Used by torch DataLoader when sampling batches.
+
+        The position of all samples is looked up at once, lines of a file that are close to each other are read
+        with a single memmap slice, and text is tokenized with a single tokenizer call.
+        """
+        idx = np.asarray(indices, dtype=np.int64).reshape(-1)
+        if ((idx >= len(self)) | (idx < 0)).any():
+            raise IndexError(
+                f"Indices {idx[(idx >= len(self)) | (idx < 0)]} out of dataset range with {len(self)} samples"
+            )
+
+        # Identify the file containing every record (same as np.digitize(idx, self.midx_bins, right=False))
+        file_ids = np.searchsorted(self.midx_bins, idx, side="right")
+        base_idx = np.where(file_ids > 0, self.midx_bins[np.maximum(file_ids - 1, 0)], 0)
+        file_idxs = idx - base_idx + self._header_lines
+        starts, ends = np.empty_like(idx), np.empty_like(idx)
+        for file_id in np.unique(file_ids):
+            in_file = file_ids == file_id
+            _, midx = self.mdata_midx_list[file_id]
+            file_idx = file_idxs[in_file]
+            ends[in_file] = midx[file_idx]
+            starts[in_file] = np.where(file_idx > 0, midx[np.maximum(file_idx - 1, 0)] + 1, 0)  # ignore newline
+
+        try:
+            samples = self._fetch_samples_from_memmap(file_ids, starts, ends)
+        except Exception as e:
+            logging.error(f"Error while fetching samples from memmap: {e}")
+            logging.error(f"file_ids: {file_ids}, file_idxs: {file_idxs}, i: {starts}, j: {ends}")
+            raise e
+
+        # parse raw text (e.g., tokenize)
+        try:
+            data = self._build_data_from_texts(samples)
+        except Exception as e:
+            logging.error(
+                "Error while building data from text, possible issue with sample expected format "
+                f"(see offending samples below): {e}"
+            )
+            logging.error(f"samples: {samples}, file_ids: {file_ids}, file_idxs: {file_idxs}")
+            raise e
+
+        return data
+
+    def _fetch_samples_from_memmap(self, file_ids, starts, ends):
+        """
+        Batched version of _fetch_sample_from_memmap, which is used as is if overriden by child-classes.
+        Otherwise, samples of the same file that are less than _MAX_READ_GAP bytes apart are read together.
+        """
+        if type(self)._fetch_sample_from_memmap is not TextMemMapDataset._fetch_sample_from_memmap:
+            return [
+                self._fetch_sample_from_memmap(self.mdata_midx_list[file_id][0], i, j)
+                for file_id, i, j in zip(file_ids.tolist(), starts.tolist(), ends.tolist())
+            ]
+
+        samples = [None] * len(file_ids)
+        order = np.lexsort((starts, file_ids)).tolist()
+        file_ids, starts, ends = file_ids.tolist(), starts.tolist(), ends.tolist()
+        run_begin = 0
+        while run_begin < len(order):
+            # extend the run of samples to read while the next one is close to the end of the run
+            first = order[run_begin]
+            run_end, run_stop = run_begin + 1, ends[first]
+            while (
+                run_end < len(order)
+                and file_ids[order[run_end]] == file_ids[first]
+                and starts[order[run_end]] - run_stop <= _MAX_READ_GAP
+            ):
+                run_stop = max(run_stop, ends[order[run_end]])
+                run_end += 1
+
+            mdata = self.mdata_midx_list[file_ids[first]][0]
+            run_start = starts[first]
+            data = mdata[run_start:run_stop].tobytes()
+            for k in order[run_begin:run_end]:
+                samples[k] = data[starts[k] - run_start : ends[k] - run_start].decode("utf-8")
+            run_begin = run_end
+
+        return samples
+
     def _fetch_sample_from_memmap(self, mdata, i, j):
         """Fetchs the text sample. Can be overriden by child-classes to support loading of partial samples
         and alternative decode methods"""
@@ -253,6 +378,20 @@ class TextMemMapDataset(Dataset):
 
         return data
 
+    def _build_data_from_texts(self, texts):
+        """
+        Batched version of _build_data_from_text, which is used as is if overriden by child-classes.
+        Otherwise, texts are tokenized with a single call if the tokenizer supports batches.
+        """
+        if (
+            type(self)._build_data_from_text is TextMemMapDataset._build_data_from_text
+            and self.tokenizer is not None
+            and hasattr(self.tokenizer, "batch_text_to_ids")
+        ):
+            # dataloader workers already run in parallel, the tokenizer should not start more threads
+            return self.tokenizer.batch_text_to_ids(texts, num_threads=1)
+        return [self._build_data_from_text(text) for text in texts]
+
     def load_file(self, fn, index_mapping_dir: Optional[str] = None):
         """
         Loads a text file as np.int8.
@@ -549,14 +688,114 @@ def _build_memmap_index_files(newline_int, build_index_fn, fn, index_mapping_dir
         return True
 
 
+def _plan_index_from_memdata(newline_int, fn, index_mapping_dir: str, chunk_size=_INDEX_CHUNK_SIZE):
+    """
+    Plans the (re)indexing of fn with the default index builder.
+
+    An existing index is reused if fn did not change since it was built. If fn was appended to, only the
+    appended bytes are scanned and the index is extended; if fn was otherwise modified (detected from its size
+    and the hash of its last bytes), the index is rebuilt.
+    Index files that do not record the size of the indexed file (e.g. built by an older version or by a custom
+    build_index_fn) are always reused.
+
+    Returns None if the index is up to date, or a dict with the newline positions to keep from the existing
+    index ("prefix") and the (fn, newline_int, start, end) chunks to scan for newlines ("tasks").
+    """
+    idx_fn = _index_fn(fn, index_mapping_dir)
+    size = os.path.getsize(fn)
+    prefix = np.empty(0, dtype=np.int64)
+
+    if _index_file_exists(idx_fn):
+        with open(idx_fn + ".info", "rb") as fp:
+            idx_info_dict = pickle.load(fp)
+        indexed_size = idx_info_dict.get("file_size")
+        if (
+            indexed_size is None
+            or idx_info_dict.get("newline_int") != newline_int
+            or idx_info_dict.get("version") != __idx_version__
+        ):
+            return None
+        same_tail = indexed_size <= size and _tail_hash(fn, indexed_size) == idx_info_dict.get("tail_hash")
+        if same_tail and indexed_size == size:
+            return None
+        if same_tail:
+            logging.info(f"Extending indexing for fn = {fn} from {indexed_size} to {size} bytes")
+            midx = np.load(idx_fn + ".npy", mmap_mode="r")
+            # keep the newlines of the indexed data, dropping the end of file position
+            prefix = midx[: np.searchsorted(midx, indexed_size)]
+        else:
+            logging.warning(f"File {fn} changed since it was indexed, rebuilding its index")
+
+    if len(prefix) == 0:
+        logging.info(f"Building indexing for fn = {fn}")
+    # empty lines at the end of the indexed data may have been dropped, rescan them with the appended data
+    scan_start = int(prefix[-1]) + 1 if len(prefix) else 0
+    tasks = [(fn, newline_int, start, start + chunk_size) for start in range(scan_start, size, chunk_size)]
+    return dict(fn=fn, idx_fn=idx_fn, newline_int=newline_int, size=size, prefix=prefix, tasks=tasks)
+
+
+def _write_index_from_memdata(plan, chunk_positions, chunk_size=_INDEX_CHUNK_SIZE):
+    """
+    Writes the index file planned by _plan_index_from_memdata, given an iterator over the newline positions
+    found in each of its chunks. The newline positions are streamed to disk, so the memory used does not grow
+    with the size of the file.
+    """
+    fn, idx_fn, size = plan["fn"], plan["idx_fn"], plan["size"]
+    itemsize = np.dtype(np.int64).itemsize
+    # newline positions are appended to a raw int64 file, and copied after a .npy header once their number is known
+    raw_fn = f"{idx_fn}.npy.{os.getpid()}.raw"
+    npy_fn = f"{idx_fn}.npy.{os.getpid()}.tmp"
+    try:
+        with open(raw_fn, "wb") as f:
+            prefix, step = plan["prefix"], max(1, chunk_size // itemsize)
+            for start in range(0, len(prefix), step):
+                f.write(np.ascontiguousarray(prefix[start : start + step]).tobytes())
+            for positions in chunk_positions:
+                f.write(positions.tobytes())
+
+        raw = np.memmap(raw_fn, dtype=np.int64, mode="r") if os.path.getsize(raw_fn) else np.empty(0, np.int64)
+        end, eof = _index_tail(raw, size)
+        del raw
+
+        logging.info(f"Saving idx file = {idx_fn}.npy")
+        header = dict(descr=np.lib.format.dtype_to_descr(np.dtype(np.int64)), fortran_order=False)
+        header["shape"] = (end + (eof is not None),)
+        with open(raw_fn, "rb") as f_raw, open(npy_fn, "wb") as f:
+            np.lib.format.write_array_header_1_0(f, header)
+            remaining = end * itemsize
+            while remaining > 0:
+                remaining -= f.write(f_raw.read(min(remaining, chunk_size)))
+            if eof is not None:
+                f.write(np.array([eof], dtype=np.int64).tobytes())
+        os.replace(npy_fn, idx_fn + ".npy")
+    finally:
+        for tmp_fn in [raw_fn, npy_fn]:
+            if os.path.exists(tmp_fn):
+                os.remove(tmp_fn)
+
+    logging.info(f"Saving metadata file = {idx_fn}.info")
+    data = dict(
+        newline_int=plan["newline_int"], version=__idx_version__, file_size=size, tail_hash=_tail_hash(fn, size)
+    )
+    with open(idx_fn + ".info", "wb") as fp:
+        pickle.dump(data, fp)
+
+
 def build_index_files(
     dataset_paths,
     newline_int,
     workers=None,
     build_index_fn=_build_index_from_memdata,
     index_mapping_dir: str = None,
+    chunk_size: int = _INDEX_CHUNK_SIZE,
 ):
-    """Auxiliary method to build multiple index files"""
+    """
+    Auxiliary method to build multiple index files
+
+    With the default build_index_fn, every file is scanned for newlines in chunks of chunk_size bytes, which are
+    spread over all workers, and the index files are written incrementally. Index files of data files that were
+    appended to are extended. A custom build_index_fn is called once per file, on one worker per file.
+    """
     if len(dataset_paths) < 1:
         raise ValueError("files_list must contain at leat one file name")
 
@@ -568,15 +807,25 @@ def build_index_files(
     start_time = time.time()
     ctx = mp.get_context("fork")
     with ctx.Pool(workers) as p:
-        build_status = p.map(
-            partial(
-                _build_memmap_index_files,
-                newline_int,
-                build_index_fn,
-                index_mapping_dir=index_mapping_dir,
-            ),
-            dataset_paths,
-        )
+        if build_index_fn is _build_index_from_memdata and not MULTISTORAGECLIENT_AVAILABLE:
+            plans = [_plan_index_from_memdata(newline_int, fn, index_mapping_dir, chunk_size) for fn in dataset_paths]
+            # chunks of all files are scanned together, in order, and consumed file after file
+            tasks = [task for plan in plans if plan is not None for task in plan["tasks"]]
+            chunk_positions = p.imap(_find_newlines_star, tasks)
+            for plan in plans:
+                if plan is not None:
+                    _write_index_from_memdata(plan, itertools.islice(chunk_positions, len(plan["tasks"])), chunk_size)
+            build_status = [plan is not None for plan in plans]
+        else:
+            build_status = p.map(
+                partial(
+                    _build_memmap_index_files,
+                    newline_int,
+                    build_index_fn,
+                    index_mapping_dir=index_mapping_dir,
+                ),
+                dataset_paths,
+            )
 
     logging.info(
         f"Time building {sum(build_status)} / {len(build_status)} mem-mapped files: "
@@ -720,8 +969,8 @@ class OnlineSampleMapping:
             if stop >= self.num_samples:
                 stop = self.num_samples
             step = step if step is not None else 1
-            sample_slice = [self[idx] for idx in range(start, stop, step)]
-            return sample_slice
+            sample_slice = self.get_sample_indices(np.arange(start, stop, step))
+            return [(sample_idx, None, None) for sample_idx in sample_slice]
         # handle indices
         else:
             # If the index is out of range, raise IndexError
@@ -748,6 +997,28 @@ class OnlineSampleMapping:
 
             return sample_idx, None, None  # for comtability with NeMo's get_samples_mapping
 
+    def get_sample_indices(self, idx: np.ndarray) -> np.ndarray:
+        """Vectorized version of __getitem__ that returns the dataset index of every sample of idx."""
+        idx = np.asarray(idx, dtype=np.int64)
+        # support negative indices
+        idx = np.where(idx < 0, idx + self.num_samples, idx)
+        if ((idx < 0) | (idx >= self.num_samples)).any():
+            raise IndexError("Index out of range")
+
+        # fetch the block sample indices
+        if self.use_digitize:
+            block_idx = np.searchsorted(self.block_bins, idx, side="right")
+        else:
+            block_idx = idx // self.block_size
+        sample_idx = np.empty_like(idx)
+        for block in np.unique(block_idx):
+            in_block = block_idx == block
+            sample_block = self.get_sample_block(block)
+            # use the local indices to fetch the samples
+            sample_idx[in_block] = sample_block[idx[in_block] - self.block_bins[block]]
+
+        return sample_idx
+
     def __len__(self) -> int:
         return self.num_samples
 
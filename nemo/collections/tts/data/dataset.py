@@ -34,8 +34,10 @@ from nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers import (
     EnglishCharsTokenizer,
     EnglishPhonemesTokenizer,
 )
+from nemo.collections.tts.parts.utils.sup_data_store import SupDataStore
 from nemo.collections.tts.parts.utils.tts_dataset_utils import (
     BetaBinomialInterpolator,
+    batched_beta_binomial_prior_distribution,
     beta_binomial_prior_distribution,
     general_padding,
     get_base_dir,
@@ -90,6 +92,7 @@ class TTSDataset(Dataset):
         text_tokenizer_pad_id: Optional[int] = None,
         sup_data_types: Optional[List[str]] = None,
         sup_data_path: Optional[Union[Path, str]] = None,
+        sup_data_store: bool = False,
         max_duration: Optional[float] = None,
         min_duration: Optional[float] = None,
         ignore_file: Optional[Union[str, Path]] = None,
@@ -133,6 +136,9 @@ class TTSDataset(Dataset):
             text_tokenizer_pad_id (Optional[int]): Index of padding. Should be specified if text_tokenizer is not BaseTokenizer.
             sup_data_types (Optional[List[str]]): List of supplementary data types.
             sup_data_path (Optional[Union[Path, str]]): A folder that contains or will contain supplementary data (e.g. pitch).
+            sup_data_store (bool): Whether to keep computed log mel, pitch, voiced mask, p_voiced and energy in a sharded
+                memory-mapped store (see `SupDataStore`) in their folders instead of one .pt file per audio.
+                Existing .pt files are still read. Defaults to False.
             max_duration (Optional[float]): Max duration of audio clips in seconds. All samples exceeding this will be
                 pruned prior to training. Note: Requires "duration" to be set in the manifest file. It does not load
                 audio to compute duration. Defaults to None which does not prune.
@@ -166,6 +172,8 @@ class TTSDataset(Dataset):
             durs_file (Optional[str]): String path to pickled durations location.
             durs_type (Optional[str]): Type of durations. Currently, supported only "aligner-based".
             use_beta_binomial_interpolator (Optional[bool]): Whether to use beta-binomial interpolator for calculating alignment prior matrix. Defaults to False.
+            use_batched_align_prior (Optional[bool]): Whether to compute alignment prior matrices for the whole batch in the collate function instead of in `__getitem__`. Exact priors are computed, the beta-binomial interpolator is not used. Defaults to False.
+            align_prior_device (Optional[str]): Device to compute batched alignment prior matrices on. Use a CUDA device only if the collate function runs in the main process (num_workers=0). Defaults to None which uses CPU.
             pitch_fmin (Optional[float]): The fmin input to librosa.pyin. Defaults to librosa.note_to_hz('C2').
             pitch_fmax (Optional[float]): The fmax input to librosa.pyin. Defaults to librosa.note_to_hz('C7').
             pitch_mean (Optional[float]): The mean that we use to normalize the pitch.
@@ -322,6 +330,12 @@ class TTSDataset(Dataset):
             Path(sup_data_path).mkdir(parents=True, exist_ok=True)
             self.sup_data_path = sup_data_path
 
+        self.sup_data_store = sup_data_store
+        # stores and writers are opened lazily in every process (e.g., in dataloader workers)
+        self._sup_data_stores_pid = None
+        self._sup_data_stores = {}
+        self._sup_data_writers = {}
+
         self.sup_data_types = []
         if sup_data_types is not None:
             for d_as_str in sup_data_types:
@@ -412,7 +426,12 @@ class TTSDataset(Dataset):
 
     def add_align_prior_matrix(self, **kwargs):
         self.use_beta_binomial_interpolator = kwargs.pop('use_beta_binomial_interpolator', False)
-        if not self.cache_text:
+        self.use_batched_align_prior = kwargs.pop('use_batched_align_prior', False)
+        self.align_prior_device = kwargs.pop('align_prior_device', None)
+        if self.use_batched_align_prior:
+            # priors of the whole batch are computed exactly, without caching and interpolation
+            self.use_beta_binomial_interpolator = False
+        elif not self.cache_text:
             if 'use_beta_binomial_interpolator' in kwargs and not self.use_beta_binomial_interpolator:
                 logging.warning(
                     "phoneme_probability is not None, but use_beta_binomial_interpolator=False, we"
@@ -512,6 +531,10 @@ class TTSDataset(Dataset):
             spec = torch.sqrt(spec.pow(2).sum(-1) + EPSILON)
         return spec
 
+    def get_num_frames(self, audio_length):
+        """Number of frames of the spectrogram of the audio, same as `get_spec(audio).shape[-1]` (centered STFT)."""
+        return 1 + (audio_length + 2 * (self.n_fft // 2) - self.n_fft) // self.hop_len
+
     def get_log_mel(self, audio):
         with torch.amp.autocast(audio.device.type, enabled=False):
             spec = self.get_spec(audio)
@@ -535,6 +558,16 @@ class TTSDataset(Dataset):
                 torch.save(audio_shifted, audio_shifted_path)
             return audio_shifted
 
+    def _load_audio(self, audio_filepath):
+        return self.featurizer.process(
+            audio_filepath,
+            trim=self.trim,
+            trim_ref=self.trim_ref,
+            trim_top_db=self.trim_top_db,
+            trim_frame_length=self.trim_frame_length,
+            trim_hop_length=self.trim_hop_length,
+        )
+
     def _pad_wav_to_multiple(self, wav):
         if self.pad_multiple > 1:
             if wav.shape[0] % self.pad_multiple != 0:
@@ -543,12 +576,61 @@ class TTSDataset(Dataset):
                 )
         return wav
 
-    def __getitem__(self, index):
-        sample = self.data[index]
-
+    def _get_sup_data_store(self, name):
+        if self._sup_data_stores_pid != os.getpid():
+            self._sup_data_stores_pid = os.getpid()
+            self._sup_data_stores, self._sup_data_writers = {}, {}
+        if name not in self._sup_data_stores:
+            self._sup_data_stores[name] = SupDataStore(getattr(self, f"{name}_folder"), dtype=np.float32)
+        return self._sup_data_stores[name]
+
+    def _load_sup_data(self, name, rel_audio_path_as_text_id):
+        """Load supplementary data from the store or the .pt file, returns None if it was not computed yet."""
+        if self.sup_data_store:
+            value = self._get_sup_data_store(name).get(rel_audio_path_as_text_id)
+            if value is not None:
+                return torch.from_numpy(value)
+        filepath = getattr(self, f"{name}_folder") / f"{rel_audio_path_as_text_id}.pt"
+        if filepath.exists():
+            return torch.load(filepath)
+        return None
+
+    def _has_sup_data(self, name, rel_audio_path_as_text_id):
+        if self.sup_data_store and rel_audio_path_as_text_id in self._get_sup_data_store(name):
+            return True
+        return (getattr(self, f"{name}_folder") / f"{rel_audio_path_as_text_id}.pt").exists()
+
+    def _save_sup_data(self, name, rel_audio_path_as_text_id, value):
+        if not self.sup_data_store:
+            torch.save(value, getattr(self, f"{name}_folder") / f"{rel_audio_path_as_text_id}.pt")
+            return
+        store = self._get_sup_data_store(name)
+        if name not in self._sup_data_writers:
+            self._sup_data_writers[name] = store.writer()
+        self._sup_data_writers[name].add(rel_audio_path_as_text_id, value.numpy())
+
+    def consolidate_sup_data(self):
+        """
+        Merge the indices of the supplementary data stores written by all processes, which makes opening the stores
+        faster. Must be called when no process computes supplementary data (e.g., after the preprocessing).
+        """
+        if not self.sup_data_store:
+            return
+        for writer in self._sup_data_writers.values():
+            writer.close()
+        self._sup_data_writers = {}
+        for data_type in [LogMel, Pitch, Voiced_mask, P_voiced, Energy]:
+            if data_type in self.sup_data_types_set:
+                self._get_sup_data_store(data_type.name).consolidate()
+
+    def _get_rel_audio_path_as_text_id(self, sample):
         # Let's keep audio name and all internal directories in rel_audio_path_as_text_id to avoid any collisions
         rel_audio_path = Path(sample["audio_filepath"]).relative_to(self.base_data_dir).with_suffix("")
-        rel_audio_path_as_text_id = str(rel_audio_path).replace("/", "_")
+        return str(rel_audio_path).replace("/", "_")
+
+    def __getitem__(self, index):
+        sample = self.data[index]
+        rel_audio_path_as_text_id = self._get_rel_audio_path_as_text_id(sample)
 
         if (
             self.segment_max_duration is not None
@@ -570,14 +652,7 @@ class TTSDataset(Dataset):
                 features = self._pad_wav_to_multiple(features)
             audio, audio_length = features, torch.tensor(features.shape[0]).long()
         else:
-            features = self.featurizer.process(
-                sample["audio_filepath"],
-                trim=self.trim,
-                trim_ref=self.trim_ref,
-                trim_top_db=self.trim_top_db,
-                trim_frame_length=self.trim_frame_length,
-                trim_hop_length=self.trim_hop_length,
-            )
+            features = self._load_audio(sample["audio_filepath"])
 
             if self.pad_multiple > 1:
                 features = self._pad_wav_to_multiple(features)
@@ -608,13 +683,10 @@ class TTSDataset(Dataset):
             if mel_path is not None and Path(mel_path).exists():
                 log_mel = torch.load(mel_path)
             else:
-                mel_path = self.log_mel_folder / f"{rel_audio_path_as_text_id}.pt"
-
-                if mel_path.exists():
-                    log_mel = torch.load(mel_path)
-                else:
+                log_mel = self._load_sup_data(LogMel.name, rel_audio_path_as_text_id)
+                if log_mel is None:
                     log_mel = self.get_log_mel(audio)
-                    torch.save(log_mel, mel_path)
+                    self._save_sup_data(LogMel.name, rel_audio_path_as_text_id, log_mel)
 
             log_mel = log_mel.squeeze(0)
             log_mel_length = torch.tensor(log_mel.shape[1]).long()
@@ -626,8 +698,8 @@ class TTSDataset(Dataset):
 
         # Load alignment prior matrix if needed
         align_prior_matrix = None
-        if AlignPriorMatrix in self.sup_data_types_set:
-            mel_len = self.get_log_mel(audio).shape[2]
+        if AlignPriorMatrix in self.sup_data_types_set and not self.use_batched_align_prior:
+            mel_len = self.get_num_frames(audio.shape[0])
             if self.use_beta_binomial_interpolator:
                 align_prior_matrix = torch.from_numpy(self.beta_binomial_interpolator(mel_len, text_length.item()))
             else:
@@ -637,12 +709,11 @@ class TTSDataset(Dataset):
         my_var = locals()
         for i, voiced_item in enumerate([Pitch, Voiced_mask, P_voiced]):
             if voiced_item in self.sup_data_types_set:
-                voiced_folder = getattr(self, f"{voiced_item.name}_folder")
-                voiced_filepath = voiced_folder / f"{rel_audio_path_as_text_id}.pt"
-                if voiced_filepath.exists():
-                    my_var.__setitem__(voiced_item.name, torch.load(voiced_filepath).float())
+                voiced_value = self._load_sup_data(voiced_item.name, rel_audio_path_as_text_id)
+                if voiced_value is not None:
+                    my_var.__setitem__(voiced_item.name, voiced_value.float())
                 else:
-                    non_exist_voiced_index.append((i, voiced_item.name, voiced_filepath))
+                    non_exist_voiced_index.append((i, voiced_item.name))
 
         if len(non_exist_voiced_index) != 0:
             voiced_tuple = librosa.pyin(
@@ -653,9 +724,9 @@ class TTSDataset(Dataset):
                 sr=self.sample_rate,
                 fill_na=0.0,
             )
-            for i, voiced_name, voiced_filepath in non_exist_voiced_index:
+            for i, voiced_name in non_exist_voiced_index:
                 my_var.__setitem__(voiced_name, torch.from_numpy(voiced_tuple[i]).float())
-                torch.save(my_var.get(voiced_name), voiced_filepath)
+                self._save_sup_data(voiced_name, rel_audio_path_as_text_id, my_var.get(voiced_name))
 
         pitch = my_var.get('pitch', None)
         pitch_length = my_var.get('pitch_length', None)
@@ -681,21 +752,21 @@ class TTSDataset(Dataset):
                 else:
                     raise ValueError("Missing statistics for pitch normalization.")
 
-                pitch -= sample_pitch_mean
+                # out of place: pitch can be a view of the memory-mapped store
+                pitch = pitch - sample_pitch_mean
                 pitch[pitch == -sample_pitch_mean] = 0.0  # Zero out values that were previously zero
-                pitch /= sample_pitch_std
+                pitch = pitch / sample_pitch_std
 
         # Load energy if needed
         energy, energy_length = None, None
         if Energy in self.sup_data_types_set:
-            energy_path = self.energy_folder / f"{rel_audio_path_as_text_id}.pt"
-
-            if energy_path.exists():
-                energy = torch.load(energy_path).float()
+            energy = self._load_sup_data(Energy.name, rel_audio_path_as_text_id)
+            if energy is not None:
+                energy = energy.float()
             else:
                 spec = self.get_spec(audio)
                 energy = torch.linalg.norm(spec.squeeze(0), axis=0).float()
-                torch.save(energy, energy_path)
+                self._save_sup_data(Energy.name, rel_audio_path_as_text_id, energy)
 
             energy_length = torch.tensor(len(energy)).long()
 
@@ -707,14 +778,7 @@ class TTSDataset(Dataset):
         reference_audio, reference_audio_length = None, None
         if ReferenceAudio in self.sup_data_types_set:
             reference = self.get_reference_for_sample(sample)
-            reference_audio = self.featurizer.process(
-                reference["audio_filepath"],
-                trim=self.trim,
-                trim_ref=self.trim_ref,
-                trim_top_db=self.trim_top_db,
-                trim_frame_length=self.trim_frame_length,
-                trim_hop_length=self.trim_hop_length,
-            )
+            reference_audio = self._load_audio(reference["audio_filepath"])
             reference_audio_length = torch.tensor(reference_audio.shape[0]).long()
 
         return (
@@ -786,15 +850,20 @@ class TTSDataset(Dataset):
         if LogMel in self.sup_data_types_set:
             log_mel_pad = torch.finfo(batch[0][4].dtype).tiny
 
-        align_prior_matrices = (
-            torch.zeros(
-                len(align_prior_matrices_list),
-                max([prior_i.shape[0] for prior_i in align_prior_matrices_list]),
-                max([prior_i.shape[1] for prior_i in align_prior_matrices_list]),
-            )
-            if AlignPriorMatrix in self.sup_data_types_set
-            else []
-        )
+        align_prior_matrices = []
+        if AlignPriorMatrix in self.sup_data_types_set:
+            if self.use_batched_align_prior:
+                align_prior_matrices = batched_beta_binomial_prior_distribution(
+                    torch.stack(tokens_lengths),
+                    self.get_num_frames(torch.stack(audio_lengths)),
+                    device=self.align_prior_device,
+                )
+            else:
+                align_prior_matrices = torch.zeros(
+                    len(align_prior_matrices_list),
+                    max([prior_i.shape[0] for prior_i in align_prior_matrices_list]),
+                    max([prior_i.shape[1] for prior_i in align_prior_matrices_list]),
+                )
         (
             audios,
             tokens,
@@ -859,7 +928,7 @@ class TTSDataset(Dataset):
             if Durations in self.sup_data_types_set:
                 durations_list.append(general_padding(durations, len(durations), max_durations_len))
 
-            if AlignPriorMatrix in self.sup_data_types_set:
+            if AlignPriorMatrix in self.sup_data_types_set and not self.use_batched_align_prior:
                 align_prior_matrices[i, : align_prior_matrix.shape[0], : align_prior_matrix.shape[1]] = (
                     align_prior_matrix
                 )
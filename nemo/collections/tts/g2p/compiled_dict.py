@@ -0,0 +1,245 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+COMPILED_DICT_MAGIC = b"NGPDICT1"
+COMPILED_DICT_FILE_SUFFIX = ".g2pdict"
+_ALIGNMENT = 64
+# arrays of the compiled dictionary, in the order of the file
+_ARRAY_NAMES = ["word_offsets", "word_bytes", "word_hashes", "hash_order", "pron_starts", "pron_offsets", "symbol_ids"]
+
+
+def _word_hash(word_bytes: bytes) -> np.uint64:
+    # numpy scalar, searchsorted would cast the whole array for a Python int
+    return np.frombuffer(hashlib.blake2b(word_bytes, digest_size=8).digest(), dtype=np.uint64)[0]
+
+
+class CompiledPhonemeDict(MutableMapping):
+    """
+    Phoneme dictionary ({word: [pronunciation, ...]}, every pronunciation is a list of symbols) compiled into flat
+    numpy arrays, which can be saved and memory-mapped, so that processes (e.g., dataloader workers) share one copy
+    in the page cache instead of every process holding its own dict of Python lists.
+    Words are found by binary search over 64-bit hashes, pronunciations are decoded on access.
+    Modifications are kept in a small in-memory overlay and are not saved.
+
+    Use `CompiledPhonemeDict.build` to compile a dict, `save` and `load` to store and memory-map it.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], symbols: List[str], info: Optional[Dict[str, Any]] = None):
+        self.word_offsets = arrays["word_offsets"]
+        self.word_bytes = arrays["word_bytes"]
+        self.word_hashes = arrays["word_hashes"]
+        self.hash_order = arrays["hash_order"]
+        self.pron_starts = arrays["pron_starts"]
+        self.pron_offsets = arrays["pron_offsets"]
+        self.symbol_ids = arrays["symbol_ids"]
+        self.symbols = symbols
+        self.info = info if info is not None else {}
+        # file the dictionary is memory-mapped from
+        self.path = None
+        # modified entries, None for deleted
+        self._overlay: Dict[str, Optional[List[List[str]]]] = {}
+        self._num_entries = self.word_hashes.shape[0]
+        self._last_find = (None, -1)
+
+    @classmethod
+    def build(
+        cls, phoneme_dict: Dict[str, List[List[str]]], info: Optional[Dict[str, Any]] = None
+    ) -> "CompiledPhonemeDict":
+        """
+        Compile the phoneme dictionary.
+
+        Args:
+            phoneme_dict: dictionary to compile, the iteration order is preserved
+            info: arbitrary JSON-serializable information saved with the dictionary (e.g., source and settings)
+        """
+        symbol_to_id = {}
+        word_offsets, pron_starts, pron_offsets, symbol_ids = [0], [0], [0], []
+        words = []
+        for word, prons in phoneme_dict.items():
+            word_bytes = word.encode("utf-8")
+            words.append(word_bytes)
+            word_offsets.append(word_offsets[-1] + len(word_bytes))
+            for pron in prons:
+                symbol_ids.extend(symbol_to_id.setdefault(symbol, len(symbol_to_id)) for symbol in pron)
+                pron_offsets.append(len(symbol_ids))
+            pron_starts.append(len(pron_offsets) - 1)
+
+        word_hashes = np.array([_word_hash(word) for word in words], dtype=np.uint64)
+        hash_order = np.argsort(word_hashes, kind="stable").astype(np.uint32)
+        arrays = {
+            "word_offsets": np.array(word_offsets, dtype=np.uint64),
+            "word_bytes": np.frombuffer(b"".join(words), dtype=np.uint8),
+            "word_hashes": word_hashes[hash_order],
+            "hash_order": hash_order,
+            "pron_starts": np.array(pron_starts, dtype=np.uint32),
+            "pron_offsets": np.array(pron_offsets, dtype=np.uint64),
+            "symbol_ids": np.array(symbol_ids, dtype=np.uint16 if len(symbol_to_id) < 2**16 else np.uint32),
+        }
+        return cls(arrays=arrays, symbols=list(symbol_to_id), info=info)
+
+    def save(self, path: Union[str, pathlib.Path]):
+        """
+        Save the compiled dictionary (without modifications) atomically: magic, header length (uint64),
+        JSON header, arrays aligned to 64 bytes.
+        """
+        arrays = {name: getattr(self, name) for name in _ARRAY_NAMES}
+        header = {
+            "symbols": self.symbols,
+            "info": self.info,
+            "arrays": {name: [array.dtype.str, array.shape[0]] for name, array in arrays.items()},
+        }
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(COMPILED_DICT_MAGIC)
+                f.write(np.uint64(len(header_bytes)).tobytes())
+                f.write(header_bytes)
+                for array in arrays.values():
+                    f.write(b"\0" * (-f.tell() % _ALIGNMENT))
+                    f.write(np.ascontiguousarray(array).tobytes())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _read_header(path: Union[str, pathlib.Path]) -> Dict[str, Any]:
+        with open(path, "rb") as f:
+            if f.read(len(COMPILED_DICT_MAGIC)) != COMPILED_DICT_MAGIC:
+                raise ValueError(f"{path} is not a compiled phoneme dictionary")
+            header_length = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_length).decode("utf-8"))
+        header["data_offset"] = len(COMPILED_DICT_MAGIC) + 8 + header_length
+        return header
+
+    @classmethod
+    def read_info(cls, path: Union[str, pathlib.Path]) -> Dict[str, Any]:
+        """Read the information saved with the dictionary without loading it."""
+        return cls._read_header(path)["info"]
+
+    @classmethod
+    def load(cls, path: Union[str, pathlib.Path]) -> "CompiledPhonemeDict":
+        """Memory-map the saved dictionary (read-only)."""
+        header = cls._read_header(path)
+        offset = header["data_offset"]
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        arrays = {}
+        for name in _ARRAY_NAMES:
+            dtype, size = header["arrays"][name]
+            dtype = np.dtype(dtype)
+            offset += -offset % _ALIGNMENT
+            # plain arrays over the mapping, indexing np.memmap is much slower
+            arrays[name] = np.frombuffer(data, dtype=dtype, count=size, offset=offset)
+            offset += size * dtype.itemsize
+        compiled_dict = cls(arrays=arrays, symbols=header["symbols"], info=header["info"])
+        compiled_dict.path = str(path)
+        return compiled_dict
+
+    def __getstate__(self):
+        if self.path is None:
+            return self.__dict__
+        # memory-mapped dictionary is mapped again instead of being copied
+        return {"mapped_path": self.path, "_overlay": self._overlay, "_num_entries": self._num_entries}
+
+    def __setstate__(self, state):
+        if "mapped_path" in state:
+            self.__dict__.update(self.load(state["mapped_path"]).__dict__)
+            self._overlay, self._num_entries = state["_overlay"], state["_num_entries"]
+        else:
+            self.__dict__.update(state)
+
+    def _find(self, word: str) -> int:
+        """Index of the entry of the compiled dictionary, -1 if the word is not there."""
+        # lookups of a word usually come in a row (`in`, then `[]`)
+        last_word, last_index = self._last_find
+        if word == last_word:
+            return last_index
+        word_bytes = word.encode("utf-8")
+        word_hash = _word_hash(word_bytes)
+        index = -1
+        i = int(self.word_hashes.searchsorted(word_hash))
+        while i < self.word_hashes.shape[0] and self.word_hashes[i] == word_hash:
+            candidate = int(self.hash_order[i])
+            if (
+                self.word_bytes[self.word_offsets[candidate] : self.word_offsets[candidate + 1]].tobytes()
+                == word_bytes
+            ):
+                index = candidate
+                break
+            i += 1
+        self._last_find = (word, index)
+        return index
+
+    def _get_word(self, index: int) -> str:
+        return self.word_bytes[self.word_offsets[index] : self.word_offsets[index + 1]].tobytes().decode("utf-8")
+
+    def _get_prons(self, index: int) -> List[List[str]]:
+        pron_offsets = self.pron_offsets[self.pron_starts[index] : self.pron_starts[index + 1] + 1].tolist()
+        symbol_ids = self.symbol_ids[pron_offsets[0] : pron_offsets[-1]].tolist()
+        start = pron_offsets[0]
+        return [
+            [self.symbols[symbol_id] for symbol_id in symbol_ids[begin - start : end - start]]
+            for begin, end in zip(pron_offsets[:-1], pron_offsets[1:])
+        ]
+
+    def __getitem__(self, word: str) -> List[List[str]]:
+        if word in self._overlay:
+            prons = self._overlay[word]
+        else:
+            index = self._find(word)
+            prons = self._get_prons(index) if index >= 0 else None
+        if prons is None:
+            raise KeyError(word)
+        return prons
+
+    def __contains__(self, word) -> bool:
+        if word in self._overlay:
+            return self._overlay[word] is not None
+        return isinstance(word, str) and self._find(word) >= 0
+
+    def __setitem__(self, word: str, prons: List[List[str]]):
+        if word not in self:
+            self._num_entries += 1
+        self._overlay[word] = prons
+
+    def __delitem__(self, word: str):
+        if word not in self:
+            raise KeyError(word)
+        self._num_entries -= 1
+        self._overlay[word] = None
+
+    def __len__(self) -> int:
+        return self._num_entries
+
+    def __iter__(self) -> Iterator[str]:
+        num_compiled = self.word_hashes.shape[0]
+        for index in range(num_compiled):
+            word = self._get_word(index)
+            if word not in self._overlay or self._overlay[word] is not None:
+                yield word
+        for word, prons in list(self._overlay.items()):
+            if prons is not None and self._find(word) < 0:
+                yield word
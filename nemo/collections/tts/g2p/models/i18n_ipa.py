@@ -12,10 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import pathlib
 import random
 import re
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
 from nemo.collections.common.tokenizers.text_to_speech.ipa_lexicon import validate_locale
@@ -25,6 +27,7 @@ from nemo.collections.common.tokenizers.text_to_speech.tokenizer_utils import (
     english_word_tokenize,
     normalize_unicode_text,
 )
+from nemo.collections.tts.g2p.compiled_dict import COMPILED_DICT_FILE_SUFFIX, CompiledPhonemeDict
 from nemo.collections.tts.g2p.models.base import BaseG2p
 from nemo.collections.tts.g2p.utils import GRAPHEME_CASE_MIXED, GRAPHEME_CASE_UPPER, set_grapheme_case
 from nemo.utils import logging
@@ -53,6 +56,8 @@ class IpaG2p(BaseG2p):
         grapheme_case: Optional[str] = GRAPHEME_CASE_UPPER,
         grapheme_prefix: Optional[str] = "",
         mapping_file: Optional[str] = None,
+        use_compiled_dict: bool = False,
+        word_cache_size: int = 100000,
     ) -> None:
         """
         Generic IPA G2P module. This module converts words from graphemes to International Phonetic Alphabet
@@ -92,6 +97,14 @@ class IpaG2p(BaseG2p):
                 from phonemes because there may be overlaps between the two set. It is suggested to choose a prefix that
                 is not used or preserved somewhere else. "#" could be a good candidate. Default to "".
             TODO @borisfom: add docstring for newly added `mapping_file` argument.
+            use_compiled_dict (bool): Whether to use the phoneme dict file compiled into a memory-mapped file
+                (see `CompiledPhonemeDict`), which is shared by all processes (e.g., dataloader workers) instead of
+                being parsed and held by every process. The compiled file is created next to `phoneme_dict` on
+                the first use and recreated if the file or the settings change. Defaults to False.
+            word_cache_size (int): Max number of words whose phonemes are memoized in every process. Words are
+                memoized only if `phoneme_probability` is None; the memo is cleared by `replace_dict` and
+                `replace_symbols`, call `clear_word_cache` after modifying `phoneme_dict` or `heteronyms` directly.
+                Set to 0 to disable. Defaults to 100000.
         """
         self.use_stresses = use_stresses
         self.grapheme_case = grapheme_case
@@ -99,6 +112,8 @@ class IpaG2p(BaseG2p):
         self.phoneme_probability = phoneme_probability
         self.locale = locale
         self._rng = random.Random()
+        self.word_cache_size = word_cache_size
+        self._word_cache = OrderedDict()
 
         if locale is not None:
             validate_locale(locale)
@@ -112,13 +127,10 @@ class IpaG2p(BaseG2p):
         else:
             self.use_chars = use_chars
 
-        phoneme_dict_obj = self._parse_phoneme_dict(phoneme_dict)
-
-        # verify if phoneme dict obj is empty
-        if phoneme_dict_obj:
-            _phoneme_dict, self.symbols = self._normalize_dict(phoneme_dict_obj)
+        if use_compiled_dict and isinstance(phoneme_dict, (str, pathlib.Path)):
+            _phoneme_dict, self.symbols = self._load_compiled_dict(phoneme_dict)
         else:
-            raise ValueError(f"{phoneme_dict} contains no entries!")
+            _phoneme_dict, self.symbols = self._parse_and_normalize_dict(phoneme_dict)
 
         if apply_to_oov_word is None:
             logging.warning(
@@ -154,6 +166,60 @@ class IpaG2p(BaseG2p):
         if self.heteronyms:
             self.heteronyms = {set_grapheme_case(het, case=self.grapheme_case) for het in self.heteronyms}
 
+    def _parse_and_normalize_dict(
+        self, phoneme_dict: Union[str, pathlib.Path, Dict[str, List[List[str]]]]
+    ) -> Tuple[Dict[str, List[List[str]]], Set]:
+        phoneme_dict_obj = self._parse_phoneme_dict(phoneme_dict)
+
+        # verify if phoneme dict obj is empty
+        if not phoneme_dict_obj:
+            raise ValueError(f"{phoneme_dict} contains no entries!")
+        return self._normalize_dict(phoneme_dict_obj)
+
+    def get_compiled_dict_path(self, phoneme_dict: Union[str, pathlib.Path]) -> pathlib.Path:
+        """Path of the compiled phoneme dict file for the dict file and the settings of the module."""
+        settings = json.dumps(self._get_compiled_dict_settings(), sort_keys=True).encode("utf-8")
+        settings_hash = hashlib.blake2b(settings, digest_size=4).hexdigest()
+        phoneme_dict = pathlib.Path(phoneme_dict)
+        return phoneme_dict.with_name(f"{phoneme_dict.name}.{settings_hash}{COMPILED_DICT_FILE_SUFFIX}")
+
+    def _get_compiled_dict_settings(self) -> Dict:
+        # settings which change the normalized dict and symbols
+        return {
+            "grapheme_case": self.grapheme_case,
+            "grapheme_prefix": self.grapheme_prefix,
+            "use_chars": self.use_chars,
+            "use_stresses": self.use_stresses,
+        }
+
+    def _load_compiled_dict(self, phoneme_dict: Union[str, pathlib.Path]) -> Tuple[CompiledPhonemeDict, Set]:
+        """
+        Load the compiled phoneme dict, compile and save it first if it does not exist or is outdated.
+        """
+        compiled_dict_path = self.get_compiled_dict_path(phoneme_dict)
+        stat = pathlib.Path(phoneme_dict).stat()
+        source = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        settings = self._get_compiled_dict_settings()
+        try:
+            info = CompiledPhonemeDict.read_info(compiled_dict_path)
+            if info["source"] == source and info["settings"] == settings:
+                logging.info(f"Loading compiled phoneme dict from {compiled_dict_path}")
+                return CompiledPhonemeDict.load(compiled_dict_path), set(info["symbols"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+        g2p_dict, symbols = self._parse_and_normalize_dict(phoneme_dict)
+        info = {"source": source, "settings": settings, "symbols": sorted(symbols)}
+        try:
+            CompiledPhonemeDict.build(g2p_dict, info=info).save(compiled_dict_path)
+        except OSError as e:
+            logging.warning(
+                f"Failed to save compiled phoneme dict to {compiled_dict_path}, using the parsed dict: {e}"
+            )
+            return g2p_dict, symbols
+        logging.info(f"Saved compiled phoneme dict to {compiled_dict_path}")
+        return CompiledPhonemeDict.load(compiled_dict_path), symbols
+
     @staticmethod
     def _parse_phoneme_dict(
         phoneme_dict: Union[str, pathlib.Path, Dict[str, List[List[str]]]]
@@ -224,6 +290,7 @@ class IpaG2p(BaseG2p):
         Replace model's phoneme dictionary with a custom one
         """
         self.phoneme_dict = self._parse_phoneme_dict(phoneme_dict)
+        self.clear_word_cache()
 
     @staticmethod
     def _parse_file_by_lines(p: Union[str, pathlib.Path]) -> List[str]:
@@ -339,6 +406,11 @@ class IpaG2p(BaseG2p):
             self.phoneme_dict.update(replacement_dict)
 
         self.symbols = new_symbols
+        self.clear_word_cache()
+
+    def clear_word_cache(self):
+        """Clear the memoized phonemes of words."""
+        self._word_cache.clear()
 
     def is_unique_in_phoneme_dict(self, word: str) -> bool:
         return len(self.phoneme_dict[word]) == 1
@@ -448,15 +520,39 @@ class IpaG2p(BaseG2p):
         else:
             return self._prepend_prefix_for_one_word(word), False
 
-    def __call__(self, text: str) -> List[str]:
-        text = normalize_unicode_text(text)
-
-        if self.heteronym_model is not None:
-            try:
-                text = self.heteronym_model.disambiguate(sentences=[text])[1][0]
-            except Exception as e:
-                logging.warning(f"Heteronym model failed {e}, skipping")
-
+    def _parse_word(self, word: str) -> List[str]:
+        pron, is_handled = self.parse_one_word(word)
+
+        # If `is_handled` is False, then the only possible case is that the word is an OOV. The OOV may have a
+        # hyphen so that it doesn't show up in the g2p dictionary. We need split it into sub-words by a hyphen,
+        # and parse the sub-words again just in case any sub-word exists in the g2p dictionary.
+        if not is_handled:
+            subwords_by_hyphen = word.split("-")
+            if len(subwords_by_hyphen) > 1:
+                pron = []  # reset the previous pron
+                for sub_word in subwords_by_hyphen:
+                    p, _ = self.parse_one_word(sub_word)
+                    pron.extend(p)
+                    pron.append("-")
+                pron.pop()  # remove the redundant hyphen that is previously appended at the end of the word.
+
+        return pron
+
+    def _parse_word_cached(self, word: str) -> Tuple[str, ...]:
+        pron = self._word_cache.get(word)
+        if pron is not None:
+            self._word_cache.move_to_end(word)
+            return pron
+
+        pron = tuple(self._parse_word(word))
+        self._word_cache[word] = pron
+        if len(self._word_cache) > self.word_cache_size:
+            self._word_cache.popitem(last=False)
+        return pron
+
+    def _text_to_phonemes(self, text: str) -> List[str]:
+        # random choice of graphemes in `parse_one_word` makes the results of words non-deterministic
+        use_word_cache = self.phoneme_probability is None and self.word_cache_size > 0
         words_list_of_tuple = self.word_tokenize_func(text)
 
         prons = []
@@ -470,21 +566,31 @@ class IpaG2p(BaseG2p):
                 ), f"{words} should only have a single item when `without_changes` is False, but found {len(words)}."
 
                 word = words[0]
-                pron, is_handled = self.parse_one_word(word)
-
-                # If `is_handled` is False, then the only possible case is that the word is an OOV. The OOV may have a
-                # hyphen so that it doesn't show up in the g2p dictionary. We need split it into sub-words by a hyphen,
-                # and parse the sub-words again just in case any sub-word exists in the g2p dictionary.
-                if not is_handled:
-                    subwords_by_hyphen = word.split("-")
-                    if len(subwords_by_hyphen) > 1:
-                        pron = []  # reset the previous pron
-                        for sub_word in subwords_by_hyphen:
-                            p, _ = self.parse_one_word(sub_word)
-                            pron.extend(p)
-                            pron.append("-")
-                        pron.pop()  # remove the redundant hyphen that is previously appended at the end of the word.
-
-                prons.extend(pron)
+                prons.extend(self._parse_word_cached(word) if use_word_cache else self._parse_word(word))
 
         return prons
+
+    def __call__(self, text: Union[str, List[str]]) -> Union[List[str], List[List[str]]]:
+        """
+        Convert the text to phonemes (and graphemes).
+
+        Args:
+            text: text, or a list of texts which are converted as a batch (e.g., with one call to the heteronym model)
+
+        Returns:
+            list of phonemes for the text, or a list of them for the list of texts
+        """
+        if isinstance(text, str):
+            return self._call_batch([text])[0]
+        return self._call_batch(text)
+
+    def _call_batch(self, texts: List[str]) -> List[List[str]]:
+        texts = [normalize_unicode_text(text) for text in texts]
+
+        if self.heteronym_model is not None and texts:
+            try:
+                texts = self.heteronym_model.disambiguate(sentences=texts)[1]
+            except Exception as e:
+                logging.warning(f"Heteronym model failed {e}, skipping")
+
+        return [self._text_to_phonemes(text) for text in texts]
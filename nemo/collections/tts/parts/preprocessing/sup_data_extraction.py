@@ -0,0 +1,253 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import librosa
+import numpy as np
+import torch
+from tqdm import tqdm
+
+from nemo.collections.tts.data.dataset import TTSDataset
+from nemo.collections.tts.torch.tts_data_types import Energy, P_voiced, Pitch, Voiced_mask
+from nemo.utils import logging
+
+# order of the outputs of librosa.pyin
+VOICED_DATA_TYPES = [Pitch, Voiced_mask, P_voiced]
+
+# dataset used by the extraction in the worker processes
+_worker_dataset: Optional[TTSDataset] = None
+
+
+def _init_worker(dataset: TTSDataset):
+    global _worker_dataset
+    _worker_dataset = dataset
+    # parallelism comes from the processes
+    torch.set_num_threads(1)
+
+
+def extract_sup_data(
+    dataset: TTSDataset, index: int, names: List[str]
+) -> Tuple[Optional[float], Dict[str, torch.Tensor], Optional[str]]:
+    """
+    Compute pitch, voicing and energy of the dataset sample in the same way as `TTSDataset.__getitem__`.
+
+    Args:
+        dataset: dataset with the sample
+        index: index of the sample
+        names: names of the supplementary data types to compute
+
+    Returns:
+        audio duration in seconds, values for the requested data types, and the error message if the sample failed
+    """
+    try:
+        audio = dataset._pad_wav_to_multiple(dataset._load_audio(dataset.data[index]["audio_filepath"]))
+        values = {}
+        voiced_names = [data_type.name for data_type in VOICED_DATA_TYPES if data_type.name in names]
+        if voiced_names:
+            voiced_tuple = librosa.pyin(
+                audio.numpy(),
+                fmin=dataset.pitch_fmin,
+                fmax=dataset.pitch_fmax,
+                frame_length=dataset.win_length,
+                sr=dataset.sample_rate,
+                fill_na=0.0,
+            )
+            for i, data_type in enumerate(VOICED_DATA_TYPES):
+                if data_type.name in voiced_names:
+                    values[data_type.name] = torch.from_numpy(voiced_tuple[i]).float()
+        if Energy.name in names:
+            spec = dataset.get_spec(audio)
+            values[Energy.name] = torch.linalg.norm(spec.squeeze(0), axis=0).float()
+        return audio.shape[0] / dataset.sample_rate, values, None
+    except Exception as e:
+        return None, {}, f"{type(e).__name__}: {e}"
+
+
+def _extract_sup_data_batch(tasks: List[Tuple[int, List[str]]]) -> List[Tuple[int, Optional[float], Dict, str]]:
+    return [(index, *extract_sup_data(_worker_dataset, index, names)) for index, names in tasks]
+
+
+class PitchStatsAccumulator:
+    """Running mean and standard deviation of the voiced pitch, for all speakers ("default") and per speaker."""
+
+    def __init__(self):
+        self._moments = defaultdict(lambda: np.zeros(3, dtype=np.float64))
+
+    def add(self, pitch: torch.Tensor, speaker_id=None):
+        pitch = pitch[pitch != 0].double()
+        moments = np.array([pitch.numel(), pitch.sum().item(), pitch.square().sum().item()])
+        self._moments["default"] += moments
+        if speaker_id is not None:
+            self._moments[str(speaker_id)] += moments
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Statistics in the format of `pitch_stats_path` of `TTSDataset`."""
+        stats = {}
+        for key, (count, total, total_sq) in self._moments.items():
+            mean = total / count if count > 0 else math.nan
+            # unbiased, as torch.std
+            std = math.sqrt(max(total_sq - count * mean**2, 0.0) / (count - 1)) if count > 1 else math.nan
+            stats[key] = {"pitch_mean": mean, "pitch_std": std}
+        return stats
+
+
+class SupDataExtractor:
+    """
+    Offline extraction of pitch, voiced mask, p_voiced and energy for `TTSDataset`, which otherwise computes them
+    on the first access in `__getitem__`. Values are saved where the dataset reads them (.pt files or
+    `SupDataStore`), so the extraction can be resumed: samples with all requested data types are skipped.
+    Samples are sorted by duration and split into batches of similar duration, which are processed by a process pool
+    (longest first), the main process saves the results and accumulates the pitch statistics.
+
+    Args:
+        dataset: dataset, supplementary data types to extract are taken from its `sup_data_types`
+        num_workers: number of worker processes, all CPUs if None, extraction in the main process if 0
+        batch_duration: total audio duration in seconds of the samples processed by a worker at once
+        overwrite: whether to recompute existing supplementary data
+    """
+
+    def __init__(
+        self,
+        dataset: TTSDataset,
+        num_workers: Optional[int] = None,
+        batch_duration: float = 60.0,
+        overwrite: bool = False,
+    ):
+        self.dataset = dataset
+        self.num_workers = os.cpu_count() if num_workers is None else num_workers
+        self.batch_duration = batch_duration
+        self.overwrite = overwrite
+        data_types = VOICED_DATA_TYPES + [Energy]
+        self.names = [data_type.name for data_type in data_types if data_type in dataset.sup_data_types_set]
+        if not self.names:
+            raise ValueError(
+                f"sup_data_types of the dataset must contain at least one of {[data_type.name for data_type in data_types]}"
+            )
+        self.pitch_stats = PitchStatsAccumulator()
+
+    def _get_duration(self, sample: Dict) -> float:
+        if sample["duration"] is not None:
+            return sample["duration"]
+        # 16-bit audio is a good enough estimate for balancing the batches
+        return os.path.getsize(sample["audio_filepath"]) / (2 * self.dataset.sample_rate)
+
+    def _make_batches(self, tasks: List[Tuple[int, List[str]]]) -> List[List[Tuple[int, List[str]]]]:
+        durations = [self._get_duration(self.dataset.data[index]) for index, _ in tasks]
+        batches, batch, batch_duration = [], [], 0.0
+        for i in np.argsort(durations, kind="stable")[::-1]:
+            if batch and batch_duration + durations[i] > self.batch_duration:
+                batches.append(batch)
+                batch, batch_duration = [], 0.0
+            batch.append(tasks[i])
+            batch_duration += durations[i]
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _save(self, index: int, values: Dict[str, torch.Tensor]):
+        sample = self.dataset.data[index]
+        key = self.dataset._get_rel_audio_path_as_text_id(sample)
+        for name, value in values.items():
+            self.dataset._save_sup_data(name, key, value)
+        self._add_pitch_stats(index, values)
+
+    def _add_pitch_stats(self, index: int, values: Dict[str, torch.Tensor]):
+        if Pitch.name not in self.names:
+            return
+        sample = self.dataset.data[index]
+        pitch = values.get(Pitch.name)
+        if pitch is None:
+            pitch = self.dataset._load_sup_data(Pitch.name, self.dataset._get_rel_audio_path_as_text_id(sample))
+        self.pitch_stats.add(pitch.float(), sample["speaker_id"])
+
+    def extract(self) -> Dict[str, float]:
+        """
+        Extract the missing supplementary data of the dataset.
+
+        Returns:
+            summary with the number of samples (computed, skipped and failed), the duration of the processed audio
+            and the throughput
+        """
+        start_time = time.perf_counter()
+        tasks = []
+        num_skipped = 0
+        for index, sample in enumerate(tqdm(self.dataset.data, desc="Checking existing supplementary data")):
+            key = self.dataset._get_rel_audio_path_as_text_id(sample)
+            missing = [name for name in self.names if self.overwrite or not self.dataset._has_sup_data(name, key)]
+            if missing:
+                tasks.append((index, missing))
+            else:
+                num_skipped += 1
+                self._add_pitch_stats(index, {})
+        logging.info(f"Supplementary data exists for {num_skipped} samples, computing for {len(tasks)} samples")
+
+        extraction_start_time = time.perf_counter()
+        num_computed, num_failed, audio_duration = 0, 0, 0.0
+        batches = self._make_batches(tasks)
+        progress = tqdm(total=len(tasks), desc="Extracting supplementary data")
+
+        def process_results(results):
+            nonlocal num_computed, num_failed, audio_duration
+            for index, duration, values, error in results:
+                if error is not None:
+                    num_failed += 1
+                    logging.warning(f"Failed to extract supplementary data for {self.dataset.data[index]}: {error}")
+                    continue
+                self._save(index, values)
+                num_computed += 1
+                audio_duration += duration
+            elapsed = time.perf_counter() - extraction_start_time
+            progress.update(len(results))
+            progress.set_postfix(rtf=f"{audio_duration / elapsed:.1f}x")
+
+        if self.num_workers > 0 and len(batches) > 1:
+            # the dataset is not picklable (lambdas), so workers get it by forking
+            with ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(self.dataset,),
+            ) as executor:
+                futures = [executor.submit(_extract_sup_data_batch, batch) for batch in batches]
+                for future in as_completed(futures):
+                    process_results(future.result())
+        else:
+            for batch in batches:
+                process_results([(index, *extract_sup_data(self.dataset, index, names)) for index, names in batch])
+        progress.close()
+        self.dataset.consolidate_sup_data()
+
+        extraction_time = time.perf_counter() - extraction_start_time
+        summary = {
+            "num_computed": num_computed,
+            "num_skipped": num_skipped,
+            "num_failed": num_failed,
+            "audio_hours": audio_duration / 3600,
+            "total_time": time.perf_counter() - start_time,
+            "samples_per_second": num_computed / extraction_time if extraction_time > 0 else 0.0,
+            "audio_seconds_per_second": audio_duration / extraction_time if extraction_time > 0 else 0.0,
+        }
+        logging.info(
+            f"Extracted supplementary data for {num_computed} samples ({summary['audio_hours']:.2f} hours of audio) "
+            f"in {extraction_time:.1f}s: {summary['samples_per_second']:.1f} samples/s, "
+            f"{summary['audio_seconds_per_second']:.1f}x real time; {num_skipped} skipped, {num_failed} failed."
+        )
+        return summary
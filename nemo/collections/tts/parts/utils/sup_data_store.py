@@ -0,0 +1,271 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+# Directory layout of the store (one store per supplementary data type):
+#   meta.json    - format version and dtype of the stored arrays
+#   <shard>.bin  - append-only shard: for every entry, key (utf-8) followed by the array data (C order)
+#   <shard>.idx  - append-only index of the shard, one record per entry, written after the entry data
+#   index.npy    - consolidated index of all shards, sorted by key hash (see `SupDataStore.consolidate`)
+SUP_DATA_STORE_VERSION = 1
+SUP_DATA_STORE_MAX_NDIM = 3
+SUP_DATA_STORE_ALIGNMENT = 64
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("key_hash", np.uint64),
+        ("shard", np.uint32),
+        ("key_length", np.uint32),
+        ("offset", np.uint64),
+        ("shape", np.uint32, (SUP_DATA_STORE_MAX_NDIM,)),
+        ("ndim", np.uint8),
+    ]
+)
+
+
+def get_key_hash(key: str) -> int:
+    """Stable 64-bit hash of the entry key (e.g., audio path based id of the utterance)."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class SupDataStoreWriter:
+    """
+    Writer to append entries to the store. Every writer appends to its own shards, so multiple writers
+    (e.g., from different processes) can append to the same store concurrently.
+    Entries are visible to the store which created the writer right away, and to other readers after
+    `SupDataStore.refresh`.
+    """
+
+    def __init__(self, path: Path, dtype: np.dtype, max_shard_size: int, store: Optional["SupDataStore"] = None):
+        self.path = path
+        self.dtype = dtype
+        self.max_shard_size = max_shard_size
+        self.store = store
+        self._data_file = None
+        self._index_file = None
+        self._shard = None
+
+    def _open_shard(self):
+        self.close()
+        while True:
+            shard = int.from_bytes(os.urandom(4), "little")
+            try:
+                self._data_file = open(self.path / f"{shard:08x}.bin", "xb")
+            except FileExistsError:
+                continue
+            break
+        self._index_file = open(self.path / f"{shard:08x}.idx", "xb")
+        self._shard = shard
+
+    def add(self, key: str, value: np.ndarray):
+        """
+        Append the array to the store. If the key already exists, the new value replaces the old one.
+
+        Args:
+            key: entry key
+            value: array with at most `SUP_DATA_STORE_MAX_NDIM` dimensions, converted to the store dtype
+        """
+        value = np.ascontiguousarray(value, dtype=self.dtype)
+        if value.ndim > SUP_DATA_STORE_MAX_NDIM:
+            raise ValueError(f"Arrays with at most {SUP_DATA_STORE_MAX_NDIM} dimensions are supported: {value.shape}")
+        if self._data_file is None or self._data_file.tell() >= self.max_shard_size:
+            self._open_shard()
+
+        key_bytes = key.encode("utf-8")
+        position = self._data_file.tell()
+        padding = -(position + len(key_bytes)) % SUP_DATA_STORE_ALIGNMENT
+        self._data_file.write(b"\0" * padding + key_bytes)
+        offset = self._data_file.tell()
+        self._data_file.write(value.tobytes())
+        # the data must be in the shard before the index record
+        self._data_file.flush()
+
+        record = np.zeros([1], dtype=INDEX_DTYPE)
+        record["key_hash"] = get_key_hash(key)
+        record["shard"] = self._shard
+        record["key_length"] = len(key_bytes)
+        record["offset"] = offset
+        record["shape"][0, : value.ndim] = value.shape
+        record["ndim"] = value.ndim
+        self._index_file.write(record.tobytes())
+        self._index_file.flush()
+        if self.store is not None:
+            self.store._add_record(record[0])
+
+    def close(self):
+        """Close the current shard."""
+        if self._data_file is not None:
+            self._data_file.close()
+            self._index_file.close()
+        self._data_file, self._index_file, self._shard = None, None, None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SupDataStore:
+    """
+    Sharded, append-only store of supplementary data of one type (e.g., pitch) for TTS datasets,
+    which replaces the folder with one `.pt` file per utterance.
+    Arrays are read from memory-mapped shards without copying. The mapping is copy-on-write: modifying a returned
+    array does not change the store, but is visible to later reads of the same entry in the process, so copy the array
+    before modifying it in place. Shards are mapped lazily, so the store can be shared with dataloader workers.
+
+    Args:
+        path: directory of the store, created if it does not exist
+        dtype: dtype of the stored arrays; required for a new store, must match the existing store otherwise
+        max_shard_size: size in bytes after which the writer starts a new shard
+    """
+
+    def __init__(
+        self, path: Union[str, Path], dtype: Optional[Union[str, np.dtype]] = None, max_shard_size: int = 2**30
+    ):
+        self.path = Path(path)
+        self.max_shard_size = max_shard_size
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["version"] != SUP_DATA_STORE_VERSION:
+                raise ValueError(f"Unsupported version of the store {self.path}: {meta['version']}")
+            self.dtype = np.dtype(meta["dtype"])
+            if dtype is not None and np.dtype(dtype) != self.dtype:
+                raise ValueError(f"Store {self.path} contains arrays of {self.dtype}, requested {np.dtype(dtype)}")
+        elif dtype is None:
+            raise ValueError(f"Store {self.path} does not exist, `dtype` is required to create it")
+        else:
+            self.dtype = np.dtype(dtype)
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path / f"meta.json.tmp{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": SUP_DATA_STORE_VERSION, "dtype": self.dtype.str}, f)
+            os.replace(tmp_path, meta_path)
+
+        self._shards: Dict[int, np.ndarray] = {}
+        self._index = self._read_index()
+        # records of the entries added by the writers of this store after the index was read, by key hash
+        self._added: Dict[int, np.void] = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shards"] = {}
+        return state
+
+    @staticmethod
+    def exists(path: Union[str, Path]) -> bool:
+        """Check if the directory contains the store."""
+        return (Path(path) / "meta.json").exists()
+
+    def _read_index(self) -> np.ndarray:
+        """Read and merge the consolidated index and the indices of the shards; later entries replace earlier."""
+        indices = []
+        if (self.path / "index.npy").exists():
+            indices.append(np.load(self.path / "index.npy"))
+        for index_path in sorted(self.path.glob("*.idx"), key=lambda path: path.stat().st_mtime_ns):
+            index_bytes = index_path.read_bytes()
+            # ignore the incomplete record of the interrupted writer
+            num_records = len(index_bytes) // INDEX_DTYPE.itemsize
+            indices.append(np.frombuffer(index_bytes, dtype=INDEX_DTYPE, count=num_records))
+        if not indices:
+            return np.zeros([0], dtype=INDEX_DTYPE)
+        index = np.concatenate(indices)[::-1]
+        # keep the last entry for every key (np.unique returns the first occurrence in the reversed index)
+        _, last_ids = np.unique(index["key_hash"], return_index=True)
+        return index[last_ids]
+
+    def refresh(self):
+        """Re-read the index to see the entries added after the store was opened."""
+        self._index = self._read_index()
+        self._added = {}
+
+    def _add_record(self, record: np.void):
+        self._added[int(record["key_hash"])] = record
+
+    def __len__(self) -> int:
+        if not self._added:
+            return self._index.shape[0]
+        added_hashes = np.fromiter(self._added, dtype=np.uint64, count=len(self._added))
+        return self._index.shape[0] + int(np.count_nonzero(~np.isin(added_hashes, self._index["key_hash"])))
+
+    def _find(self, key: str) -> Optional[np.void]:
+        key_hash = get_key_hash(key)
+        record = self._added.get(key_hash)
+        if record is not None:
+            return record
+        i = np.searchsorted(self._index["key_hash"], np.uint64(key_hash))
+        if i == self._index.shape[0] or self._index["key_hash"][i] != key_hash:
+            return None
+        return self._index[i]
+
+    def _get_shard(self, shard: int, end: int) -> np.ndarray:
+        data = self._shards.get(shard)
+        if data is None or data.shape[0] < end:
+            # the shard can grow after it was mapped
+            data = np.memmap(self.path / f"{shard:08x}.bin", dtype=np.uint8, mode="c")
+            self._shards[shard] = data
+        return data
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Get the array for the key.
+
+        Args:
+            key: entry key
+
+        Returns:
+            copy-on-write view of the memory-mapped array, None if the key is not in the store
+        """
+        record = self._find(key)
+        if record is None:
+            return None
+        shape = tuple(int(dim) for dim in record["shape"][: record["ndim"]])
+        offset = int(record["offset"])
+        end = offset + int(np.prod(shape, dtype=np.int64)) * self.dtype.itemsize
+        data = self._get_shard(int(record["shard"]), end)
+        key_bytes = key.encode("utf-8")
+        if bytes(data[offset - len(key_bytes) : offset]) != key_bytes:
+            # hash collision
+            return None
+        return data[offset:end].view(self.dtype).reshape(shape)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def writer(self) -> SupDataStoreWriter:
+        """Create the writer to append entries to the store (use as a context manager)."""
+        return SupDataStoreWriter(path=self.path, dtype=self.dtype, max_shard_size=self.max_shard_size, store=self)
+
+    def consolidate(self):
+        """
+        Merge the indices of all shards into the single index. Must not be called while writers are active.
+        """
+        index = self._read_index()
+        merged_paths = list(self.path.glob("*.idx"))
+        tmp_path = self.path / f"index.tmp{os.getpid()}.npy"
+        np.save(tmp_path, index)
+        os.replace(tmp_path, self.path / "index.npy")
+        for index_path in merged_paths:
+            index_path.unlink()
+        self._index = index
+        self._added = {}
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import functools
+import math
 import os
 import random
 import traceback
@@ -159,6 +160,53 @@ def beta_binomial_prior_distribution(phoneme_count: int, mel_count: int, scaling
     return logbetabinom(n, a, b, x).exp().numpy()
 
 
+def batched_beta_binomial_prior_distribution(
+    phoneme_counts: torch.Tensor,
+    mel_counts: torch.Tensor,
+    scaling_factor: float = 1.0,
+    device: Optional[torch.device] = None,
+) -> torch.Tensor:
+    """
+    Compute the priors of `beta_binomial_prior_distribution` for a batch in one vectorized pass.
+
+    Args:
+        phoneme_counts: number of phonemes (text tokens) of every item, [B]
+        mel_counts: number of mel frames of every item, [B]
+        scaling_factor: scaling factor of the beta-binomial distribution
+        device: device to compute the priors on, device of `phoneme_counts` if None
+
+    Returns:
+        priors padded with zeros, [B, max(mel_counts), max(phoneme_counts)]
+    """
+    device = phoneme_counts.device if device is None else device
+    max_phoneme_count, max_mel_count = int(phoneme_counts.max()), int(mel_counts.max())
+
+    # logbetabinom(n, a, b, x) with n = phoneme_count - 1, a = s * y, b = s * (mel_count + 1 - y):
+    # both terms gammaln(x + a) and gammaln(n - x + b) depending on x and y are gammaln(i + s * j) for integer i, j,
+    # so they are taken from one table instead of computing gammaln for every element of the batch
+    table = gammaln(
+        torch.arange(0, max_phoneme_count, device=device, dtype=torch.float)[None, :]
+        + scaling_factor * torch.arange(0, max_mel_count + 1, device=device, dtype=torch.float)[:, None]
+    )
+    # padding is -inf, so the prior is 0 there
+    log_prior = torch.full([len(phoneme_counts), max_mel_count, max_phoneme_count], -math.inf, device=device)
+    for i, (phoneme_count, mel_count) in enumerate(zip(phoneme_counts.tolist(), mel_counts.tolist())):
+        # gammaln(n - x + b) for y in [1, mel_count], x in [0, n]
+        log_prior[i, :mel_count, :phoneme_count] = table[1 : mel_count + 1, :phoneme_count].flip(0, 1)
+    log_prior += table[1:, :]
+
+    # remaining terms depend only on x or y; arguments are clamped in the padding to keep them finite
+    n = phoneme_counts.to(device=device, dtype=torch.float)[:, None, None] - 1
+    mel_counts = mel_counts.to(device=device, dtype=torch.float)[:, None, None]
+    x = torch.arange(0, max_phoneme_count, device=device, dtype=torch.float)[None, None, :]
+    y = torch.arange(1, max_mel_count + 1, device=device, dtype=torch.float)[None, :, None]
+    a = scaling_factor * y
+    b = scaling_factor * (mel_counts + 1 - y).clamp(min=1)
+    log_prior += gammaln(n + 1) - gammaln(x + 1) - gammaln((n - x).clamp(min=0) + 1)
+    log_prior -= gammaln(n + a + b) + logbeta(a, b)
+    return log_prior.exp_()
+
+
 def get_base_dir(paths):
     def is_relative_to(path1, path2):
         try:
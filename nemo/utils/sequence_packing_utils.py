@@ -13,14 +13,23 @@
 # limitations under the License.
 
 import collections
-from typing import Dict, List
+import json
+import os
+from typing import Dict, Iterable, List, Optional
 
 import numpy as np
 from tqdm import tqdm
 
 from nemo.utils import logging
 
-PACKING_ALGOS = ['first_fit_decreasing', 'first_fit_shuffle']
+try:
+    import numba
+
+    HAVE_NUMBA = True
+except (ImportError, ModuleNotFoundError):
+    HAVE_NUMBA = False
+
+PACKING_ALGOS = ['first_fit_decreasing', 'first_fit_shuffle', 'best_fit_decreasing', 'best_fit']
 
 
 def find_first_bin_that_fits(bins: List[List[int]], s: int, bin_size: int) -> int:
@@ -41,10 +50,162 @@ def find_first_bin_that_fits(bins: List[List[int]], s: int, bin_size: int) -> in
     return -1
 
 
+def _first_fit_bins(seqlens: np.ndarray, pack_size: int):
+    """
+    First-Fit on a max segment tree over the remaining capacity of the bins, O(n log n).
+
+    Bins that are not open yet have the full capacity, so the leftmost leaf that fits 's' is either the first
+    open bin that fits or the next bin to open. Compiled with numba when available.
+
+    Returns:
+      The bin index of every sequence and the number of bins.
+    """
+    size = 1
+    while size < max(len(seqlens), 1):
+        size *= 2
+    tree = np.full(2 * size, pack_size, dtype=np.int64)
+    bin_ids = np.empty(len(seqlens), dtype=np.int64)
+    num_bins = 0
+    for i in range(len(seqlens)):
+        s = seqlens[i]
+        if tree[1] < s:
+            # longer than the pack size, gets a bin of its own
+            node = num_bins + size
+        else:
+            node = 1
+            while node < size:
+                node = 2 * node if tree[2 * node] >= s else 2 * node + 1
+        b = node - size
+        bin_ids[i] = b
+        if b == num_bins:
+            num_bins += 1
+        tree[node] -= s
+        node //= 2
+        while node >= 1:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+    return bin_ids, num_bins
+
+
+def _best_fit_bins(seqlens: np.ndarray, pack_size: int):
+    """
+    Best-Fit on buckets of bins keyed by their remaining capacity, O(n log pack_size).
+
+    A min segment tree over the capacities finds the smallest non-empty bucket that fits 's'. Every bucket is a
+    linked list of bins, so ties are broken in favour of the most recently filled bin.
+    Compiled with numba when available.
+
+    Returns:
+      The bin index of every sequence and the number of bins.
+    """
+    size = 1
+    while size < pack_size + 1:
+        size *= 2
+    empty = pack_size + 1
+    tree = np.full(2 * size, empty, dtype=np.int64)
+    head = np.full(pack_size + 1, -1, dtype=np.int64)
+    count = np.zeros(pack_size + 1, dtype=np.int64)
+    next_bin = np.full(len(seqlens), -1, dtype=np.int64)
+    bin_ids = np.empty(len(seqlens), dtype=np.int64)
+    num_bins = 0
+    for i in range(len(seqlens)):
+        s = seqlens[i]
+        # smallest remaining capacity in [s, pack_size] that has a bin
+        capacity = empty
+        if s <= pack_size:
+            lo = max(s, 0) + size
+            hi = pack_size + size + 1
+            while lo < hi:
+                if lo & 1:
+                    capacity = min(capacity, tree[lo])
+                    lo += 1
+                if hi & 1:
+                    hi -= 1
+                    capacity = min(capacity, tree[hi])
+                lo //= 2
+                hi //= 2
+
+        if capacity == empty:
+            b = num_bins
+            num_bins += 1
+            remaining = pack_size - s
+        else:
+            b = head[capacity]
+            head[capacity] = next_bin[b]
+            count[capacity] -= 1
+            if count[capacity] == 0:
+                node = capacity + size
+                tree[node] = empty
+                node //= 2
+                while node >= 1:
+                    tree[node] = min(tree[2 * node], tree[2 * node + 1])
+                    node //= 2
+            remaining = capacity - s
+        bin_ids[i] = b
+
+        if remaining >= 0:
+            next_bin[b] = head[remaining]
+            head[remaining] = b
+            count[remaining] += 1
+            if count[remaining] == 1:
+                node = remaining + size
+                tree[node] = remaining
+                node //= 2
+                while node >= 1:
+                    tree[node] = min(tree[2 * node], tree[2 * node + 1])
+                    node //= 2
+    return bin_ids, num_bins
+
+
+if HAVE_NUMBA:
+    _first_fit_bins = numba.jit(nopython=True, nogil=True)(_first_fit_bins)
+    _best_fit_bins = numba.jit(nopython=True, nogil=True)(_best_fit_bins)
+
+
+def _pack(bins_fn, seqlens: List[int], pack_size: int, order: Optional[str] = None) -> List[List[int]]:
+    """
+    Runs a packing kernel and groups the sequences by bin, in the order the bins were opened.
+
+    Args:
+      bins_fn: The packing kernel, `_first_fit_bins` or `_best_fit_bins`.
+      seqlens: The lengths of the sequences, or objects that can be summed into their length
+               (e.g. samples of a task encoder). The bins contain the original items.
+      pack_size: The maximum capacity of each bin.
+      order: The order in which the sequences are packed, None (as given), 'decreasing' (stable sort by length)
+             or 'shuffle' (permutation from np.random).
+    """
+    items = seqlens.tolist() if isinstance(seqlens, np.ndarray) else list(seqlens)
+    if all(isinstance(s, (int, np.integer)) for s in items):
+        lengths = np.array(items, dtype=np.int64)
+    else:
+        lengths = np.array([sum([s]) for s in items], dtype=np.int64)
+
+    if order is None:
+        perm = np.arange(len(items))
+    elif order == 'decreasing':
+        perm = np.argsort(-lengths, kind='stable')
+    elif order == 'shuffle':
+        perm = np.arange(len(items))
+        np.random.shuffle(perm)
+    else:
+        raise ValueError(f"Unknown packing order: {order}")
+
+    if len(items) == 0:
+        return []
+    bin_ids, num_bins = bins_fn(lengths[perm], pack_size)
+    res = [[] for _ in range(num_bins)]
+    for i, b in zip(perm.tolist(), bin_ids.tolist()):
+        res[b].append(items[i])
+    return res
+
+
 def first_fit(seqlens: List[int], pack_size: int) -> List[List[int]]:
     """
     Packs sequences of varying lengths into bins using the First-Fit algorithm.
 
+    Every sequence goes to the first bin that has enough space left, which is found in O(log n)
+    with a segment tree over the remaining capacity of the bins.
+
     Args:
       seqlens: A list of integers, representing the lengths of the sequences to be packed.
       pack_size: The maximum capacity of each bin.
@@ -53,14 +214,7 @@ def first_fit(seqlens: List[int], pack_size: int) -> List[List[int]]:
       A list of lists, where each inner list represents a bin and contains the indices
         of the sequences assigned to that bin.
     """
-    res = []
-    for s in seqlens:
-        first_bin = find_first_bin_that_fits(res, s, pack_size)
-        if first_bin == -1:  # open a new bin
-            res.append([s])
-        else:
-            res[first_bin].append(s)
-    return res
+    return _pack(_first_fit_bins, seqlens, pack_size)
 
 
 def first_fit_decreasing(seqlens: List[int], pack_size: int) -> List[List[int]]:
@@ -76,8 +230,7 @@ def first_fit_decreasing(seqlens: List[int], pack_size: int) -> List[List[int]]:
     Returns:
       A list of lists, similar to the output of the 'first_fit' function.
     """
-    sorted_seqlens = sorted(seqlens, reverse=True)
-    return first_fit(sorted_seqlens, pack_size)
+    return _pack(_first_fit_bins, seqlens, pack_size, order='decreasing')
 
 
 def first_fit_shuffle(seqlens: List[int], pack_size: int) -> List[List[int]]:
@@ -93,9 +246,70 @@ def first_fit_shuffle(seqlens: List[int], pack_size: int) -> List[List[int]]:
     Returns:
       A list of lists, similar to the output of the 'first_fit' function.
     """
-    shuffled_seqlens = seqlens[:]
-    np.random.shuffle(shuffled_seqlens)
-    return first_fit(shuffled_seqlens, pack_size)
+    return _pack(_first_fit_bins, seqlens, pack_size, order='shuffle')
+
+
+def best_fit(seqlens: List[int], pack_size: int) -> List[List[int]]:
+    """
+    Packs sequences of varying lengths into bins using the Best-Fit algorithm.
+
+    Every sequence goes to the bin with the least space left that can still fit it. Ties are broken in favour of
+    the most recently filled bin.
+
+    Args:
+      seqlens: A list of integers, representing the lengths of the sequences to be packed.
+      pack_size: The maximum capacity of each bin.
+
+    Returns:
+      A list of lists, similar to the output of the 'first_fit' function.
+    """
+    return _pack(_best_fit_bins, seqlens, pack_size)
+
+
+def best_fit_decreasing(seqlens: List[int], pack_size: int) -> List[List[int]]:
+    """
+    Packs sequences of varying lengths into bins using the Best-Fit Decreasing algorithm.
+
+    This is a variation of the Best-Fit algorithm where the sequences are sorted by decreasing length before packing.
+
+    Args:
+      seqlens: A list of integers, representing the lengths of the sequences to be packed.
+      pack_size: The maximum capacity of each bin.
+
+    Returns:
+      A list of lists, similar to the output of the 'first_fit' function.
+    """
+    return _pack(_best_fit_bins, seqlens, pack_size, order='decreasing')
+
+
+def get_packing_stats(assignments: List[List[int]], pack_size: int) -> Dict[str, float]:
+    """
+    Computes statistics of a packing strategy.
+
+    Args:
+      assignments: A list of lists, where each inner list represents a bin and contains the sequence lengths
+                   assigned to that bin (output of the packing algorithms).
+      pack_size: The maximum capacity of each bin.
+
+    Returns:
+      A dict with the number of sequences and bins, the average number of sequences per bin ('packing_factor'),
+      the fraction of the bins filled with tokens ('packing_efficiency'), the number of padding tokens and
+      the min, mean and max number of tokens per bin.
+    """
+    packed_seq_lens = np.array([sum(b) for b in assignments], dtype=np.int64)
+    num_sequences = sum(len(b) for b in assignments)
+    num_bins = len(assignments)
+    return {
+        'num_sequences': num_sequences,
+        'num_bins': num_bins,
+        'packing_factor': num_sequences / num_bins,
+        'packing_efficiency': float(packed_seq_lens.sum()) / num_bins / pack_size,
+        'num_padding_tokens': int(np.clip(pack_size - packed_seq_lens, 0, None).sum()),
+        'min_tokens_per_bin': int(packed_seq_lens.min()),
+        'mean_tokens_per_bin': float(packed_seq_lens.mean()),
+        'max_tokens_per_bin': int(packed_seq_lens.max()),
+        'max_samples_per_bin': max(len(b) for b in assignments),
+    }
 
 
 def create_hist(dataset: np.array, truncate_seq_len: int):
@@ -152,7 +366,7 @@ def create_packing_strategy(
     Args:
           histogram: A list representing the histogram data (number of sequences for each length).
           pack_size: The maximum capacity of each bin.
-          packing_algorithm: One of the supported packing algorithms from ['first_fit_decreasing', 'first_fit_shuffle']
+          packing_algorithm: One of the supported packing algorithms from PACKING_ALGOS
 
     Returns:
           assignments: A list of lists, where each inner list represents a bin and contains the indices of the
@@ -162,24 +376,25 @@ def create_packing_strategy(
 
     logging.info(f"Packing sequences to length {pack_size}...")
 
-    all_seq_lens = []
-    for i, count in enumerate(histogram):
-        all_seq_lens.extend([i] * count)
+    all_seq_lens = np.repeat(np.arange(len(histogram)), histogram)
 
     packing_fn = globals()[packing_algorithm]
     assignments = packing_fn(all_seq_lens, pack_size)
-    packed_seq_lens = [sum(x) for x in assignments]
-    packing_factor = len(all_seq_lens) / len(packed_seq_lens)
+    stats = get_packing_stats(assignments, pack_size)
 
-    max_seqlen = max(all_seq_lens)
-    max_samples_per_bin = max([len(b) for b in assignments])
-    packing_metadata = {'dataset_max_seqlen': max_seqlen, 'max_samples_per_bin': max_samples_per_bin}
+    max_seqlen = int(all_seq_lens.max())
+    packing_metadata = {'dataset_max_seqlen': max_seqlen, 'max_samples_per_bin': stats['max_samples_per_bin']}
 
-    logging.debug("Packed sequence lengths:")
-    logging.debug(packed_seq_lens)
-    logging.info(f"Packing is {sum(packed_seq_lens)/len(packed_seq_lens)/pack_size*100:.2f}% efficient")
     logging.info(
-        f">>>>> For pack size {pack_size}, average number of sequences per pack is n = {packing_factor:.3f} <<<<<"
+        f"Packed {stats['num_sequences']} sequences into {stats['num_bins']} bins, "
+        f"{stats['num_padding_tokens']} padding tokens, "
+        f"tokens per bin min/mean/max: {stats['min_tokens_per_bin']}/{stats['mean_tokens_per_bin']:.1f}/"
+        f"{stats['max_tokens_per_bin']}"
+    )
+    logging.info(f"Packing is {stats['packing_efficiency']*100:.2f}% efficient")
+    logging.info(
+        f">>>>> For pack size {pack_size}, average number of sequences per pack is "
+        f"n = {stats['packing_factor']:.3f} <<<<<"
     )
     return assignments, packing_metadata
 
@@ -251,3 +466,162 @@ def fill_packing_strategy(
     assert all(not seq[0] for seq in ifile_handles.values()), "Error: There are items left over from the assignment"
     assert all(not seq[1] for seq in ifile_handles.values()), "Error: There are items left over from the assignment"
     return output_data
+
+
+PACKED_SEQUENCE_INDEX_FILE = 'index.json'
+# name -> dtype of the flat arrays of a packed sequence dataset, `input_ids` uses the dtype given to the writer
+PACKED_SEQUENCE_ARRAYS = {
+    'input_ids': None,
+    'loss_mask': np.bool_,
+    'seq_start_id': np.int32,
+    'pack_offsets': np.int64,
+    'seq_offsets': np.int64,
+}
+
+
+def is_packed_sequence_dir(path: str) -> bool:
+    """Whether `path` is a packed sequence dataset in the flat format (written by `PackedSequenceWriter`)."""
+    return os.path.isfile(os.path.join(path, PACKED_SEQUENCE_INDEX_FILE))
+
+
+class PackedSequenceWriter:
+    """
+    Writes packed sequences to a directory of flat arrays that `PackedSequenceData` memory-maps.
+
+    The tokens, loss masks and sequence start ids of all the packs are appended to raw binary files, and
+    `pack_offsets` / `seq_offsets` give the slice of every pack in them. The index file is written last,
+    so a directory without it is an incomplete dataset.
+
+    Args:
+      output_dir: The directory of the dataset, created if it does not exist.
+      token_dtype: The dtype of the token ids.
+    """
+
+    def __init__(self, output_dir: str, token_dtype: np.dtype = np.int32):
+        self.output_dir = str(output_dir)
+        self.dtypes = dict(PACKED_SEQUENCE_ARRAYS, input_ids=np.dtype(token_dtype))
+        os.makedirs(self.output_dir, exist_ok=True)
+        index_file = os.path.join(self.output_dir, PACKED_SEQUENCE_INDEX_FILE)
+        if os.path.exists(index_file):
+            os.remove(index_file)
+        self._files = {name: open(os.path.join(self.output_dir, f'{name}.bin'), 'wb') for name in self.dtypes}
+        self.num_packs = 0
+        self.num_tokens = 0
+        self.num_sequences = 0
+        self._write('pack_offsets', [0])
+        self._write('seq_offsets', [0])
+
+    def _write(self, name: str, values):
+        self._files[name].write(np.asarray(values, dtype=self.dtypes[name]).tobytes())
+
+    def write(self, pack: Dict):
+        """Appends a pack, a dict with `input_ids`, `loss_mask` and `seq_start_id` (see `fill_packing_strategy`)."""
+        input_ids = np.asarray(pack['input_ids'], dtype=self.dtypes['input_ids'])
+        loss_mask = pack['loss_mask'] if pack['loss_mask'] is not None else np.ones(len(input_ids))
+        if len(loss_mask) != len(input_ids):
+            raise ValueError(f"loss_mask has {len(loss_mask)} elements for {len(input_ids)} input_ids")
+        self._files['input_ids'].write(input_ids.tobytes())
+        self._write('loss_mask', loss_mask)
+        self._write('seq_start_id', pack['seq_start_id'])
+        self.num_packs += 1
+        self.num_tokens += len(input_ids)
+        self.num_sequences += len(pack['seq_start_id'])
+        self._write('pack_offsets', [self.num_tokens])
+        self._write('seq_offsets', [self.num_sequences])
+
+    def close(self):
+        """Flushes the arrays and writes the index file."""
+        for f in self._files.values():
+            f.close()
+        index = {
+            'num_packs': self.num_packs,
+            'num_tokens': self.num_tokens,
+            'num_sequences': self.num_sequences,
+            'dtypes': {name: np.dtype(dtype).name for name, dtype in self.dtypes.items()},
+        }
+        tmp_file = os.path.join(self.output_dir, PACKED_SEQUENCE_INDEX_FILE + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_file, os.path.join(self.output_dir, PACKED_SEQUENCE_INDEX_FILE))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            for f in self._files.values():
+                f.close()
+
+
+def save_packed_sequence_data(output_data: Iterable[Dict], output_dir: str, token_dtype: np.dtype = np.int32):
+    """
+    Saves packed sequences (e.g. the output of `fill_packing_strategy`) in the flat format of `PackedSequenceData`.
+    """
+    with PackedSequenceWriter(output_dir, token_dtype=token_dtype) as writer:
+        for pack in output_data:
+            writer.write(pack)
+
+
+class PackedSequenceData:
+    """
+    Memory-mapped packed sequence dataset written by `PackedSequenceWriter`.
+
+    Items are dicts like the ones of the legacy `.npy` files, with `input_ids` and `loss_mask` as read-only
+    views into the memory-mapped arrays, so reading a pack copies nothing but its sequence start ids.
+    The arrays are opened lazily, and the object is pickled by path, so it is cheap to send to dataloader workers.
+
+    Args:
+      path: The directory of the dataset.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(os.path.join(self.path, PACKED_SEQUENCE_INDEX_FILE)) as f:
+            self.index = json.load(f)
+        self._arrays = None
+
+    @property
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """The memory-mapped flat arrays."""
+        if self._arrays is None:
+            self._arrays = {
+                name: np.memmap(os.path.join(self.path, f'{name}.bin'), dtype=np.dtype(dtype), mode='r')
+                for name, dtype in self.index['dtypes'].items()
+            }
+        return self._arrays
+
+    def __len__(self) -> int:
+        return self.index['num_packs']
+
+    def __getitem__(self, idx: int) -> Dict:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"index {idx} is out of range for {len(self)} packs")
+        arrays = self.arrays
+        start, end = arrays['pack_offsets'][idx : idx + 2]
+        seq_start, seq_end = arrays['seq_offsets'][idx : idx + 2]
+        return {
+            'input_ids': arrays['input_ids'][start:end],
+            'loss_mask': arrays['loss_mask'][start:end],
+            'seq_start_id': arrays['seq_start_id'][seq_start:seq_end].tolist(),
+        }
+
+    def __getstate__(self):
+        return {'path': self.path, 'index': self.index, '_arrays': None}
+
+
+def convert_packed_sequence_data(input_path: str, output_dir: str, token_dtype: np.dtype = np.int32):
+    """
+    Converts a packed sequence dataset saved as a `.npy` object array of dicts to the flat format of
+    `PackedSequenceData`.
+
+    Args:
+      input_path: The `.npy` file, e.g. written by `prepare_packed_sequence_data` before the flat format.
+      output_dir: The directory of the converted dataset.
+      token_dtype: The dtype of the token ids.
+    """
+    logging.info(f"Converting packed sequence dataset {input_path} to {output_dir}")
+    save_packed_sequence_data(np.load(input_path, allow_pickle=True), output_dir, token_dtype=token_dtype)
@@ -0,0 +1,142 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the per-batch cost of the alignment prior matrices of `TTSDataset`.
+
+Batches of random audio durations and text lengths are generated, and for every batch the padded priors are built by:
+- "exact": `beta_binomial_prior_distribution` per item, with the mel length taken from the log mel spectrogram as
+  `TTSDataset.__getitem__` did before (`--mel_from_spec`) or computed from the audio length, then padded and stacked;
+- "interpolator": `BetaBinomialInterpolator` per item (cached priors resized with `scipy.ndimage.zoom`),
+  with the mel length computed from the audio length;
+- "batched": `batched_beta_binomial_prior_distribution` for the whole batch on CPU and, if available, on GPU.
+The mean time per batch over `--num_batches` batches is reported.
+
+# Usage
+    python benchmark_align_prior.py --batch_size 32 --num_batches 20
+    python benchmark_align_prior.py --batch_size 64 --max_duration 20 --mel_from_spec
+"""
+
+import argparse
+import time
+
+import librosa
+import numpy as np
+import torch
+
+from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    BetaBinomialInterpolator,
+    batched_beta_binomial_prior_distribution,
+    beta_binomial_prior_distribution,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the per-batch cost of the alignment prior matrices.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--batch_size", type=int, default=32)
+    parser.add_argument("--num_batches", type=int, default=20)
+    parser.add_argument("--sample_rate", type=int, default=22050)
+    parser.add_argument("--n_fft", type=int, default=1024)
+    parser.add_argument("--hop_length", type=int, default=256)
+    parser.add_argument("--n_mels", type=int, default=80)
+    parser.add_argument("--min_duration", type=float, default=1.0, help="Min audio duration in seconds.")
+    parser.add_argument("--max_duration", type=float, default=10.0, help="Max audio duration in seconds.")
+    parser.add_argument("--tokens_per_second", type=float, default=15.0, help="Mean number of tokens per second.")
+    parser.add_argument(
+        "--mel_from_spec", action="store_true", help="Compute the mel length of 'exact' from the log mel spectrogram."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def pad_priors(priors):
+    batch = torch.zeros(len(priors), max(prior.shape[0] for prior in priors), max(prior.shape[1] for prior in priors))
+    for i, prior in enumerate(priors):
+        batch[i, : prior.shape[0], : prior.shape[1]] = torch.from_numpy(prior)
+    return batch
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    window = torch.hann_window(args.n_fft, periodic=False)
+    mel_fb = torch.tensor(
+        librosa.filters.mel(sr=args.sample_rate, n_fft=args.n_fft, n_mels=args.n_mels), dtype=torch.float
+    )
+
+    def get_num_frames(audio_length):
+        return 1 + audio_length // args.hop_length
+
+    def get_mel_len_from_spec(audio):
+        spec = torch.stft(audio, n_fft=args.n_fft, hop_length=args.hop_length, window=window, return_complex=True)
+        return torch.log(torch.clamp(mel_fb @ spec.abs(), min=1e-9)).shape[1]
+
+    interpolator = BetaBinomialInterpolator()
+
+    def exact(audios, audio_lengths, text_lengths):
+        priors = []
+        for i, (audio_length, text_length) in enumerate(zip(audio_lengths.tolist(), text_lengths.tolist())):
+            mel_len = get_mel_len_from_spec(audios[i]) if args.mel_from_spec else get_num_frames(audio_length)
+            priors.append(beta_binomial_prior_distribution(text_length, mel_len))
+        return pad_priors(priors)
+
+    def interpolated(audios, audio_lengths, text_lengths):
+        return pad_priors(
+            [
+                interpolator(get_num_frames(audio_length), text_length)
+                for audio_length, text_length in zip(audio_lengths.tolist(), text_lengths.tolist())
+            ]
+        )
+
+    def batched(device):
+        def build(audios, audio_lengths, text_lengths):
+            priors = batched_beta_binomial_prior_distribution(
+                text_lengths, get_num_frames(audio_lengths), device=device
+            )
+            if priors.is_cuda:
+                torch.cuda.synchronize()
+            return priors
+
+        return build
+
+    methods = [("exact", exact), ("interpolator", interpolated), ("batched (cpu)", batched("cpu"))]
+    if torch.cuda.is_available():
+        methods.append(("batched (cuda)", batched("cuda")))
+
+    batches = []
+    for _ in range(args.num_batches):
+        durations = rng.uniform(args.min_duration, args.max_duration, size=args.batch_size)
+        audio_lengths = torch.from_numpy((durations * args.sample_rate).astype(np.int64))
+        text_lengths = torch.from_numpy(
+            np.maximum(1, rng.poisson(durations * args.tokens_per_second)).astype(np.int64)
+        )
+        audios = [torch.randn(audio_length) for audio_length in audio_lengths.tolist()] if args.mel_from_spec else None
+        batches.append((audios, audio_lengths, text_lengths))
+
+    print(f"{'method':>16s} {'ms / batch':>11s}")
+    for name, build in methods:
+        # warm up (and fill the cache of the interpolator)
+        build(*batches[0])
+        start = time.perf_counter()
+        for batch in batches:
+            build(*batch)
+        elapsed = (time.perf_counter() - start) / len(batches)
+        print(f"{name:>16s} {1000 * elapsed:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
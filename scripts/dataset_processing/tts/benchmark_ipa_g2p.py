@@ -0,0 +1,96 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the construction time, dictionary size and conversion speed of `IpaG2p` with the parsed phoneme dict,
+and with the compiled (memory-mapped) phoneme dict, with and without the word memo.
+
+Sentences are the texts of a manifest (`--manifest_path`) or random words of the phoneme dict. Every configuration
+converts the sentences twice: "cold" is the first pass, "warm" the second one (memoized words).
+Outputs of all configurations are checked to be identical. The first configuration with the compiled dict compiles
+it next to `--phoneme_dict`, the second one loads it.
+
+# Usage
+    python benchmark_ipa_g2p.py \
+        --phoneme_dict scripts/tts_dataset_files/ipa_cmudict-0.7b_nv23.01.txt \
+        --heteronyms scripts/tts_dataset_files/heteronyms-052722
+"""
+
+import argparse
+import json
+import pickle
+import random
+import time
+
+from nemo.collections.tts.g2p.models.i18n_ipa import IpaG2p
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark IpaG2p with the parsed and the compiled phoneme dict.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--phoneme_dict", type=str, required=True)
+    parser.add_argument("--heteronyms", type=str, default=None)
+    parser.add_argument("--manifest_path", type=str, default=None, help="Manifest with the sentences ('text').")
+    parser.add_argument("--num_sentences", type=int, default=2000)
+    parser.add_argument("--words_per_sentence", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def get_sentences(args):
+    if args.manifest_path is not None:
+        with open(args.manifest_path, encoding="utf-8") as f:
+            return [json.loads(line)["text"] for line in f][: args.num_sentences]
+    with open(args.phoneme_dict, encoding="utf-8") as f:
+        words = [line.split()[0] for line in f if line.strip() and not line.startswith(";;;")]
+    rng = random.Random(args.seed)
+    return [" ".join(rng.choices(words, k=args.words_per_sentence)) + "." for _ in range(args.num_sentences)]
+
+
+def main():
+    args = parse_args()
+    sentences = get_sentences(args)
+    kwargs = dict(heteronyms=args.heteronyms, use_chars=True, grapheme_case="mixed", grapheme_prefix="#")
+
+    configs = [
+        ("parsed dict", dict(word_cache_size=0)),
+        ("parsed dict + memo", dict()),
+        ("compiled dict", dict(use_compiled_dict=True, word_cache_size=0)),
+        ("compiled dict + memo", dict(use_compiled_dict=True)),
+    ]
+    reference = None
+    print(f"{'config':>22s} {'init s':>8s} {'pickled MB':>11s} {'cold ms/sent':>13s} {'warm ms/sent':>13s}")
+    for name, config in configs:
+        start = time.perf_counter()
+        g2p = IpaG2p(args.phoneme_dict, **kwargs, **config)
+        init_time = time.perf_counter() - start
+        # what every dataloader worker gets
+        pickled_size = len(pickle.dumps(g2p.phoneme_dict)) / 2**20
+
+        times = []
+        for _ in range(2):
+            start = time.perf_counter()
+            outputs = [g2p(sentence) for sentence in sentences]
+            times.append((time.perf_counter() - start) / len(sentences))
+        if reference is None:
+            reference = outputs
+        elif outputs != reference:
+            raise RuntimeError(f"Outputs of '{name}' differ from the ones of '{configs[0][0]}'")
+        print(f"{name:>22s} {init_time:8.3f} {pickled_size:11.2f} {1000 * times[0]:13.3f} {1000 * times[1]:13.3f}")
+
+
+if __name__ == "__main__":
+    main()
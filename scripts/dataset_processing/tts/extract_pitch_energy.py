@@ -0,0 +1,62 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script precomputes pitch, voiced mask, p_voiced and energy of a TTSDataset with a process pool, so that they are
+not computed during the first training epoch, and computes pitch statistics in the same pass.
+It uses the same dataset configs as extract_sup_data.py, the data types to extract are taken from
+`sup_data_types`. Samples whose supplementary data already exists are skipped, so an interrupted run can be resumed.
+
+$ python <nemo_root_path>/scripts/dataset_processing/tts/extract_pitch_energy.py \
+    --config-path=ljspeech/ds_conf \
+    --config-name=ds_for_fastpitch_align.yaml \
+    manifest_filepath=<data_root_path>/train_manifest.json \
+    sup_data_path=<data_root_path>/sup_data \
+    +num_workers=16 \
+    +pitch_stats_path=<data_root_path>/pitch_stats.json
+"""
+
+import json
+
+from hydra.utils import instantiate
+
+from nemo.collections.tts.parts.preprocessing.sup_data_extraction import SupDataExtractor
+from nemo.core.config import hydra_runner
+from nemo.utils import logging
+
+
+@hydra_runner(config_path='ljspeech/ds_conf', config_name='ds_for_fastpitch_align')
+def main(cfg):
+    dataset = instantiate(cfg.dataset)
+    extractor = SupDataExtractor(
+        dataset=dataset,
+        num_workers=cfg.get("num_workers", None),
+        batch_duration=cfg.get("batch_duration", 60.0),
+        overwrite=cfg.get("overwrite", False),
+    )
+    extractor.extract()
+
+    pitch_stats = extractor.pitch_stats.get_stats()
+    if "default" in pitch_stats:
+        logging.info(
+            f"PITCH_MEAN={pitch_stats['default']['pitch_mean']}, PITCH_STD={pitch_stats['default']['pitch_std']}"
+        )
+        pitch_stats_path = cfg.get("pitch_stats_path", None)
+        if pitch_stats_path is not None:
+            with open(pitch_stats_path, 'w', encoding="utf-8") as stats_f:
+                json.dump(pitch_stats, stats_f, indent=4)
+
+
+if __name__ == '__main__':
+    main()  # noqa pylint: disable=no-value-for-parameter
@@ -78,6 +78,9 @@ def main(cfg):
     print(f"Processing {cfg.manifest_filepath}:")
     CFG_NAME2FUNC[cfg.name](dataloader)
 
+    # merge the indices written by the dataloader workers if supplementary data is kept in the stores
+    dataset.consolidate_sup_data()
+
 
 if __name__ == '__main__':
     main()  # noqa pylint: disable=no-value-for-parameter
@@ -0,0 +1,108 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the sequence packing algorithms of `nemo.utils.sequence_packing_utils`.
+
+Sequence lengths are drawn from a log-normal distribution (typical of SFT datasets) and truncated to the pack size.
+Every packing algorithm is timed for every number of sequences and its packing statistics are reported.
+Up to `--max_reference_sequences`, the packing is also run with a scan over all bins (the previous
+implementation of First-Fit) and the bins are checked to be identical.
+
+# Usage
+    python benchmark_sequence_packing.py --num_sequences 10000 100000 1000000 10000000 --pack_size 4096
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from nemo.utils import sequence_packing_utils
+from nemo.utils.sequence_packing_utils import PACKING_ALGOS, find_first_bin_that_fits, get_packing_stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the sequence packing algorithms.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--num_sequences", type=int, nargs="+", default=[10000, 100000, 1000000, 10000000], help="Dataset sizes."
+    )
+    parser.add_argument("--pack_size", type=int, default=4096)
+    parser.add_argument("--mean_seqlen", type=float, default=512.0, help="Median of the sequence lengths.")
+    parser.add_argument("--algorithms", nargs="+", default=PACKING_ALGOS, choices=PACKING_ALGOS)
+    parser.add_argument(
+        "--max_reference_sequences",
+        type=int,
+        default=20000,
+        help="Largest dataset that is also packed with the scan over all bins.",
+    )
+    return parser.parse_args()
+
+
+def first_fit_reference(seqlens, pack_size):
+    res = []
+    for s in seqlens:
+        first_bin = find_first_bin_that_fits(res, s, pack_size)
+        if first_bin == -1:
+            res.append([s])
+        else:
+            res[first_bin].append(s)
+    return res
+
+
+def reference_packing(algorithm, seqlens, pack_size):
+    if algorithm == "first_fit_decreasing":
+        return first_fit_reference(sorted(seqlens, reverse=True), pack_size)
+    if algorithm == "first_fit_shuffle":
+        shuffled = seqlens[:]
+        np.random.shuffle(shuffled)
+        return first_fit_reference(shuffled, pack_size)
+    return None
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(0)
+    # compile the numba kernels before timing
+    for algorithm in args.algorithms:
+        getattr(sequence_packing_utils, algorithm)([1, 2, 3], 4)
+
+    for num_sequences in args.num_sequences:
+        seqlens = np.clip(rng.lognormal(np.log(args.mean_seqlen), 1.0, num_sequences), 1, args.pack_size)
+        seqlens = seqlens.astype(np.int64).tolist()
+        for algorithm in args.algorithms:
+            np.random.seed(0)
+            start = time.perf_counter()
+            assignments = getattr(sequence_packing_utils, algorithm)(seqlens, args.pack_size)
+            elapsed = time.perf_counter() - start
+            stats = get_packing_stats(assignments, args.pack_size)
+            line = (
+                f"{algorithm:22s} n={num_sequences:<9d}: {elapsed:8.2f}s, {stats['num_bins']:8d} bins, "
+                f"efficiency {100 * stats['packing_efficiency']:6.2f}%, packing factor {stats['packing_factor']:6.2f}"
+            )
+
+            if num_sequences <= args.max_reference_sequences and algorithm.startswith("first_fit"):
+                np.random.seed(0)
+                start = time.perf_counter()
+                expected = reference_packing(algorithm, seqlens, args.pack_size)
+                reference_elapsed = time.perf_counter() - start
+                line += f", scan {reference_elapsed:8.2f}s, identical: {assignments == expected}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
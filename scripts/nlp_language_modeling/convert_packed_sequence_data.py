@@ -0,0 +1,58 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Converts packed sequence datasets saved as `.npy` object arrays (e.g. by `prepare_packed_ft_dataset.py` or
+`prepare_packed_sequence_data`) to the flat memory-mapped format of
+`nemo.utils.sequence_packing_utils.PackedSequenceData`, which `GPTSFTPackedDataset` reads without unpickling
+the whole dataset.
+
+Every `.npy` file is converted to a directory of the same name without the suffix, unless `--output_dir` is set.
+
+# Usage
+    python convert_packed_sequence_data.py --input packed/training_4096.npy packed/validation_4096.npy
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from nemo.utils.sequence_packing_utils import PackedSequenceData, convert_packed_sequence_data
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Convert .npy packed sequence datasets to the memory-mapped flat format.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--input", nargs="+", required=True, help="Packed sequence .npy files.")
+    parser.add_argument(
+        "--output_dir", default=None, help="Directory to write the converted datasets to. Defaults to their input."
+    )
+    parser.add_argument("--token_dtype", default="int32", choices=["int32", "int64"])
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    for input_path in args.input:
+        name = os.path.splitext(os.path.basename(input_path))[0]
+        output_dir = os.path.join(args.output_dir or os.path.dirname(input_path), name)
+        convert_packed_sequence_data(input_path, output_dir, token_dtype=np.dtype(args.token_dtype))
+        print(f"{input_path} -> {output_dir}: {len(PackedSequenceData(output_dir))} packs")
+
+
+if __name__ == "__main__":
+    main()
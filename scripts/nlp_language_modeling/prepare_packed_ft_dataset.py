@@ -34,12 +34,13 @@ Two main steps are run in this script:
 sequence length truncation, tokenization, etc) and the result is an array of tokenized sequences, 
 represented by indices). 
 2. The sequences are grouped by length, and a packing algorithm is run. (https://en.wikipedia.org/wiki/Bin_packing_problem#Offline_algorithms)
-Currently, two variants of "first fit" are supported.
+Currently, two variants of "first fit" and two variants of "best fit" are supported.
 "first_fit_decreasing" sorts the sequences in decreasing order before applying first-fit. 
 It generates a more optimal packing, but it tends to keep all short sequences together, which may affect convergence.
 "first_fit_shuffle" runs first-fit in a random order. Packing is less optimal but it keeps the dataset order random.
 The recommendation is to run "first_fit_shuffle" and check the packed sequence lengths in the printout. 
 If they are similar to the target length (i.e. packing is efficient), then use shuffle. Otherwise try first_fit_decreasing.
+"best_fit" and "best_fit_decreasing" put every sequence into the fullest pack that can still fit it.
 
 Example usage:
 
@@ -0,0 +1,146 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the sparse-affinity speaker clustering (`SparseSpeakerClustering`) against the dense path
+(`SpeakerClustering`) on synthetic multiscale speaker embeddings.
+
+A recording with random speaker turns is split into multiscale segments. The embedding of each segment is the
+mixture of the random unit vectors of the speakers weighted by their speaking time in the segment, plus Gaussian
+noise, and the label of a base-scale segment is the speaker with the longest speaking time in it. Both clustering
+paths get the same inputs, and the runtime, the estimated number of speakers and the DER are reported. With oracle
+speech activity and no overlaps, the DER is the speaker confusion of the base-scale segments after the optimal
+mapping of the cluster labels to speakers.
+The dense path is skipped for recordings with more than `--max_dense_segments` base-scale segments.
+
+# Usage
+    python benchmark_sparse_clustering.py --num_segments 2000 5000 20000 100000
+    python benchmark_sparse_clustering.py --num_segments 100000 --num_speakers 8 --noise_sigma 0.8
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+from scipy.optimize import linear_sum_assignment
+
+from nemo.collections.asr.parts.utils.offline_clustering import SpeakerClustering
+from nemo.collections.asr.parts.utils.sparse_clustering import SparseSpeakerClustering
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark sparse-affinity vs. dense speaker clustering.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--num_segments", type=int, nargs="+", default=[2000, 5000, 100000])
+    parser.add_argument("--num_speakers", type=int, default=4)
+    parser.add_argument("--max_num_speakers", type=int, default=8)
+    parser.add_argument("--emb_dim", type=int, default=192)
+    parser.add_argument("--noise_sigma", type=float, default=0.6, help="Norm of the noise added to embeddings.")
+    parser.add_argument("--mean_turn_sec", type=float, default=5.0, help="Mean duration of speaker turns.")
+    parser.add_argument("--window", type=float, nargs="+", default=[1.5, 1.0, 0.5], help="Window of each scale.")
+    parser.add_argument("--shift", type=float, nargs="+", default=[0.75, 0.5, 0.25], help="Shift of each scale.")
+    parser.add_argument("--max_rp_threshold", type=float, default=0.15)
+    parser.add_argument("--sparse_search_volume", type=int, default=30)
+    parser.add_argument("--max_neighbors", type=int, default=64, help="Neighbors per segment of the sparse path.")
+    parser.add_argument("--max_dense_segments", type=int, default=5000, help="Largest input of the dense path.")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def generate_recording(args, num_segments, rng):
+    """Generate multiscale embeddings and timestamps of a recording with `num_segments` base-scale segments."""
+    duration = num_segments * args.shift[-1] + args.window[-1] - args.shift[-1]
+    turn_ends = np.cumsum(rng.exponential(args.mean_turn_sec, size=int(duration / args.mean_turn_sec * 2) + 10))
+    turn_speakers = rng.randint(args.num_speakers, size=turn_ends.shape[0])
+    speaker_embs = rng.randn(args.num_speakers, args.emb_dim)
+    speaker_embs /= np.linalg.norm(speaker_embs, axis=1, keepdims=True)
+
+    # Cumulative speaking time of each speaker at every turn boundary
+    turn_bounds = np.concatenate([[0.0], turn_ends])
+    turn_durs = np.diff(turn_bounds)
+    speaking_time = np.zeros((args.num_speakers, turn_bounds.shape[0]))
+    for spk in range(args.num_speakers):
+        speaking_time[spk, 1:] = np.cumsum(np.where(turn_speakers == spk, turn_durs, 0.0))
+
+    embeddings, timestamps, segment_counts = [], [], []
+    for window, shift in zip(args.window, args.shift):
+        starts = np.arange(0.0, duration - window + 1e-6, shift)
+        stamps = np.stack([starts, starts + window], axis=1)
+        # A segment that spans several turns has the embedding of the speakers mixed by their speaking time.
+        overlaps = np.stack(
+            [
+                np.interp(stamps[:, 1], turn_bounds, cum) - np.interp(stamps[:, 0], turn_bounds, cum)
+                for cum in speaking_time
+            ],
+            axis=1,
+        )
+        overlaps /= overlaps.sum(axis=1, keepdims=True)
+        speakers = np.argmax(overlaps, axis=1)
+        noise = rng.randn(starts.shape[0], args.emb_dim) * args.noise_sigma / np.sqrt(args.emb_dim)
+        embeddings.append(overlaps @ speaker_embs + noise)
+        timestamps.append(stamps)
+        segment_counts.append(starts.shape[0])
+    return (
+        torch.from_numpy(np.concatenate(embeddings)).float(),
+        torch.from_numpy(np.concatenate(timestamps)).float(),
+        torch.tensor(segment_counts),
+        torch.ones(1, len(args.window)),
+        speakers,
+    )
+
+
+def speaker_confusion(labels, speakers):
+    """Fraction of base-scale segments whose cluster is not mapped to their speaker."""
+    confusion = np.zeros((labels.max() + 1, speakers.max() + 1))
+    np.add.at(confusion, (labels, speakers), 1)
+    rows, cols = linear_sum_assignment(-confusion)
+    return 1.0 - confusion[rows, cols].sum() / labels.shape[0]
+
+
+def run(clustering, inputs, args):
+    embeddings, timestamps, segment_counts, weights, speakers = inputs
+    start = time.perf_counter()
+    labels = clustering.forward_infer(
+        embeddings_in_scales=embeddings,
+        timestamps_in_scales=timestamps,
+        multiscale_segment_counts=segment_counts,
+        multiscale_weights=weights,
+        max_num_speakers=args.max_num_speakers,
+        max_rp_threshold=args.max_rp_threshold,
+        sparse_search_volume=args.sparse_search_volume,
+    )
+    elapsed = time.perf_counter() - start
+    labels = labels.cpu().numpy()
+    return elapsed, len(np.unique(labels)), speaker_confusion(labels, speakers)
+
+
+def main():
+    args = parse_args()
+    rng = np.random.RandomState(args.seed)
+    print(f"{'segments':>9s} {'method':>7s} {'time (s)':>9s} {'speakers':>9s} {'DER (%)':>8s}")
+    for num_segments in args.num_segments:
+        inputs = generate_recording(args, num_segments, rng)
+        methods = [("sparse", SparseSpeakerClustering(max_neighbors=args.max_neighbors))]
+        if num_segments <= args.max_dense_segments:
+            methods.append(("dense", SpeakerClustering()))
+        for name, clustering in methods:
+            elapsed, num_clusters, der = run(clustering, inputs, args)
+            print(f"{num_segments:9d} {name:>7s} {elapsed:9.2f} {num_clusters:9d} {100 * der:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
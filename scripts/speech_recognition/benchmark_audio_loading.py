@@ -0,0 +1,108 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of reading short segments out of long recordings with `AudioSegment.from_file`.
+
+For each format, a synthetic recording is written and `--num_reads` random (offset, duration) segments are
+read with the handle cache disabled (a file is opened and its header parsed on every read) and enabled.
+Formats that cannot be written by the installed libsndfile are skipped.
+
+# Usage
+    python benchmark_audio_loading.py --formats wav flac opus mp3 --file_duration 3600 --segment_duration 10
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+from nemo.collections.asr.parts.preprocessing.segment import AudioSegment, audio_file_cache
+
+# extension -> (soundfile format, subtype)
+FORMATS = {
+    "wav": ("WAV", "PCM_16"),
+    "flac": ("FLAC", "PCM_16"),
+    "opus": ("OGG", "OPUS"),
+    "mp3": ("MP3", "MPEG_LAYER_III"),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark segment reads with and without the audio file handle cache.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument("--file_duration", type=float, default=600.0, help="Duration of the recording in seconds.")
+    parser.add_argument("--segment_duration", type=float, default=10.0, help="Duration of each read in seconds.")
+    parser.add_argument("--num_reads", type=int, default=200)
+    parser.add_argument("--sample_rate", type=int, default=16000)
+    parser.add_argument("--cache_size", type=int, default=32)
+    return parser.parse_args()
+
+
+def write_recording(path, sf_format, subtype, duration, sample_rate):
+    sample_rate = 48000 if subtype == "OPUS" else sample_rate
+    num_samples = int(duration * sample_rate)
+    chunk = 60 * sample_rate
+    rng = np.random.default_rng(0)
+    with sf.SoundFile(path, "w", samplerate=sample_rate, channels=1, format=sf_format, subtype=subtype) as f:
+        for start in range(0, num_samples, chunk):
+            f.write(0.1 * rng.standard_normal(min(chunk, num_samples - start)).astype(np.float32))
+
+
+def read_segments(path, segments):
+    start = time.perf_counter()
+    total = 0
+    for offset, duration in segments:
+        total += AudioSegment.from_file(path, offset=offset, duration=duration).num_samples
+    return time.perf_counter() - start, total
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(0)
+    segments = [
+        (rng.uniform(0, args.file_duration - args.segment_duration), args.segment_duration)
+        for _ in range(args.num_reads)
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for extension in args.formats:
+            sf_format, subtype = FORMATS[extension]
+            path = os.path.join(tmpdir, f"recording.{extension}")
+            try:
+                write_recording(path, sf_format, subtype, args.file_duration, args.sample_rate)
+            except (sf.LibsndfileError, TypeError, ValueError) as e:
+                print(f"{extension:5s}: skipped, cannot write with the installed libsndfile ({e})")
+                continue
+
+            audio_file_cache.resize(0)
+            uncached, total = read_segments(path, segments)
+            audio_file_cache.resize(args.cache_size)
+            cached, cached_total = read_segments(path, segments)
+            assert cached_total == total
+            audio_file_cache.clear()
+            print(
+                f"{extension:5s}: uncached {1000 * uncached / args.num_reads:8.2f} ms/read, "
+                f"cached {1000 * cached / args.num_reads:8.2f} ms/read, speedup {uncached / cached:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
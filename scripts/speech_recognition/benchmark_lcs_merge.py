@@ -0,0 +1,109 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the longest common subsequence merge of buffered RNNT inference
+(`LongestCommonSubsequenceBatchedFrameASRRNNT`).
+
+For every (delay, chunk length) pair, synthetic overlapping token buffers are merged with
+`lcs_alignment_merge_buffer` one stream at a time and with `lcs_alignment_merge_buffer_batch` for the whole
+batch of streams, and the merged buffers are checked to be identical.
+
+# Usage
+    python benchmark_lcs_merge.py --delays 4 8 16 --chunk_tokens 20 40 80 --batch_size 32
+"""
+
+import argparse
+import random
+import time
+
+from nemo.collections.asr.parts.utils.streaming_utils import (
+    lcs_alignment_merge_buffer,
+    lcs_alignment_merge_buffer_batch,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark per-stream vs. batched LCS merge of buffered RNNT transcripts.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--delays", type=int, nargs="+", default=[4, 8, 16], help="LCS delays in timesteps.")
+    parser.add_argument("--chunk_tokens", type=int, nargs="+", default=[20, 40, 80], help="Tokens per chunk.")
+    parser.add_argument("--max_steps_per_timestep", type=int, default=5)
+    parser.add_argument("--batch_size", type=int, default=32, help="Number of streams merged together.")
+    parser.add_argument("--num_chunks", type=int, default=50, help="Number of chunks per stream.")
+    parser.add_argument("--vocab_size", type=int, default=128)
+    parser.add_argument("--error_rate", type=float, default=0.1, help="Rate of substituted tokens in overlaps.")
+    return parser.parse_args()
+
+
+def make_chunks(rng, num_chunks, chunk_tokens, overlap_tokens, vocab_size, error_rate):
+    """Chunks of a random transcript, each one starting with a noisy copy of the end of the previous one."""
+    transcript = [rng.randrange(vocab_size) for _ in range(num_chunks * chunk_tokens + overlap_tokens)]
+    chunks = []
+    for c in range(num_chunks):
+        start = max(0, c * chunk_tokens - overlap_tokens)
+        chunk = transcript[start : (c + 1) * chunk_tokens]
+        chunks.append([t if rng.random() > error_rate else rng.randrange(vocab_size) for t in chunk])
+    return chunks
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(0)
+    # compile the numba kernel before timing
+    lcs_alignment_merge_buffer_batch([[1, 2, 3]], [[2, 3, 4]], delay=1)
+
+    for delay in args.delays:
+        for chunk_tokens in args.chunk_tokens:
+            overlap_tokens = min(chunk_tokens, delay * 2)
+            streams = [
+                make_chunks(rng, args.num_chunks, chunk_tokens, overlap_tokens, args.vocab_size, args.error_rate)
+                for _ in range(args.batch_size)
+            ]
+
+            start = time.perf_counter()
+            expected = []
+            for chunks in streams:
+                buffer = []
+                for chunk in chunks:
+                    buffer = lcs_alignment_merge_buffer(
+                        buffer, chunk, delay, model=None, max_steps_per_timestep=args.max_steps_per_timestep
+                    )
+                expected.append(buffer)
+            per_stream = time.perf_counter() - start
+
+            start = time.perf_counter()
+            buffers = [[] for _ in streams]
+            for c in range(args.num_chunks):
+                buffers = lcs_alignment_merge_buffer_batch(
+                    buffers,
+                    [chunks[c] for chunks in streams],
+                    delay,
+                    max_steps_per_timestep=args.max_steps_per_timestep,
+                )
+            batched = time.perf_counter() - start
+
+            num_merges = args.batch_size * args.num_chunks
+            print(
+                f"delay={delay:3d} chunk_tokens={chunk_tokens:4d}: "
+                f"per-stream {1e6 * per_stream / num_merges:8.1f} us/merge, "
+                f"batched {1e6 * batched / num_merges:8.1f} us/merge, "
+                f"identical: {buffers == expected}"
+            )
+
+
+if __name__ == "__main__":
+    main()
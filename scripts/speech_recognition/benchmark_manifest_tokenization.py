@@ -0,0 +1,111 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the tokenization of manifest transcripts at ASR dataset construction.
+
+Reports rows/sec of building an `ASRAudioText` collection with serial tokenization
+and with `tokenization_num_workers` processes, and checks that the results are identical.
+
+# Usage
+    python benchmark_manifest_tokenization.py --num_rows 200000 --num_workers 2 4 8
+    python benchmark_manifest_tokenization.py --manifest train_manifest.json --spe_model tokenizer.model
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import tempfile
+import time
+
+from nemo.collections.common.parts.preprocessing import collections, parsers
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark serial vs. parallel tokenization of ASR manifests.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--manifest", default=None, help="NeMo manifest. If not set, a synthetic one is generated.")
+    parser.add_argument("--num_rows", type=int, default=100000, help="Number of rows of the synthetic manifest.")
+    parser.add_argument(
+        "--spe_model", default=None, help="SentencePiece model to tokenize with. Defaults to an English char parser."
+    )
+    parser.add_argument("--num_workers", type=int, nargs="+", default=[2, 4, 8], help="Pool sizes to benchmark.")
+    parser.add_argument("--min_duration", type=float, default=None)
+    parser.add_argument("--max_duration", type=float, default=None)
+    return parser.parse_args()
+
+
+def write_synthetic_manifest(path: str, num_rows: int):
+    rng = random.Random(0)
+    words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(5000)]
+    with open(path, "w") as f:
+        for i in range(num_rows):
+            text = " ".join(rng.choices(words, k=rng.randint(5, 40)))
+            item = {"audio_filepath": f"/data/audio/{i:09d}.wav", "duration": rng.uniform(0.5, 20.0), "text": text}
+            f.write(json.dumps(item) + "\n")
+
+
+def make_parser(spe_model):
+    if spe_model is None:
+        return parsers.make_parser(name="en")
+
+    from nemo.collections.common.tokenizers import SentencePieceTokenizer
+
+    tokenizer = SentencePieceTokenizer(model_path=spe_model)
+
+    def parse(text):
+        return tokenizer.text_to_ids(text)
+
+    return parse
+
+
+def benchmark(manifest, parser, args, num_workers):
+    start = time.perf_counter()
+    collection = collections.ASRAudioText(
+        manifest,
+        parser=parser,
+        min_duration=args.min_duration,
+        max_duration=args.max_duration,
+        tokenization_num_workers=num_workers,
+    )
+    return collection, time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manifest = args.manifest
+        if manifest is None:
+            manifest = os.path.join(tmpdir, "manifest.json")
+            write_synthetic_manifest(manifest, args.num_rows)
+        parser = make_parser(args.spe_model)
+
+        reference, elapsed = benchmark(manifest, parser, args, num_workers=None)
+        num_rows = len(reference)
+        print(f"serial     : {num_rows / elapsed:12.0f} rows/sec ({elapsed:.2f}s for {num_rows} rows)")
+        for num_workers in args.num_workers:
+            collection, elapsed = benchmark(manifest, parser, args, num_workers=num_workers)
+            identical = list(collection) == list(reference)
+            print(
+                f"workers={num_workers:<3d}: {num_rows / elapsed:12.0f} rows/sec ({elapsed:.2f}s), "
+                f"identical to serial: {identical}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark of iterating a NeMo tarred dataset with `LazyNeMoTarredIterator`, with and without shard prefetching.
+
+A synthetic tarred dataset is written (`--num_shards` shards of `--files_per_shard` files). Slow object storage is
+simulated by reading the shards through `pipe:` commands which sleep for `--shard_latency` seconds before streaming
+the shard at `--bandwidth` MB/s, and a training step is simulated by sleeping `--step_time` seconds
+every `--batch_size` cuts. For every `--prefetch_shards` value, the total time, the mean wait time per shard
+and the read throughput are reported, and the cut order is checked to be the same.
+
+# Usage
+    python benchmark_tarred_prefetch.py --num_shards 8 --shard_latency 0.5 --prefetch_shards 0 1 2 4
+"""
+
+import argparse
+import json
+import shlex
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from nemo.collections.common.data.lhotse.nemo_adapters import LazyNeMoTarredIterator
+
+# writes the file (argv[1]) to stdout after the latency (argv[2], seconds) at the bandwidth (argv[3], MB/s)
+THROTTLED_CAT = """
+import sys, time
+path, latency, bandwidth = sys.argv[1], float(sys.argv[2]), float(sys.argv[3])
+time.sleep(latency)
+with open(path, "rb") as f:
+    while block := f.read(65536):
+        sys.stdout.buffer.write(block)
+        time.sleep(len(block) / (bandwidth * 1e6))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark LazyNeMoTarredIterator with and without shard prefetching.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--num_shards", type=int, default=8)
+    parser.add_argument("--files_per_shard", type=int, default=32)
+    parser.add_argument("--file_duration", type=float, default=5.0, help="Duration of each audio file in seconds.")
+    parser.add_argument("--sample_rate", type=int, default=16000)
+    parser.add_argument("--shard_latency", type=float, default=0.5, help="Seconds before a shard starts streaming.")
+    parser.add_argument("--bandwidth", type=float, default=50.0, help="Streaming speed of a shard in MB/s.")
+    parser.add_argument("--batch_size", type=int, default=16)
+    parser.add_argument("--step_time", type=float, default=0.1, help="Seconds of a simulated training step.")
+    parser.add_argument("--prefetch_shards", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--prefetch_max_bytes", type=int, default=1 << 30)
+    return parser.parse_args()
+
+
+def write_dataset(root: Path, args) -> str:
+    rng = np.random.default_rng(0)
+    num_samples = int(args.file_duration * args.sample_rate)
+    for shard_id in range(args.num_shards):
+        entries = []
+        with tarfile.open(root / f"audio_{shard_id}.tar", "w") as tar:
+            for i in range(args.files_per_shard):
+                name = f"{shard_id}_{i}.wav"
+                sf.write(root / name, 0.1 * rng.standard_normal(num_samples), args.sample_rate)
+                tar.add(root / name, arcname=name)
+                (root / name).unlink()
+                entries.append(
+                    {"audio_filepath": name, "text": name, "duration": args.file_duration, "shard_id": shard_id}
+                )
+        with open(root / f"manifest_{shard_id}.json", "w") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+    return str(root / f"manifest__OP_0..{args.num_shards - 1}_CL_.json")
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        manifest_path = write_dataset(root, args)
+        # stream every shard after the latency, with the bandwidth limit
+        tar_paths = [
+            "pipe:"
+            + shlex.join(
+                [
+                    sys.executable,
+                    "-c",
+                    THROTTLED_CAT,
+                    str(root / f"audio_{i}.tar"),
+                    str(args.shard_latency),
+                    str(args.bandwidth),
+                ]
+            )
+            for i in range(args.num_shards)
+        ]
+
+        expected_ids = None
+        print(f"{'prefetch':>8s} {'total s':>8s} {'wait s/shard':>13s} {'MB/s':>8s}")
+        for prefetch_shards in args.prefetch_shards:
+            iterator = LazyNeMoTarredIterator(
+                manifest_path,
+                tar_paths,
+                shuffle_shards=True,
+                shard_seed=0,
+                prefetch_shards=prefetch_shards,
+                prefetch_max_bytes=args.prefetch_max_bytes,
+            )
+            start = time.perf_counter()
+            ids = []
+            for cut in iterator:
+                ids.append(cut.id)
+                if len(ids) % args.batch_size == 0:
+                    time.sleep(args.step_time)
+            total_time = time.perf_counter() - start
+
+            if expected_ids is None:
+                expected_ids = ids
+            elif ids != expected_ids:
+                raise RuntimeError(f"Cut order differs with prefetch_shards={prefetch_shards}")
+            stats = list(iterator.shard_stats)
+            wait_time = np.mean([s.wait_time for s in stats])
+            throughput = np.mean([s.bytes_per_second for s in stats]) / 1e6
+            print(f"{prefetch_shards:8d} {total_time:8.2f} {wait_time:13.3f} {throughput:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
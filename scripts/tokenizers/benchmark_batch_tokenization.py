@@ -0,0 +1,118 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the batch encode/decode API of NeMo tokenizers (`batch_text_to_ids` / `batch_ids_to_text`).
+
+Texts are read from `--input_file` (one text per line) or sampled from a random vocabulary of words. They are
+tokenized one string at a time with `text_to_ids` / `ids_to_text`, in batches with the tokenizer's
+`batch_text_to_ids` / `batch_ids_to_text`, and in batches with the thread-pool fallback of `TokenizerSpec`.
+The outputs are checked to be identical.
+
+# Usage
+    python benchmark_batch_tokenization.py --tokenizer sentencepiece --model_path tokenizer.model
+    python benchmark_batch_tokenization.py --tokenizer huggingface --model_path gpt2 --batch_size 256
+    python benchmark_batch_tokenization.py --tokenizer tiktoken --model_path vocab.json
+"""
+
+import argparse
+import os
+import random
+import string
+import time
+
+from nemo.collections.common.tokenizers.tokenizer_spec import TokenizerSpec
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark per-string vs. batched tokenization.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--tokenizer", required=True, choices=["sentencepiece", "huggingface", "tiktoken"])
+    parser.add_argument("--model_path", required=True, help="SentencePiece model, HF model name or tiktoken vocab.")
+    parser.add_argument("--input_file", default=None, help="Text file with one text per line.")
+    parser.add_argument("--num_texts", type=int, default=20000, help="Number of random texts without input_file.")
+    parser.add_argument("--words_per_text", type=int, default=64, help="Words per random text.")
+    parser.add_argument("--batch_size", type=int, default=128)
+    parser.add_argument("--num_threads", type=int, default=os.cpu_count() or 1, help="Threads of the batched calls.")
+    return parser.parse_args()
+
+
+def build_tokenizer(args):
+    if args.tokenizer == "sentencepiece":
+        from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer
+
+        return SentencePieceTokenizer(args.model_path)
+    if args.tokenizer == "huggingface":
+        from nemo.collections.common.tokenizers.huggingface.auto_tokenizer import AutoTokenizer
+
+        return AutoTokenizer(args.model_path)
+    from nemo.collections.common.tokenizers.tiktoken_tokenizer import TiktokenTokenizer
+
+    return TiktokenTokenizer(args.model_path)
+
+
+def load_texts(args):
+    if args.input_file is not None:
+        with open(args.input_file) as f:
+            return [line.rstrip("\n") for line in f]
+    rng = random.Random(0)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 10))) for _ in range(5000)]
+    return [" ".join(rng.choices(words, k=args.words_per_text)) for _ in range(args.num_texts)]
+
+
+def timed(fn, batches):
+    start = time.perf_counter()
+    outputs = [output for batch in batches for output in fn(batch)]
+    return outputs, time.perf_counter() - start
+
+
+def main():
+    args = parse_args()
+    tokenizer = build_tokenizer(args)
+    texts = load_texts(args)
+    text_batches = [texts[i : i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+    num_chars = sum(len(text) for text in texts)
+
+    expected_ids, loop_time = timed(lambda batch: [tokenizer.text_to_ids(text) for text in batch], text_batches)
+    batch_ids, batch_time = timed(lambda batch: tokenizer.batch_text_to_ids(batch, args.num_threads), text_batches)
+    pool_ids, pool_time = timed(
+        lambda batch: TokenizerSpec.batch_text_to_ids(tokenizer, batch, args.num_threads), text_batches
+    )
+    num_tokens = sum(len(ids) for ids in expected_ids)
+    print(f"encode {len(texts)} texts, {num_chars} chars, {num_tokens} tokens, batch size {args.batch_size}:")
+    for name, elapsed, ids in [("loop", loop_time, expected_ids), ("batch", batch_time, batch_ids)]:
+        print(f"  {name:12s}: {len(texts) / elapsed:10.0f} texts/s, identical: {ids == expected_ids}")
+    print(f"  {'thread pool':12s}: {len(texts) / pool_time:10.0f} texts/s, identical: {pool_ids == expected_ids}")
+
+    id_batches = [expected_ids[i : i + args.batch_size] for i in range(0, len(expected_ids), args.batch_size)]
+    expected_texts, loop_time = timed(lambda batch: [tokenizer.ids_to_text(ids) for ids in batch], id_batches)
+    batch_texts, batch_time = timed(
+        lambda batch: tokenizer.batch_ids_to_text(batch, num_threads=args.num_threads), id_batches
+    )
+    pool_texts, pool_time = timed(
+        lambda batch: TokenizerSpec.batch_ids_to_text(tokenizer, batch, args.num_threads), id_batches
+    )
+    print("decode:")
+    for name, elapsed, outputs in [
+        ("loop", loop_time, expected_texts),
+        ("batch", batch_time, batch_texts),
+        ("thread pool", pool_time, pool_texts),
+    ]:
+        print(f"  {name:12s}: {len(texts) / elapsed:10.0f} texts/s, identical: {outputs == expected_texts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -97,6 +97,24 @@ def check_subword_timestamps(hyp: Hypothesis, decoding: CTCBPEDecoding):
     assert len(hyp.timestamp['segment']) == segments_count
 
 
+def reference_ctc_collapse(prediction, blank_id):
+    decoded_prediction, token_lengths, token_repetitions = [], [], []
+    previous, last_length, last_repetition = blank_id, 0, 1
+    for pidx, p in enumerate(prediction):
+        if (p != previous or previous == blank_id) and p != blank_id:
+            decoded_prediction.append(p)
+            token_lengths.append(pidx - last_length)
+            last_length = pidx
+            token_repetitions.append(last_repetition)
+            last_repetition = 1
+        if p == previous and previous != blank_id:
+            last_repetition += 1
+        previous = p
+    if len(token_repetitions) > 0:
+        token_repetitions = token_repetitions[1:] + [last_repetition]
+    return decoded_prediction, token_lengths, token_repetitions
+
+
 class TestCTCDecoding:
     @pytest.mark.unit
     def test_constructor(self):
@@ -367,3 +385,34 @@ class TestCTCDecoding:
                 assert torch.all(hyp.y_sequence == batched_hyp.y_sequence)
                 if timestamps:
                     assert hyp.timestamp == batched_hyp.timestamp
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('timestamps', [False, True])
+    def test_batched_ctc_collapse(self, timestamps):
+        cfg = CTCDecodingConfig(strategy='greedy', compute_timestamps=timestamps)
+        decoding = CTCDecoding(decoding_cfg=cfg, vocabulary=char_vocabulary())
+        blank_id = decoding.blank_id
+
+        torch.manual_seed(0)
+        # few labels to get long runs of repetitions and blanks
+        sequences = [torch.randint(low=blank_id - 2, high=blank_id + 1, size=[T]) for T in [30, 1, 0, 17, 30]]
+        sequences.append(torch.full([5], blank_id))
+        lengths = [25, 0, 0, 40, 30, 5]
+        hypotheses = [
+            Hypothesis(score=0.0, y_sequence=sequence, length=length) for sequence, length in zip(sequences, lengths)
+        ]
+        # list labels are supported as well
+        hypotheses.append(Hypothesis(score=0.0, y_sequence=[1, 1, blank_id, 1, 2, 2, 2], length=0))
+
+        hypotheses = decoding.decode_hypothesis(hypotheses, fold_consecutive=True)
+
+        for hypothesis in hypotheses:
+            prediction = list(hypothesis.y_sequence)
+            prediction = prediction[: hypothesis.length] if hypothesis.length > 0 else prediction
+            decoded_prediction, token_lengths, token_repetitions = reference_ctc_collapse(
+                [int(p) for p in prediction], blank_id
+            )
+            if timestamps:
+                assert hypothesis.text == (decoded_prediction, token_lengths, token_repetitions)
+            else:
+                assert hypothesis.text == decoding.decode_tokens_to_str(decoded_prediction)
@@ -0,0 +1,194 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+import torch
+
+from nemo.collections.asr.parts.mixins import TranscribeConfig, TranscriptionMixin, TranscriptionSession
+from nemo.collections.asr.parts.mixins.transcription import GenericTranscriptionType
+
+
+class TensorTranscribableDummy(torch.nn.Module, TranscriptionMixin):
+    """Transcribes audio tensors to the sum of their samples, and records the batch sizes."""
+
+    def __init__(self, output_type: str = 'list'):
+        super().__init__()
+        self.encoder = torch.nn.Linear(1, 1)
+        self.sample_rate = 16000
+        self.output_type = output_type
+        self.batch_sizes = []
+        self.training_mode_in_forward = []
+
+    def _transcribe_input_manifest_processing(self, audio_files: List[str], temp_dir: str, trcfg: TranscribeConfig):
+        raise NotImplementedError()
+
+    def _setup_transcribe_dataloader(self, config: Dict):
+        raise NotImplementedError()
+
+    def _transcribe_forward(self, batch: Any, trcfg: TranscribeConfig):
+        audio, audio_len = batch[0], batch[1]
+        self.batch_sizes.append(audio.shape[0])
+        self.training_mode_in_forward.append(self.training)
+        mask = torch.arange(audio.shape[1]).unsqueeze(0) < audio_len.unsqueeze(1)
+        return (audio * mask).sum(dim=1), audio_len
+
+    def _transcribe_output_processing(self, outputs, trcfg: TranscribeConfig) -> GenericTranscriptionType:
+        sums, lengths = outputs
+        sums, lengths = sums.tolist(), lengths.tolist()
+        if self.output_type == 'dict':
+            return {'sum': sums, 'length': lengths}
+        if self.output_type == 'tuple':
+            return sums, lengths
+        return sums
+
+
+def make_audio(num_samples: int, value: float = 1.0) -> np.ndarray:
+    return np.full(num_samples, value, dtype=np.float32)
+
+
+class TestTranscriptionSession:
+    @pytest.mark.unit
+    def test_results_and_model_state(self):
+        model = TensorTranscribableDummy()
+        model.train()
+        audio = [make_audio(num_samples, value) for num_samples, value in [(16000, 1.0), (800, 2.0), (48000, 0.5)]]
+
+        with model.transcription_session(batch_size=2, max_wait_time=0.01) as session:
+            assert isinstance(session, TranscriptionSession)
+            assert not model.training
+            results = session.transcribe(audio)
+            results.append(session.submit(torch.ones(10)).result())
+
+        assert results == [16000.0, 1600.0, 24000.0, 10.0]
+        assert model.training
+        assert not any(model.training_mode_in_forward)
+        assert all(batch_size <= 2 for batch_size in model.batch_sizes)
+
+        stats = session.stats()
+        assert stats['num_requests'] == 4
+        assert stats['num_failed_requests'] == 0
+        assert stats['num_batches'] == len(model.batch_sizes)
+        assert stats['mean_batch_size'] == 4 / len(model.batch_sizes)
+        assert 0.0 < stats['mean_batch_fill'] <= 1.0
+        assert 0.0 <= stats['latency_p50'] <= stats['latency_p95'] <= stats['latency_max']
+
+    @pytest.mark.unit
+    def test_duration_buckets(self):
+        model = TensorTranscribableDummy()
+        # a long wait time makes batches only out of full buckets, until the session is closed
+        session = TranscriptionSession(model, batch_size=3, max_wait_time=60.0, duration_bins=[1.0, 10.0]).start()
+        short_futures = [session.submit(make_audio(1600)) for _ in range(3)]
+        long_futures = [session.submit(make_audio(32000)) for _ in range(2)]
+        assert [future.result(timeout=10) for future in short_futures] == [1600.0] * 3
+        assert not any(future.done() for future in long_futures)
+        session.close()
+
+        assert [future.result() for future in long_futures] == [32000.0] * 2
+        assert model.batch_sizes == [3, 2]
+
+    @pytest.mark.unit
+    def test_max_wait_time_fills_batch_from_closest_buckets(self):
+        model = TensorTranscribableDummy()
+        session = TranscriptionSession(model, batch_size=4, max_wait_time=60.0, duration_bins=[1.0, 2.0, 10.0])
+        session.start()
+        # enqueue requests in different buckets while the batching thread waits
+        with session._condition:
+            futures = [session.submit(make_audio(num_samples)) for num_samples in [8000, 24000, 24000, 320000]]
+            session.max_wait_time = 0.0
+        assert [future.result(timeout=10) for future in futures] == [8000.0, 24000.0, 24000.0, 320000.0]
+        session.close()
+        assert model.batch_sizes == [4]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('output_type', ['dict', 'tuple'])
+    def test_structured_outputs(self, output_type):
+        model = TensorTranscribableDummy(output_type=output_type)
+        with model.transcription_session(batch_size=4, max_wait_time=0.01) as session:
+            results = session.transcribe([make_audio(100), make_audio(200, 2.0)])
+
+        if output_type == 'dict':
+            assert results == [{'sum': 100.0, 'length': 100}, {'sum': 400.0, 'length': 200}]
+        else:
+            assert results == [(100.0, 100), (400.0, 200)]
+
+    @pytest.mark.unit
+    def test_concurrent_callers(self):
+        model = TensorTranscribableDummy()
+        results = {}
+
+        with model.transcription_session(batch_size=8, max_wait_time=0.005) as session:
+
+            def caller(idx):
+                results[idx] = session.transcribe([make_audio(100 * (idx + 1))] * 5)
+
+            threads = [threading.Thread(target=caller, args=(idx,)) for idx in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert results == {idx: [100.0 * (idx + 1)] * 5 for idx in range(6)}
+        assert session.stats()['num_requests'] == 30
+
+    @pytest.mark.unit
+    def test_audio_files(self, tmp_path):
+        import soundfile as sf
+
+        model = TensorTranscribableDummy()
+        audio_file = os.path.join(tmp_path, 'audio.wav')
+        sf.write(audio_file, make_audio(8000, 0.25), 16000)
+
+        with model.transcription_session(batch_size=2, max_wait_time=0.01, num_workers=2) as session:
+            futures = [session.submit(audio_file), session.submit(os.path.join(tmp_path, 'missing.wav'))]
+            assert futures[0].result() == pytest.approx(2000.0)
+            with pytest.raises(Exception):
+                futures[1].result()
+
+        assert session.stats()['num_failed_requests'] == 1
+
+    @pytest.mark.unit
+    def test_submit_to_closed_session(self):
+        model = TensorTranscribableDummy()
+        session = TranscriptionSession(model)
+        with pytest.raises(RuntimeError):
+            session.submit(make_audio(10))
+        with pytest.raises(ValueError):
+            TranscriptionSession(model, batch_size=0)
+
+    @pytest.mark.unit
+    def test_override_config_is_not_modified(self):
+        model = TensorTranscribableDummy()
+        override_config = TranscribeConfig(batch_size=32, num_workers=4, verbose=True)
+        with model.transcription_session(batch_size=2, override_config=override_config) as session:
+            assert session.transcribe([make_audio(10)]) == [10.0]
+            assert session.transcribe_cfg.batch_size == 2
+
+        assert override_config == TranscribeConfig(batch_size=32, num_workers=4, verbose=True)
+        assert override_config._internal is None
+
+    @pytest.mark.unit
+    def test_unsupported_model(self):
+        class PromptedTranscribableDummy(TensorTranscribableDummy):
+            def _setup_transcribe_tensor_dataloader(self, config: Dict, trcfg: TranscribeConfig):
+                raise NotImplementedError()
+
+        model = PromptedTranscribableDummy()
+        with pytest.raises(NotImplementedError, match="does not support transcription sessions"):
+            model.transcription_session()
+        assert model.training
@@ -15,12 +15,18 @@
 import random
 from pathlib import Path
 
+import numpy as np
 import pytest
 import torch
 from torch.nn.utils.rnn import pad_sequence
 from tqdm.auto import tqdm
 
-from nemo.collections.asr.parts.submodules.ngram_lm import KenLMBatchedWrapper, NGramGPULanguageModel
+from nemo.collections.asr.parts.submodules.ngram_lm import (
+    DEFAULT_TOKEN_OFFSET,
+    KenLMBatchedWrapper,
+    NGramGPULanguageModel,
+)
+from nemo.collections.asr.parts.submodules.ngram_lm.ngram_lm_batched import SUFFIX_TREE_FILE_SUFFIX, SuffixTreeStorage
 from nemo.core.utils.optional_libs import KENLM_AVAILABLE, TRITON_AVAILABLE
 
 DEVICES = [torch.device("cpu")]
@@ -207,3 +213,152 @@ class TestNGramGPULanguageModel:
         assert (n_gpu_lm_loaded.backoff_to_states == n_gpu_lm.backoff_to_states).all()
         assert torch.allclose(n_gpu_lm_loaded.backoff_weights, n_gpu_lm.backoff_weights)
         assert torch.allclose(n_gpu_lm_loaded.final_weights, n_gpu_lm.final_weights)
+
+
+def write_random_arpa(path: Path, vocab_size: int, max_order: int, num_sentences: int, seed: int = 0) -> dict:
+    """
+    Write ARPA LM with random weights for n-grams from random sentences (tokens are encoded with the default offset).
+    Returns dictionary: tuple of symbols (token ids, "<s>", "</s>", "<unk>") -> (weight, backoff) with natural log.
+    """
+    rng = random.Random(seed)
+    order2ngrams = [set() for _ in range(max_order)]
+    for _ in range(num_sentences):
+        # some tokens (e.g., 33 -> "\x85") are treated as line boundaries by `str.splitlines`
+        sentence = ["<s>"] + [rng.randrange(vocab_size - 4) for _ in range(rng.randint(1, 10))] + ["</s>"]
+        for order in range(1, max_order + 1):
+            for i in range(len(sentence) - order + 1):
+                order2ngrams[order - 1].add(tuple(sentence[i : i + order]))
+    order2ngrams[0].add(("<unk>",))
+
+    ngrams = dict()
+    lines = (
+        ["\\data\\"] + [f"ngram {order}={len(order2ngrams[order - 1])}" for order in range(1, max_order + 1)] + [""]
+    )
+    for order in range(1, max_order + 1):
+        lines.append(f"\\{order}-grams:")
+        for ngram in sorted(order2ngrams[order - 1], key=str):
+            weight = -99.0 if ngram == ("<s>",) else round(rng.uniform(-3.0, -0.1), 4)
+            backoff = round(rng.uniform(-1.0, 0.0), 4) if order < max_order else 0.0
+            words = " ".join(
+                symbol if isinstance(symbol, str) else chr(symbol + DEFAULT_TOKEN_OFFSET) for symbol in ngram
+            )
+            lines.append(f"{weight}\t{words}\t{backoff}" if order < max_order else f"{weight}\t{words}")
+            ngrams[ngram] = (weight / np.log10(np.e), backoff / np.log10(np.e))
+        lines.append("")
+    lines.append("\\end\\")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return ngrams
+
+
+def reference_score(ngrams: dict, history: tuple, label, max_order: int) -> float:
+    """Score of the label given history for back-off N-Gram LM (without unk normalization)"""
+    history = history[-(max_order - 1) :] if max_order > 1 else tuple()
+    score = 0.0
+    while (*history, label) not in ngrams:
+        if not history:
+            return score + ngrams[("<unk>",)][0]
+        score += ngrams.get(history, (0.0, 0.0))[1]
+        history = history[1:]
+    return score + ngrams[(*history, label)][0]
+
+
+def assert_same_lm(lm: NGramGPULanguageModel, lm_ref: NGramGPULanguageModel):
+    for name in [
+        "arcs_weights",
+        "from_states",
+        "to_states",
+        "ilabels",
+        "start_end_arcs",
+        "state_order",
+        "backoff_to_states",
+        "backoff_weights",
+        "final_weights",
+    ]:
+        assert torch.equal(getattr(lm, name), getattr(lm_ref, name)), f"{name} differ"
+
+
+class TestNGramGPULanguageModelFromArpa:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("max_order", [2, 4])
+    def test_parse_arpa(self, tmp_path, max_order):
+        vocab_size = 64
+        arpa_path = tmp_path / "lm.arpa"
+        ngrams = write_random_arpa(arpa_path, vocab_size=vocab_size, max_order=max_order, num_sentences=200)
+        n_gpu_lm = NGramGPULanguageModel.from_arpa(
+            arpa_path, vocab_size=vocab_size, normalize_unk=False, use_triton=False, use_cache=False, num_workers=0
+        )
+        assert not any(path.suffix == SUFFIX_TREE_FILE_SUFFIX for path in tmp_path.iterdir())
+
+        # parallel parsing of small chunks gives the same model
+        suffix_tree_np = NGramGPULanguageModel._arpa_to_suffix_tree(
+            lm_path=arpa_path,
+            vocab_size=vocab_size,
+            normalize_unk=False,
+            token_offset=DEFAULT_TOKEN_OFFSET,
+            num_workers=2,
+            chunk_size=256,
+        )
+        assert_same_lm(NGramGPULanguageModel.from_suffix_tree(suffix_tree_np, use_triton=False), n_gpu_lm)
+
+        rng = random.Random(1)
+        sentences = [[rng.randrange(vocab_size) for _ in range(rng.randint(1, 8))] for _ in range(10)]
+        scores = n_gpu_lm.score_sentences(
+            labels=pad_sequence([torch.LongTensor(sentence) for sentence in sentences], batch_first=True),
+            labels_lengths=torch.LongTensor([len(sentence) for sentence in sentences]),
+            bos=True,
+            eos=True,
+        )
+        for i, sentence in enumerate(sentences):
+            history = ("<s>",)
+            for j, label in enumerate(sentence + ["</s>"]):
+                assert scores[i, j].item() == pytest.approx(
+                    reference_score(ngrams, history, label, max_order), abs=1e-4
+                )
+                history = (*history, label)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_suffix_tree_save_load(self, tmp_path, mmap):
+        vocab_size = 64
+        arpa_path = tmp_path / "lm.arpa"
+        write_random_arpa(arpa_path, vocab_size=vocab_size, max_order=3, num_sentences=100)
+        suffix_tree_np = NGramGPULanguageModel._arpa_to_suffix_tree(
+            lm_path=arpa_path, vocab_size=vocab_size, normalize_unk=True, token_offset=DEFAULT_TOKEN_OFFSET
+        )
+        suffix_tree_path = tmp_path / f"lm{SUFFIX_TREE_FILE_SUFFIX}"
+        suffix_tree_np.save(suffix_tree_path, source_info={"name": "test"})
+        assert SuffixTreeStorage.read_info(suffix_tree_path)["source_info"] == {"name": "test"}
+
+        suffix_tree_loaded = SuffixTreeStorage.load(suffix_tree_path, mmap=mmap)
+        assert isinstance(suffix_tree_loaded.arcs, np.memmap) == mmap
+        assert suffix_tree_loaded.unk_prob == pytest.approx(suffix_tree_np.unk_prob)
+        n_gpu_lm = NGramGPULanguageModel.from_suffix_tree(suffix_tree_np, use_triton=False)
+        assert_same_lm(NGramGPULanguageModel.from_suffix_tree(suffix_tree_loaded, use_triton=False), n_gpu_lm)
+        assert_same_lm(NGramGPULanguageModel.from_file(suffix_tree_path, vocab_size=vocab_size), n_gpu_lm)
+
+    @pytest.mark.unit
+    def test_arpa_cache(self, tmp_path, monkeypatch):
+        vocab_size = 64
+        arpa_path = tmp_path / "lm.arpa"
+        write_random_arpa(arpa_path, vocab_size=vocab_size, max_order=3, num_sentences=100, seed=0)
+        cache_path = NGramGPULanguageModel.get_arpa_cache_path(arpa_path, vocab_size=vocab_size)
+        n_gpu_lm = NGramGPULanguageModel.from_file(arpa_path, vocab_size=vocab_size, use_triton=False)
+        assert cache_path.exists()
+
+        with monkeypatch.context() as patch:
+            patch.setattr(NGramGPULanguageModel, "_arpa_to_suffix_tree", None)  # must not be called
+            assert_same_lm(NGramGPULanguageModel.from_file(arpa_path, vocab_size=vocab_size), n_gpu_lm)
+
+        # cache for other conversion parameters is stored separately
+        NGramGPULanguageModel.from_arpa(arpa_path, vocab_size=vocab_size, normalize_unk=False)
+        assert NGramGPULanguageModel.get_arpa_cache_path(
+            arpa_path, vocab_size=vocab_size, normalize_unk=False
+        ).exists()
+
+        # modified ARPA invalidates the cache
+        write_random_arpa(arpa_path, vocab_size=vocab_size, max_order=3, num_sentences=120, seed=1)
+        n_gpu_lm_modified = NGramGPULanguageModel.from_arpa(arpa_path, vocab_size=vocab_size, use_cache=False)
+        assert_same_lm(NGramGPULanguageModel.from_arpa(arpa_path, vocab_size=vocab_size), n_gpu_lm_modified)
+        assert_same_lm(
+            NGramGPULanguageModel.from_suffix_tree_file(cache_path, vocab_size=vocab_size), n_gpu_lm_modified
+        )
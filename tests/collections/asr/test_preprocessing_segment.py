@@ -23,7 +23,13 @@ import pytest
 import soundfile as sf
 
 from nemo.collections.asr.parts.preprocessing.perturb import NoisePerturbation, SilencePerturbation
-from nemo.collections.asr.parts.preprocessing.segment import AudioSegment, select_channels
+from nemo.collections.asr.parts.preprocessing.segment import (
+    AudioFileCache,
+    AudioSegment,
+    audio_file_cache,
+    read_audio_samples,
+    select_channels,
+)
 
 
 class TestSelectChannels:
@@ -485,3 +491,81 @@ class TestAudioSegment:
 
                 # Test
                 assert audio_segment_1 == audio_segment_2, f'trim setup {trim_setup}, loaded segments not matching'
+
+
+class TestAudioFileCache:
+    sample_rate = 16000
+
+    def write_signal(self, path, num_channels=1, signal_len_sec=3, format=None):
+        num_samples = signal_len_sec * self.sample_rate
+        samples = 0.5 * np.random.rand(num_samples, num_channels) - 0.25
+        sf.write(path, samples.squeeze(), self.sample_rate, format=format)
+        return path
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("extension", ["wav", "flac", "ogg"])
+    @pytest.mark.parametrize("num_channels", [1, 2])
+    def test_partial_read_matches_full_decode(self, tmpdir, extension, num_channels):
+        """Segments read through the cached handles match slicing the fully decoded signal."""
+        audio_file = self.write_signal(os.path.join(tmpdir, f'test.{extension}'), num_channels=num_channels)
+        full, _ = sf.read(audio_file, dtype='float32')
+
+        # read the segments in a non-monotonic order to exercise seeking of the cached handle
+        for offset, duration in [(1.5, 0.5), (0, 1), (0.25, 0), (2.5, 2), (0, 0)]:
+            segment = AudioSegment.from_file(audio_file, offset=offset, duration=duration)
+            start = int(offset * self.sample_rate)
+            stop = start + int(duration * self.sample_rate) if duration > 0 else None
+            np.testing.assert_array_equal(segment.samples, full[start:stop])
+
+            n_segments = 4000
+            segment = AudioSegment.segment_from_file(audio_file, n_segments=n_segments, offset=offset)
+            start = int(np.floor(offset * self.sample_rate))
+            np.testing.assert_array_equal(segment.samples, full[start : start + n_segments])
+
+        assert audio_file in audio_file_cache._entries
+
+    @pytest.mark.unit
+    def test_read_into_preallocated_buffer(self, tmpdir):
+        audio_file = self.write_signal(os.path.join(tmpdir, 'test.wav'), num_channels=2)
+        full, _ = sf.read(audio_file, dtype='float32')
+
+        buffer = np.zeros((self.sample_rate, 2), dtype=np.float32)
+        samples, sample_rate = read_audio_samples(audio_file, offset=1.0, duration=0.5, out=buffer)
+        assert sample_rate == self.sample_rate
+        assert np.shares_memory(samples, buffer)
+        np.testing.assert_array_equal(samples, full[self.sample_rate : self.sample_rate + self.sample_rate // 2])
+
+        # not enough room for the requested frames
+        with pytest.raises(ValueError):
+            read_audio_samples(audio_file, duration=2.0, out=buffer)
+
+    @pytest.mark.unit
+    def test_lru_and_invalidation(self, tmpdir):
+        cache = AudioFileCache(max_size=2)
+        audio_files = [self.write_signal(os.path.join(tmpdir, f'test_{n}.wav')) for n in range(3)]
+        for audio_file in audio_files:
+            with cache.open(audio_file) as f:
+                f.read(10)
+        assert len(cache) == 2
+        assert list(cache._entries) == audio_files[1:]
+
+        # the handle is rewound and reused
+        handle = cache._entries[audio_files[1]].handle
+        with cache.open(audio_files[1]) as f:
+            assert f is handle
+            assert f.tell() == 0
+        assert list(cache._entries) == [audio_files[2], audio_files[1]]
+
+        # a rewritten file is reopened
+        self.write_signal(audio_files[1], signal_len_sec=1)
+        os.utime(audio_files[1], ns=(0, 0))
+        with cache.open(audio_files[1]) as f:
+            assert f is not handle
+            assert f.frames == self.sample_rate
+        assert handle.closed
+
+        cache.resize(0)
+        assert len(cache) == 0
+        with cache.open(audio_files[0]) as f:
+            assert f.frames == 3 * self.sample_rate
+        assert len(cache) == 0
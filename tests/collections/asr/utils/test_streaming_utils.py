@@ -0,0 +1,167 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+from omegaconf import OmegaConf
+
+from nemo.collections.asr.parts.utils.streaming_utils import (
+    BatchedFrameASRRNNT,
+    BatchedFrameASRTDT,
+    LongestCommonSubsequenceBatchedFrameASRRNNT,
+    _lcs_merge_indices,
+    _lcs_suffix_table,
+    lcs_alignment_merge_buffer,
+    lcs_alignment_merge_buffer_batch,
+    longest_common_subsequence_merge,
+    longest_common_subsequence_merge_batch,
+)
+
+# (previous buffer, current chunk, expected [i, j, slice_len])
+LCS_MERGE_CASES = [
+    ([1, 2, 3, 4], [3, 4, 5, 6], [2, 0, 2]),  # complete merge
+    ([1, 2, 3, 4, 5], [2, 3, 9, 5, 6, 7], [1, 0, 4]),  # partial merge with a diagonal skip
+    ([7, 7, 7], [1, 2, 3], [3, 0, 0]),  # no overlap
+    ([1, 2, 1, 2, 3], [1, 2, 3, 1, 2, 3, 4], [2, 3, 3]),  # repeated subsequences
+    ([5, 6, 7, 8, 9], [6, 7, 0, 9, 10, 11], [1, 0, 4]),
+    ([4, 1, 2], [1, 2, 1, 2], [1, 2, 2]),
+]
+
+
+def lcs_suffix_table_reference(X, Y):
+    table = [[0 for _ in range(len(Y) + 1)] for _ in range(len(X) + 1)]
+    for i in range(1, len(X) + 1):
+        for j in range(1, len(Y) + 1):
+            if X[i - 1] == Y[j - 1]:
+                table[i][j] = table[i - 1][j - 1] + 1
+    return table
+
+
+class TestLongestCommonSubsequenceMerge:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("X, Y, expected", LCS_MERGE_CASES)
+    def test_merge(self, X, Y, expected):
+        result_idx, alignment = longest_common_subsequence_merge(X, Y)
+        assert result_idx == expected
+        assert alignment.tolist() == lcs_suffix_table_reference(X, Y)
+
+    @pytest.mark.unit
+    def test_python_kernel_matches(self):
+        """The merge heuristics give the same slices with and without numba."""
+        merge_indices = getattr(_lcs_merge_indices, "py_func", _lcs_merge_indices)
+        for X, Y, expected in LCS_MERGE_CASES:
+            table = _lcs_suffix_table(np.array([X]), np.array([Y]))[0]
+            i, j, slice_len, _ = merge_indices(table, 1)
+            assert [i, j, slice_len] == expected
+
+    @pytest.mark.unit
+    def test_batch_matches_single(self):
+        rng = random.Random(0)
+        Xs, Ys = [], []
+        for _ in range(200):
+            tokens = [rng.randrange(5) for _ in range(rng.randint(1, 40))]
+            split = rng.randint(1, len(tokens))
+            Xs.append(tokens[max(0, split - rng.randint(1, 15)) : split])
+            Ys.append(tokens[max(0, split - rng.randint(0, 8)) :] + [rng.randrange(5) for _ in range(3)])
+
+        result_idxs, alignments = longest_common_subsequence_merge_batch(Xs, Ys)
+        for X, Y, result_idx, alignment in zip(Xs, Ys, result_idxs, alignments):
+            expected_idx, expected_alignment = longest_common_subsequence_merge(X, Y)
+            assert result_idx == expected_idx
+            assert alignment.tolist() == expected_alignment.tolist()
+
+        buffers = [list(X) for X in Xs]
+        expected = [lcs_alignment_merge_buffer(list(X), Y, delay=2, model=None) for X, Y in zip(Xs, Ys)]
+        assert lcs_alignment_merge_buffer_batch(buffers, Ys, delay=2) == expected
+
+    @pytest.mark.unit
+    def test_merge_buffer_without_delay_or_buffer(self):
+        assert lcs_alignment_merge_buffer_batch([[1, 2], []], [[2, 3], [4]], delay=0) == [[1, 2, 2, 3], [4]]
+        assert lcs_alignment_merge_buffer_batch([[1, 2], []], [[2, 3], [4]], delay=1) == [[1, 2, 3], [4]]
+
+
+class DummyTokenizer:
+    vocabulary = list("abcdefghij")
+
+    def ids_to_tokens(self, ids):
+        return [self.vocabulary[i] for i in ids]
+
+    def ids_to_text(self, ids):
+        return "".join(self.ids_to_tokens(ids))
+
+
+def make_dummy_rnnt_model():
+    tokenizer = DummyTokenizer()
+    return SimpleNamespace(
+        _cfg=OmegaConf.create(
+            {
+                "sample_rate": 16000,
+                "preprocessor": {
+                    "_target_": "nemo.collections.asr.modules.AudioToMelSpectrogramPreprocessor",
+                    "window_stride": 0.01,
+                    "features": 80,
+                },
+            }
+        ),
+        preprocessor=SimpleNamespace(log=True),
+        tokenizer=tokenizer,
+        decoder=SimpleNamespace(vocabulary=tokenizer.vocabulary),
+        device=torch.device("cpu"),
+    )
+
+
+def make_chunk_alignments(num_chunks, blank_id):
+    """
+    Alignments (frames of (logprob, token id)) of buffers of 6 frames: the 2 tokens of the previous chunk as
+    the left context, then the 2 tokens of the chunk (frames 3 and 4), and a blank as the right context.
+    """
+    alignments = []
+    for k in range(num_chunks):
+        context = [2 * k - 2, 2 * k - 1] if k > 0 else [blank_id, blank_id]
+        tokens = context + [blank_id, 2 * k, 2 * k + 1, blank_id]
+        alignments.append([[(0.0, token)] for token in tokens])
+    return alignments
+
+
+class TestBatchedFrameASRRNNT:
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "cls, kwargs",
+        [
+            (BatchedFrameASRRNNT, {}),
+            (BatchedFrameASRTDT, {"tdt_search_boundary": 2}),
+            (LongestCommonSubsequenceBatchedFrameASRRNNT, {}),
+        ],
+    )
+    def test_transcribe(self, cls, kwargs, monkeypatch):
+        asr = cls(make_dummy_rnnt_model(), frame_len=0.02, total_buffer=0.06, batch_size=2, **kwargs)
+        if isinstance(asr, LongestCommonSubsequenceBatchedFrameASRRNNT):
+            asr.lcs_delay = 1
+        # the alignments are set directly instead of being inferred from audio
+        monkeypatch.setattr(asr, "infer_logits", lambda: None)
+        asr.all_alignments = [make_chunk_alignments(4, asr.blank_id), make_chunk_alignments(3, asr.blank_id)]
+        asr.frame_bufferer.signal_end_index = [4, 3]
+
+        assert asr.transcribe(tokens_per_chunk=2, delay=2) == ["abcdefgh", "abcdef"]
+
+    @pytest.mark.unit
+    def test_lcs_transcribe_requires_lcs_delay(self, monkeypatch):
+        asr = LongestCommonSubsequenceBatchedFrameASRRNNT(make_dummy_rnnt_model(), batch_size=1)
+        monkeypatch.setattr(asr, "infer_logits", lambda: None)
+        with pytest.raises(ValueError):
+            asr.transcribe(tokens_per_chunk=2, delay=2)
@@ -12,19 +12,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
 import numpy as np
 import pytest
+import torch
 from pyannote.core import Annotation, Segment
 
 from nemo.collections.asr.parts.utils.vad_utils import (
     align_labels_to_frames,
+    binarization,
+    binarization_batch,
     convert_labels_to_speech_segments,
     frame_vad_construct_pyannote_object_per_file,
+    generate_overlap_vad_seq_batch,
+    generate_overlap_vad_seq_per_file,
+    generate_overlap_vad_seq_per_tensor,
+    generate_vad_segment_table_per_file,
+    generate_vad_segments,
     get_frame_labels,
     get_nonspeech_segments,
     load_speech_overlap_segments_from_rttm,
     load_speech_segments_from_rttm,
+    load_vad_segments,
     read_rttm_as_pyannote_object,
+    write_vad_segment_tables,
 )
 
 
@@ -124,3 +136,96 @@ class TestVADUtils:
         assert speech_segments_new == speech_segments
         ref, hyp = frame_vad_construct_pyannote_object_per_file(frame_labels, frame_labels, 0.02)
         assert ref == hyp == pyannote_object_gt
+
+
+def get_random_vad_preds(num_files=8, seed=0):
+    rng = np.random.default_rng(seed)
+    preds = {}
+    for n in range(num_files):
+        num_frames = int(rng.integers(10, 800))
+        probs = np.cumsum(rng.normal(0, 0.1, num_frames)) % 1.0
+        preds[f"file_{n}"] = torch.from_numpy(probs.astype(np.float32))
+    return preds
+
+
+class TestVADPostProcessingBatch:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("smoothing_method", ["mean", "median"])
+    @pytest.mark.parametrize("overlap, window_length_in_sec", [(0.875, 0.63), (0.5, 0.15)])
+    def test_overlap_vad_seq_batch(self, smoothing_method, overlap, window_length_in_sec):
+        frames = list(get_random_vad_preds().values())
+        per_args = {"overlap": overlap, "window_length_in_sec": window_length_in_sec, "shift_length_in_sec": 0.01}
+        preds = generate_overlap_vad_seq_batch(frames, per_args, smoothing_method)
+        for frame, pred in zip(frames, preds):
+            expected = generate_overlap_vad_seq_per_tensor(frame, per_args, smoothing_method)
+            assert torch.equal(pred, expected)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "onset, offset, pad_onset, pad_offset", [(0.6, 0.4, 0.05, 0.1), (0.5, 0.5, 0.0, 0.0), (0.3, 0.7, 0.2, -0.1)]
+    )
+    def test_binarization_batch(self, onset, offset, pad_onset, pad_offset):
+        sequences = list(get_random_vad_preds().values())
+        per_args = {"pad_onset": pad_onset, "pad_offset": pad_offset, "frame_length_in_sec": 0.01}
+        segments = binarization_batch(sequences, [onset] * len(sequences), [offset] * len(sequences), per_args)
+        for sequence, segment in zip(sequences, segments):
+            expected = binarization(sequence, {**per_args, "onset": onset, "offset": offset})
+            assert torch.equal(segment, expected)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("smoothing_method", [None, "median"])
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"onset": 0.6, "offset": 0.4, "pad_onset": 0.05, "min_duration_on": 0.2, "min_duration_off": 0.3},
+            {"onset": 0.8, "offset": 0.3, "scale": "relative", "min_duration_off": 0.1, "filter_speech_first": False},
+            {"onset": 0.9, "offset": 0.5, "scale": "percentile", "pad_offset": 0.1},
+        ],
+    )
+    def test_generate_vad_segments_matches_files(self, tmpdir, smoothing_method, params):
+        """The in-memory pipeline writes the same tables as the file-based one."""
+        frame_preds = get_random_vad_preds()
+        frame_dir = os.path.join(tmpdir, "frames")
+        os.makedirs(frame_dir)
+        for name, pred in frame_preds.items():
+            with open(os.path.join(frame_dir, name + ".frame"), "w") as f:
+                for p in pred.tolist():
+                    f.write('{0:0.4f}\n'.format(p))
+
+        pred_dir = frame_dir
+        if smoothing_method:
+            pred_dir = os.path.join(tmpdir, "smoothed")
+            os.makedirs(pred_dir)
+            per_args = {
+                "overlap": 0.875,
+                "window_length_in_sec": 0.63,
+                "shift_length_in_sec": 0.01,
+                "out_dir": pred_dir,
+                "smoothing_method": smoothing_method,
+            }
+            for name in frame_preds:
+                generate_overlap_vad_seq_per_file(os.path.join(frame_dir, name + ".frame"), per_args)
+        file_table_dir = os.path.join(tmpdir, "file_tables")
+        os.makedirs(file_table_dir)
+        for filename in os.listdir(pred_dir):
+            per_args = {"frame_length_in_sec": 0.01, "out_dir": file_table_dir, **params}
+            generate_vad_segment_table_per_file(os.path.join(pred_dir, filename), per_args)
+
+        store = os.path.join(tmpdir, "segments.npz")
+        segments = generate_vad_segments(
+            frame_preds,
+            params,
+            frame_length_in_sec=0.01,
+            smoothing_method=smoothing_method,
+            overlap=0.875,
+            window_length_in_sec=0.63,
+            batch_size=3,
+            out_path=store,
+        )
+        assert list(segments) == list(frame_preds)
+        table_dir = write_vad_segment_tables(load_vad_segments(store), os.path.join(tmpdir, "tables"))
+        for name in frame_preds:
+            with open(os.path.join(file_table_dir, name + ".txt")) as f:
+                expected = f.read()
+            with open(os.path.join(table_dir, name + ".txt")) as f:
+                assert f.read() == expected
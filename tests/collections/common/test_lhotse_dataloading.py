@@ -736,6 +736,37 @@ def test_dataloader_from_tarred_nemo_manifest_multi(nemo_tarred_manifest_path_mu
     assert b["audio"].shape[0] == b["audio_lens"].shape[0] == 3
 
 
+def test_dataloader_from_tarred_nemo_manifest_multi_prefetch(nemo_tarred_manifest_path_multi: tuple[str, str]):
+    json_mft, tar_mft = nemo_tarred_manifest_path_multi
+
+    def get_batches(**kwargs):
+        config = OmegaConf.create(
+            {
+                "manifest_filepath": json_mft,
+                "tarred_audio_filepaths": tar_mft,
+                "sample_rate": 16000,
+                "shuffle": True,
+                "use_lhotse": True,
+                "num_workers": 0,
+                "batch_size": 3,
+                "shuffle_buffer_size": 10,
+                "seed": 0,
+                "shard_seed": 0,
+                **kwargs,
+            }
+        )
+        dl = get_lhotse_dataloader_from_config(
+            config=config, global_rank=0, world_size=1, dataset=UnsupervisedAudioDataset()
+        )
+        return list(islice(dl, 6))
+
+    expected = get_batches()
+    batches = get_batches(tarred_prefetch_shards=1, tarred_prefetch_max_bytes=50000)
+    assert [b["ids"] for b in batches] == [b["ids"] for b in expected]
+    for b, e in zip(batches, expected):
+        torch.testing.assert_close(b["audio"], e["audio"])
+
+
 def test_dataloader_from_tarred_nemo_manifest_multi_max_open_streams(nemo_tarred_manifest_path_multi: tuple[str, str]):
     json_mft, tar_mft = nemo_tarred_manifest_path_multi
     config = OmegaConf.create(
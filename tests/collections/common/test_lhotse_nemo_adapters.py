@@ -12,13 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import tarfile
+import threading
+import time
+from pathlib import Path
+
 import numpy as np
 import pytest
 from lhotse import AudioSource, CutSet, MonoCut, Recording, SupervisionSegment
 from lhotse.serialization import save_to_jsonl
 from lhotse.testing.dummies import DummyManifest
 
-from nemo.collections.common.data.lhotse.nemo_adapters import LazyNeMoIterator
+from nemo.collections.common.data.lhotse.nemo_adapters import (
+    LazyNeMoIterator,
+    LazyNeMoTarredIterator,
+    ShardReadStats,
+    TarShardPrefetcher,
+)
 
 
 @pytest.fixture
@@ -200,3 +210,92 @@ def test_lazy_nemo_iterator_with_offset_metadata_only(nemo_offset_manifest_path)
         assert s.channel == 0
         assert s.text == "irrelevant"
         assert s.language == "en"
+
+
+@pytest.fixture
+def nemo_tarred_manifest_paths(tmp_path_factory):
+    """12 utterances of length 1s in 4 tar shards with a NeMo manifest per shard, the tar of shard 2 is truncated."""
+    tmpdir = tmp_path_factory.mktemp("nemo_tarred_data")
+    cuts = list(DummyManifest(CutSet, begin_id=0, end_id=12, with_data=True).save_audios(tmpdir, progress_bar=False))
+    for shard_id in range(4):
+        shard_cuts = cuts[3 * shard_id : 3 * (shard_id + 1)]
+        nemo = []
+        tar_path = tmpdir / f"audio_{shard_id}.tar"
+        with tarfile.open(tar_path, "w") as tar:
+            for c in shard_cuts:
+                audio_path = Path(c.recording.sources[0].source)
+                tar.add(audio_path, arcname=audio_path.name)
+                nemo.append(
+                    {"audio_filepath": audio_path.name, "text": c.id, "duration": c.duration, "shard_id": shard_id}
+                )
+        save_to_jsonl(nemo, tmpdir / f"manifest_{shard_id}.json")
+    # the first file of the shard is read, the rest is lost
+    data = (tmpdir / "audio_2.tar").read_bytes()
+    (tmpdir / "audio_2.tar").write_bytes(data[: len(data) // 2])
+    return str(tmpdir / "manifest__OP_0..3_CL_.json"), str(tmpdir / "audio__OP_0..3_CL_.tar")
+
+
+@pytest.mark.parametrize("prefetch_max_bytes", [1, 1 << 30])
+@pytest.mark.parametrize("prefetch_shards", [1, 3])
+def test_lazy_nemo_tarred_iterator_prefetch(nemo_tarred_manifest_paths, prefetch_shards, prefetch_max_bytes):
+    manifest_path, tar_path = nemo_tarred_manifest_paths
+    kwargs = dict(shuffle_shards=True, shard_seed=0)
+
+    expected = list(LazyNeMoTarredIterator(manifest_path, tar_path, **kwargs))
+    iterator = LazyNeMoTarredIterator(
+        manifest_path, tar_path, prefetch_shards=prefetch_shards, prefetch_max_bytes=prefetch_max_bytes, **kwargs
+    )
+    cuts = list(iterator)
+
+    # the truncated shard is skipped after its complete files
+    assert 9 < len(cuts) < 12
+    assert [c.id for c in cuts] == [c.id for c in expected]
+    assert [c.supervisions[0].text for c in cuts] == [c.supervisions[0].text for c in expected]
+    for c, e in zip(cuts, expected):
+        np.testing.assert_array_equal(c.load_audio(), e.load_audio())
+
+    assert [stats.tar_path for stats in iterator.shard_stats] == list(dict.fromkeys(c.tar_origin for c in expected))
+    assert sum(stats.num_files for stats in iterator.shard_stats) == len(cuts)
+    for stats in iterator.shard_stats:
+        assert stats.num_bytes > 0 and stats.read_time > 0 and stats.wait_time >= 0
+        assert stats.bytes_per_second > 0
+
+    # stopping early stops the readers
+    num_threads = threading.active_count()
+    assert [c.id for _, c in zip(range(4), iterator)] == [c.id for c in expected[:4]]
+    for _ in range(100):
+        if threading.active_count() <= num_threads:
+            break
+        time.sleep(0.05)
+    assert threading.active_count() <= num_threads
+
+
+def test_tar_shard_prefetcher_reads_ahead():
+    num_shards, num_items = 5, 3
+    started = [threading.Event() for _ in range(num_shards)]
+
+    def read_shard(position):
+        started[position].set()
+        for i in range(num_items):
+            yield 10, (position, i)
+        if position == 3:
+            raise tarfile.ReadError("truncated")
+
+    stats = [ShardReadStats(shard_id=position, tar_path="") for position in range(num_shards)]
+    prefetcher = TarShardPrefetcher(read_shard, stats=stats, num_ahead=2, max_bytes=25)
+    try:
+        # the shards ahead are read before the first one is consumed, up to the memory budget
+        assert started[1].wait(5) and started[2].wait(5)
+        assert not started[3].wait(0.1)
+        for position in range(num_shards):
+            items = prefetcher.iter_shard(position)
+            if position == 3:
+                with pytest.raises(tarfile.ReadError):
+                    list(items)
+            else:
+                assert list(items) == [(position, i) for i in range(num_items)]
+            assert prefetcher._used_bytes <= 25
+    finally:
+        prefetcher.close()
+    assert [s.num_files for s in stats] == [num_items] * num_shards
+    assert [s.num_bytes for s in stats] == [10 * num_items] * num_shards
@@ -0,0 +1,292 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+
+import pytest
+import sentencepiece as spm
+
+from nemo.collections.common.parts.preprocessing import collections, manifest_index, parsers
+from nemo.collections.common.parts.preprocessing.manifest_index import (
+    ManifestIndex,
+    get_manifest_index_dir,
+    get_parser_cache_key,
+    tokenize_texts,
+    tokenizer_cache_key,
+)
+from nemo.collections.common.tokenizers.aggregate_tokenizer import AggregateTokenizer
+from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer
+
+
+@pytest.fixture(scope="module")
+def spm_models(tmp_path_factory):
+    sentences = ["the quick brown fox jumps over the lazy dog", "pack my box with five dozen liquor jugs"]
+    model_paths = []
+    for vocab_size in [32, 40]:
+        model_prefix = str(tmp_path_factory.mktemp("spm") / "tokenizer")
+        spm.SentencePieceTrainer.train(
+            sentence_iterator=iter(sentences * 10), model_prefix=model_prefix, vocab_size=vocab_size, model_type="bpe"
+        )
+        model_paths.append(model_prefix + ".model")
+    return model_paths
+
+
+class BatchParser:
+    """Parser whose batch_text_to_ids appends the size of the batch and its languages to every result."""
+
+    def __call__(self, text, lang=None):
+        return [ord(c) for c in "".join(text)] + ([ord(lang)] if lang is not None else [])
+
+    def batch_text_to_ids(self, texts, langs=None, num_threads=None):
+        langs = langs if langs is not None else [None] * len(texts)
+        return [self(text, lang) + [-len(texts)] for text, lang in zip(texts, langs)]
+
+
+@pytest.fixture()
+def manifest_path(tmp_path):
+    items = [
+        {"audio_filepath": "/data/a.wav", "duration": 1.5, "text": "hello world", "lang": "en"},
+        {"audio_filepath": "/data/b.wav", "duration": 0.2, "text": "short", "speaker": 3},
+        {"audio_filepath": "/data/c.wav", "duration": 7.0, "text": "", "offset": 1.25, "orig_sample_rate": 8000},
+        {"audio_filepath": "/data/d.wav", "duration": 3.0, "text": "labels", "token_labels": [5, 6, 7]},
+        {"audio_filepath": "/data/a.wav", "duration": 2.5, "text": "ünïcode text", "offset": 3.0},
+        {"audio_filepath": "/data/e.wav", "duration": 12.0, "text": "too long"},
+    ]
+    path = tmp_path / "manifest.json"
+    with open(path, "w") as f:
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+    return str(path)
+
+
+class TestManifestIndex:
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {},
+            {"min_duration": 0.5, "max_duration": 10.0},
+            {"do_sort_by_duration": True},
+            {"max_number": 2, "min_duration": 0.5},
+            {"index_by_file_id": True},
+        ],
+    )
+    def test_matches_manifest_parsing(self, manifest_path, tmp_path, kwargs):
+        parser = parsers.make_parser(name="en")
+        expected = collections.ASRAudioText(manifest_path, parser=parser, **kwargs)
+        indexed = collections.ASRAudioText(
+            manifest_path,
+            parser=parser,
+            use_manifest_index=True,
+            manifest_index_dir=str(tmp_path / "index"),
+            **kwargs,
+        )
+        assert len(indexed) == len(expected)
+        assert list(indexed) == list(expected)
+        if kwargs.get("index_by_file_id"):
+            assert indexed.mapping == expected.mapping
+
+    @pytest.mark.unit
+    def test_index_is_reused_and_pickled_by_path(self, manifest_path, tmp_path):
+        parser = parsers.make_parser(name="en")
+        index_dir = get_manifest_index_dir(manifest_path, index_mapping_dir=str(tmp_path))
+        collections.ASRAudioText(
+            manifest_path, parser=parser, use_manifest_index=True, manifest_index_dir=str(tmp_path)
+        )
+        assert os.path.isdir(index_dir)
+        assert len(os.listdir(os.path.join(index_dir, "tokens"))) == 2  # token cache dir and its lock file
+
+        index = ManifestIndex.from_manifests(manifest_path, index_mapping_dir=str(tmp_path))
+        assert index.index_dir == index_dir
+        assert len(pickle.dumps(index)) < 1024
+        restored = pickle.loads(pickle.dumps(index))
+        assert [restored.get_audio_file(i) for i in range(len(restored))] == [
+            index.get_audio_file(i) for i in range(len(index))
+        ]
+
+    @pytest.mark.unit
+    def test_modified_manifest_gets_new_index(self, manifest_path, tmp_path):
+        first_dir = get_manifest_index_dir(manifest_path, index_mapping_dir=str(tmp_path))
+        with open(manifest_path, "a") as f:
+            f.write(json.dumps({"audio_filepath": "/data/f.wav", "duration": 1.0, "text": "new"}) + "\n")
+        assert get_manifest_index_dir(manifest_path, index_mapping_dir=str(tmp_path)) != first_dir
+
+    @pytest.mark.unit
+    def test_audio_text_array_storage(self):
+        parser = parsers.make_parser(name="base")
+        collection = collections.AudioText(
+            ids=[10, 11, 12],
+            audio_files=["/a.wav", "/a.wav", "/b.wav"],
+            durations=[2.0, 1.0, 3.0],
+            texts=["ab", "c", ""],
+            offsets=[None, 2.0, None],
+            speakers=[None, "spk", 1],
+            orig_sampling_rates=[None, None, 16000],
+            token_labels=[None, None, [1, 2]],
+            langs=["en", None, "de"],
+            parser=parser,
+            do_sort_by_duration=True,
+        )
+        entity_type = collections.AudioText.OUTPUT_TYPE
+        assert not isinstance(collection.data, list)
+        assert list(collection) == [
+            entity_type(11, "/a.wav", 1.0, parser("c"), 2.0, "c", "spk", None, None),
+            entity_type(10, "/a.wav", 2.0, parser("ab"), None, "ab", None, None, "en"),
+            entity_type(12, "/b.wav", 3.0, [1, 2], None, "", 1, 16000, "de"),
+        ]
+        assert collection[-1] == collection[2]
+        assert collection.data.index.meta["num_rows"] == 3
+        # audio paths are interned
+        assert len(collection.data.index._strings["audio_file"].offsets) == 3
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("kwargs", [{}, {"max_number": 3, "min_duration": 0.5}])
+    def test_parallel_tokenization_matches_serial(self, manifest_path, tmp_path, kwargs):
+        parser = parsers.make_parser(name="en")
+        expected = collections.ASRAudioText(manifest_path, parser=parser, **kwargs)
+        parallel = collections.ASRAudioText(manifest_path, parser=parser, tokenization_num_workers=2, **kwargs)
+        assert list(parallel) == list(expected)
+
+        indexed = collections.ASRAudioText(
+            manifest_path,
+            parser=parser,
+            use_manifest_index=True,
+            manifest_index_dir=str(tmp_path),
+            tokenization_num_workers=2,
+            **kwargs,
+        )
+        assert list(indexed) == list(expected)
+
+    @pytest.mark.unit
+    def test_tokenize_texts_keeps_order(self):
+        texts = [(f"text {i}", None) for i in range(1000)]
+        parser = parsers.make_parser(name="base")
+        expected = [parser(text) for text, _ in texts]
+        assert list(tokenize_texts(parser, texts, num_workers=3, chunk_size=7)) == expected
+
+    @pytest.mark.unit
+    def test_tokenize_texts_batches_chunks(self):
+        parser = BatchParser()
+        texts = [(f"text {i}", None) for i in range(20)]
+        assert list(tokenize_texts(parser, texts, num_workers=2, chunk_size=8)) == [
+            parser(text) + [-8 if i < 16 else -4] for i, (text, _) in enumerate(texts)
+        ]
+
+        # languages are passed with the batch, and chunks mixing texts with and without language are not batched
+        texts = [("a", "x"), ("b", "y"), ("c", "x"), (["span"], None), ("d", "y")]
+        assert list(tokenize_texts(parser, texts, num_workers=2, chunk_size=3)) == [
+            parser("a", "x") + [-3],
+            parser("b", "y") + [-3],
+            parser("c", "x") + [-3],
+            parser(["span"]),
+            parser("d", "y"),
+        ]
+
+    @pytest.mark.unit
+    def test_tokenization_context(self, monkeypatch):
+        parser = parsers.make_parser(name="base")
+        default_method = manifest_index.mp.get_start_method()
+        assert manifest_index._get_tokenization_context(parser).get_start_method() == default_method
+
+        # forked workers cannot use CUDA once it is initialized
+        monkeypatch.setattr(manifest_index.torch.cuda, 'is_initialized', lambda: True)
+        assert manifest_index._get_tokenization_context(parser).get_start_method() != 'fork'
+
+        # parsers that cannot be sent to spawned workers are run in the current process
+        local_parser = lambda text: [len(text)]
+        assert manifest_index._get_tokenization_context(local_parser) is None
+        texts = [(f"text {i}", None) for i in range(10)]
+        assert list(tokenize_texts(local_parser, texts, num_workers=2)) == [[6]] * 10
+
+    @pytest.mark.unit
+    def test_tokenizer_cache_key(self, spm_models, tmp_path):
+        model_path, other_model_path = spm_models
+        copied_model_path = str(tmp_path / "copy.model")
+        shutil.copy(model_path, copied_model_path)
+
+        tokenizer = SentencePieceTokenizer(model_path)
+        key = tokenizer_cache_key(tokenizer)
+        assert key is not None and key.startswith(
+            "nemo.collections.common.tokenizers.sentencepiece_tokenizer.SentencePieceTokenizer:"
+        )
+        # the same model and configuration give the same key, wherever the model file is and after use
+        tokenizer.batch_text_to_ids(["the quick fox"])
+        assert tokenizer_cache_key(tokenizer) == key
+        assert tokenizer_cache_key(SentencePieceTokenizer(copied_model_path)) == key
+        # another model or configuration gives another key
+        assert tokenizer_cache_key(SentencePieceTokenizer(other_model_path)) != key
+        assert tokenizer_cache_key(SentencePieceTokenizer(model_path, ignore_extra_whitespaces=False)) != key
+
+        aggregate = AggregateTokenizer({"en": tokenizer, "de": SentencePieceTokenizer(other_model_path)})
+        swapped = AggregateTokenizer({"de": tokenizer, "en": SentencePieceTokenizer(other_model_path)})
+        assert None not in (tokenizer_cache_key(aggregate), tokenizer_cache_key(swapped))
+        assert tokenizer_cache_key(aggregate) != tokenizer_cache_key(swapped)
+
+        # the key is the same in another process
+        code = (
+            "import sys\n"
+            "from nemo.collections.common.parts.preprocessing.manifest_index import tokenizer_cache_key\n"
+            "from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer\n"
+            "print(tokenizer_cache_key(SentencePieceTokenizer(sys.argv[1])))"
+        )
+        output = subprocess.run([sys.executable, "-c", code, copied_model_path], capture_output=True, text=True)
+        assert output.stdout.strip().splitlines()[-1] == key
+
+    @pytest.mark.unit
+    def test_tokenizer_cache_key_of_unsupported_state(self):
+        class FunctionTokenizer:
+            def __init__(self):
+                self.encode = lambda text: [len(text)]
+
+        assert tokenizer_cache_key(FunctionTokenizer()) is None
+
+    @pytest.mark.unit
+    def test_tokenizer_cache_key_of_private_state(self):
+        class BytesTokenizer:
+            def __init__(self, tokens):
+                self._token2id = {token: i for i, token in enumerate(tokens)}
+                self._encode = self.encode
+
+            def encode(self, text):
+                return [self._token2id[token] for token in text.encode('utf-8').split()]
+
+        key = tokenizer_cache_key(BytesTokenizer([b"a", b"b"]))
+        assert key is not None
+        assert tokenizer_cache_key(BytesTokenizer([b"a", b"b"])) == key
+        # private vocabularies with bytes tokens are part of the key
+        assert tokenizer_cache_key(BytesTokenizer([b"b", b"a"])) != key
+        assert tokenizer_cache_key(BytesTokenizer([b"a", b"c"])) != key
+
+    @pytest.mark.unit
+    def test_parser_cache_key(self, spm_models):
+        class Wrapper:
+            def __init__(self, tokenizer):
+                self._tokenizer = tokenizer
+
+            def __call__(self, text):
+                return self._tokenizer.text_to_ids(text)
+
+        class UncachedWrapper(Wrapper):
+            cache_key = None
+
+        model_path, other_model_path = spm_models
+        key = get_parser_cache_key(Wrapper(SentencePieceTokenizer(model_path)))
+        assert key is not None and key != get_parser_cache_key(Wrapper(SentencePieceTokenizer(other_model_path)))
+        # a parser without a key is never cached, its state is not described instead
+        assert get_parser_cache_key(UncachedWrapper(SentencePieceTokenizer(model_path))) is None
@@ -0,0 +1,102 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import sentencepiece as spm
+import torch
+
+from nemo.collections.common.tokenizers.aggregate_tokenizer import AggregateTokenizer
+from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer
+
+EN_SENTENCES = ["the quick brown fox jumps over the lazy dog", "pack my box with five dozen liquor jugs"]
+ES_SENTENCES = [
+    "el veloz murcielago hindu comia feliz cardillo y kiwi",
+    "la cigüeña tocaba el saxofon detras del palenque",
+]
+
+
+def _train_spm(tmp_path_factory, name, sentences, vocab_size):
+    model_prefix = str(tmp_path_factory.mktemp(name) / "tokenizer")
+    spm.SentencePieceTrainer.train(
+        sentence_iterator=iter(sentences * 10), model_prefix=model_prefix, vocab_size=vocab_size, model_type="bpe"
+    )
+    return SentencePieceTokenizer(model_prefix + ".model")
+
+
+@pytest.fixture(scope="module")
+def aggregate_tokenizer(tmp_path_factory):
+    return AggregateTokenizer(
+        {
+            "en": _train_spm(tmp_path_factory, "en", EN_SENTENCES, 40),
+            "es": _train_spm(tmp_path_factory, "es", ES_SENTENCES, 56),
+        }
+    )
+
+
+def _legacy_ids_to_tokens(tokenizer, ids):
+    tokens = []
+    for id in ids:
+        for lang, offset in reversed(list(tokenizer.token_id_offset.items())):
+            if id >= offset:
+                tokens.extend(tokenizer.tokenizers_dict[lang].ids_to_tokens([id - offset]))
+                break
+    return tokens
+
+
+class TestAggregateTokenizer:
+    @pytest.mark.unit
+    def test_lookup_arrays(self, aggregate_tokenizer):
+        assert aggregate_tokenizer.offset_token_ids_by_token_id.tolist() == list(range(40)) + list(range(56))
+        assert aggregate_tokenizer.tokenizer_nums_by_token_id.tolist() == [0] * 40 + [1] * 56
+        assert aggregate_tokenizer.langs_by_token_id[39] == "en"
+        assert aggregate_tokenizer.langs_by_token_id[40] == "es"
+        assert aggregate_tokenizer.tokenizers_by_token_id[95] is aggregate_tokenizer.tokenizers_dict["es"]
+
+    @pytest.mark.unit
+    def test_decode_mixed_ids(self, aggregate_tokenizer):
+        en_ids = aggregate_tokenizer.text_to_ids(EN_SENTENCES[0], "en")
+        es_ids = aggregate_tokenizer.text_to_ids(ES_SENTENCES[0], "es")
+        ids = en_ids[:5] + es_ids + en_ids[5:]
+        expected_tokens = _legacy_ids_to_tokens(aggregate_tokenizer, ids)
+        assert aggregate_tokenizer.ids_to_tokens(ids) == expected_tokens
+        expected_text = "".join(expected_tokens).replace("▁", " ")
+        assert aggregate_tokenizer.ids_to_text(ids) == expected_text
+        assert aggregate_tokenizer.ids_to_text(np.array(ids)) == expected_text
+        assert aggregate_tokenizer.ids_to_text(torch.tensor(ids)) == expected_text
+        assert aggregate_tokenizer.ids_to_text(en_ids).strip() == EN_SENTENCES[0]
+        assert aggregate_tokenizer.ids_to_text([]) == ""
+
+        batch = [ids, [], es_ids, en_ids]
+        assert aggregate_tokenizer.batch_ids_to_text(batch) == [aggregate_tokenizer.ids_to_text(x) for x in batch]
+
+    @pytest.mark.unit
+    def test_langs(self, aggregate_tokenizer):
+        en_ids = aggregate_tokenizer.text_to_ids(EN_SENTENCES[1], "en")
+        es_ids = aggregate_tokenizer.text_to_ids(ES_SENTENCES[1], "es")
+        assert aggregate_tokenizer.ids_to_lang(en_ids + es_ids[:1]) == "en"
+        assert aggregate_tokenizer.ids_to_lang(es_ids + en_ids[:1]) == "es"
+        # ties go to the language appearing first
+        assert aggregate_tokenizer.ids_to_lang([es_ids[0], en_ids[0]]) == "es"
+        assert aggregate_tokenizer.ids_to_lang([en_ids[0], es_ids[0]]) == "en"
+        assert aggregate_tokenizer.ids_to_lang([]) == ""
+
+        text_and_langs = aggregate_tokenizer.ids_to_text_and_langs(en_ids + es_ids)
+        assert [x["lang"] for x in text_and_langs] == ["en"] * len(en_ids) + ["es"] * len(es_ids)
+        tokens = _legacy_ids_to_tokens(aggregate_tokenizer, en_ids + es_ids)
+        assert [x["char"] for x in text_and_langs] == [token.replace("▁", " ").strip() for token in tokens]
+
+        words_and_langs = aggregate_tokenizer.ids_to_words_and_langs(en_ids + es_ids)
+        assert [x["word"] for x in words_and_langs] == (EN_SENTENCES[1] + " " + ES_SENTENCES[1]).split()
+        assert [x["lang"] for x in words_and_langs] == ["en"] * 8 + ["es"] * 8
@@ -0,0 +1,152 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import json
+
+import numpy as np
+import pytest
+import sentencepiece as spm
+import torch
+
+from nemo.collections.common.tokenizers import tokenizer_spec
+from nemo.collections.common.tokenizers.aggregate_tokenizer import AggregateTokenizer
+from nemo.collections.common.tokenizers.sentencepiece_tokenizer import SentencePieceTokenizer
+from nemo.collections.common.tokenizers.tiktoken_tokenizer import TiktokenTokenizer
+from nemo.collections.common.tokenizers.tokenizer_spec import TokenizerSpec
+
+SENTENCES = [
+    "the quick brown fox jumps over the lazy dog",
+    "pack my box with five dozen liquor jugs",
+    "how vexingly quick daft zebras jump",
+    "",
+    "sphinx of black quartz judge my vow",
+    "the five boxing wizards jump quickly",
+]
+
+
+@pytest.fixture(scope="module")
+def spm_model(tmp_path_factory):
+    model_prefix = str(tmp_path_factory.mktemp("spm") / "tokenizer")
+    spm.SentencePieceTrainer.train(
+        sentence_iterator=iter(SENTENCES * 10), model_prefix=model_prefix, vocab_size=48, model_type="bpe"
+    )
+    return model_prefix + ".model"
+
+
+class CharTokenizer(TokenizerSpec):
+    def text_to_tokens(self, text):
+        return list(text)
+
+    def tokens_to_text(self, tokens):
+        return "".join(tokens)
+
+    def tokens_to_ids(self, tokens):
+        return [ord(t) for t in tokens]
+
+    def ids_to_tokens(self, ids):
+        return [chr(i) for i in ids]
+
+    def text_to_ids(self, text):
+        return self.tokens_to_ids(self.text_to_tokens(text))
+
+    def ids_to_text(self, ids):
+        return self.tokens_to_text(self.ids_to_tokens(ids))
+
+
+class TestBatchTokenization:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("num_threads", [None, 1, 3])
+    def test_thread_pool_fallback(self, num_threads):
+        tokenizer = CharTokenizer()
+        batch_ids = tokenizer.batch_text_to_ids(SENTENCES, num_threads=num_threads)
+        assert batch_ids == [tokenizer.text_to_ids(text) for text in SENTENCES]
+        assert tokenizer.batch_ids_to_text(batch_ids, num_threads=num_threads) == SENTENCES
+        assert tokenizer.batch_text_to_ids([]) == []
+
+    @pytest.mark.unit
+    def test_serial_by_default(self, monkeypatch):
+        def no_pool(*args, **kwargs):
+            raise AssertionError("a thread pool was started without num_threads")
+
+        monkeypatch.setattr(tokenizer_spec, "ThreadPoolExecutor", no_pool)
+        tokenizer = CharTokenizer()
+        batch_ids = tokenizer.batch_text_to_ids(SENTENCES)
+        assert batch_ids == [tokenizer.text_to_ids(text) for text in SENTENCES]
+        assert tokenizer.batch_ids_to_text(batch_ids) == SENTENCES
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("legacy", [False, True])
+    def test_sentencepiece(self, spm_model, legacy):
+        tokenizer = SentencePieceTokenizer(spm_model, legacy=legacy)
+        batch_ids = tokenizer.batch_text_to_ids(SENTENCES)
+        assert batch_ids == [tokenizer.text_to_ids(text) for text in SENTENCES]
+        expected = [tokenizer.ids_to_text(ids) for ids in batch_ids]
+        assert tokenizer.batch_ids_to_text(batch_ids) == expected
+        assert tokenizer.batch_ids_to_text([np.array(ids) for ids in batch_ids], num_threads=2) == expected
+        assert tokenizer.batch_ids_to_text([torch.tensor(ids, dtype=torch.long) for ids in batch_ids]) == expected
+
+    @pytest.mark.unit
+    def test_aggregate(self, spm_model):
+        tokenizer = AggregateTokenizer(
+            {"en": SentencePieceTokenizer(spm_model), "es": SentencePieceTokenizer(spm_model)}
+        )
+        langs = ["en", "es", "es", "en", "es", "en"]
+        batch_ids = tokenizer.batch_text_to_ids(SENTENCES, langs)
+        assert batch_ids == [tokenizer.text_to_ids(text, lang) for text, lang in zip(SENTENCES, langs)]
+        assert tokenizer.batch_text_to_ids(SENTENCES, "es") == [tokenizer.text_to_ids(t, "es") for t in SENTENCES]
+        assert tokenizer.batch_ids_to_text(batch_ids) == [tokenizer.ids_to_text(ids) for ids in batch_ids]
+
+    @pytest.mark.unit
+    def test_tiktoken(self, tmp_path):
+        merges = [bytes([i]) for i in range(256)] + [b"th", b"he", b"the", b" the", b"qu", b"ck"]
+        vocab = [
+            {"rank": i, "token_bytes": base64.b64encode(token).decode(), "token_str": token.decode("latin-1")}
+            for i, token in enumerate(merges)
+        ]
+        vocab_file = tmp_path / "vocab.json"
+        vocab_file.write_text(json.dumps(vocab))
+        tokenizer = TiktokenTokenizer(str(vocab_file), vocab_size=len(merges) + 16, num_special_tokens=16)
+        batch_ids = tokenizer.batch_text_to_ids(SENTENCES)
+        assert batch_ids == [tokenizer.text_to_ids(text) for text in SENTENCES]
+        assert tokenizer.batch_ids_to_text(batch_ids) == SENTENCES
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("include_special_tokens", [False, True])
+    def test_huggingface_fast(self, tmp_path, include_special_tokens):
+        from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+        from transformers import PreTrainedTokenizerFast
+
+        from nemo.collections.common.tokenizers.huggingface.auto_tokenizer import AutoTokenizer
+
+        backend = Tokenizer(models.BPE(unk_token="<unk>"))
+        backend.pre_tokenizer = pre_tokenizers.ByteLevel()
+        backend.decoder = decoders.ByteLevel()
+        trainer = trainers.BpeTrainer(
+            vocab_size=300,
+            special_tokens=["<unk>", "<s>", "</s>"],
+            initial_alphabet=pre_tokenizers.ByteLevel.alphabet(),
+        )
+        backend.train_from_iterator(SENTENCES * 10, trainer)
+        PreTrainedTokenizerFast(tokenizer_object=backend, bos_token="<s>", eos_token="</s>").save_pretrained(tmp_path)
+
+        tokenizer = AutoTokenizer(str(tmp_path), include_special_tokens=include_special_tokens)
+        assert tokenizer.tokenizer.is_fast
+        batch_ids = tokenizer.batch_text_to_ids(SENTENCES)
+        assert batch_ids == [tokenizer.text_to_ids(text) for text in SENTENCES]
+        batch_ids = [ids + [tokenizer.eos_id] for ids in batch_ids]
+        for remove_special_tokens in [True, False]:
+            assert tokenizer.batch_ids_to_text(batch_ids, remove_special_tokens=remove_special_tokens) == [
+                tokenizer.ids_to_text(ids, remove_special_tokens=remove_special_tokens) for ids in batch_ids
+            ]
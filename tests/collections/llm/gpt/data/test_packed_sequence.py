@@ -22,6 +22,12 @@ from nemo.collections.llm.gpt.data.packed_sequence import (
     prepare_packed_sequence_data,
     tokenize_dataset,
 )
+from nemo.utils.sequence_packing_utils import (
+    PackedSequenceData,
+    create_hist,
+    create_packing_strategy,
+    fill_packing_strategy,
+)
 
 
 class MockTokenizer:
@@ -80,6 +86,47 @@ def test_prepare_packed_sequence_data(mock_tokenizer, sample_data_file):
         assert metadata_path.exists()
 
 
+@pytest.mark.parametrize("num_workers", [None, 2])
+@pytest.mark.parametrize("suffix", [".npy", ""])
+def test_prepare_packed_sequence_data_matches_in_memory_packing(mock_tokenizer, num_workers, suffix):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_path = Path(tmpdir) / "data.jsonl"
+        with open(input_path, "w") as f:
+            for i in range(50):
+                f.write('{"input": "%s", "output": "%s"}\n' % ("abc" * (i % 7), "xy" * (i % 5)))
+
+        np.random.seed(0)
+        dataset = tokenize_dataset(path=input_path, tokenizer=mock_tokenizer, max_seq_length=32, seed=42)
+        sequences, histogram = create_hist(dataset, 32)
+        assignments, _ = create_packing_strategy(histogram, 64, "first_fit_shuffle")
+        expected = fill_packing_strategy(assignments, sequences, 64, mock_tokenizer.eos_id)
+
+        output_path = Path(tmpdir) / f"packed{suffix}"
+        np.random.seed(0)
+        stats = prepare_packed_sequence_data(
+            input_path=input_path,
+            output_path=output_path,
+            output_metadata_path=None,
+            packed_sequence_size=64,
+            tokenizer=mock_tokenizer,
+            max_seq_length=32,
+            seed=42,
+            num_workers=num_workers,
+            shard_size=8,
+        )
+        assert stats['num_samples'] == 50
+        assert stats['num_packs'] == len(expected)
+
+        packed = np.load(output_path, allow_pickle=True) if suffix else PackedSequenceData(output_path)
+        assert len(packed) == len(expected)
+        for pack, expected_pack in zip(packed, expected):
+            assert list(pack['input_ids']) == expected_pack['input_ids']
+            assert list(pack['loss_mask']) == expected_pack['loss_mask']
+            assert pack['seq_start_id'] == expected_pack['seq_start_id']
+        # the tokenized shards are removed
+        assert not any(p.name.startswith(f".{output_path.name}") for p in Path(tmpdir).iterdir())
+
+
 def test_packed_sequence_specs():
     # Test initialization with default values
     specs = PackedSequenceSpecs()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import json
+import pickle
 from unittest.mock import MagicMock
 
 import numpy as np
@@ -22,6 +23,7 @@ from nemo.collections.llm.gpt.data.utils import (
     IGNORE_INDEX,
     _add_speaker_and_signal,
     _build_memmap_index_files,
+    _EpochPermutationSampleMapping,
     _get_header_conversation_type_mask_role,
     _JSONLMemMapDataset,
     _mask_targets,
@@ -274,5 +276,51 @@ def test_online_sample_mapping_cache():
     np.testing.assert_array_equal(mapping.get_sample_block(2), block3)
 
 
+@pytest.mark.parametrize("dataset_size", [1, 2, 7, 100, 1000])
+def test_epoch_permutation_sample_mapping_is_permutation_per_epoch(dataset_size):
+    mapping = _EpochPermutationSampleMapping(dataset_size=dataset_size, num_samples=3 * dataset_size + 1, seed=42)
+    assert len(mapping) == 3 * dataset_size + 1
+    epochs = []
+    for epoch in range(3):
+        indices = [mapping[epoch * dataset_size + i][0] for i in range(dataset_size)]
+        assert sorted(indices) == list(range(dataset_size))
+        epochs.append(indices)
+    if dataset_size >= 100:
+        # every epoch is shuffled differently
+        assert epochs[0] != epochs[1] != epochs[2]
+        assert epochs[0] != list(range(dataset_size))
+
+
+def test_epoch_permutation_sample_mapping_is_deterministic():
+    mapping = _EpochPermutationSampleMapping(dataset_size=1000, num_samples=5000, seed=42)
+    same_seed = _EpochPermutationSampleMapping(dataset_size=1000, num_samples=5000, seed=42)
+    other_seed = _EpochPermutationSampleMapping(dataset_size=1000, num_samples=5000, seed=43)
+    indices = [mapping[i][0] for i in range(5000)]
+    assert indices == [same_seed[i][0] for i in range(5000)]
+    assert indices != [other_seed[i][0] for i in range(5000)]
+
+    # resuming at any sample, in another process or with vectorized lookups, gives the same schedule
+    restored = pickle.loads(pickle.dumps(mapping))
+    assert [restored[i][0] for i in range(2500, 5000)] == indices[2500:]
+    assert mapping.get_sample_indices(np.arange(1234, 4321)).tolist() == indices[1234:4321]
+    assert [i for i, _, _ in mapping[10:3000:7]] == indices[10:3000:7]
+    assert mapping[-1][0] == indices[-1]
+    with pytest.raises(IndexError):
+        mapping[5000]
+
+
+def test_epoch_permutation_sample_mapping_without_shuffle():
+    mapping = _EpochPermutationSampleMapping(dataset_size=10, num_samples=25, shuffle=False)
+    assert [i for i, _, _ in mapping[:]] == list(range(10)) * 2 + list(range(5))
+
+
+def test_epoch_permutation_sample_mapping_large_schedule():
+    mapping = _EpochPermutationSampleMapping(dataset_size=10**9, num_samples=10**12, seed=1)
+    indices = mapping.get_sample_indices(np.arange(10**5) + 5 * 10**9)
+    assert len(np.unique(indices)) == 10**5
+    assert indices.min() >= 0 and indices.max() < 10**9
+    assert mapping[5 * 10**9][0] == indices[0]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,141 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pickle
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+
+from nemo.collections.nlp.data.language_modeling.megatron import blendable_dataset
+from nemo.collections.nlp.data.language_modeling.megatron.blendable_dataset import (
+    BlendableDataset,
+    _fill_blending_indices_range,
+)
+
+WEIGHTS = [0.5, 0.3, 0.2]
+SIZE = 1000
+
+
+def build_blending_indices(dataset_index, dataset_sample_index, weights, num_datasets, size, verbose):
+    """Python version of the build_blending_indices C++ helper."""
+    current_samples = np.zeros(num_datasets, dtype=np.int64)
+    for sample_idx in range(size):
+        errors = weights * max(sample_idx, 1.0) - current_samples
+        max_error_index = int(np.argmax(errors))
+        dataset_index[sample_idx] = max_error_index
+        dataset_sample_index[sample_idx] = current_samples[max_error_index]
+        current_samples[max_error_index] += 1
+
+
+@pytest.fixture
+def helpers(monkeypatch):
+    helpers = SimpleNamespace(build_blending_indices=build_blending_indices, num_imports=0)
+
+    def import_helpers(compile_on_local_rank_zero=True):
+        helpers.num_imports += 1
+        return helpers
+
+    monkeypatch.setattr(blendable_dataset, "_import_helpers", import_helpers)
+    monkeypatch.setattr(torch.distributed, "get_rank", lambda *args, **kwargs: 0)
+    monkeypatch.setattr(torch.distributed, "barrier", lambda *args, **kwargs: None)
+    return helpers
+
+
+@pytest.fixture
+def datasets():
+    return [[f"dataset {d} sample {k}" for k in range(400)] for d in range(len(WEIGHTS))]
+
+
+class TestBlendableDataset:
+    @pytest.mark.unit
+    def test_build_indices(self, helpers, datasets):
+        dataset = BlendableDataset(datasets, WEIGHTS, SIZE)
+        counts = np.bincount(dataset.dataset_index, minlength=len(WEIGHTS))
+        assert np.abs(counts - np.array(WEIGHTS) * SIZE).max() <= 1
+        for d in range(len(WEIGHTS)):
+            assert dataset.dataset_sample_index[dataset.dataset_index == d].tolist() == list(range(counts[d]))
+        assert dataset[0] == datasets[dataset.dataset_index[0]][0]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("build_block_size", [64, 100, SIZE])
+    def test_parallel_block_fill_matches_sequential(self, tmp_path, helpers, datasets, build_block_size):
+        sequential = BlendableDataset(datasets, WEIGHTS, SIZE, build_block_size=build_block_size)
+        parallel = BlendableDataset(
+            datasets, WEIGHTS, SIZE, index_cache_dir=str(tmp_path), build_block_size=build_block_size, build_workers=3
+        )
+        assert isinstance(parallel.dataset_index, np.memmap)
+        assert np.array_equal(parallel.dataset_index, sequential.dataset_index)
+        assert np.array_equal(parallel.dataset_sample_index, sequential.dataset_sample_index)
+
+        # every dataset consumes consecutive samples, and deviates from its weight by at most one sample per block
+        num_blocks = -(-SIZE // build_block_size)
+        counts = np.bincount(parallel.dataset_index, minlength=len(WEIGHTS))
+        assert np.abs(counts - np.array(WEIGHTS) * SIZE).max() <= num_blocks
+        for d in range(len(WEIGHTS)):
+            assert parallel.dataset_sample_index[parallel.dataset_index == d].tolist() == list(range(counts[d]))
+
+    @pytest.mark.unit
+    def test_fill_blending_indices_range(self, helpers):
+        block = BlendableDataset._build_block(helpers, np.array(WEIGHTS), 64, verbose=False)
+        dataset_index, dataset_sample_index = np.zeros(SIZE, dtype=np.uint8), np.zeros(SIZE, dtype=np.int64)
+        _fill_blending_indices_range(dataset_index, dataset_sample_index, *block, 0, SIZE)
+
+        # ranges that do not start or end on a block boundary
+        range_index, range_sample_index = np.zeros(SIZE, dtype=np.uint8), np.zeros(SIZE, dtype=np.int64)
+        bounds = [0, 10, 64, 65, 300, 301, 999, SIZE]
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            _fill_blending_indices_range(range_index, range_sample_index, *block, start, end)
+        assert np.array_equal(range_index, dataset_index)
+        assert np.array_equal(range_sample_index, dataset_sample_index)
+
+    @pytest.mark.unit
+    def test_cached_indices_are_reused(self, tmp_path, helpers, datasets):
+        dataset = BlendableDataset(datasets, WEIGHTS, SIZE, index_cache_dir=str(tmp_path), build_block_size=64)
+        assert helpers.num_imports == 1
+        cache_files = dataset._index_cache_files()
+        assert all(os.path.isfile(fn) for fn in cache_files)
+        assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(fn) for fn in cache_files)
+
+        # the same blend with unnormalized weights loads the cached files without building the indices again
+        cached = BlendableDataset(
+            datasets, [2 * w for w in WEIGHTS], SIZE, index_cache_dir=str(tmp_path), build_block_size=64
+        )
+        assert helpers.num_imports == 1
+        assert cached._index_cache_files() == cache_files
+        assert np.array_equal(cached.dataset_index, dataset.dataset_index)
+        assert np.array_equal(cached.dataset_sample_index, dataset.dataset_sample_index)
+
+        # a different blend is built in other files
+        other = BlendableDataset(datasets, WEIGHTS, SIZE, index_cache_dir=str(tmp_path), build_block_size=100)
+        assert helpers.num_imports == 2
+        assert other._index_cache_files() != cache_files
+
+    @pytest.mark.unit
+    def test_pickle_reopens_cached_indices(self, tmp_path, helpers, datasets):
+        dataset = BlendableDataset(datasets, WEIGHTS, SIZE, index_cache_dir=str(tmp_path))
+        # the indices are not serialized
+        assert "dataset_index" not in dataset.__getstate__()
+        assert "dataset_sample_index" not in dataset.__getstate__()
+        state = pickle.dumps(dataset)
+
+        unpickled = pickle.loads(state)
+        assert helpers.num_imports == 1
+        assert isinstance(unpickled.dataset_index, np.memmap)
+        assert isinstance(unpickled.dataset_sample_index, np.memmap)
+        assert np.array_equal(unpickled.dataset_index, dataset.dataset_index)
+        assert np.array_equal(unpickled.dataset_sample_index, dataset.dataset_sample_index)
+        assert [unpickled[i] for i in range(SIZE)] == [dataset[i] for i in range(SIZE)]
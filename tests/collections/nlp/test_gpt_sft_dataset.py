@@ -0,0 +1,91 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import numpy as np
+import pytest
+
+from nemo.collections.nlp.data.language_modeling.megatron.gpt_sft_dataset import GPTSFTDataset
+from nemo.collections.nlp.data.language_modeling.text_memmap_dataset import OnlineSampleMapping
+
+NUM_EXAMPLES = 25
+
+
+class CharTokenizer:
+    bos_id = 1
+    eos_id = 2
+
+    def text_to_ids(self, text):
+        return [ord(c) for c in text]
+
+
+@pytest.fixture
+def sft_file(tmp_path):
+    path = tmp_path / "sft.jsonl"
+    with open(path, "w") as f:
+        for k in range(NUM_EXAMPLES):
+            f.write(json.dumps({"input": f"question {k}", "output": f"answer {k}" * (k % 3 + 1), "id": k}) + "\n")
+    return str(path)
+
+
+def make_dataset(sft_file, samples_mapping):
+    dataset = GPTSFTDataset(
+        sft_file,
+        CharTokenizer(),
+        max_seq_length=64,
+        add_bos=True,
+        label_key="output",
+        truncation_field="input",
+        prompt_template="Q: {input} A: {output}",
+        memmap_workers=1,
+    )
+    if samples_mapping == "online":
+        dataset.max_num_samples = 2 * NUM_EXAMPLES + 3
+        dataset.samples_mapping = OnlineSampleMapping(NUM_EXAMPLES, dataset.max_num_samples, block_size=7, seed=5)
+    elif samples_mapping == "precomputed":
+        # same layout as the samples mapping built by the megatron helpers: (sample index, start, end)
+        dataset.max_num_samples = 2 * NUM_EXAMPLES
+        rng = np.random.RandomState(0)
+        dataset.samples_mapping = np.zeros((dataset.max_num_samples, 3), dtype=np.uint32)
+        dataset.samples_mapping[:, 0] = rng.randint(0, NUM_EXAMPLES, size=dataset.max_num_samples)
+    return dataset
+
+
+class TestGPTSFTDatasetGetItems:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("samples_mapping", [None, "online", "precomputed"])
+    def test_getitems_matches_getitem(self, sft_file, samples_mapping):
+        dataset = make_dataset(sft_file, samples_mapping)
+        rng = np.random.RandomState(1)
+        batches = [list(range(len(dataset))), rng.randint(0, len(dataset), size=16), [3, 3, 0, len(dataset) - 1]]
+        for idx in batches:
+            assert dataset.__getitems__(idx) == [dataset[i] for i in idx]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("samples_mapping", [None, "online", "precomputed"])
+    def test_getitems_padded_indices(self, sft_file, samples_mapping):
+        # batches are padded to the global batch size with negative indices
+        dataset = make_dataset(sft_file, samples_mapping)
+        idx = [4, 0, -1, -2]
+        examples = dataset.__getitems__(idx)
+        assert examples == [dataset[i] for i in idx]
+        autogenerated = [example["metadata"].get("__AUTOGENERATED__", False) for example in examples]
+        assert autogenerated == [False, False, samples_mapping is None, samples_mapping is None]
+
+    @pytest.mark.unit
+    def test_getitems_out_of_range(self, sft_file):
+        dataset = make_dataset(sft_file, "online")
+        with pytest.raises(AssertionError):
+            dataset.__getitems__([0, len(dataset)])
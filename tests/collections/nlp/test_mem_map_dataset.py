@@ -0,0 +1,263 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from nemo.collections.nlp.data.language_modeling import text_memmap_dataset
+from nemo.collections.nlp.data.language_modeling.text_memmap_dataset import (
+    CSVMemMapDataset,
+    JSONLMemMapDataset,
+    OnlineSampleMapping,
+    TextMemMapDataset,
+    _build_index_from_memdata,
+    _plan_index_from_memdata,
+    build_index_files,
+)
+
+INDEX_CONTENTS = [
+    "a\nbb\nccc\n",
+    "a\nbb\nccc",  # no final newline
+    "a\nbb\n\n\n",  # trailing empty lines
+    "\n\na\n\nbb\n",  # leading and inner empty lines
+    "single line",
+    "\n",
+]
+
+# (indexed content, appended content)
+APPEND_CONTENTS = [
+    ("a\nbb\n", "ccc\ndd\n"),
+    ("a\nbb", "b\ncc\n"),  # the last line of the indexed data continues
+    ("a\nbb", "\n\n"),
+    ("a\nbb\n\n\n", "cc\n"),  # empty lines dropped from the indexed data are not empty anymore
+    ("a\n", "\n\n"),
+]
+
+
+def reference_index(fn, newline_int=10):
+    """Newline positions as computed by the original, single-pass index builder."""
+    mdata = np.fromfile(fn, dtype=np.uint8)
+    midx = np.where(mdata == newline_int)[0].tolist()
+    if len(midx) == 0 or midx[-1] + 1 != len(mdata):
+        midx.append(len(mdata) + 1)
+    else:
+        while len(midx) > 1 and midx[-1] - midx[-2] < 2:
+            midx.pop(-1)
+    return np.asarray(midx, dtype=np.int64)
+
+
+def build_fixed_index(fn, newline_int):
+    return np.array([1, 4, 7])
+
+
+def random_text(rng, num_lines):
+    return "".join("x" * rng.randint(0, 20) + "\n" for _ in range(num_lines))
+
+
+def write_text(path, text, mode="w"):
+    with open(path, mode) as f:
+        f.write(text)
+    return str(path)
+
+
+def load_index(fn, index_mapping_dir):
+    idx_fn = text_memmap_dataset._index_fn(fn, index_mapping_dir)
+    with open(idx_fn + ".info", "rb") as fp:
+        info = pickle.load(fp)
+    return np.load(idx_fn + ".npy"), info
+
+
+class TestBuildIndexFiles:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64])
+    def test_build_index_from_memdata(self, tmp_path, chunk_size):
+        for i, text in enumerate(INDEX_CONTENTS):
+            fn = write_text(tmp_path / f"{i}.txt", text)
+            midx = _build_index_from_memdata(fn, 10, chunk_size=chunk_size)
+            assert midx.tolist() == reference_index(fn).tolist()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_parallel_build_matches_single_pass(self, tmp_path, workers):
+        rng = random.Random(0)
+        texts = INDEX_CONTENTS + [random_text(rng, 200), random_text(rng, 300) + "\n\n", random_text(rng, 10)[:-1]]
+        files = [write_text(tmp_path / f"{i}.txt", text) for i, text in enumerate(texts)]
+
+        build_index_files(files, 10, workers=workers, index_mapping_dir=str(tmp_path / "idx"), chunk_size=7)
+        for fn in files:
+            midx, info = load_index(fn, str(tmp_path / "idx"))
+            assert midx.dtype == np.int64
+            assert midx.tolist() == _build_index_from_memdata(fn, 10).tolist()
+            assert midx.tolist() == reference_index(fn).tolist()
+            assert info["file_size"] == len(open(fn, "rb").read())
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("text, appended", APPEND_CONTENTS)
+    def test_extend_index_after_append(self, tmp_path, text, appended):
+        fn = write_text(tmp_path / "data.txt", text)
+        build_index_files([fn], 10, workers=2, chunk_size=2)
+        write_text(fn, appended, mode="a")
+
+        # only the appended data (and the trailing empty lines of the indexed data) are scanned
+        plan = _plan_index_from_memdata(10, fn, None, chunk_size=2)
+        assert len(plan["prefix"]) > 0
+        assert plan["tasks"][0][2] == plan["prefix"][-1] + 1
+
+        build_index_files([fn], 10, workers=2, chunk_size=2)
+        midx, info = load_index(fn, None)
+        assert midx.tolist() == reference_index(fn).tolist()
+        assert info["file_size"] == len(text) + len(appended)
+        assert _plan_index_from_memdata(10, fn, None) is None
+
+        dataset = TextMemMapDataset([fn], workers=1)
+        assert [dataset[i] for i in range(len(dataset))] == (text + appended).rstrip("\n").split("\n")
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("modified", ["a\nXX\nccc\ndd\n", "a\nb\n", "a\nbb\ncXc", "a\nbb\ncc\n"])
+    def test_rebuild_index_after_modification(self, tmp_path, modified):
+        fn = write_text(tmp_path / "data.txt", "a\nbb\nccc")
+        build_index_files([fn], 10, workers=1)
+        write_text(fn, modified)
+
+        plan = _plan_index_from_memdata(10, fn, None, chunk_size=4)
+        assert len(plan["prefix"]) == 0 and plan["tasks"][0][2] == 0
+
+        build_index_files([fn], 10, workers=2, chunk_size=4)
+        midx, info = load_index(fn, None)
+        assert midx.tolist() == reference_index(fn).tolist()
+        assert info["file_size"] == len(modified)
+
+    @pytest.mark.unit
+    def test_index_without_file_size_is_reused(self, tmp_path):
+        fn = write_text(tmp_path / "data.txt", "a\nbb\n")
+        build_index_files([fn], 10, workers=1, build_index_fn=build_fixed_index)
+        write_text(fn, "ccc\n", mode="a")
+
+        build_index_files([fn], 10, workers=1)
+        midx, info = load_index(fn, None)
+        assert midx.tolist() == [1, 4, 7]
+        assert "file_size" not in info
+
+
+class CharTokenizer:
+    def text_to_ids(self, text):
+        return [ord(c) for c in text]
+
+
+class BatchCharTokenizer(CharTokenizer):
+    def batch_text_to_ids(self, texts, num_threads=None):
+        # dataloader workers already run in parallel, datasets should not start more threads
+        assert num_threads == 1
+        return [self.text_to_ids(text) for text in texts]
+
+
+class RecordingMemmap:
+    """Wraps the memmap of a data file to record the slices read from it."""
+
+    def __init__(self, mdata):
+        self.mdata = mdata
+        self._mmap = mdata._mmap
+        self.slices = []
+
+    def __getitem__(self, key):
+        self.slices.append(key)
+        return self.mdata[key]
+
+
+@pytest.fixture
+def text_files(tmp_path):
+    rng = random.Random(0)
+    files = []
+    for i, num_lines in enumerate([5, 1, 30, 12]):
+        lines = ["header"] + [f"file {i} line {k} " + "x" * rng.randint(0, 50) for k in range(num_lines)]
+        files.append(write_text(tmp_path / f"{i}.txt", "\n".join(lines) + "\n" * rng.randint(0, 2)))
+    return files
+
+
+class TestTextMemMapDatasetGetItems:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("tokenizer", [None, CharTokenizer(), BatchCharTokenizer()])
+    def test_getitems_matches_getitem(self, text_files, tokenizer):
+        dataset = TextMemMapDataset(text_files, header_lines=1, workers=1, tokenizer=tokenizer)
+        assert len(dataset) == 5 + 1 + 30 + 12
+
+        rng = random.Random(1)
+        batches = [
+            list(range(len(dataset))),
+            [47, 0, 6, 5, 5, 18, 3],
+            [rng.randrange(len(dataset)) for _ in range(64)],
+        ]
+        batches.append(np.array(batches[-1]))
+        for idx in batches:
+            assert dataset.__getitems__(idx) == [dataset[i] for i in idx]
+        assert dataset.__getitems__([]) == []
+
+    @pytest.mark.unit
+    def test_getitems_out_of_range(self, text_files):
+        dataset = TextMemMapDataset(text_files, header_lines=1, workers=1)
+        for idx in [[0, -1], [len(dataset)]]:
+            with pytest.raises(IndexError):
+                dataset.__getitems__(idx)
+            with pytest.raises(IndexError):
+                [dataset[i] for i in idx]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("max_read_gap, expected_reads", [(4096, 2), (1, 3), (0, 5)])
+    def test_getitems_coalesces_reads(self, text_files, monkeypatch, max_read_gap, expected_reads):
+        monkeypatch.setattr(text_memmap_dataset, "_MAX_READ_GAP", max_read_gap)
+        dataset = TextMemMapDataset(text_files, header_lines=1, workers=1)
+        dataset.mdata_midx_list = [(RecordingMemmap(mdata), midx) for mdata, midx in dataset.mdata_midx_list]
+
+        # lines 2, 3 and 4 of the third file are only separated by a newline, line 6 is one line further
+        idx = [6 + 4, 6 + 2, 4, 6 + 3, 6 + 6]
+        samples = dataset.__getitems__(idx)
+        assert sum(len(mdata.slices) for mdata, _ in dataset.mdata_midx_list) == expected_reads
+        assert samples == [dataset[i] for i in idx]
+
+    @pytest.mark.unit
+    def test_getitems_child_classes(self, tmp_path):
+        records = [{"text": f"line {k}", "label": k} for k in range(20)]
+        jsonl_fn = write_text(tmp_path / "data.jsonl", "\n".join(json.dumps(r) for r in records) + "\n")
+        dataset = JSONLMemMapDataset([jsonl_fn], workers=1)
+        assert dataset.__getitems__([3, 4, 19, 0, 3]) == [records[i] for i in [3, 4, 19, 0, 3]]
+
+        csv_fn = write_text(tmp_path / "data.csv", "id,text\n" + "".join(f"{k},row {k}\n" for k in range(20)))
+        dataset = CSVMemMapDataset([csv_fn], header_lines=1, workers=1, tokenizer=BatchCharTokenizer())
+        idx = [7, 8, 0, 19]
+        assert (
+            dataset.__getitems__(idx)
+            == [dataset[i] for i in idx]
+            == [CharTokenizer().text_to_ids(f"row {i}") for i in idx]
+        )
+
+
+class TestOnlineSampleMapping:
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "dataset_size, num_samples, block_size, shuffle",
+        [(100, 50, 10, True), (100, 250, 30, True), (100, 150, 20, False), (7, 100, None, True)],
+    )
+    def test_get_sample_indices_matches_getitem(self, dataset_size, num_samples, block_size, shuffle):
+        mapping = OnlineSampleMapping(dataset_size, num_samples, block_size=block_size, shuffle=shuffle, seed=3)
+        idx = np.concatenate([np.arange(num_samples), -np.arange(1, num_samples + 1)])
+        assert mapping.get_sample_indices(idx).tolist() == [mapping[i][0] for i in idx.tolist()]
+        assert [sample[0] for sample in mapping[5:40:3]] == [mapping[i][0] for i in range(5, 40, 3)]
+        with pytest.raises(IndexError):
+            mapping.get_sample_indices([num_samples])
+        with pytest.raises(IndexError):
+            mapping.get_sample_indices([-num_samples - 1])
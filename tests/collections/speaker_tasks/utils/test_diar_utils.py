@@ -22,6 +22,7 @@ from nemo.collections.asr.data.audio_to_label import repeat_signal
 from nemo.collections.asr.parts.utils.longform_clustering import LongFormSpeakerClustering
 from nemo.collections.asr.parts.utils.offline_clustering import (
     SpeakerClustering,
+    get_argmin_mat,
     get_scale_interpolated_embs,
     getCosAffinityMatrix,
     getKneighborsConnections,
@@ -38,6 +39,12 @@ from nemo.collections.asr.parts.utils.online_clustering import (
 )
 from nemo.collections.asr.parts.utils.optimization_utils import LinearSumAssignmentSolver
 from nemo.collections.asr.parts.utils.optimization_utils import linear_sum_assignment as nemo_linear_sum_assignment
+from nemo.collections.asr.parts.utils.sparse_clustering import (
+    SparseSpeakerClustering,
+    getNearestScaleMapping,
+    getSparseAffinityGraph,
+    sparseEigDecompose,
+)
 from nemo.collections.asr.parts.utils.speaker_utils import (
     OnlineSegmentor,
     check_ranges,
@@ -52,8 +59,10 @@ from nemo.collections.asr.parts.utils.speaker_utils import (
     get_target_sig,
     int2fl,
     is_overlap,
+    load_embeddings_store,
     merge_float_intervals,
     merge_int_intervals,
+    save_embeddings_store,
     tensor_to_list,
 )
 
@@ -484,6 +493,35 @@ class TestGetSubsegments:
         assert result == [[0.0, 0.25]]
 
 
+class TestEmbeddingsStore:
+    @pytest.mark.unit
+    def test_save_and_load_embeddings_store(self, tmp_path):
+        embeddings = {
+            'rec2': torch.randn(5, 8),
+            'rec1': torch.randn(1, 8).half(),
+            'rec3': torch.randn(12, 8),
+        }
+        file_prefix = os.path.join(tmp_path, 'subsegments_scale0_embeddings')
+        store_path = save_embeddings_store(embeddings, file_prefix)
+        assert store_path == file_prefix + '.npy'
+
+        loaded = load_embeddings_store(file_prefix)
+        assert list(loaded.keys()) == list(embeddings.keys())
+        for uniq_id, emb in embeddings.items():
+            assert loaded[uniq_id].dtype == torch.float32
+            assert torch.equal(loaded[uniq_id], emb.float())
+
+        # the embeddings are copy-on-write views on the memory-mapped store
+        loaded['rec2'] += 1.0
+        assert torch.equal(load_embeddings_store(file_prefix)['rec2'], embeddings['rec2'])
+
+    @pytest.mark.unit
+    def test_empty_embeddings_store(self, tmp_path):
+        file_prefix = os.path.join(tmp_path, 'empty')
+        save_embeddings_store({}, file_prefix)
+        assert load_embeddings_store(file_prefix) == {}
+
+
 class TestDiarizationSegmentationUtils:
     """
     Test segmentation util functions
@@ -1045,6 +1083,85 @@ class TestSpeakerClustering:
         self.test_online_speaker_clustering(n_spks, total_sec, buffer_size, sigma, seed, jit_script, cuda)
 
 
+class TestSparseSpeakerClustering:
+    """
+    Test speaker clustering on sparse k-nearest-neighbor affinity graphs
+    """
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_spks, shuffle", [(2, False), (3, True)])
+    def test_nearest_scale_mapping(self, n_spks, shuffle):
+        em, ts, mc, mw, spk_ts, gt = generate_toy_data(n_spks=n_spks, spk_dur=5, torch_seed=0)
+        _, timestamps_in_scales = split_input_data(em, ts, mc)
+        if shuffle:
+            timestamps_in_scales = [stamps[torch.randperm(stamps.shape[0])] for stamps in timestamps_in_scales]
+        for target, mapping in zip(get_argmin_mat(timestamps_in_scales), getNearestScaleMapping(timestamps_in_scales)):
+            assert torch.equal(target, mapping)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_components", [1, 3, 12])
+    def test_sparse_eig_decompose(self, n_components, n_segments=60, n_neighbors=4, num_eigs=9):
+        torch.manual_seed(0)
+        # connect each segment to random neighbors within its component
+        component = torch.arange(n_segments) % n_components
+        members = [torch.nonzero(component == c).squeeze(1) for c in range(n_components)]
+        knn_indices = torch.stack(
+            [members[c][torch.randperm(members[c].shape[0])][:n_neighbors] for c in component.tolist()]
+        )
+        knn_indices = torch.where(
+            knn_indices == torch.arange(n_segments).unsqueeze(1), knn_indices.roll(1, 1), knn_indices
+        )
+        affinity_mat = getSparseAffinityGraph(knn_indices, n_neighbors)
+        lambdas, diffusion_map = sparseEigDecompose(affinity_mat, num_eigs=num_eigs)
+
+        dense_affinity = torch.from_numpy(affinity_mat.toarray())
+        inv_sqrt_degree = torch.diag(dense_affinity.sum(dim=1).rsqrt())
+        laplacian = torch.eye(n_segments, dtype=torch.float64) - inv_sqrt_degree @ dense_affinity @ inv_sqrt_degree
+        target_lambdas = torch.linalg.eigvalsh(laplacian)[:num_eigs].float()
+        assert torch.allclose(lambdas, target_lambdas, atol=1e-4)
+        assert (lambdas[: min(n_components, num_eigs)].abs() < 1e-5).all()
+        residual = laplacian.float() @ diffusion_map - diffusion_map * lambdas
+        assert torch.allclose(residual, torch.zeros_like(residual), atol=1e-4)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("n_spks", [1, 2, 3, 4, 5, 6, 7])
+    @pytest.mark.parametrize("total_sec, SSV, seed", [(30, 10, 0)])
+    def test_sparse_speaker_clustering(self, n_spks, total_sec, SSV, seed):
+        spk_dur = total_sec / n_spks
+        em, ts, mc, mw, spk_ts, gt = generate_toy_data(n_spks=n_spks, spk_dur=spk_dur, torch_seed=seed)
+        sparse_speaker_clustering = SparseSpeakerClustering(max_neighbors=32, max_block_numel=1000)
+        Y_out = sparse_speaker_clustering.forward_infer(
+            embeddings_in_scales=em,
+            timestamps_in_scales=ts,
+            multiscale_segment_counts=mc,
+            multiscale_weights=mw,
+            oracle_num_speakers=-1,
+            max_num_speakers=8,
+            enhanced_count_thres=40,
+            sparse_search_volume=SSV,
+            max_rp_threshold=0.15,
+            fixed_thres=-1.0,
+        )
+        permuted_Y = stitch_cluster_labels(Y_old=gt, Y_new=Y_out)
+        # mc[-1] is the number of base scale segments
+        assert len(set(permuted_Y.tolist())) == n_spks
+        assert Y_out.shape[0] == mc[-1]
+        assert all(permuted_Y == gt)
+
+    @pytest.mark.unit
+    def test_sparse_speaker_clustering_long_form(self, n_spks=3, spk_dur=200):
+        em, ts, mc, mw, spk_ts, gt = generate_toy_data(n_spks=n_spks, spk_dur=spk_dur, torch_seed=0)
+        Y_out = SparseSpeakerClustering().forward_infer(
+            embeddings_in_scales=em,
+            timestamps_in_scales=ts,
+            multiscale_segment_counts=mc,
+            multiscale_weights=mw,
+            max_num_speakers=8,
+        )
+        permuted_Y = stitch_cluster_labels(Y_old=gt, Y_new=Y_out)
+        assert all(permuted_Y == gt)
+
+
 class TestLinearSumAssignmentAlgorithm:
     @pytest.mark.unit
     def test_lsa_solver_export_test(self):
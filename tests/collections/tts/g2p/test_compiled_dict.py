@@ -0,0 +1,75 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+
+import pytest
+
+from nemo.collections.tts.g2p.compiled_dict import CompiledPhonemeDict
+
+PHONEME_DICT = {
+    "HELLO": [list("həˈɫoʊ")],
+    "LEAD": [list("ˈlɛd"), list("ˈlid")],
+    "Jones": [list("ˈdʒoʊnz")],
+    "façade": [list("fəˈsɑd")],
+    "EMPTY": [],
+}
+
+
+class TestCompiledPhonemeDict:
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_build_save_load(self, tmp_path):
+        path = tmp_path / "dict.g2pdict"
+        CompiledPhonemeDict.build(PHONEME_DICT, info={"source": "test"}).save(path)
+        assert CompiledPhonemeDict.read_info(path) == {"source": "test"}
+
+        compiled_dict = CompiledPhonemeDict.load(path)
+        assert len(compiled_dict) == len(PHONEME_DICT)
+        assert list(compiled_dict) == list(PHONEME_DICT)
+        assert dict(compiled_dict.items()) == PHONEME_DICT
+        assert "JONES" not in compiled_dict and "HELL" not in compiled_dict
+        with pytest.raises(KeyError):
+            compiled_dict["JONES"]
+        assert compiled_dict.get("JONES") is None
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_modify(self, tmp_path):
+        path = tmp_path / "dict.g2pdict"
+        CompiledPhonemeDict.build(PHONEME_DICT).save(path)
+        compiled_dict = CompiledPhonemeDict.load(path)
+
+        compiled_dict["LEAD"] = [list("ˈlɛd")]
+        compiled_dict["WORLD"] = [list("ˈwɝɫd")]
+        del compiled_dict["Jones"]
+        with pytest.raises(KeyError):
+            del compiled_dict["Jones"]
+        compiled_dict.update({"Jones": [list("ˈdʒoʊnz")]})
+
+        expected = {**PHONEME_DICT, "LEAD": [list("ˈlɛd")], "WORLD": [list("ˈwɝɫd")]}
+        assert len(compiled_dict) == len(expected)
+        assert dict(compiled_dict.items()) == expected
+
+        # the memory-mapped dictionary is mapped again, modifications are kept
+        for unpickled in [
+            pickle.loads(pickle.dumps(compiled_dict)),
+            pickle.loads(pickle.dumps(CompiledPhonemeDict.build(expected))),
+        ]:
+            assert dict(unpickled.items()) == expected
+        assert pickle.loads(pickle.dumps(compiled_dict)).path == str(path)
+        assert len(pickle.dumps(compiled_dict)) < 1000
+
+        # modifications are not saved
+        assert dict(CompiledPhonemeDict.load(path).items()) == PHONEME_DICT
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import os
+import shutil
 import unicodedata
 
 import pytest
@@ -38,6 +39,7 @@ class TestIpaG2p:
         phoneme_probability=None,
         grapheme_case=GRAPHEME_CASE_UPPER,
         grapheme_prefix="",
+        use_compiled_dict=False,
     ):
         return IpaG2p(
             phoneme_dict,
@@ -47,6 +49,7 @@ class TestIpaG2p:
             phoneme_probability=phoneme_probability,
             grapheme_case=grapheme_case,
             grapheme_prefix=grapheme_prefix,
+            use_compiled_dict=use_compiled_dict,
         )
 
     @pytest.mark.run_only_on('CPU')
@@ -183,6 +186,82 @@ class TestIpaG2p:
         assert g2p.phoneme_dict["WORLD"][0] == list("ˈwɝɫd")
         assert g2p.phoneme_dict["AIRPORT"][0] == list("ˈɛɹˌpɔɹt")
 
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_compiled_dict(self, tmp_path):
+        phoneme_dict_path = tmp_path / "test_dict_en.txt"
+        shutil.copy(self.PHONEME_DICT_PATH_EN, phoneme_dict_path)
+        input_text = "Hello NVIDIA's airports, Jones's airport's worlds and kitty-hello!"
+        kwargs = dict(
+            locale="en-US",
+            use_chars=True,
+            grapheme_case=GRAPHEME_CASE_MIXED,
+            grapheme_prefix=self.GRAPHEME_PREFIX,
+            apply_to_oov_word=None,
+        )
+        g2p = self._create_g2p(phoneme_dict=phoneme_dict_path, **kwargs)
+
+        g2p_compiled = self._create_g2p(phoneme_dict=phoneme_dict_path, use_compiled_dict=True, **kwargs)
+        compiled_dict_path = g2p_compiled.get_compiled_dict_path(phoneme_dict_path)
+        assert compiled_dict_path.exists()
+        # loaded instead of compiled again
+        g2p_loaded = self._create_g2p(phoneme_dict=phoneme_dict_path, use_compiled_dict=True, **kwargs)
+        assert g2p_loaded.phoneme_dict.path == str(compiled_dict_path)
+        # compiled again for other settings
+        g2p_upper = self._create_g2p(phoneme_dict=phoneme_dict_path, use_compiled_dict=True, use_chars=True)
+        assert g2p_upper.get_compiled_dict_path(phoneme_dict_path) != compiled_dict_path
+        assert self._create_g2p(phoneme_dict=phoneme_dict_path, use_chars=True)(input_text) == g2p_upper(input_text)
+
+        for g2p_other in [g2p_compiled, g2p_loaded]:
+            assert g2p_other.symbols == g2p.symbols
+            assert dict(g2p_other.phoneme_dict.items()) == dict(g2p.phoneme_dict)
+            assert g2p_other(input_text) == g2p(input_text)
+
+        # source dict changed
+        with open(phoneme_dict_path, "a") as f:
+            f.write("kitty  ˈkɪti\n")
+        g2p_changed = self._create_g2p(phoneme_dict=phoneme_dict_path, use_compiled_dict=True, **kwargs)
+        assert g2p_changed.phoneme_dict["kitty"] == [list("ˈkɪti")]
+        assert {"k", "ɪ", "t", "i"}.issubset(g2p_changed.symbols)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_replace_symbols_with_compiled_dict(self, tmp_path):
+        phoneme_dict_path = tmp_path / "test_dict_en.txt"
+        shutil.copy(self.PHONEME_DICT_PATH_EN, phoneme_dict_path)
+        g2p = self._create_g2p(phoneme_dict=phoneme_dict_path, use_chars=True, use_compiled_dict=True)
+        assert g2p("lead jones") == list("LEAD ˈdʒoʊnz")
+
+        g2p.replace_symbols(symbols=g2p.symbols - {"i", "ʒ"})
+        assert g2p.phoneme_dict["LEAD"] == [list("ˈlɛd")]
+        assert "JONES" not in g2p.phoneme_dict
+        assert g2p("lead jones") == list("ˈlɛd JONES")
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_forward_call_with_word_cache(self):
+        g2p = self._create_g2p()
+        assert g2p("Hello world.") == list("həˈɫoʊ ˈwɝɫd.")
+        assert {"Hello", "world"}.issubset(g2p._word_cache)
+        assert g2p("Hello world.") == list("həˈɫoʊ ˈwɝɫd.")
+
+        g2p.replace_dict({"HELLO": [list("ˈhɛɫoʊ")]})
+        assert not g2p._word_cache
+        assert g2p("Hello world.") == list("ˈhɛɫoʊ WORLD.")
+
+        g2p = IpaG2p(self.PHONEME_DICT_PATH_EN, apply_to_oov_word=lambda x: x, word_cache_size=1)
+        assert g2p("Hello world.") == list("həˈɫoʊ ˈwɝɫd.")
+        assert list(g2p._word_cache) == ["."]
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_forward_call_batch(self):
+        input_texts = ["Hello world.", "Lead the airport's NVIDIA!", ""]
+        g2p = self._create_g2p(locale="en-US")
+
+        assert g2p(input_texts) == [g2p(text) for text in input_texts]
+        assert g2p([]) == []
+
     @pytest.mark.run_only_on('CPU')
     @pytest.mark.unit
     def test_forward_call(self):
@@ -0,0 +1,101 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+import torch
+
+from nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers import EnglishCharsTokenizer
+from nemo.collections.tts.data.dataset import TTSDataset
+from nemo.collections.tts.parts.preprocessing.sup_data_extraction import SupDataExtractor
+
+SAMPLE_RATE = 16000
+SUP_DATA_TYPES = ["pitch", "voiced_mask", "p_voiced", "energy"]
+
+
+def write_manifest(tmp_path, num_samples=4):
+    rng = np.random.default_rng(0)
+    manifest_path = tmp_path / "manifest.json"
+    with open(manifest_path, "w") as f:
+        for i in range(num_samples):
+            audio_path = tmp_path / "audio" / f"speaker{i % 2}" / f"{i}.wav"
+            audio_path.parent.mkdir(parents=True, exist_ok=True)
+            # harmonic tone with a different pitch in every file
+            t = np.arange(SAMPLE_RATE // 4 * (i + 1)) / SAMPLE_RATE
+            audio = 0.5 * np.sin(2 * np.pi * (120 + 20 * i) * t) + 0.01 * rng.standard_normal(t.shape[0])
+            sf.write(audio_path, audio, SAMPLE_RATE)
+            entry = {"audio_filepath": str(audio_path), "text": "text", "duration": t.shape[0] / SAMPLE_RATE}
+            f.write(json.dumps({**entry, "speaker": i % 2}) + "\n")
+    return manifest_path
+
+
+def make_dataset(manifest_path, sup_data_path, sup_data_store):
+    return TTSDataset(
+        manifest_filepath=str(manifest_path),
+        sample_rate=SAMPLE_RATE,
+        text_tokenizer=EnglishCharsTokenizer(),
+        sup_data_types=SUP_DATA_TYPES + ["speaker_id"],
+        sup_data_path=sup_data_path,
+        sup_data_store=sup_data_store,
+    )
+
+
+class TestSupDataExtractor:
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("sup_data_store", [False, True])
+    @pytest.mark.parametrize("num_workers", [0, 2])
+    def test_extract_same_as_dataset(self, tmp_path, sup_data_store, num_workers):
+        manifest_path = write_manifest(tmp_path)
+        reference = make_dataset(manifest_path, tmp_path / "reference", sup_data_store=False)
+        dataset = make_dataset(manifest_path, tmp_path / "extracted", sup_data_store=sup_data_store)
+
+        summary = SupDataExtractor(dataset, num_workers=num_workers, batch_duration=0.6).extract()
+        assert summary["num_computed"] == len(dataset)
+        assert summary["num_skipped"] == 0 and summary["num_failed"] == 0
+
+        # the dataset loads the extracted data instead of computing it
+        extracted = make_dataset(manifest_path, tmp_path / "extracted", sup_data_store=sup_data_store)
+        for index in range(len(dataset)):
+            key = extracted._get_rel_audio_path_as_text_id(extracted.data[index])
+            for name in SUP_DATA_TYPES:
+                assert extracted._has_sup_data(name, key)
+            for expected, actual in zip(reference[index], extracted[index]):
+                if isinstance(expected, torch.Tensor):
+                    assert torch.equal(expected, actual)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_resume_and_pitch_stats(self, tmp_path):
+        manifest_path = write_manifest(tmp_path)
+        dataset = make_dataset(manifest_path, tmp_path / "sup_data", sup_data_store=True)
+        # compute a part of the data on the fly
+        dataset[0]
+        dataset[1]
+        dataset.consolidate_sup_data()
+
+        extractor = SupDataExtractor(make_dataset(manifest_path, tmp_path / "sup_data", sup_data_store=True))
+        summary = extractor.extract()
+        assert summary["num_computed"] == 2 and summary["num_skipped"] == 2
+
+        pitch = [dataset[index][8] for index in range(len(dataset))]
+        stats = extractor.pitch_stats.get_stats()
+        for speaker_id, speaker_pitch in [("default", pitch), ("0", pitch[0::2]), ("1", pitch[1::2])]:
+            values = torch.cat(speaker_pitch)
+            values = values[values != 0]
+            assert stats[speaker_id]["pitch_mean"] == pytest.approx(values.mean().item(), rel=1e-5)
+            assert stats[speaker_id]["pitch_std"] == pytest.approx(values.std().item(), rel=1e-4)
@@ -0,0 +1,150 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pickle
+
+import numpy as np
+import pytest
+import soundfile as sf
+import torch
+
+from nemo.collections.common.tokenizers.text_to_speech.tts_tokenizers import EnglishCharsTokenizer
+from nemo.collections.tts.data.dataset import TTSDataset
+from nemo.collections.tts.parts.utils.sup_data_store import INDEX_DTYPE, SupDataStore
+
+
+class TestSupDataStore:
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_add_get(self, tmp_path):
+        rng = np.random.default_rng(0)
+        values = {f"speaker_{i}_audio": rng.random((2, i + 1)).astype(np.float32) for i in range(20)}
+        values["pitch"] = rng.random(7).astype(np.float32)
+        values["log_mel"] = rng.random((1, 80, 3)).astype(np.float32)
+
+        store = SupDataStore(tmp_path / "store", dtype=np.float32, max_shard_size=256)
+        other_store = SupDataStore(tmp_path / "store")
+        with store.writer() as writer:
+            for key, value in values.items():
+                writer.add(key, value)
+                # the writes are visible to the store of the writer right away
+                np.testing.assert_array_equal(store.get(key), value)
+        assert len(store) == len(values)
+        assert len(other_store) == 0
+
+        other_store.refresh()
+        assert len(other_store) == len(values)
+        store.refresh()
+        assert len(store) == len(values)
+        assert len(list((tmp_path / "store").glob("*.bin"))) > 1
+        for key, value in values.items():
+            np.testing.assert_array_equal(store.get(key), value)
+        assert store.get("missing") is None
+        assert "missing" not in store
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_consolidate_and_reopen(self, tmp_path):
+        store = SupDataStore(tmp_path, dtype=np.float32)
+        with store.writer() as writer:
+            writer.add("a", np.arange(3))
+            writer.add("b", np.ones((2, 2)))
+        # the latest value replaces the previous one, also from another writer
+        with store.writer() as writer:
+            writer.add("a", np.arange(5))
+        assert len(store) == 2
+        np.testing.assert_array_equal(store.get("a"), np.arange(5, dtype=np.float32))
+        store.consolidate()
+
+        assert list(tmp_path.glob("*.idx")) == []
+        reopened = SupDataStore(tmp_path)
+        assert reopened.dtype == np.float32
+        assert len(reopened) == 2
+        np.testing.assert_array_equal(reopened.get("a"), np.arange(5, dtype=np.float32))
+        np.testing.assert_array_equal(reopened.get("b"), np.ones((2, 2), dtype=np.float32))
+
+        with pytest.raises(ValueError):
+            SupDataStore(tmp_path, dtype=np.float64)
+        with pytest.raises(ValueError):
+            SupDataStore(tmp_path / "missing")
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_interrupted_writer(self, tmp_path):
+        store = SupDataStore(tmp_path, dtype=np.float32)
+        with store.writer() as writer:
+            writer.add("a", np.arange(3))
+            writer.add("b", np.arange(4))
+        # simulate a writer interrupted while writing the index record of "b"
+        (index_path,) = tmp_path.glob("*.idx")
+        index_path.write_bytes(index_path.read_bytes()[:-5])
+
+        store.refresh()
+        assert len(store) == 1
+        np.testing.assert_array_equal(store.get("a"), np.arange(3, dtype=np.float32))
+        assert store.get("b") is None
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_copy_on_write_and_pickle(self, tmp_path):
+        store = SupDataStore(tmp_path, dtype=np.float32)
+        with store.writer() as writer:
+            writer.add("a", np.arange(3))
+        store.refresh()
+
+        value = store.get("a")
+        value += 1
+        np.testing.assert_array_equal(SupDataStore(tmp_path).get("a"), np.arange(3, dtype=np.float32))
+
+        unpickled = pickle.loads(pickle.dumps(SupDataStore(tmp_path)))
+        np.testing.assert_array_equal(unpickled.get("a"), np.arange(3, dtype=np.float32))
+
+
+class TestTTSDatasetSupDataStore:
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    def test_getitem_loads_computed_data(self, tmp_path, monkeypatch):
+        sample_rate = 16000
+        t = np.arange(sample_rate // 2) / sample_rate
+        sf.write(tmp_path / "audio.wav", 0.5 * np.sin(2 * np.pi * 150 * t), sample_rate)
+        manifest_path = tmp_path / "manifest.json"
+        with open(manifest_path, "w") as f:
+            f.write(json.dumps({"audio_filepath": str(tmp_path / "audio.wav"), "text": "text", "duration": 0.5}))
+        dataset = TTSDataset(
+            manifest_filepath=str(manifest_path),
+            sample_rate=sample_rate,
+            text_tokenizer=EnglishCharsTokenizer(),
+            sup_data_types=["log_mel", "pitch", "voiced_mask", "p_voiced", "energy"],
+            sup_data_path=tmp_path / "sup_data",
+            sup_data_store=True,
+        )
+
+        def num_records():
+            return sum(path.stat().st_size for path in (tmp_path / "sup_data").rglob("*.idx")) // INDEX_DTYPE.itemsize
+
+        computed = dataset[0]
+        assert num_records() == 5
+
+        def fail(*args, **kwargs):
+            raise AssertionError("supplementary data is computed again")
+
+        monkeypatch.setattr("nemo.collections.tts.data.dataset.librosa.pyin", fail)
+        monkeypatch.setattr(dataset, "get_log_mel", fail)
+        monkeypatch.setattr(dataset, "get_spec", fail)
+        loaded = dataset[0]
+        assert num_records() == 5
+        for expected, actual in zip(computed, loaded):
+            if isinstance(expected, torch.Tensor):
+                assert torch.equal(expected, actual)
@@ -20,6 +20,8 @@ import pytest
 import torch
 
 from nemo.collections.tts.parts.utils.tts_dataset_utils import (
+    batched_beta_binomial_prior_distribution,
+    beta_binomial_prior_distribution,
     filter_dataset_by_duration,
     get_abs_rel_paths,
     get_audio_filepaths,
@@ -208,3 +210,20 @@ class TestTTSDatasetUtils:
         assert filtered_entries[1]["duration"] == 5.0
         assert total_hours == (135.6 / 3600.0)
         assert filtered_hours == (15.0 / 3600.0)
+
+    @pytest.mark.run_only_on('CPU')
+    @pytest.mark.unit
+    @pytest.mark.parametrize("scaling_factor", [1.0, 0.5])
+    def test_batched_beta_binomial_prior_distribution(self, scaling_factor):
+        phoneme_counts = torch.tensor([1, 5, 37, 120])
+        mel_counts = torch.tensor([3, 800, 200, 1000])
+
+        priors = batched_beta_binomial_prior_distribution(phoneme_counts, mel_counts, scaling_factor=scaling_factor)
+
+        assert priors.shape == (4, 1000, 120)
+        for prior, phoneme_count, mel_count in zip(priors, phoneme_counts.tolist(), mel_counts.tolist()):
+            expected_prior = beta_binomial_prior_distribution(phoneme_count, mel_count, scaling_factor=scaling_factor)
+            torch.testing.assert_close(
+                prior[:mel_count, :phoneme_count], torch.from_numpy(expected_prior), rtol=1e-3, atol=1e-3
+            )
+            assert torch.all(prior[mel_count:] == 0) and torch.all(prior[:, phoneme_count:] == 0)
@@ -0,0 +1,195 @@
+# Copyright (c) 2025, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from nemo.utils import sequence_packing_utils
+from nemo.utils.sequence_packing_utils import (
+    PACKING_ALGOS,
+    PackedSequenceData,
+    best_fit,
+    convert_packed_sequence_data,
+    create_packing_strategy,
+    find_first_bin_that_fits,
+    first_fit,
+    first_fit_decreasing,
+    first_fit_shuffle,
+    get_packing_stats,
+    is_packed_sequence_dir,
+    save_packed_sequence_data,
+)
+
+
+def first_fit_reference(seqlens, pack_size):
+    res = []
+    for s in seqlens:
+        first_bin = find_first_bin_that_fits(res, s, pack_size)
+        if first_bin == -1:
+            res.append([s])
+        else:
+            res[first_bin].append(s)
+    return res
+
+
+def random_seqlens(rng, pack_size, n):
+    # a few sequences are longer than the pack size and get a bin of their own
+    return [rng.randint(0, pack_size + 4) for _ in range(n)]
+
+
+class TestSequencePacking:
+    @pytest.mark.unit
+    @pytest.mark.parametrize("pack_size", [1, 7, 64])
+    def test_first_fit_matches_reference(self, pack_size):
+        rng = random.Random(pack_size)
+        for n in [0, 1, 10, 500]:
+            seqlens = random_seqlens(rng, pack_size, n)
+            assert first_fit(seqlens, pack_size) == first_fit_reference(seqlens, pack_size)
+            assert first_fit_decreasing(seqlens, pack_size) == first_fit_reference(
+                sorted(seqlens, reverse=True), pack_size
+            )
+
+            np.random.seed(n)
+            packed = first_fit_shuffle(seqlens, pack_size)
+            np.random.seed(n)
+            shuffled = seqlens[:]
+            np.random.shuffle(shuffled)
+            assert packed == first_fit_reference(shuffled, pack_size)
+
+    @pytest.mark.unit
+    def test_python_kernels_match(self):
+        """The packing kernels give the same bins with and without numba."""
+        rng = random.Random(0)
+        seqlens = np.array(random_seqlens(rng, 32, 300), dtype=np.int64)
+        for name in ["_first_fit_bins", "_best_fit_bins"]:
+            kernel = getattr(sequence_packing_utils, name)
+            bin_ids, num_bins = getattr(kernel, "py_func", kernel)(seqlens, 32)
+            expected_bin_ids, expected_num_bins = kernel(seqlens, 32)
+            assert num_bins == expected_num_bins
+            assert bin_ids.tolist() == expected_bin_ids.tolist()
+
+    @pytest.mark.unit
+    def test_best_fit(self):
+        assert best_fit([6, 5, 3, 4, 1], 10) == [[6, 3], [5, 4, 1]]
+        # ties go to the most recently filled bin
+        assert best_fit([8, 8, 2, 2], 10) == [[8, 2], [8, 2]]
+        assert best_fit([8, 8, 1, 1], 10) == [[8], [8, 1, 1]]
+
+        rng = random.Random(0)
+        seqlens = random_seqlens(rng, 64, 2000)
+        for algorithm in PACKING_ALGOS:
+            packed = getattr(sequence_packing_utils, algorithm)(seqlens, 64)
+            assert sorted(s for b in packed for s in b) == sorted(seqlens)
+            assert all(sum(b) <= 64 or len(b) == 1 for b in packed)
+
+    @pytest.mark.unit
+    def test_packs_summable_items(self):
+        """Items that are not lengths (e.g. samples) are packed by `sum` and kept in a stable order."""
+
+        class Item:
+            def __init__(self, name, length):
+                self.name, self.length = name, length
+
+            def __radd__(self, other):
+                return other + self.length
+
+            def __lt__(self, other):
+                return self.length < other.length
+
+        items = [Item(name, length) for name, length in zip("abcdef", [3, 5, 3, 2, 5, 1])]
+        packed = first_fit_decreasing(items, 8)
+        expected = first_fit_reference(sorted(items, reverse=True), 8)
+        assert [[item.name for item in b] for b in packed] == [[item.name for item in b] for b in expected]
+
+    @pytest.mark.unit
+    def test_packing_stats(self):
+        stats = get_packing_stats([[3, 4], [5], [2, 2, 2]], pack_size=8)
+        assert stats['num_sequences'] == 6
+        assert stats['num_bins'] == 3
+        assert stats['packing_factor'] == 2
+        assert stats['packing_efficiency'] == pytest.approx(18 / 24)
+        assert stats['num_padding_tokens'] == 6
+        assert (stats['min_tokens_per_bin'], stats['max_tokens_per_bin']) == (5, 7)
+        assert stats['max_samples_per_bin'] == 3
+
+    @pytest.mark.unit
+    def test_create_packing_strategy(self):
+        histogram = [0, 3, 0, 2, 1]
+        assignments, packing_metadata = create_packing_strategy(histogram, 5, 'first_fit_decreasing')
+        assert assignments == [[4, 1], [3, 1, 1], [3]]
+        assert packing_metadata == {'dataset_max_seqlen': 4, 'max_samples_per_bin': 3}
+
+
+@pytest.fixture()
+def packs():
+    rng = random.Random(0)
+    packs = []
+    for _ in range(20):
+        seqlens = [rng.randint(1, 10) for _ in range(rng.randint(1, 4))]
+        packs.append(
+            {
+                'input_ids': [rng.randrange(32000) for _ in range(sum(seqlens))],
+                'loss_mask': [rng.random() > 0.5 for _ in range(sum(seqlens))],
+                'seq_start_id': np.cumsum([0] + seqlens[:-1]).tolist(),
+            }
+        )
+    return packs
+
+
+class TestPackedSequenceData:
+    @pytest.mark.unit
+    def test_round_trip(self, packs, tmp_path):
+        save_packed_sequence_data(packs, str(tmp_path / "packed"))
+        assert is_packed_sequence_dir(str(tmp_path / "packed"))
+        data = PackedSequenceData(str(tmp_path / "packed"))
+        assert len(data) == len(packs)
+        for idx in [0, 7, len(packs) - 1, -1, -len(packs)]:
+            item = data[idx]
+            assert item['input_ids'].tolist() == packs[idx]['input_ids']
+            assert item['loss_mask'].tolist() == packs[idx]['loss_mask']
+            assert item['seq_start_id'] == packs[idx]['seq_start_id']
+        with pytest.raises(IndexError):
+            data[len(packs)]
+
+    @pytest.mark.unit
+    def test_reads_are_zero_copy_and_pickled_by_path(self, packs, tmp_path):
+        save_packed_sequence_data(packs, str(tmp_path / "packed"))
+        data = PackedSequenceData(str(tmp_path / "packed"))
+        item = data[3]
+        assert not item['input_ids'].flags.owndata
+        assert not item['input_ids'].flags.writeable
+        assert len(pickle.dumps(data)) < 1024
+        restored = pickle.loads(pickle.dumps(data))
+        assert restored[3]['input_ids'].tolist() == item['input_ids'].tolist()
+
+    @pytest.mark.unit
+    def test_incomplete_dataset_is_not_packed_dir(self, packs, tmp_path):
+        with pytest.raises(KeyError):
+            save_packed_sequence_data(packs + [{'input_ids': [1]}], str(tmp_path / "packed"))
+        assert not is_packed_sequence_dir(str(tmp_path / "packed"))
+
+    @pytest.mark.unit
+    def test_convert_npy(self, packs, tmp_path):
+        np.save(tmp_path / "packed.npy", packs)
+        convert_packed_sequence_data(str(tmp_path / "packed.npy"), str(tmp_path / "packed"))
+        legacy = np.load(tmp_path / "packed.npy", allow_pickle=True)
+        data = PackedSequenceData(str(tmp_path / "packed"))
+        assert len(data) == len(legacy)
+        for item, expected in zip(data, legacy):
+            assert item['input_ids'].tolist() == expected['input_ids']
+            assert item['loss_mask'].tolist() == expected['loss_mask']
+            assert item['seq_start_id'] == expected['seq_start_id']